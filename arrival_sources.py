@@ -0,0 +1,191 @@
+"""
+Fontes de chegada para simulação de sistema aberto.
+
+Em vez da lista completa de tarefas, o Simulator pode receber uma
+ArrivalSource: um iterador de TCBs em ordem não decrescente de ingresso
+que o simulador consome sob demanda, a cada tick, só até o tempo atual.
+A simulação termina quando a fonte se esgota e todas as tarefas admitidas
+terminam, ou ao atingir o horizonte de tempo (Simulator(horizon=...)).
+
+Fontes disponíveis:
+    ArrivalSource(tarefas)           # qualquer iterável/gerador de TCBs
+    ArrivalSource(tarefas, window=N) # reordena tarefas até N posições fora de ordem
+    poisson_source(taxa, ...)        # chegadas de Poisson, infinitas se limit=None
+    open_config_source("config.txt") # linhas interpretadas uma a uma ("-" = stdin)
+    mapped_source(workload)          # carga binária mapeada (workload_bin)
+
+Memória constante com fluxo infinito:
+    algo, quantum, alpha, source = open_config_source("-")
+    simulator = Simulator(create_scheduler(algo, quantum, alpha), source,
+                          horizon=10**6, retire_finished=True)
+    while not simulator.is_finished():
+        simulator.step()
+        del simulator.gantt_data[:]   # ou ChromeTraceWriter(drain=True)
+
+Com retire_finished=True o simulador descarta as tarefas concluídas (as
+médias continuam em get_statistics) e desliga o histórico de step_back.
+"""
+
+import heapq
+import random
+import sys
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from config_loader import iter_task_lines, parse_settings_line
+from tasks import TCB
+
+# Tarefas lidas à frente por open_config_source para reordenar linhas fora de ordem
+REORDER_WINDOW = 1024
+
+
+class ArrivalSource:
+    """
+    Tarefas em ordem de ingresso, lidas sob demanda.
+
+    Guarda só a próxima tarefa (lookahead); tarefas fora de ordem geram
+    ValueError no momento em que são lidas. Com window=N, até N tarefas são
+    lidas à frente e entregues em ordem de ingresso (empates na ordem da
+    fonte): só tarefas deslocadas mais de N posições geram o erro.
+    """
+
+    def __init__(self, tasks: Iterable[TCB], window: int = 0):
+        if window < 0:
+            raise ValueError("A janela de reordenação não pode ser negativa")
+        self._iterator = iter(tasks)
+        self._window = window
+        self._buffer: List[Tuple[int, int, TCB]] = []  # Heap (ingresso, ordem de leitura, tarefa)
+        self._read = 0
+        self._pending: Optional[TCB] = None
+        self._done = False
+        self._last_arrival: Optional[int] = None
+        self.taken = 0  # Tarefas já entregues ao simulador
+
+    def peek(self) -> Optional[TCB]:
+        """Próxima tarefa, sem consumi-la (None se a fonte acabou)."""
+        if self._pending is None and not self._done:
+            try:
+                task = self._next_task()
+            except StopIteration:
+                self._done = True
+                return None
+            if self._last_arrival is not None and task.inicio < self._last_arrival:
+                raise ValueError(f"Fonte de chegadas fora de ordem: tarefa {task.id} chega em {task.inicio}, "
+                                 f"depois de uma chegada em {self._last_arrival}")
+            self._last_arrival = task.inicio
+            self._pending = task
+        return self._pending
+
+    def _next_task(self) -> TCB:
+        if not self._window:
+            return next(self._iterator)
+        while len(self._buffer) <= self._window:
+            task = next(self._iterator, None)
+            if task is None:
+                break
+            heapq.heappush(self._buffer, (task.inicio, self._read, task))
+            self._read += 1
+        if not self._buffer:
+            raise StopIteration
+        return heapq.heappop(self._buffer)[2]
+
+    def next_arrival(self) -> Optional[int]:
+        """Ingresso da próxima tarefa, ou None se a fonte acabou."""
+        task = self.peek()
+        return None if task is None else task.inicio
+
+    def exhausted(self) -> bool:
+        """Se não há mais tarefas a chegar."""
+        return self.peek() is None
+
+    def take_until(self, time: int) -> List[TCB]:
+        """Consome as tarefas com ingresso <= time."""
+        taken = []
+        task = self.peek()
+        while task is not None and task.inicio <= time:
+            taken.append(task)
+            self._pending = None
+            task = self.peek()
+        self.taken += len(taken)
+        return taken
+
+    def __iter__(self) -> Iterator[TCB]:
+        """Consome o restante da fonte."""
+        while not self.exhausted():
+            task, self._pending = self._pending, None
+            self.taken += 1
+            yield task
+
+
+def poisson_source(rate: float, mean_duration: float = 5.0, seed: int = 0, limit: Optional[int] = None,
+                   max_priority: int = 10, start: int = 0, first_id: int = 1) -> ArrivalSource:
+    """
+    Chegadas de Poisson (intervalos exponenciais) com durações exponenciais.
+
+    Args:
+        rate: Chegadas por unidade de tempo
+        mean_duration: Duração média das tarefas (mínimo de 1 tick cada)
+        seed: Semente do gerador aleatório
+        limit: Número de tarefas (None = fluxo infinito)
+        max_priority: Prioridades sorteadas em 1..max_priority
+        start: Instante a partir do qual as chegadas começam
+        first_id: Id da primeira tarefa (as seguintes são consecutivas)
+    """
+    if rate <= 0 or mean_duration <= 0:
+        raise ValueError("Taxa de chegada e duração média devem ser positivas")
+    return ArrivalSource(_poisson_tasks(random.Random(seed), rate, mean_duration, limit, max_priority,
+                                        start, first_id))
+
+
+def _poisson_tasks(rng: random.Random, rate: float, mean_duration: float, limit: Optional[int],
+                   max_priority: int, start: int, first_id: int) -> Iterator[TCB]:
+    clock = float(start)
+    tid = first_id
+    while limit is None or tid - first_id < limit:
+        clock += rng.expovariate(rate)
+        duracao = max(1, round(rng.expovariate(1 / mean_duration)))
+        prio = rng.randint(1, max_priority)
+        yield TCB(id=tid, RGB=[rng.randint(0, 255) for _ in range(3)], inicio=int(clock), duracao=duracao,
+                  prio_s=prio, prio_d=prio)
+        tid += 1
+
+
+def open_config_source(config: Union[str, IO[str]], window: int = REORDER_WINDOW
+                       ) -> Tuple[str, Optional[int], Optional[int], ArrivalSource]:
+    """
+    Abre uma configuração de texto como fonte de chegadas.
+
+    A primeira linha (algoritmo, quantum, alpha) é lida na hora; as tarefas
+    são interpretadas uma a uma conforme o simulador avança. Aceita caminho,
+    "-" (entrada padrão) ou objeto de arquivo (ex.: pipe). As linhas precisam
+    estar em ordem de ingresso, a menos de window linhas lidas à frente
+    (arquivos pequenos, como os de exemplo, podem estar em qualquer ordem).
+
+    Returns:
+        Tupla (algoritmo, quantum, alpha, fonte)
+    """
+    if config == "-":
+        f, owned = sys.stdin, False
+    elif isinstance(config, str):
+        f, owned = open(config, "r"), True
+    else:
+        f, owned = config, False
+    try:
+        algo, quantum, alpha = parse_settings_line(f.readline())
+    except ValueError:
+        if owned:
+            f.close()
+        raise
+    return algo, quantum, alpha, ArrivalSource(_lines_then_close(f, owned), window)
+
+
+def _lines_then_close(f: IO[str], owned: bool) -> Iterator[TCB]:
+    try:
+        yield from iter_task_lines(f, first_line=2)
+    finally:
+        if owned:
+            f.close()
+
+
+def mapped_source(workload, start: int = 0) -> ArrivalSource:
+    """Fonte sobre uma carga binária mapeada (workload_bin.MappedWorkload), a partir da tarefa start."""
+    return ArrivalSource(workload.iter_tasks(start))
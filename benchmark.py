@@ -0,0 +1,330 @@
+"""
+Benchmark dos escalonadores em diferentes escalas de carga.
+
+Gera cargas de trabalho determinísticas (semente fixa) com tarefas só de CPU,
+com muito I/O ou com muito uso de mutex, executa Simulator.run_full() para
+cada algoritmo de SCHEDULER_FACTORY e registra:
+    - ticks/s (passos de simulação por segundo)
+    - pico de memória (tracemalloc)
+    - custo do histórico de step_back (_save_state)
+    - custo de exportar o trace (ChromeTraceWriter)
+
+Os resultados podem ser gravados como linha de base em JSON e comparados com
+execuções futuras, apontando regressões acima de um limiar.
+
+Uso:
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.15
+    python benchmark.py --scales 10 100 1000 10000 100000 1000000 --max-ticks 2000
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from tasks import TCB
+from scheduler import SCHEDULER_FACTORY, create_scheduler
+from simulador import Simulator
+from trace_export import ChromeTraceWriter
+
+DEFAULT_SCALES = [10, 100, 1000]
+MIXES = ("cpu", "io", "mutex")
+DEFAULT_SEED = 2024
+DEFAULT_MAX_TICKS = 2000
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.10
+
+# Métricas comparadas: nome -> True se maior é melhor
+COMPARED_METRICS = {
+    'ticks_per_sec': True,
+    'peak_memory_kb': False,
+}
+
+
+def generate_workload(n_tasks: int, mix: str = "cpu", seed: int = DEFAULT_SEED,
+                      max_duration: int = 10, load: float = 1.5, n_mutexes: int = 2) -> List[TCB]:
+    """
+    Gera uma carga de trabalho determinística.
+
+    Args:
+        n_tasks: Número de tarefas
+        mix: 'cpu' (sem eventos), 'io' (rajadas de I/O) ou 'mutex' (seções críticas)
+        seed: Semente do gerador aleatório
+        max_duration: Duração máxima de cada tarefa
+        load: Carga oferecida (trabalho total / intervalo de chegadas)
+        n_mutexes: Número de mutexes compartilhados no mix 'mutex'
+
+    Returns:
+        Lista de tarefas
+    """
+    if mix not in MIXES:
+        raise ValueError(f"Mix '{mix}' inválido. Use um de: {', '.join(MIXES)}")
+
+    rng = random.Random(f"{seed}:{mix}:{n_tasks}")
+    mean_duration = (1 + max_duration) / 2
+    horizon = max(1, int(n_tasks * mean_duration / load))
+
+    tasks = []
+    for i in range(n_tasks):
+        duracao = rng.randint(2, max_duration)
+        io_events = []
+        ml_events = []
+        mu_events = []
+
+        if mix == "io":
+            # 1 a 3 rajadas de I/O em instantes distintos da execução
+            points = rng.sample(range(1, duracao), k=min(duracao - 1, rng.randint(1, 3)))
+            io_events = [(p, rng.randint(1, 5)) for p in sorted(points)]
+        elif mix == "mutex":
+            # Uma seção crítica [lock, unlock) em um dos mutexes compartilhados
+            mutex_id = rng.randint(1, n_mutexes)
+            lock_at = rng.randint(0, duracao - 1)
+            unlock_at = rng.randint(lock_at + 1, duracao)
+            ml_events = [(mutex_id, lock_at)]
+            mu_events = [(mutex_id, unlock_at)]
+
+        tasks.append(TCB(
+            id=i + 1,
+            RGB=[rng.randint(0, 255) for _ in range(3)],
+            inicio=rng.randint(0, horizon),
+            duracao=duracao,
+            prio_s=rng.randint(1, 10),
+            io_events=io_events,
+            ml_events=ml_events,
+            mu_events=mu_events,
+        ))
+    return tasks
+
+
+def _timed_run(algo: str, tasks_factory, max_ticks: int, history: bool = True,
+               trace: bool = False, repeat: int = 1) -> Dict[str, float]:
+    """Executa a simulação 'repeat' vezes e mede o melhor tempo de parede."""
+    best = None
+    for _ in range(max(1, repeat)):
+        run = _timed_run_once(algo, tasks_factory, max_ticks, history, trace)
+        if best is None or run['seconds'] < best['seconds']:
+            best = run
+    return best
+
+
+def _timed_run_once(algo: str, tasks_factory, max_ticks: int, history: bool,
+                    trace: bool) -> Dict[str, float]:
+    """Executa uma simulação e mede tempo de parede e ticks."""
+    simulator = Simulator(create_scheduler(algo, quantum=3, alpha=1), tasks_factory())
+    if not history:
+        simulator.max_history = 0
+
+    writer = None
+    if trace:
+        writer = ChromeTraceWriter(os.devnull, drain=True)
+        writer.attach(simulator)
+
+    start = time.perf_counter()
+    simulator.run_full(max_iterations=max_ticks)
+    elapsed = time.perf_counter() - start
+
+    if writer:
+        writer.close()
+    return {'seconds': elapsed, 'ticks': simulator.time,
+            'finished': simulator.is_finished()}
+
+
+def _peak_memory_kb(algo: str, tasks_factory, max_ticks: int) -> float:
+    """Mede o pico de memória (KiB) alocado durante criação e execução."""
+    tracemalloc.start()
+    try:
+        simulator = Simulator(create_scheduler(algo, quantum=3, alpha=1), tasks_factory())
+        simulator.run_full(max_iterations=max_ticks)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def benchmark_case(algo: str, n_tasks: int, mix: str, seed: int = DEFAULT_SEED,
+                   max_ticks: int = DEFAULT_MAX_TICKS, memory: bool = True,
+                   overhead: bool = True, repeat: int = DEFAULT_REPEAT) -> dict:
+    """
+    Mede um caso (algoritmo, escala, mix).
+
+    Args:
+        algo: Nome do algoritmo em SCHEDULER_FACTORY
+        n_tasks: Número de tarefas da carga
+        mix: Tipo de carga ('cpu', 'io', 'mutex')
+        seed: Semente da carga
+        max_ticks: Limite de passos por execução
+        memory: Se True, mede o pico de memória com tracemalloc
+        overhead: Se True, mede o custo de _save_state e do trace
+        repeat: Repetições de cada execução cronometrada (vale o melhor tempo)
+
+    Returns:
+        Dicionário com as métricas do caso
+    """
+    tasks_factory = lambda: generate_workload(n_tasks, mix, seed)
+
+    base = _timed_run(algo, tasks_factory, max_ticks, repeat=repeat)
+    result = {
+        'algo': algo,
+        'mix': mix,
+        'n_tasks': n_tasks,
+        'ticks': base['ticks'],
+        'finished': base['finished'],
+        'seconds': base['seconds'],
+        'ticks_per_sec': base['ticks'] / base['seconds'] if base['seconds'] > 0 else 0.0,
+    }
+
+    if overhead:
+        no_history = _timed_run(algo, tasks_factory, max_ticks, history=False, repeat=repeat)
+        traced = _timed_run(algo, tasks_factory, max_ticks, history=False, trace=True, repeat=repeat)
+        # Fração do tempo gasta com histórico / trace em relação à execução de referência
+        result['save_state_overhead'] = 1 - no_history['seconds'] / base['seconds'] if base['seconds'] else 0.0
+        result['trace_overhead'] = traced['seconds'] / no_history['seconds'] - 1 if no_history['seconds'] else 0.0
+
+    if memory:
+        result['peak_memory_kb'] = _peak_memory_kb(algo, tasks_factory, max_ticks)
+
+    return result
+
+
+def run_benchmark(scales: List[int] = None, mixes: List[str] = None, algos: List[str] = None,
+                  seed: int = DEFAULT_SEED, max_ticks: int = DEFAULT_MAX_TICKS,
+                  memory: bool = True, overhead: bool = True, repeat: int = DEFAULT_REPEAT,
+                  verbose: bool = True) -> dict:
+    """
+    Executa a matriz completa de casos.
+
+    Returns:
+        Dicionário com 'meta' (ambiente e parâmetros) e 'results' (lista de casos)
+    """
+    scales = scales or DEFAULT_SCALES
+    mixes = mixes or list(MIXES)
+    algos = algos or list(SCHEDULER_FACTORY)
+
+    results = []
+    for n_tasks in scales:
+        for mix in mixes:
+            for algo in algos:
+                case = benchmark_case(algo, n_tasks, mix, seed, max_ticks, memory, overhead, repeat)
+                results.append(case)
+                if verbose:
+                    print(format_case(case), flush=True)
+
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'max_ticks': max_ticks,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def format_case(case: dict) -> str:
+    """Formata um caso em uma linha de tabela."""
+    line = (f"{case['algo']:<11}{case['mix']:<7}{case['n_tasks']:>9}{case['ticks']:>8}"
+            f"{case['ticks_per_sec']:>12.0f} ticks/s")
+    if 'peak_memory_kb' in case:
+        line += f"{case['peak_memory_kb']:>11.0f} KiB"
+    if 'save_state_overhead' in case:
+        line += f"  hist {100 * case['save_state_overhead']:5.1f}%  trace {100 * case['trace_overhead']:+6.1f}%"
+    return line
+
+
+def _case_key(case: dict) -> str:
+    """Chave que identifica um caso entre execuções."""
+    return f"{case['algo']}|{case['mix']}|{case['n_tasks']}"
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """
+    Compara duas execuções e lista as regressões acima do limiar.
+
+    Args:
+        baseline: Resultado de referência (formato de run_benchmark)
+        current: Resultado atual
+        threshold: Variação relativa tolerada (0.10 = 10%)
+
+    Returns:
+        Lista de regressões: {'case', 'metric', 'baseline', 'current', 'change'}
+    """
+    base_cases = {_case_key(c): c for c in baseline['results']}
+    regressions = []
+    for case in current['results']:
+        ref = base_cases.get(_case_key(case))
+        if ref is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric not in case or metric not in ref or not ref[metric]:
+                continue
+            change = (case[metric] - ref[metric]) / ref[metric]
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append({
+                    'case': _case_key(case),
+                    'metric': metric,
+                    'baseline': ref[metric],
+                    'current': case[metric],
+                    'change': change,
+                })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Benchmark dos escalonadores")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Números de tarefas a testar (ex: 10 100 1000 1000000)")
+    parser.add_argument("--mixes", nargs="+", choices=MIXES, default=list(MIXES))
+    parser.add_argument("--algos", nargs="+", choices=list(SCHEDULER_FACTORY), default=None)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS,
+                        help="Limite de passos por execução")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Repetições por execução; vale o melhor tempo (padrão: 3)")
+    parser.add_argument("--no-memory", action="store_true", help="Não mede o pico de memória")
+    parser.add_argument("--no-overhead", action="store_true", help="Não mede custo de histórico/trace")
+    parser.add_argument("--save", metavar="ARQUIVO", help="Grava os resultados em JSON")
+    parser.add_argument("--compare", metavar="ARQUIVO", help="Compara com uma linha de base JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Limiar de regressão relativo (padrão: 0.10)")
+    args = parser.parse_args(argv)
+
+    print(f"{'Algoritmo':<11}{'Mix':<7}{'Tarefas':>9}{'Ticks':>8}{'Vazão':>18}")
+    print("=" * 80)
+    current = run_benchmark(args.scales, args.mixes, args.algos, args.seed, args.max_ticks,
+                            memory=not args.no_memory, overhead=not args.no_overhead,
+                            repeat=args.repeat)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nResultados salvos em: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, current, args.threshold)
+        print()
+        if regressions:
+            print(f"⚠️  {len(regressions)} regressão(ões) acima de {100 * args.threshold:.0f}%:")
+            for r in regressions:
+                print(f"  {r['case']:<28} {r['metric']:<15} {r['baseline']:>12.1f} -> "
+                      f"{r['current']:>12.1f} ({100 * r['change']:+.1f}%)")
+            return 1
+        print(f"✅ Nenhuma regressão acima de {100 * args.threshold:.0f}%")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
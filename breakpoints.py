@@ -0,0 +1,290 @@
+"""
+Breakpoints e "executar até" para a simulação.
+
+Um Breakpoint é uma condição ligada a um tipo de evento do simulador
+(ver Simulator.add_listener), opcionalmente filtrada por tarefa, mutex ou
+tempo, com um predicado extra sobre o estado. Exemplos:
+    Breakpoint('dispatch', task_id=7)             # tarefa 7 entrou na CPU
+    Breakpoint('mutex_contended', mutex_id=2)     # alguém esperou pelo mutex 2
+    Breakpoint('io_block', task_id=3)             # tarefa 3 entrou em I/O
+    Breakpoint('deadlock')
+    at_time(500)                                  # tempo 500
+    ready_longer_than(10)                         # fila de prontos > 10
+
+BreakpointSet escuta o simulador e guarda os breakpoints indexados por
+evento (e os de tempo por tick), então cada evento só avalia as condições
+que dependem dele; sem breakpoints para um evento o custo é uma consulta
+a dicionário. Condições sobre o estado (evento 'step' com predicado) param
+só quando passam de falsas para verdadeiras.
+
+run_until() executa na velocidade normal e para no fim do passo em que a
+condição disparou. BreakpointSet.pending guarda só os disparos do último
+passo, então não cresce numa execução longa sem paradas. reverse_continue() volta ao disparo anterior usando os
+keyframes (KeyframeIndex): reexecuta trechos entre keyframes, do mais
+recente para o mais antigo, até achar um disparo antes do tempo atual.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# Eventos que podem ter breakpoints, com o nome mostrado na interface
+EVENTS = {
+    'arrival': "Chegada",
+    'dispatch': "Entrou na CPU",
+    'preempt': "Preemptada",
+    'quantum_expired': "Quantum esgotado",
+    'io_block': "Entrou em I/O",
+    'io_unblock': "Saiu do I/O",
+    'mutex_acquire': "Adquiriu mutex",
+    'mutex_contended': "Mutex ocupado",
+    'mutex_release': "Liberou mutex",
+    'finish': "Terminou",
+    'deadlock': "Deadlock",
+    'step': "Fim do passo",
+}
+
+# Eventos emitidos depois de incrementar o tempo (os demais são do tick anterior)
+_AFTER_TICK = ('step', 'deadlock')
+
+
+class Hit(NamedTuple):
+    """Disparo de um breakpoint."""
+    time: int          # Tempo em que a simulação para (fim do passo do evento)
+    breakpoint: "Breakpoint"
+    event: str
+    info: dict
+
+
+class Breakpoint:
+    """
+    Condição de parada.
+
+    Args:
+        event: Tipo de evento (chave de EVENTS)
+        task_id: Só eventos desta tarefa (em 'deadlock', tarefa entre as travadas)
+        mutex_id: Só eventos deste mutex
+        time: Só no tick `time` (apenas com event='step')
+        condition: Predicado extra condition(simulator, info)
+        description: Texto mostrado na interface (gerado se omitido)
+    """
+
+    def __init__(self, event: str, task_id=None, mutex_id: Optional[int] = None,
+                 time: Optional[int] = None, condition: Optional[Callable] = None,
+                 description: Optional[str] = None):
+        if event not in EVENTS:
+            raise ValueError(f"Evento desconhecido: {event}")
+        if time is not None and event != 'step':
+            raise ValueError("Breakpoint de tempo deve usar o evento 'step'")
+        self.event = event
+        self.task_id = task_id
+        self.mutex_id = mutex_id
+        self.time = time
+        self.condition = condition
+        self.description = description or self._describe()
+        self.enabled = True
+        self.hits = 0
+        self._armed = True  # Condições de estado: disparam na subida
+
+    @property
+    def level(self) -> bool:
+        """Se é uma condição sobre o estado (avaliada a cada passo)."""
+        return self.event == 'step' and self.time is None and self.condition is not None
+
+    def matches(self, simulator, info: dict) -> bool:
+        if self.task_id is not None:
+            if 'task_id' in info:
+                if info['task_id'] != self.task_id:
+                    return False
+            elif self.task_id not in info.get('task_ids', ()):
+                return False
+        if self.mutex_id is not None and info.get('mutex_id') != self.mutex_id:
+            return False
+        return self.condition is None or bool(self.condition(simulator, info))
+
+    def _describe(self) -> str:
+        if self.time is not None:
+            return f"Tempo {self.time}"
+        parts = [EVENTS[self.event]]
+        if self.task_id is not None:
+            parts.append(f"T{self.task_id}")
+        if self.mutex_id is not None:
+            parts.append(f"M{self.mutex_id}")
+        return " ".join(parts)
+
+    def __repr__(self):
+        return f"Breakpoint({self.description!r})"
+
+
+def at_time(time: int) -> Breakpoint:
+    """Para quando a simulação chega ao tempo `time`."""
+    return Breakpoint('step', time=time)
+
+
+def ready_longer_than(length: int) -> Breakpoint:
+    """Para quando a fila de prontos passa a ter mais de `length` tarefas."""
+    return Breakpoint('step', condition=lambda simulator, info: len(simulator.ready_queue) > length,
+                      description=f"Fila de prontos > {length}")
+
+
+class BreakpointSet:
+    """Breakpoints de um Simulator, avaliados nos eventos de que dependem."""
+
+    def __init__(self, simulator, breakpoints=()):
+        self.simulator = simulator
+        self.breakpoints: List[Breakpoint] = []
+        self.pending: List[Hit] = []  # Disparos do último passo (limpos no primeiro evento do seguinte)
+        self.muted = False            # Ignora eventos (reexecuções internas)
+        self._step_ended = False      # O último evento recebido foi um 'step'
+        self._by_event: Dict[str, List[Breakpoint]] = {}
+        self._by_time: Dict[int, List[Breakpoint]] = {}
+        for bp in breakpoints:
+            self.add(bp)
+        simulator.add_listener(self._on_event)
+
+    def __len__(self) -> int:
+        return len(self.breakpoints)
+
+    def __iter__(self):
+        return iter(self.breakpoints)
+
+    def add(self, bp: Breakpoint) -> Breakpoint:
+        self.breakpoints.append(bp)
+        if bp.time is not None:
+            self._by_time.setdefault(bp.time, []).append(bp)
+        else:
+            self._by_event.setdefault(bp.event, []).append(bp)
+        if bp.level:
+            bp._armed = not bp.matches(self.simulator, {})
+        return bp
+
+    def remove(self, bp: Breakpoint):
+        self.breakpoints.remove(bp)
+        index = self._by_time if bp.time is not None else self._by_event
+        key = bp.time if bp.time is not None else bp.event
+        index[key].remove(bp)
+        if not index[key]:
+            del index[key]
+
+    def clear(self):
+        for bp in list(self.breakpoints):
+            self.remove(bp)
+
+    def detach(self):
+        """Para de escutar o simulador."""
+        self.simulator.remove_listener(self._on_event)
+
+    def resync(self):
+        """Rearma as condições de estado a partir do estado atual (após navegar no tempo)."""
+        for bp in self._by_event.get('step', ()):
+            if bp.level:
+                bp._armed = not bp.matches(self.simulator, {})
+
+    def run_until(self, max_iterations: int = 10000) -> List[Hit]:
+        """
+        Executa até um breakpoint disparar, a simulação terminar ou entrar em deadlock.
+
+        Returns:
+            Disparos do passo em que parou (vazio se parou por outro motivo)
+        """
+        simulator = self.simulator
+        self.pending = []
+        self.resync()
+        iterations = 0
+        while not simulator.is_finished() and iterations < max_iterations:
+            simulator.step()
+            iterations += 1
+            if self.pending or simulator.is_deadlocked():
+                break
+        return self.pending
+
+    def reverse_continue(self, keyframes) -> List[Hit]:
+        """
+        Volta ao disparo anterior ao tempo atual.
+
+        Reexecuta, do mais recente para o mais antigo, os trechos entre
+        keyframes até encontrar disparos; a simulação fica no fim do passo
+        do último deles. Sem disparo anterior, a simulação fica onde estava.
+
+        Returns:
+            Disparos no tempo em que parou (vazio se não havia anterior)
+        """
+        simulator = self.simulator
+        current = simulator.time
+        times = keyframes.times
+        end = current
+        found: List[Hit] = []
+        for start in reversed(times[:bisect_left(times, current)]):
+            self._seek(keyframes, start)
+            found = [hit for hit in self._scan(end) if hit.time < current]
+            if found:
+                break
+            end = start
+        target = found[-1].time if found else current
+        self._seek(keyframes, target)
+        self.resync()
+        self.pending = [hit for hit in found if hit.time == target]
+        return self.pending
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _seek(self, keyframes, target: int):
+        self.muted = True
+        try:
+            keyframes.seek(target)
+        finally:
+            self.muted = False
+
+    def _scan(self, end: int) -> List[Hit]:
+        """Executa sem histórico até `end` guardando todos os disparos (sem contar em bp.hits)."""
+        simulator = self.simulator
+        saved_history, saved_pending = simulator.max_history, self.pending
+        found: List[Hit] = []
+        self.pending = []
+        self.resync()
+        simulator.max_history = 0
+        try:
+            while simulator.time < end and not simulator.is_finished():
+                simulator.step()
+                found.extend(self.pending)
+                if simulator.is_deadlocked():
+                    break
+            return found
+        finally:
+            simulator.max_history = saved_history
+            for hit in found:
+                hit.breakpoint.hits -= 1
+            self.pending = saved_pending
+
+    def _on_event(self, event, time, info):
+        if self._step_ended:
+            # Passo novo: quem acompanhava o anterior já viu os disparos dele
+            self.pending = []
+            self._step_ended = False
+        if not self.muted:
+            self._evaluate(event, time, info)
+        if event == 'step':
+            self._step_ended = True
+
+    def _evaluate(self, event, time, info):
+        candidates = self._by_event.get(event)
+        if event == 'step':
+            at = self._by_time.get(time)
+            if at:
+                candidates = at + candidates if candidates else at
+        if not candidates:
+            return
+        simulator = self.simulator
+        stop = time if event in _AFTER_TICK else time + 1
+        for bp in candidates:
+            if not bp.enabled:
+                continue
+            if bp.level:
+                matched = bp.matches(simulator, info)
+                fire, bp._armed = matched and bp._armed, not matched
+            else:
+                fire = bp.matches(simulator, info)
+            if fire:
+                bp.hits += 1
+                self.pending.append(Hit(stop, bp, event, info))
@@ -0,0 +1,316 @@
+"""
+Execução do simulador pela linha de comando (sem interface gráfica).
+
+Uso:
+    python cli.py config.txt
+    python cli.py config.txt --profile
+    python cli.py config.txt --profile-json perfil.json
+    python cli.py config.txt --max-iter 500000
+    python cli.py config.txt --cache-dir ~/.cache/simulador
+    python cli.py enorme.txt --jobs 8       # interpretação em lote, em 8 processos
+    python cli.py carga.wlb                  # carga binária (workload_bin)
+    python cli.py config.txt --png gantt.png
+    python cli.py config.txt --svg gantt.svg --svg-window 100:200
+    python cli.py config.txt --chrome-trace run.json     # trace para o Perfetto (trace_export)
+    python cli.py config.txt --stream --horizon 100000   # tarefas lidas sob demanda
+    gerador | python cli.py - --stream                    # fonte de chegadas pela entrada padrão
+    python cli.py trace.swf.gz --stream --algo SRTF --time-scale 0.01   # trace SWF (swf_import)
+    python cli.py config.txt --save-run execucao.srun          # salva o trace e as estatísticas
+    python cli.py execucao.srun --svg trecho.svg --window 100:200   # reabre sem simular (saved_run)
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+
+from arrival_sources import REORDER_WINDOW, ArrivalSource, mapped_source, open_config_source
+from config_loader import load_simulation_config
+from png_render import save_png
+from saved_run import CODECS, SavedRun, SavedRunWriter, is_saved_run, save_run
+from svg_export import export_svg
+from swf_import import add_trace_arguments, is_swf_trace, trace_from_args
+from trace_export import ChromeTraceWriter
+from workload_bin import MappedWorkload, is_binary_workload
+from workload_cache import load_cached_config
+from scheduler import create_scheduler
+from simulador import Simulator
+
+
+def parse_window(text: str):
+    """Converte 'INICIO:FIM' (FIM opcional) na janela de tempo."""
+    start, _, end = text.partition(":")
+    try:
+        return int(start or 0), int(end) if end else None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Janela inválida: {text}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Cria o parser de argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(description="Simulador de escalonamento de processos (modo texto)")
+    parser.add_argument("config", help="Arquivo de configuração (.txt), carga binária (.wlb), trace SWF "
+                                       "(.swf, .swf.gz), execução salva (.srun) ou - (entrada padrão)")
+    parser.add_argument("--max-iter", type=int, default=10000,
+                        help="Limite de passos da simulação (padrão: 10000)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Ativa a instrumentação e imprime o relatório de desempenho")
+    parser.add_argument("--profile-json", metavar="ARQUIVO",
+                        help="Ativa a instrumentação e grava as métricas em JSON")
+    parser.add_argument("--png", metavar="ARQUIVO",
+                        help="Grava o gráfico de Gantt em PNG (sem interface gráfica)")
+    parser.add_argument("--svg", metavar="ARQUIVO",
+                        help="Grava o gráfico de Gantt em SVG (sem interface gráfica)")
+    parser.add_argument("--svg-window", metavar="INICIO:FIM", type=parse_window,
+                        help="Janela de tempo exportada no SVG (ex.: 100:200)")
+    parser.add_argument("--chrome-trace", metavar="ARQUIVO",
+                        help="Grava a execução no formato Chrome Trace (JSON), aberto no Perfetto; "
+                             "com --stream, gravado em fluxo")
+    parser.add_argument("--cache-dir", metavar="DIR",
+                        help="Diretório do cache binário da configuração (padrão: ao lado do arquivo)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Sempre interpreta o texto da configuração, sem usar nem gravar o cache")
+    parser.add_argument("--jobs", type=int, metavar="N",
+                        help="Interpreta a configuração em lote, em N processos (0 = um por CPU)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Lê as tarefas sob demanda e descarta as concluídas (memória constante; sem "
+                             "Gantt nem estatísticas por tarefa). A entrada deve estar em ordem de ingresso; "
+                             "configurações de texto toleram linhas fora de ordem até "
+                             f"{REORDER_WINDOW} posições")
+    parser.add_argument("--horizon", type=int, metavar="TEMPO",
+                        help="Para a simulação neste tempo, mesmo com tarefas pendentes")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Não imprime as estatísticas por tarefa")
+    parser.add_argument("--algo", help="Algoritmo de escalonamento, no lugar do da configuração "
+                                       "(traces SWF: padrão FIFO)")
+    parser.add_argument("--quantum", type=int, help="Quantum usado com --algo")
+    parser.add_argument("--alpha", type=int, help="Alpha usado com --algo")
+    add_trace_arguments(parser)
+    parser.add_argument("--save-run", metavar="ARQUIVO",
+                        help="Salva o trace e as estatísticas da execução (reabrir com cli.py ARQUIVO)")
+    parser.add_argument("--run-codec", choices=CODECS, default="zlib",
+                        help="Compressão dos blocos da execução salva (padrão: zlib)")
+    parser.add_argument("--window", metavar="INICIO:FIM", type=parse_window,
+                        help="Janela de tempo consultada/exportada de uma execução salva")
+    return parser
+
+
+def override_algorithm(args, algo_name, quantum, alpha):
+    """Algoritmo, quantum e alpha da linha de comando (--algo), se informados."""
+    if args.algo:
+        return args.algo.upper(), args.quantum, args.alpha
+    return algo_name, quantum, alpha
+
+
+def print_statistics(simulator: Simulator, quiet: bool = False):
+    """Imprime as estatísticas da simulação no terminal."""
+    print_report(simulator.get_statistics(), simulator.time, simulator.counters.completed, simulator.task_count,
+                 quiet)
+
+
+def print_report(stats: dict, final_time, completed, task_count, quiet: bool = False):
+    """Imprime as estatísticas (da simulação ou de uma execução salva)."""
+    print(f"Tempo final: {final_time}")
+    print(f"Tarefas concluídas: {completed}/{task_count}")
+    print(f"Turnaround Médio: {stats['avg_turnaround']:.2f}")
+    print(f"Espera Média: {stats['avg_waiting']:.2f}")
+    print(f"Resposta Média: {stats['avg_response']:.2f}")
+    if quiet:
+        return
+    print()
+    print(f"{'ID':<6}{'Chegada':<10}{'Término':<10}{'Turnaround':<12}{'Espera':<10}")
+    print("=" * 50)
+    for t in sorted(stats['tasks'], key=lambda x: x['id']):
+        print(f"{t['id']:<6}{t['arrival']:<10}{t['completion']:<10}{t['turnaround_time']:<12}{t['waiting_time']:<10}")
+
+
+def run_stream(args) -> int:
+    """Simulação em sistema aberto: tarefas admitidas da fonte conforme chegam (--stream)."""
+    if args.png or args.svg:
+        print("Erro: --png/--svg não estão disponíveis com --stream", file=sys.stderr)
+        return 2
+    with contextlib.ExitStack() as stack:
+        if is_swf_trace(args.config):
+            algo_name, quantum, alpha = "FIFO", None, None
+            source = ArrivalSource(stack.enter_context(trace_from_args(args.config, args)))
+        elif args.config != "-" and is_binary_workload(args.config):
+            workload = stack.enter_context(MappedWorkload(args.config))
+            algo_name, quantum, alpha, source = workload.algorithm, workload.quantum, workload.alpha, \
+                mapped_source(workload)
+        else:
+            algo_name, quantum, alpha, source = open_config_source(args.config)
+        try:
+            algo_name, quantum, alpha = override_algorithm(args, algo_name, quantum, alpha)
+            scheduler = create_scheduler(algo_name, quantum, alpha)
+        except ValueError as e:
+            print(f"Erro: {e}", file=sys.stderr)
+            return 2
+        simulator = Simulator(scheduler, source, horizon=args.horizon, retire_finished=True)
+        writer = None
+        if args.save_run:
+            writer = stack.enter_context(SavedRunWriter(args.save_run, algo_name, quantum, alpha,
+                                                        codec=args.run_codec))
+        chrome = None
+        if args.chrome_trace:
+            if writer is not None:
+                # Registrado antes do trace Chrome, que descarta os registros do passo
+                def save_step(event, time, info):
+                    if event == 'step':
+                        writer.feed(simulator.gantt_data)
+                simulator.add_listener(save_step)
+            chrome = stack.enter_context(ChromeTraceWriter(args.chrome_trace, drain=True))
+            chrome.attach(simulator)
+        steps = 0
+        try:
+            while not simulator.is_finished() and steps < args.max_iter:
+                simulator.step()
+                steps += 1
+                if writer is not None and chrome is None:
+                    writer.feed(simulator.gantt_data)
+                # Sem Gantt: descarta os registros do passo (memória constante)
+                del simulator.gantt_data[:]
+                if simulator.is_deadlocked():
+                    break
+        except ValueError as e:
+            # Fonte fora de ordem (além da janela de reordenação)
+            print(f"Erro: {e}", file=sys.stderr)
+            return 1
+        if writer is not None:
+            writer.finish(simulator)
+            print(f"Execução salva em {args.save_run} ({writer.chunk_count} blocos)")
+        if chrome is not None:
+            chrome.close()
+            print(f"Trace salvo em {args.chrome_trace} ({chrome.events_written} eventos)")
+    finished_ok = simulator.is_finished()
+    if not finished_ok:
+        deadlocked = simulator.detect_deadlock()
+        if deadlocked:
+            print(f"⚠️ DEADLOCK DETECTADO: {', '.join(f't{tid}' for tid in deadlocked)}")
+        else:
+            print(f"⚠️ Limite de {args.max_iter} passos atingido")
+    print_statistics(simulator, quiet=True)
+    return 0 if finished_ok else 1
+
+
+def show_saved_run(args) -> int:
+    """Relatório e exportação de uma execução salva, sem simular (só os blocos da janela são lidos)."""
+    if args.save_run:
+        print("Erro: --save-run não se aplica a uma execução salva", file=sys.stderr)
+        return 2
+    try:
+        run = SavedRun(args.config)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+    with run:
+        settings = run.algorithm
+        if run.quantum is not None:
+            settings += f" (Q={run.quantum})"
+        if run.alpha is not None:
+            settings += f" (α={run.alpha})"
+        print(f"Execução salva: {settings}, carga {run.workload_hash or 'desconhecida'}")
+        if run.deadlock:
+            print(f"⚠️ DEADLOCK DETECTADO: {', '.join(f't{tid}' for tid in run.deadlock)}")
+        if run.statistics is not None:
+            print_report(run.statistics, run.final_time, run.completed, run.task_count,
+                         quiet=args.quiet or args.window is not None)
+        t0, t1 = args.window or args.svg_window or (0, None)
+        if args.window:
+            print()
+            print(f"Janela {t0}:{'' if t1 is None else t1}")
+            print(f"{'ID':<6}{'EXEC':<8}{'READY':<8}{'IO':<8}{'MUTEX':<8}")
+            print("=" * 38)
+            totals = run.totals(t0, t1)
+            for tid in sorted((tid for tid in totals if tid != "IDLE")):
+                counts = totals[tid]
+                print(f"{tid:<6}{counts['EXEC']:<8}{counts['READY']:<8}{counts['IO']:<8}{counts['MUTEX']:<8}")
+            print(f"CPU ociosa: {totals.get('IDLE', {}).get('IDLE', 0)} ticks")
+        if args.png:
+            # O PNG começa no tick 0: a janela é deslocada para o início da imagem
+            shifted = {tid: [(start - t0, end - t0, state) for start, end, state in spans]
+                       for tid, spans in run.intervals(t0, t1).items()}
+            width, height = save_png(shifted, args.png, task_ids=run.task_ids, colors=run.colors)
+            print(f"Gantt salvo em {args.png} ({width}x{height})")
+        if args.svg:
+            rects = export_svg(run.intervals(t0, t1), args.svg, task_ids=run.task_ids, colors=run.colors,
+                               t0=t0, t1=t1)
+            print(f"Gantt salvo em {args.svg} ({rects} intervalos)")
+    return 0
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da linha de comando."""
+    args = build_parser().parse_args(argv)
+
+    if args.stream:
+        return run_stream(args)
+    if args.config != "-" and is_saved_run(args.config):
+        return show_saved_run(args)
+    if is_swf_trace(args.config):
+        algo_name, quantum, alpha = "FIFO", None, None
+        tasks = list(trace_from_args(args.config, args))
+    elif args.config == "-":
+        algo_name, quantum, alpha, source = open_config_source("-")
+        tasks = list(source)
+    elif is_binary_workload(args.config):
+        with MappedWorkload(args.config) as workload:
+            algo_name, quantum, alpha, tasks = workload.load()
+    elif args.no_cache:
+        algo_name, quantum, alpha, tasks = load_simulation_config(args.config, args.jobs is not None, args.jobs)
+    else:
+        algo_name, quantum, alpha, tasks = load_cached_config(args.config, args.cache_dir, args.jobs is not None,
+                                                              args.jobs)
+    try:
+        algo_name, quantum, alpha = override_algorithm(args, algo_name, quantum, alpha)
+        scheduler = create_scheduler(algo_name, quantum, alpha)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+
+    simulator = Simulator(scheduler, tasks, horizon=args.horizon)
+    profile = None
+    if args.profile or args.profile_json:
+        profile = simulator.enable_profiling()
+    chrome = None
+    if args.chrome_trace:
+        chrome = ChromeTraceWriter(args.chrome_trace)
+        chrome.attach(simulator)
+
+    finished_ok = simulator.run_full(max_iterations=args.max_iter)
+    if chrome is not None:
+        chrome.close()
+    if not finished_ok:
+        deadlocked = simulator.detect_deadlock()
+        if deadlocked:
+            print(f"⚠️ DEADLOCK DETECTADO: {', '.join(f't{tid}' for tid in deadlocked)}")
+        else:
+            print(f"⚠️ Limite de {args.max_iter} passos atingido")
+
+    print_statistics(simulator, quiet=args.quiet)
+
+    if args.png:
+        width, height = save_png(simulator.gantt_data, args.png, task_ids=[t.id for t in simulator.all_tasks])
+        print(f"Gantt salvo em {args.png} ({width}x{height})")
+    if args.svg:
+        t0, t1 = args.svg_window or (0, None)
+        rects = export_svg(simulator.gantt_data, args.svg, task_ids=[t.id for t in simulator.all_tasks], t0=t0, t1=t1)
+        print(f"Gantt salvo em {args.svg} ({rects} intervalos)")
+    if args.save_run:
+        chunks = save_run(args.save_run, simulator, algo_name, quantum, alpha, codec=args.run_codec)
+        print(f"Execução salva em {args.save_run} ({chunks} blocos)")
+    if chrome is not None:
+        print(f"Trace salvo em {args.chrome_trace} ({chrome.events_written} eventos)")
+
+    if profile:
+        if args.profile:
+            print()
+            print(profile.report())
+        if args.profile_json:
+            with open(args.profile_json, "w", encoding="utf-8") as f:
+                json.dump(profile.to_dict(), f, indent=2)
+
+    return 0 if finished_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
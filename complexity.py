@@ -0,0 +1,236 @@
+"""
+Perfilador empírico de complexidade das políticas de escalonamento.
+
+Executa cada escalonador com números de tarefas crescendo em progressão
+geométrica, em duas varreduras:
+    - 'tasks': cresce o total de tarefas com a fila de prontos rasa
+      (carga < 1). Expõe varreduras sobre all_tasks a cada tick.
+    - 'depth': todas as tarefas chegam em t=0, então a fila de prontos
+      tem profundidade ~N. Expõe varreduras sobre ready_queue
+      (min/max na seleção, envelhecimento).
+
+Para cada varredura ajusta, por mínimos quadrados em escala log-log, o
+expoente k de custo ~ N^k para o tempo por tick, para a memória por tarefa
+e para o tempo por tick de cada fase medida pela instrumentação do
+simulador (Simulator.enable_profiling). Um expoente por tick próximo de 0
+significa custo total linear no número de ticks; expoentes > 0 indicam as
+fases responsáveis por comportamento super-linear.
+
+Uso:
+    python complexity.py
+    python complexity.py --algos SRTF PRIOPENV-T --min 32 --max 4096
+    python complexity.py --json complexidade.json
+"""
+
+import argparse
+import json
+import math
+import sys
+import tracemalloc
+from typing import List, Optional, Sequence
+
+from benchmark import generate_workload
+from scheduler import SCHEDULER_FACTORY, create_scheduler
+from simulador import Simulator
+
+SWEEPS = ("tasks", "depth")
+DEFAULT_MIN = 16
+DEFAULT_MAX = 512
+DEFAULT_FACTOR = 2
+DEFAULT_TICKS = 300
+SUPERLINEAR_THRESHOLD = 0.25  # Expoente por tick acima do qual a fase é apontada
+
+# Fases que são parte de outras e não entram no ranking
+NESTED_PHASES = ('step',)
+
+
+def fit_exponent(sizes: Sequence[float], values: Sequence[float]) -> Optional[float]:
+    """
+    Ajusta o expoente k de values ~ c * sizes^k por mínimos quadrados em log-log.
+
+    Args:
+        sizes: Tamanhos (N)
+        values: Custos medidos
+
+    Returns:
+        Expoente ajustado, ou None se houver menos de dois pontos válidos
+    """
+    points = [(math.log(n), math.log(v)) for n, v in zip(sizes, values) if n > 0 and v > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return cov / var_x
+
+
+def geometric_sizes(minimum: int, maximum: int, factor: int = DEFAULT_FACTOR) -> List[int]:
+    """Gera tamanhos minimum, minimum*factor, ... até maximum."""
+    if minimum < 1:
+        raise ValueError("O tamanho mínimo deve ser ao menos 1")
+    if factor <= 1:
+        raise ValueError("A razão da progressão deve ser maior que 1")
+    sizes = []
+    n = minimum
+    while n <= maximum:
+        sizes.append(n)
+        n *= factor
+    return sizes
+
+
+def _make_tasks(n_tasks: int, sweep: str, seed: int):
+    """Monta a carga da varredura."""
+    if sweep == "tasks":
+        return generate_workload(n_tasks, "cpu", seed=seed, load=0.8)
+    tasks = generate_workload(n_tasks, "cpu", seed=seed)
+    for task in tasks:
+        task.inicio = 0
+    return tasks
+
+
+def measure(algo: str, n_tasks: int, sweep: str, max_ticks: int = DEFAULT_TICKS,
+            seed: int = 2024) -> dict:
+    """
+    Mede um ponto da varredura.
+
+    Returns:
+        Dicionário com 'n', 'ticks', 'ns_per_tick', 'bytes_per_task',
+        'mean_ready' e 'phases' (ns por tick de cada fase)
+    """
+    simulator = Simulator(create_scheduler(algo, quantum=3, alpha=1), _make_tasks(n_tasks, sweep, seed))
+    profile = simulator.enable_profiling()
+    simulator.run_full(max_iterations=max_ticks)
+    data = profile.to_dict()
+    ticks = max(1, simulator.time)
+
+    tracemalloc.start()
+    try:
+        mem_sim = Simulator(create_scheduler(algo, quantum=3, alpha=1), _make_tasks(n_tasks, sweep, seed))
+        mem_sim.run_full(max_iterations=max_ticks)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'n': n_tasks,
+        'ticks': simulator.time,
+        'ns_per_tick': data['phases']['step']['total_ns'] / ticks,
+        'bytes_per_task': peak / n_tasks,
+        'mean_ready': data['queues']['ready_queue']['mean'],
+        'phases': {name: phase['total_ns'] / ticks for name, phase in data['phases'].items()},
+    }
+
+
+def analyze(algo: str, sizes: Sequence[int], sweep: str, max_ticks: int = DEFAULT_TICKS,
+            seed: int = 2024) -> dict:
+    """
+    Executa uma varredura e ajusta os expoentes.
+
+    Returns:
+        Dicionário com os pontos medidos, 'time_exponent', 'memory_exponent'
+        e 'phase_exponents' (fase -> expoente do custo por tick)
+    """
+    points = [measure(algo, n, sweep, max_ticks, seed) for n in sizes]
+    ns = [p['n'] for p in points]
+
+    phase_names = points[0]['phases'].keys() if points else []
+    phase_exponents = {}
+    for name in phase_names:
+        exponent = fit_exponent(ns, [p['phases'][name] for p in points])
+        if exponent is not None:
+            phase_exponents[name] = exponent
+
+    return {
+        'algo': algo,
+        'sweep': sweep,
+        'points': points,
+        'time_exponent': fit_exponent(ns, [p['ns_per_tick'] for p in points]),
+        'memory_exponent': fit_exponent(ns, [p['bytes_per_task'] for p in points]),
+        'phase_exponents': phase_exponents,
+    }
+
+
+def superlinear_phases(result: dict, threshold: float = SUPERLINEAR_THRESHOLD) -> List[tuple]:
+    """
+    Lista as fases cujo custo por tick cresce com N, da mais para a menos pesada.
+
+    Returns:
+        Lista de (fase, expoente, fração do tempo do passo no maior N)
+    """
+    if not result['points']:
+        return []
+    largest = result['points'][-1]
+    step_ns = largest['phases'].get('step') or 1
+    found = []
+    for name, exponent in result['phase_exponents'].items():
+        if name in NESTED_PHASES or exponent < threshold:
+            continue
+        found.append((name, exponent, largest['phases'][name] / step_ns))
+    return sorted(found, key=lambda item: -item[2])
+
+
+def unique_algorithms() -> List[str]:
+    """Nomes de SCHEDULER_FACTORY sem aliases (um por classe)."""
+    seen = set()
+    names = []
+    for name, cls in SCHEDULER_FACTORY.items():
+        if cls not in seen:
+            seen.add(cls)
+            names.append(name)
+    return names
+
+
+def format_result(result: dict) -> str:
+    """Formata o resultado de uma varredura para o terminal."""
+    def fmt(value):
+        return "  n/a" if value is None else f"{value:+.2f}"
+
+    lines = [f"{result['algo']:<11} {result['sweep']:<6} tempo/tick N^{fmt(result['time_exponent'])}"
+             f"   memória/tarefa N^{fmt(result['memory_exponent'])}"]
+    for name, exponent, share in superlinear_phases(result):
+        lines.append(f"    ↳ {name:<18} N^{exponent:+.2f}  ({100 * share:.0f}% do passo no maior N)")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Perfil empírico de complexidade dos escalonadores")
+    parser.add_argument("--algos", nargs="+", choices=list(SCHEDULER_FACTORY), default=None)
+    parser.add_argument("--sweeps", nargs="+", choices=SWEEPS, default=list(SWEEPS))
+    parser.add_argument("--min", type=int, default=DEFAULT_MIN, help="Menor número de tarefas")
+    parser.add_argument("--max", type=int, default=DEFAULT_MAX, help="Maior número de tarefas")
+    parser.add_argument("--factor", type=int, default=DEFAULT_FACTOR, help="Razão da progressão")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="Ticks medidos por ponto")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--json", metavar="ARQUIVO", help="Grava os resultados em JSON")
+    args = parser.parse_args(argv)
+    if args.min < 1:
+        parser.error("--min deve ser ao menos 1")
+    if args.factor <= 1:
+        parser.error("--factor deve ser maior que 1")
+
+    sizes = geometric_sizes(args.min, args.max, args.factor)
+    algos = args.algos or unique_algorithms()
+    print(f"Tamanhos: {sizes}  (até {args.ticks} ticks por ponto)")
+    print("Expoentes k de custo ~ N^k (tempo por tick ~ N^0 = custo total linear)")
+    print("=" * 70)
+
+    results = []
+    for sweep in args.sweeps:
+        for algo in algos:
+            result = analyze(algo, sizes, sweep, args.ticks, args.seed)
+            results.append(result)
+            print(format_result(result), flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'sizes': sizes, 'ticks': args.ticks, 'results': results}, f, indent=2)
+        print(f"\nResultados salvos em: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Carga em lote de configurações grandes: load_simulation_config(bulk=True).
+
+Interpretar um arquivo de vários GB linha a linha num só núcleo é lento. Aqui
+o arquivo é mapeado em memória (mmap) e dividido, depois da primeira linha,
+em blocos de ~chunk_bytes que terminam em fim de linha. Cada bloco é
+interpretado num processo do pool com as mesmas funções de config_loader
+(iter_task_lines: comentários, linhas-modelo, parse_events, hex_to_rgb, ids
+ML01/MU01). O processo ordena as suas tarefas por ingresso e as devolve
+empacotadas em arrays (workload_cache.pack_workload), bem mais baratas de
+transferir que TCBs; o principal desempacota e intercala os blocos por
+ingresso (heapq.merge, estável: empates ficam na ordem do arquivo).
+
+Os avisos de linhas mal formatadas são guardados nos processos com o número
+da linha relativo ao bloco e impressos pelo principal, na ordem do arquivo e
+com o número original da linha, como na carga linha a linha.
+"""
+
+import heapq
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import config_loader
+from config_loader import format_warning, iter_task_lines, parse_settings_line
+from tasks import TCB
+from workload_cache import pack_workload, unpack_workload
+
+BULK_CHUNK_BYTES = 8 << 20  # Tamanho aproximado de cada bloco
+
+
+def chunk_bounds(data, start: int, chunk_bytes: int = BULK_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """Intervalos [início, fim) de bytes, cada um terminando em fim de linha (o último no fim dos dados)."""
+    bounds = []
+    end_of_data = len(data)
+    while start < end_of_data:
+        newline = data.find(b"\n", min(start + chunk_bytes, end_of_data) - 1)
+        end = end_of_data if newline < 0 else newline + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _read_chunk(filepath: str, start: int, end: int) -> str:
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return data[start:end].decode("utf-8")
+
+
+def parse_text(text: str) -> Tuple[List[TCB], int, list]:
+    """
+    Interpreta as linhas de tarefa de um bloco.
+
+    Returns:
+        Tupla (tarefas em ordem de ingresso, número de linhas do bloco,
+        avisos como (linha relativa ao bloco, mensagem))
+    """
+    # Mesma divisão em linhas da leitura em modo texto (novas linhas universais)
+    lines = io.StringIO(text, newline=None).readlines()
+    warnings = []
+    sink = config_loader._warning_sink
+    config_loader._warning_sink = warnings
+    try:
+        tasks = list(iter_task_lines(lines, first_line=0))
+    finally:
+        config_loader._warning_sink = sink
+    tasks.sort(key=lambda t: t.inicio)
+    return tasks, len(lines), warnings
+
+
+def parse_chunk(filepath: str, start: int, end: int) -> Tuple[bytes, int, list]:
+    """Como parse_text() sobre os bytes [start, end) do arquivo, com as tarefas empacotadas (função do pool)."""
+    tasks, n_lines, warnings = parse_text(_read_chunk(filepath, start, end))
+    return pack_workload("", None, None, tasks), n_lines, warnings
+
+
+def load_config_bulk(filepath: str, processes: Optional[int] = None,
+                     chunk_bytes: int = BULK_CHUNK_BYTES) -> Tuple[str, Optional[int], Optional[int], List[TCB]]:
+    """
+    Mesmo resultado de load_simulation_config(), com as tarefas em ordem de ingresso.
+
+    Args:
+        filepath: Arquivo de configuração
+        processes: Processos do pool (1 = no processo atual, None = um por CPU)
+        chunk_bytes: Tamanho aproximado de cada bloco
+    """
+    if os.path.getsize(filepath) == 0:
+        # Arquivo vazio não pode ser mapeado
+        return config_loader.load_simulation_config(filepath)
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        first_line = data.readline()
+        bounds = chunk_bounds(data, len(first_line), chunk_bytes)
+    scheduler_type, quantum, alpha = parse_settings_line(first_line.decode("utf-8"))
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(bounds) <= 1:
+        # No processo atual: sem empacotar
+        results = [parse_text(_read_chunk(filepath, start, end)) for start, end in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = [(unpack_workload(payload)[3], n_lines, warnings) for payload, n_lines, warnings
+                       in pool.map(parse_chunk, [filepath] * len(bounds), *zip(*bounds))]
+
+    line = 2  # Primeira linha de tarefa do arquivo
+    chunks = []
+    for tasks, n_lines, warnings in results:
+        for relative, message in warnings:
+            print(format_warning(None if relative is None else line + relative, message))
+        chunks.append(tasks)
+        line += n_lines
+    tasks = list(heapq.merge(*chunks, key=lambda t: t.inicio))
+    return scheduler_type, quantum, alpha, tasks
@@ -9,10 +9,50 @@ Formato do arquivo de configuração:
     - Eventos podem ser: IO:tempo-duracao, ML:tempo (mutex lock), MU:tempo (mutex unlock)
     - Múltiplos eventos são separados por ';'
     - Linhas começando com '#' são ignoradas (comentários)
+
+Linhas-modelo (expandidas sob demanda em várias tarefas):
+    t<A>..t<B>[@semente];cor;ingresso;duracao;[prioridade];[eventos]
+
+    gera as tarefas A..B (inclusive). Cada campo numérico aceita:
+        5                 constante
+        1,2,3             lista repetida em ciclo
+        0+5               início e passo: 0, 5, 10, ... (o passo pode ser qualquer
+                          uma das outras formas, ex.: 0+exp(2) = chegadas de Poisson)
+        uniform(1,10)     inteiro sorteado entre 1 e 10
+        exp(4)            exponencial de média 4, arredondada
+        choice(2,8,20)    um dos valores, sorteado
+    A cor aceita uma cor, uma lista em ciclo (#ff0000,#00ff00) ou 'random'.
+    Os eventos são repetidos em todas as tarefas. Os sorteios usam a semente
+    da linha (padrão: A), então a expansão é reprodutível. Ex.:
+        t1..t1000000@7;#ff0000,#00ff00,#0000ff;0+exp(2);uniform(1,10);choice(1,5);IO:2-1
 """
 
+import itertools
+import random
+import re
 from tasks import TCB
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, Iterable, Iterator, List, Tuple, Optional
+
+
+# Avisos de interpretação: impressos, ou guardados como (linha, mensagem) em
+# _warning_sink (carga em lote: os processos devolvem os avisos ao principal)
+_warning_sink: Optional[list] = None
+_warning_line: Optional[int] = None  # Linha do arquivo em interpretação
+
+
+def format_warning(line_number: Optional[int], message: str) -> str:
+    """Texto de um aviso de interpretação."""
+    if line_number is None:
+        return f"Aviso: {message}"
+    return f"Aviso: linha {line_number}: {message}"
+
+
+def _warn(message: str):
+    """Emite um aviso de interpretação, com o número da linha atual."""
+    if _warning_sink is not None:
+        _warning_sink.append((_warning_line, message))
+    else:
+        print(format_warning(_warning_line, message))
 
 
 def hex_to_rgb(hex_color: str) -> List[int]:
@@ -92,7 +132,7 @@ def parse_events(events_string: str) -> Tuple[List[Tuple[int, int]], List[Tuple[
                     duracao = int(io_data[1])
                     io_events.append((tempo_inicio, duracao))
                 except ValueError:
-                    print(f"Aviso: formato de I/O inválido: '{part}'")
+                    _warn(f"formato de I/O inválido: '{part}'")
         
         elif part.startswith('ML'):
             # Evento de Mutex Lock: formato 'MLxx:tempo' ou 'ML:tempo'
@@ -105,7 +145,7 @@ def parse_events(events_string: str) -> Tuple[List[Tuple[int, int]], List[Tuple[
                     mutex_id = int(mutex_id_str) if mutex_id_str else 0
                     ml_events.append((mutex_id, tempo))
             except ValueError:
-                print(f"Aviso: formato de ML inválido: '{part}'")
+                _warn(f"formato de ML inválido: '{part}'")
         
         elif part.startswith('MU'):
             # Evento de Mutex Unlock: formato 'MUxx:tempo' ou 'MU:tempo'
@@ -118,7 +158,7 @@ def parse_events(events_string: str) -> Tuple[List[Tuple[int, int]], List[Tuple[
                     mutex_id = int(mutex_id_str) if mutex_id_str else 0
                     mu_events.append((mutex_id, tempo))
             except ValueError:
-                print(f"Aviso: formato de MU inválido: '{part}'")
+                _warn(f"formato de MU inválido: '{part}'")
     
     return io_events, ml_events, mu_events
 
@@ -141,7 +181,239 @@ def parse_io_events(io_string: str) -> List[Tuple[int, int]]:
     io_events, _, _ = parse_events(io_string)
     return io_events
 
-def load_simulation_config(filepath: str) -> Tuple[str, Optional[int], Optional[int], List[TCB]]:
+def parse_settings_line(line: str) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    Interpreta a primeira linha da configuração: ALGORITMO;QUANTUM;ALPHA.
+
+    Returns:
+        Tupla (scheduler_type, quantum, alpha), com None nos campos vazios
+    """
+    first_line = line.strip().split(';')
+    scheduler_type = first_line[0].strip().upper()
+    quantum = None
+    alpha = None
+
+    if len(first_line) > 1 and first_line[1].strip():
+        quantum = int(first_line[1].strip())
+
+    if len(first_line) > 2 and first_line[2].strip():
+        alpha = int(first_line[2].strip())
+
+    return scheduler_type, quantum, alpha
+
+
+def parse_task_line(line: str) -> Optional[TCB]:
+    """
+    Interpreta uma linha de tarefa: t<ID>;cor_hex;ingresso;duracao;prioridade;[eventos]
+
+    Returns:
+        TCB da tarefa, ou None para linhas vazias e comentários
+
+    Raises:
+        ValueError, IndexError: Se a linha estiver mal formatada
+    """
+    if not line.strip() or line.strip().startswith('#'):
+        return None
+
+    parts = line.strip().split(';')
+
+    task_id_str = parts[0].strip().lower().replace('t', '')
+    task_id = int(task_id_str)
+
+    cor_hex = parts[1].strip()
+    try:
+        rgb_color = hex_to_rgb(cor_hex)
+    except ValueError as ve:
+        _warn(f"{ve}. Usando cinza padrão para tarefa {task_id}.")
+        rgb_color = [128, 128, 128]
+
+    ingresso = int(parts[2])
+    duracao = int(parts[3])
+
+    prioridade = 0
+    events_start_index = 5
+
+    if len(parts) > 4:
+        part4 = parts[4].strip()
+        if part4 and not any(part4.startswith(prefix) for prefix in ['IO:', 'ML', 'MU']):
+            try:
+                prioridade = int(part4)
+            except ValueError:
+                prioridade = 0
+        else:
+            events_start_index = 4
+
+    events_str = ""
+    if len(parts) > events_start_index:
+        events_str = ';'.join(parts[events_start_index:])
+
+    io_events, ml_events, mu_events = parse_events(events_str)
+
+    return TCB(
+        id=task_id,
+        RGB=rgb_color,
+        state=1,
+        inicio=ingresso,
+        duracao=duracao,
+        prio_s=prioridade,
+        prio_d=prioridade,
+        io_events=io_events,
+        ml_events=ml_events,
+        mu_events=mu_events
+    )
+
+
+_TEMPLATE_ID = re.compile(r"t(\d+)\.\.t?(\d+)(?:@(-?\d+))?", re.IGNORECASE)
+_TEMPLATE_FUNCTION = re.compile(r"(uniform|exp|choice)\((.*)\)", re.IGNORECASE)
+
+# Gera a sequência de valores de um campo a partir do gerador aleatório da linha
+ValueStream = Callable[[random.Random], Iterator[int]]
+
+
+def is_template_line(line: str) -> bool:
+    """Se a linha é uma linha-modelo (id no formato t<A>..t<B>)."""
+    return '..' in line.split(';', 1)[0] and not line.lstrip().startswith('#')
+
+
+def _compile_value(spec: str) -> ValueStream:
+    """Interpreta a forma de um campo numérico (ver o cabeçalho do módulo)."""
+    spec = spec.strip()
+    start, plus, step = spec.partition('+')
+    if plus and start.strip():
+        first = int(start)
+        steps = _compile_value(step)
+
+        def progression(rng):
+            value = first
+            for delta in steps(rng):
+                yield value
+                value += delta
+        return progression
+
+    match = _TEMPLATE_FUNCTION.fullmatch(spec)
+    if match:
+        name = match.group(1).lower()
+        args = [float(arg) if name == 'exp' else int(arg) for arg in match.group(2).split(',')]
+        if name == 'uniform':
+            low, high = args
+            if low > high:
+                raise ValueError(f"Intervalo inválido: '{spec}'")
+            return lambda rng: (rng.randint(low, high) for _ in itertools.count())
+        if name == 'exp':
+            mean, = args
+            if mean <= 0:
+                raise ValueError(f"Média inválida: '{spec}'")
+            return lambda rng: (round(rng.expovariate(1 / mean)) for _ in itertools.count())
+        return lambda rng: (rng.choice(args) for _ in itertools.count())
+
+    values = [int(value) for value in spec.split(',')]
+    return lambda rng: itertools.cycle(values)
+
+
+def _compile_color(spec: str) -> Callable[[random.Random], Iterator[List[int]]]:
+    spec = spec.strip()
+    if spec.lower() == 'random':
+        return lambda rng: ([rng.randint(0, 255) for _ in range(3)] for _ in itertools.count())
+    colors = [hex_to_rgb(color) for color in spec.split(',')]
+    return lambda rng: (list(color) for color in itertools.cycle(colors))
+
+
+class TaskTemplate:
+    """
+    Linha-modelo já interpretada; as tarefas são criadas só ao iterar.
+
+    Uso:
+        template = TaskTemplate("t1..t1000;#ff0000;0+2;5;1")
+        len(template)           # 1000
+        for task in template:   # TCBs criados um a um
+            ...
+    """
+
+    def __init__(self, line: str):
+        parts = line.strip().split(';')
+        match = _TEMPLATE_ID.fullmatch(parts[0].strip())
+        if not match:
+            raise ValueError(f"Intervalo de ids inválido: '{parts[0].strip()}'")
+        self.first_id, self.last_id = int(match.group(1)), int(match.group(2))
+        if self.last_id < self.first_id:
+            raise ValueError(f"Intervalo de ids vazio: '{parts[0].strip()}'")
+        self.seed = int(match.group(3)) if match.group(3) is not None else self.first_id
+
+        self._color = _compile_color(parts[1])
+        self._arrival = _compile_value(parts[2])
+        self._duration = _compile_value(parts[3])
+        self._priority = lambda rng: itertools.repeat(0)
+        events_start_index = 5
+        if len(parts) > 4:
+            part4 = parts[4].strip()
+            if part4 and not any(part4.startswith(prefix) for prefix in ['IO:', 'ML', 'MU']):
+                # Como nas linhas comuns, prioridade inválida vira 0 (aqui com aviso)
+                try:
+                    self._priority = _compile_value(part4)
+                except ValueError:
+                    _warn(f"Prioridade inválida '{part4}' para tarefa {parts[0].strip()}. Usando 0.")
+            else:
+                events_start_index = 4
+        self._events = parse_events(';'.join(parts[events_start_index:]))
+
+    def __len__(self) -> int:
+        return self.last_id - self.first_id + 1
+
+    def __iter__(self) -> Iterator[TCB]:
+        rng = random.Random(self.seed)
+        io_events, ml_events, mu_events = self._events
+        fields = zip(range(self.first_id, self.last_id + 1), self._color(rng), self._arrival(rng),
+                     self._duration(rng), self._priority(rng))
+        for task_id, rgb_color, ingresso, duracao, prioridade in fields:
+            yield TCB(
+                id=task_id,
+                RGB=rgb_color,
+                state=1,
+                inicio=ingresso,
+                duracao=duracao,
+                prio_s=prioridade,
+                prio_d=prioridade,
+                # Cada tarefa com sua cópia: o simulador consome os eventos
+                io_events=list(io_events),
+                ml_events=list(ml_events),
+                mu_events=list(mu_events)
+            )
+
+
+def iter_task_lines(lines: Iterable[str], first_line: int = 1) -> Iterator[TCB]:
+    """
+    Interpreta linhas de tarefa uma a uma, sob demanda.
+
+    Linhas-modelo são expandidas só conforme as tarefas são consumidas.
+    Linhas mal formatadas geram o mesmo aviso de load_simulation_config()
+    e são ignoradas.
+
+    Args:
+        lines: Linhas de tarefa
+        first_line: Número (no arquivo) da primeira linha, usado nos avisos
+    """
+    global _warning_line
+    for number, line in enumerate(lines, first_line):
+        _warning_line = number
+        try:
+            if is_template_line(line):
+                template = TaskTemplate(line)
+            else:
+                template = None
+                task = parse_task_line(line)
+        except (ValueError, IndexError) as e:
+            _warn(f"ignorando linha mal formatada: '{line.strip()}' - Erro: {e}")
+            continue
+        finally:
+            _warning_line = None
+        if template is not None:
+            yield from template
+        elif task is not None:
+            yield task
+
+
+def load_simulation_config(filepath: str, bulk: bool = False,
+                           processes: Optional[int] = None) -> Tuple[str, Optional[int], Optional[int], List[TCB]]:
     """
     Carrega a configuração da simulação a partir de um arquivo de texto.
     
@@ -151,6 +423,10 @@ def load_simulation_config(filepath: str) -> Tuple[str, Optional[int], Optional[
     
     Args:
         filepath: Caminho para o arquivo de configuração
+        bulk: Modo em lote para arquivos grandes: o arquivo é mapeado em memória,
+            dividido em blocos de linhas e interpretado num pool de processos
+            (ver config_bulk). As tarefas voltam em ordem de ingresso.
+        processes: Processos do modo em lote (None = um por CPU)
     
     Returns:
         Tupla contendo:
@@ -159,75 +435,29 @@ def load_simulation_config(filepath: str) -> Tuple[str, Optional[int], Optional[
             - alpha (Optional[int]): Valor do alpha para envelhecimento ou None
             - tasks (List[TCB]): Lista de tarefas carregadas
     """
-    tasks = []
-    scheduler_type = ""
-    quantum = None
-    alpha = None
+    if bulk:
+        # Import local: config_bulk importa este módulo
+        from config_bulk import load_config_bulk
+        return load_config_bulk(filepath, processes)
 
     with open(filepath, 'r') as f:
-        first_line = f.readline().strip().split(';')
-        scheduler_type = first_line[0].strip().upper()
-        
-        if len(first_line) > 1 and first_line[1].strip():
-            quantum = int(first_line[1].strip())
-        
-        if len(first_line) > 2 and first_line[2].strip():
-            alpha = int(first_line[2].strip())
+        scheduler_type, quantum, alpha = parse_settings_line(f.readline())
+        tasks = list(iter_task_lines(f, first_line=2))
 
-        for line in f:
-            try:
-                if not line.strip() or line.strip().startswith('#'):
-                    continue
-                
-                parts = line.strip().split(';')
-                
-                task_id_str = parts[0].strip().lower().replace('t', '')
-                task_id = int(task_id_str)
-                
-                cor_hex = parts[1].strip()
-                try:
-                    rgb_color = hex_to_rgb(cor_hex)
-                except ValueError as ve:
-                    print(f"Aviso: {ve}. Usando cinza padrão para tarefa {task_id}.")
-                    rgb_color = [128, 128, 128]
-
-                ingresso = int(parts[2])
-                duracao = int(parts[3])
-                
-                prioridade = 0
-                events_start_index = 5
-                
-                if len(parts) > 4:
-                    part4 = parts[4].strip()
-                    if part4 and not any(part4.startswith(prefix) for prefix in ['IO:', 'ML', 'MU']):
-                        try:
-                            prioridade = int(part4)
-                        except ValueError:
-                            prioridade = 0
-                    else:
-                        events_start_index = 4
-                
-                events_str = ""
-                if len(parts) > events_start_index:
-                    events_str = ';'.join(parts[events_start_index:])
-                
-                io_events, ml_events, mu_events = parse_events(events_str)
-                
-                task = TCB(
-                    id=task_id,
-                    RGB=rgb_color,
-                    state=1,
-                    inicio=ingresso,
-                    duracao=duracao,
-                    prio_s=prioridade,
-                    prio_d=prioridade,
-                    io_events=io_events,
-                    ml_events=ml_events,
-                    mu_events=mu_events
-                )
-                tasks.append(task)
-            except (ValueError, IndexError) as e:
-                print(f"Aviso: ignorando linha mal formatada: '{line.strip()}' - Erro: {e}")
-                continue
-            
-    return scheduler_type, quantum, alpha, tasks
\ No newline at end of file
+    return scheduler_type, quantum, alpha, tasks
+
+
+def format_task_line(task: TCB) -> str:
+    """
+    Linha de configuração de uma tarefa (inverso de parse_task_line).
+
+    Exemplo:
+        >>> format_task_line(TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=5, prio_s=2, io_events=[(2, 1)]))
+        't01;#ff0000;0;5;2;IO:2-1'
+    """
+    r, g, b = task.RGB[:3]
+    parts = [f"t{task.id:02d}", f"#{r:02x}{g:02x}{b:02x}", str(task.inicio), str(task.duracao), str(task.prio_s)]
+    parts.extend(f"IO:{start}-{length}" for start, length in task.io_events)
+    parts.extend(f"ML{mutex_id:02d}:{time}" for mutex_id, time in task.ml_events)
+    parts.extend(f"MU{mutex_id:02d}:{time}" for mutex_id, time in task.mu_events)
+    return ';'.join(parts)
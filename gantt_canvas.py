@@ -0,0 +1,347 @@
+"""
+Desenho incremental do gráfico de Gantt no Canvas do Tkinter.
+
+O renderizador mantém o Canvas sincronizado com simulator.gantt_data sem
+redesenhar tudo a cada passo:
+    - só os registros novos desde o último quadro são desenhados;
+    - o eixo do tempo é estendido: a linha e a última polilinha de marcas
+      são ajustadas e só os rótulos dos novos ticks são criados;
+    - ao voltar um passo (step_back trunca gantt_data), apenas os itens dos
+      registros removidos são apagados ou encurtados, e os rótulos dos ticks
+      que deixaram o eixo são apagados pela tag do tick.
+
+Registros consecutivos de uma tarefa com o mesmo estilo (mesmo estado e
+cor) viram um único segmento: um retângulo que é esticado a cada tick, mais
+as divisórias internas entre ticks. As divisórias são desenhadas como
+poucas polilinhas em zigue-zague (cada uma cobre até DIVIDER_CHUNK ticks e
+percorre as bordas superior e inferior, que coincidem com o contorno do
+retângulo), então o resultado visual é o mesmo de um retângulo por tick com
+uma fração dos itens. Com blocos estreitos (zoom baixo) as divisórias são
+omitidas. O eixo segue a mesma ideia: as marcas dos ticks são polilinhas de
+AXIS_CHUNK ticks que descem e sobem sobre a linha do eixo, e só um tick a
+cada axis_step() recebe rótulo.
+
+Toda alteração vem de um log por registro, então o custo de cada quadro é
+proporcional ao que mudou, não ao tamanho do histórico.
+"""
+
+import tkinter as tk
+import weakref
+from typing import Dict, List, Tuple
+
+BLOCK_WIDTH = 20
+LEFT_MARGIN = 50
+ROW_HEIGHT = 40
+TOP_MARGIN = 20
+BAR_HALF_HEIGHT = 15
+DIVIDER_CHUNK = 32      # Divisórias por polilinha
+DIVIDER_MIN_WIDTH = 4   # Largura mínima do bloco para desenhar divisórias
+AXIS_CHUNK = 256        # Marcas de tick por polilinha do eixo
+MIN_LABEL_SPACING = 60  # Pixels mínimos entre rótulos do eixo
+
+TAG_GANTT = "gantt"  # Todos os itens do gráfico
+TAG_AXIS = "axis"    # Itens do eixo do tempo
+
+
+def state_style(state: str, rgb) -> tuple:
+    """
+    Cores de preenchimento e contorno de um registro do Gantt.
+
+    Returns:
+        Tupla (fill, outline) no formato aceito pelo Canvas
+    """
+    color = f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+    if state == "IO":
+        return "#bfbfbf", "black"
+    if state == "READY":
+        return "", color
+    if state == "MUTEX":
+        return "#9932CC", "black"
+    return color, "black"
+
+
+# Simulador -> ((versão, quantidade de tarefas), ids das linhas)
+_ROW_IDS = weakref.WeakKeyDictionary()
+
+
+def row_task_ids(simulator) -> tuple:
+    """
+    Ids das tarefas na ordem das linhas do Gantt (maior id em cima).
+
+    Ordenados uma vez por simulador; só são refeitos quando a lista de
+    tarefas muda (Simulator.tasks_version, ou a quantidade de tarefas para
+    objetos sem versão, como saved_run.RunWindow).
+    """
+    key = (getattr(simulator, 'tasks_version', 0), len(simulator.all_tasks))
+    cached = _ROW_IDS.get(simulator)
+    if cached is None or cached[0] != key:
+        cached = (key, tuple(sorted((t.id for t in simulator.all_tasks), reverse=True)))
+        _ROW_IDS[simulator] = cached
+    return cached[1]
+
+
+def axis_tag(tick: int) -> str:
+    """Tag do rótulo do tick (1-based) no eixo."""
+    return f"tick{tick}"
+
+
+def axis_step(zoom: Tuple[int, int], min_spacing: int = MIN_LABEL_SPACING) -> int:
+    """Menor passo 1, 2, 5, 10, 20, 50, ... (em ticks) com rótulos a pelo menos min_spacing px."""
+    ppt, tpp = zoom
+    magnitude = 1
+    while True:
+        for factor in (1, 2, 5):
+            step = factor * magnitude
+            if step * ppt >= min_spacing * tpp:
+                return step
+        magnitude *= 10
+
+
+class _Segment:
+    """Trecho contínuo de uma tarefa com o mesmo estilo, desenhado como um retângulo."""
+
+    __slots__ = ('key', 'start', 'end', 'y', 'outline', 'rect', 'dividers', 'previous')
+
+    def __init__(self, key, start: int, y: int, outline: str, previous):
+        self.key = key            # (tid, fill, outline)
+        self.start = start        # Primeiro tick (inclusivo)
+        self.end = start + 1      # Último tick (exclusivo)
+        self.y = y
+        self.outline = outline
+        self.rect = None
+        self.dividers: List[int] = []  # Itens das polilinhas, em blocos de DIVIDER_CHUNK
+        self.previous = previous  # Segmento anterior com a mesma chave (para desfazer)
+
+
+class GanttCanvasRenderer:
+    """
+    Mantém o Canvas em sincronia com o Gantt de um simulador.
+
+    Uso:
+        renderer = GanttCanvasRenderer(canvas)
+        renderer.sync(simulator)  # a cada update_ui()
+    """
+
+    def __init__(self, canvas, block_width: int = BLOCK_WIDTH, left_margin: int = LEFT_MARGIN):
+        self.canvas = canvas
+        self.block_width = block_width
+        self.left_margin = left_margin
+        self._simulator = None
+        self._task_ids: tuple = ()
+        self._rows: Dict[int, int] = {}
+        self._axis_y = 0
+        self._axis_line = None
+        self._axis_marks: List[int] = []  # Polilinhas das marcas, em blocos de AXIS_CHUNK ticks
+        self._axis_ticks = 0       # Ticks cobertos pelo eixo
+        self._prefix_max: List[int] = []  # Maior tempo visto até cada registro
+        self._log: list = []       # Por registro: (segmento, criado?) ou None
+        self._last: dict = {}      # Chave de estilo -> último segmento
+        self.segments = 0          # Segmentos no Canvas
+
+    @property
+    def drawn_records(self) -> int:
+        """Quantidade de registros de gantt_data já desenhados."""
+        return len(self._prefix_max)
+
+    def reset(self):
+        """Apaga o gráfico; o próximo sync() redesenha tudo."""
+        self.canvas.delete(TAG_GANTT)
+        self._simulator = None
+        self._task_ids = ()
+        self._rows = {}
+        self._axis_line = None
+        self._axis_marks = []
+        self._axis_ticks = 0
+        self._prefix_max = []
+        self._log = []
+        self._last = {}
+        self.segments = 0
+
+    @property
+    def show_dividers(self) -> bool:
+        """Se as divisórias entre ticks são desenhadas no zoom atual."""
+        return self.block_width >= DIVIDER_MIN_WIDTH
+
+    def sync(self, simulator, records=None):
+        """
+        Atualiza o Canvas para refletir simulator.gantt_data.
+
+        Redesenha do zero apenas quando o simulador ou o conjunto de tarefas
+        mudou; caso contrário aplica somente a diferença.
+
+        Args:
+            simulator: Simulador a desenhar
+            records: Registros a desenhar no lugar de simulator.gantt_data
+                (ex.: o trace completo já conhecido depois de voltar no tempo)
+        """
+        if simulator is None or not simulator.all_tasks:
+            self.reset()
+            return
+
+        task_ids = row_task_ids(simulator)
+        if simulator is not self._simulator or task_ids != self._task_ids:
+            self.reset()
+            self._start(simulator, task_ids)
+
+        gantt_data = (simulator.gantt_data if records is None else records) or []
+        if len(gantt_data) < self.drawn_records:
+            self._truncate(len(gantt_data))
+        for index in range(self.drawn_records, len(gantt_data)):
+            self._draw_record(index, gantt_data[index])
+
+        self._update_axis(simulator)
+
+    def adopt(self, simulator, records: int):
+        """
+        Passa a desenhar outro simulador cujo trace coincide com o desenhado
+        nos primeiros `records` registros (ex.: depois de editar tarefas).
+
+        Só o que vem depois desse ponto é apagado; o próximo sync() desenha
+        o restante. Se o conjunto de tarefas mudou, redesenha tudo.
+        """
+        task_ids = row_task_ids(simulator)
+        if self._simulator is None or task_ids != self._task_ids:
+            self.reset()
+            return
+        self._simulator = simulator
+        if records < self.drawn_records:
+            self._truncate(records)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _start(self, simulator, task_ids: tuple):
+        """Desenha os rótulos das linhas e prepara o eixo."""
+        self._simulator = simulator
+        self._task_ids = task_ids
+        self._rows = {tid: i * ROW_HEIGHT + TOP_MARGIN for i, tid in enumerate(task_ids)}
+        for tid, y in self._rows.items():
+            self.canvas.create_text(20, y, anchor=tk.W, text=f"T{tid}", tags=(TAG_GANTT,))
+        self._axis_y = max(self._rows.values()) + ROW_HEIGHT
+        x = self.left_margin
+        self._axis_line = self.canvas.create_line(x, self._axis_y, x, self._axis_y, width=2,
+                                                  tags=(TAG_GANTT, TAG_AXIS))
+
+    def _draw_record(self, index: int, entry):
+        """Desenha um registro, estendendo um segmento ou abrindo outro, e anota no log."""
+        if len(entry) == 4:
+            time, tid, rgb, state = entry
+        else:
+            time, tid, rgb = entry
+            state = "EXEC"
+
+        previous = self._prefix_max[-1] if self._prefix_max else -1
+        self._prefix_max.append(max(previous, time))
+
+        y = self._rows.get(tid)
+        if tid == "IDLE" or y is None:
+            self._log.append(None)
+            return
+        fill, outline = state_style(state, rgb)
+        key = (tid, fill, outline)
+        last = self._last.get(key)
+        if last is not None and last.end == time:
+            last.end += 1
+            self._reshape(last)
+            self._log.append((last, False))
+            return
+
+        segment = _Segment(key, time, y, outline, last)
+        x = self.left_margin + time * self.block_width
+        segment.rect = self.canvas.create_rectangle(x, y - BAR_HALF_HEIGHT, x + self.block_width, y + BAR_HALF_HEIGHT,
+                                                    fill=fill, outline=outline, width=1, tags=(TAG_GANTT,))
+        self._last[key] = segment
+        self.segments += 1
+        self._log.append((segment, True))
+
+    def _truncate(self, length: int):
+        """Desfaz, do fim para o início, os registros com índice >= length."""
+        for index in range(self.drawn_records - 1, length - 1, -1):
+            change = self._log[index]
+            if change is None:
+                continue
+            segment, created = change
+            if created:
+                self.canvas.delete(segment.rect)
+                for item in segment.dividers:
+                    self.canvas.delete(item)
+                if segment.previous is None:
+                    del self._last[segment.key]
+                else:
+                    self._last[segment.key] = segment.previous
+                self.segments -= 1
+            else:
+                segment.end -= 1
+                self._reshape(segment)
+        del self._prefix_max[length:]
+        del self._log[length:]
+
+    def _reshape(self, segment: _Segment):
+        """Ajusta o retângulo e a última polilinha de divisórias ao tamanho do segmento."""
+        bw = self.block_width
+        x0 = self.left_margin + segment.start * bw
+        top, bottom = segment.y - BAR_HALF_HEIGHT, segment.y + BAR_HALF_HEIGHT
+        self.canvas.coords(segment.rect, x0, top, x0 + (segment.end - segment.start) * bw, bottom)
+        if not self.show_dividers:
+            return
+
+        count = segment.end - segment.start - 1
+        chunks = -(-count // DIVIDER_CHUNK)
+        while len(segment.dividers) > chunks:
+            self.canvas.delete(segment.dividers.pop())
+        if chunks == 0:
+            return
+
+        first = (chunks - 1) * DIVIDER_CHUNK
+        points = []
+        for j in range(first, count):
+            x = x0 + (j + 1) * bw
+            points.extend((x, top, x, bottom) if j % 2 == 0 else (x, bottom, x, top))
+        if len(segment.dividers) < chunks:
+            segment.dividers.append(self.canvas.create_line(*points, fill=segment.outline, width=1,
+                                                            tags=(TAG_GANTT,)))
+        else:
+            self.canvas.coords(segment.dividers[-1], *points)
+
+    def _update_axis(self, simulator):
+        """Estende ou encolhe o eixo do tempo até o tick atual."""
+        max_time = self._prefix_max[-1] if self._prefix_max else simulator.time
+        total_time = max(max_time + 1, 1)
+        if total_time == self._axis_ticks:
+            return
+
+        step = axis_step((self.block_width, 1))
+        for tick in range(self._axis_ticks // step * step, total_time, -step):
+            self.canvas.delete(axis_tag(tick))
+        for tick in range((self._axis_ticks // step + 1) * step, total_time + 1, step):
+            self._draw_axis_label(tick)
+        self._update_axis_marks(total_time)
+        self._axis_ticks = total_time
+
+        x_end = self.left_margin + total_time * self.block_width
+        self.canvas.coords(self._axis_line, self.left_margin, self._axis_y, x_end, self._axis_y)
+        self.canvas.config(scrollregion=(0, 0, x_end + 50, self._axis_y + 40))
+
+    def _update_axis_marks(self, total_time: int):
+        """Ajusta as polilinhas com as marcas das bordas dos ticks 0..total_time."""
+        chunks = total_time // AXIS_CHUNK + 1
+        while len(self._axis_marks) > chunks:
+            self.canvas.delete(self._axis_marks.pop())
+        y = self._axis_y
+        # O último bloco existente pode ter mudado; os anteriores estão completos
+        for j in range(max(len(self._axis_marks) - 1, 0), chunks):
+            points = []
+            for edge in range(j * AXIS_CHUNK, min((j + 1) * AXIS_CHUNK, total_time + 1)):
+                x = self.left_margin + edge * self.block_width
+                points.extend((x, y, x, y - 6, x, y + 6, x, y))
+            if j < len(self._axis_marks):
+                self.canvas.coords(self._axis_marks[j], *points)
+            else:
+                self._axis_marks.append(self.canvas.create_line(*points, tags=(TAG_GANTT, TAG_AXIS)))
+
+    def _draw_axis_label(self, tick: int):
+        """Desenha o rótulo de um tick (1-based), no centro do bloco."""
+        x = self.left_margin + (tick - 0.5) * self.block_width
+        self.canvas.create_text(x, self._axis_y + 18, text=str(tick), anchor=tk.N, font=("Arial", 9),
+                                tags=(TAG_GANTT, TAG_AXIS, axis_tag(tick)))
@@ -0,0 +1,268 @@
+"""
+Índice de intervalos sobre o trace do Gantt.
+
+TraceIndex junta os registros (tempo, tarefa, cor, estado) de gantt_data em
+intervalos [início, fim) por tarefa e estado, guardados em listas ordenadas
+por início. Com isso:
+    - at(tarefa, tick): estado no tick, por busca binária (O(log n));
+    - intervals(tarefa, t0, t1): intervalos que cruzam uma janela de tempo;
+    - totals(tarefa, t0, t1): ticks em cada estado numa janela, usando somas
+      prefixadas por estado (O(log n));
+    - span(tarefa): primeiro e último tick da tarefa.
+
+O índice é alimentado incrementalmente (feed) como os renderizadores do
+Gantt: cada registro novo estende o último intervalo da tarefa ou abre um
+novo, e um log por registro permite desfazer quando gantt_data é truncado.
+
+MutexHistory complementa o índice com os intervalos em que cada tarefa
+segurou cada mutex, a partir dos eventos mutex_acquire/mutex_release do
+simulador (O(1) por evento).
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+STATES = ("EXEC", "READY", "IO", "MUTEX")
+
+# Entradas do log de desfazer
+_EXTEND = -1  # O registro estendeu o último intervalo
+_APPEND = -2  # O registro abriu um intervalo no fim
+# Valores >= 0: o registro foi inserido fora de ordem nesta posição
+
+
+class _TaskIntervals:
+    """Intervalos de uma tarefa, ordenados por início."""
+
+    __slots__ = ("starts", "ends", "states", "rgb", "prefix")
+
+    def __init__(self, rgb):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.states: List[str] = []
+        self.rgb = rgb
+        # prefix[s][i] = ticks no estado s nos intervalos anteriores ao i-ésimo.
+        # Mantido a cada intervalo novo; None após uma inserção fora de ordem
+        # (recalculado na próxima consulta)
+        self.prefix: Optional[Dict[str, List[int]]] = {s: [] for s in STATES}
+
+    def append(self, time: int, state: str):
+        prefix = self.prefix
+        if prefix is not None:
+            last = len(self.starts) - 1
+            for name, acc in prefix.items():
+                acc.append((acc[-1] + (self.ends[last] - self.starts[last] if self.states[last] == name else 0))
+                           if last >= 0 else 0)
+        self.starts.append(time)
+        self.ends.append(time + 1)
+        self.states.append(state)
+
+    def pop(self):
+        self.starts.pop()
+        self.ends.pop()
+        self.states.pop()
+        if self.prefix is not None:
+            for acc in self.prefix.values():
+                acc.pop()
+
+    def build_prefix(self) -> Dict[str, List[int]]:
+        if self.prefix is None:
+            self.prefix = {s: [] for s in STATES}
+            totals = dict.fromkeys(STATES, 0)
+            for start, end, state in zip(self.starts, self.ends, self.states):
+                for name, acc in self.prefix.items():
+                    acc.append(totals[name])
+                if state in totals:
+                    totals[state] += end - start
+        return self.prefix
+
+
+class TraceIndex:
+    """Intervalos por tarefa construídos a partir de gantt_data."""
+
+    def __init__(self):
+        self.tasks: Dict[object, _TaskIntervals] = {}
+        self._log: List[Tuple[object, int]] = []
+
+    @property
+    def records(self) -> int:
+        """Quantidade de registros de gantt_data já incorporados."""
+        return len(self._log)
+
+    def feed(self, gantt_data):
+        """Incorpora os registros novos (ou desfaz os removidos) de gantt_data."""
+        if len(gantt_data) < len(self._log):
+            self._truncate(len(gantt_data))
+        for index in range(len(self._log), len(gantt_data)):
+            self._apply(gantt_data[index])
+
+    def truncate(self, length: int):
+        """Desfaz os registros a partir de `length` (o trace mudou dali em diante)."""
+        if length < len(self._log):
+            self._truncate(length)
+
+    def at(self, tid, time: int) -> Optional[Tuple[int, int, str]]:
+        """
+        Intervalo da tarefa que contém o tick.
+
+        Returns:
+            (início, fim, estado) ou None se a tarefa não tem registro no tick
+        """
+        row = self.tasks.get(tid)
+        if row is None:
+            return None
+        i = bisect_right(row.starts, time) - 1
+        if i >= 0 and time < row.ends[i]:
+            return row.starts[i], row.ends[i], row.states[i]
+        return None
+
+    def intervals(self, tid, t0: int = 0, t1: Optional[int] = None) -> List[Tuple[int, int, str]]:
+        """Intervalos (início, fim, estado) da tarefa que cruzam [t0, t1), cortados na janela."""
+        row = self.tasks.get(tid)
+        if row is None:
+            return []
+        first = self._first_crossing(row, t0)
+        last = len(row.starts) if t1 is None else bisect_left(row.starts, t1)
+        result = []
+        for i in range(first, last):
+            start, end = max(row.starts[i], t0), row.ends[i] if t1 is None else min(row.ends[i], t1)
+            if start < end:
+                result.append((start, end, row.states[i]))
+        return result
+
+    def totals(self, tid, t0: int = 0, t1: Optional[int] = None) -> Dict[str, int]:
+        """Ticks em cada estado dentro de [t0, t1)."""
+        return {state: self._ticks_before(tid, state, t1) - self._ticks_before(tid, state, t0)
+                for state in STATES}
+
+    def span(self, tid) -> Optional[Tuple[int, int]]:
+        """(primeiro tick, fim do último intervalo) da tarefa, ou None."""
+        row = self.tasks.get(tid)
+        if not row or not row.starts:
+            return None
+        return row.starts[0], row.ends[-1]
+
+    def color(self, tid):
+        row = self.tasks.get(tid)
+        return row.rgb if row else None
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _apply(self, entry):
+        time, tid, rgb, state = entry if len(entry) == 4 else (*entry, "EXEC")
+        if tid == "IDLE":
+            self._log.append((None, _APPEND))
+            return
+        row = self.tasks.get(tid)
+        if row is None:
+            row = self.tasks[tid] = _TaskIntervals(rgb)
+        if row.starts and row.ends[-1] == time and row.states[-1] == state:
+            row.ends[-1] += 1
+            self._log.append((tid, _EXTEND))
+        elif not row.starts or time >= row.ends[-1]:
+            row.append(time, state)
+            self._log.append((tid, _APPEND))
+        else:
+            # Registro fora de ordem (raro): intervalo próprio na posição certa
+            row.prefix = None
+            i = bisect_right(row.starts, time)
+            row.starts.insert(i, time)
+            row.ends.insert(i, time + 1)
+            row.states.insert(i, state)
+            self._log.append((tid, i))
+
+    def _truncate(self, length: int):
+        """Desfaz os registros a partir de `length`, do mais novo para o mais antigo."""
+        while len(self._log) > length:
+            tid, action = self._log.pop()
+            if tid is None:
+                continue
+            row = self.tasks[tid]
+            if action == _EXTEND:
+                row.ends[-1] -= 1
+                continue
+            if action == _APPEND:
+                row.pop()
+            else:
+                row.prefix = None
+                del row.starts[action], row.ends[action], row.states[action]
+            if not row.starts:
+                del self.tasks[tid]
+
+    @staticmethod
+    def _first_crossing(row: _TaskIntervals, t0: int) -> int:
+        """Primeiro intervalo que termina depois de t0."""
+        i = bisect_right(row.starts, t0) - 1
+        if i < 0:
+            return 0
+        return i if row.ends[i] > t0 else i + 1
+
+    def _ticks_before(self, tid, state: str, time: Optional[int]) -> int:
+        """Ticks da tarefa no estado antes de `time` (None = todos)."""
+        row = self.tasks.get(tid)
+        if row is None or state not in STATES:
+            return 0
+        acc = row.build_prefix()[state]
+        i = len(row.starts) - 1 if time is None else bisect_right(row.starts, time - 1) - 1
+        if i < 0:
+            return 0
+        end = row.ends[i] if time is None else min(row.ends[i], time)
+        return acc[i] + (end - row.starts[i] if row.states[i] == state else 0)
+
+
+class MutexHistory:
+    """
+    Intervalos em que cada tarefa segurou cada mutex.
+
+    Registrado como listener do simulador; trechos ainda abertos terminam
+    em None. Como a simulação é determinística, eventos de ticks já
+    registrados (reexecutados depois de voltar no tempo) são ignorados.
+    """
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.holds: Dict[object, List[List]] = {}  # tid -> [[mutex, início, fim|None], ...]
+        self._open: Dict[Tuple[object, int], List] = {}
+        self._recorded = simulator.time  # Ticks anteriores a este já foram registrados
+        simulator.add_listener(self._on_event)
+
+    def held_at(self, tid, time: int) -> List[int]:
+        """Mutexes que a tarefa segurava durante o tick."""
+        held = []
+        for mutex_id, start, end in self.holds.get(tid, ()):
+            if start <= time and (end is None or time < end):
+                held.append(mutex_id)
+        return sorted(held)
+
+    def fork(self, simulator, time: int) -> "MutexHistory":
+        """
+        Histórico para outro simulador que se comporta igual a este até `time`
+        (ver keyframes.KeyframeIndex.fork): mantém os trechos iniciados antes
+        de `time`, reabrindo os que terminavam depois.
+        """
+        history = MutexHistory(simulator)
+        history._recorded = time
+        for tid, holds in self.holds.items():
+            for mutex_id, start, end in holds:
+                if start >= time:
+                    continue
+                hold = [mutex_id, start, end if end is not None and end <= time else None]
+                history.holds.setdefault(tid, []).append(hold)
+                if hold[2] is None:
+                    history._open[(tid, mutex_id)] = hold
+        return history
+
+    def _on_event(self, event, time, info):
+        if event == 'step':
+            self._recorded = max(self._recorded, time)
+        elif time < self._recorded:
+            return
+        elif event == 'mutex_acquire':
+            hold = [info['mutex_id'], time, None]
+            self.holds.setdefault(info['task_id'], []).append(hold)
+            self._open[(info['task_id'], info['mutex_id'])] = hold
+        elif event == 'mutex_release':
+            hold = self._open.pop((info['task_id'], info['mutex_id']), None)
+            if hold is not None:
+                hold[2] = time + 1
@@ -0,0 +1,684 @@
+"""
+Visão do Gantt com zoom, nível de detalhe e cache de tiles.
+
+Em 100% (20 px por tick) o gráfico continua vetorial, mas só os ticks e as
+linhas visíveis viram itens do Canvas (com os estilos do GanttCanvasRenderer),
+redesenhados a cada quadro ou rolagem. Nos demais níveis de zoom o gráfico é
+rasterizado em tiles (tk.PhotoImage) de TILE_WIDTH pixels por TILE_ROWS tarefas:
+    - só os tiles visíveis são colocados no Canvas;
+    - os tiles renderizados ficam num cache LRU por nível de zoom e só são
+      invalidados quando o trecho de tempo que cobrem muda (passo/voltar);
+    - em todos os níveis, rótulos do eixo e das linhas são redesenhados só
+      para a área visível, com passo adaptativo (1, 2, 5, 10, 20, 50, ... ticks).
+
+Assim nenhum nível cria itens proporcionais ao tamanho do trace, e um trace
+que não cabe na janela ao ser aberto já começa no zoom que o mostra inteiro.
+
+Quando um pixel cobre vários ticks, o estado exibido é o dominante no
+intervalo e a cor é clareada pela fração de ticks ocupados. As contagens por
+estado vêm de uma pirâmide (GanttTimeline) mantida por tarefa apenas no
+trecho em que ela aparece no Gantt, então o custo de um tile não depende do
+tamanho do trace.
+"""
+
+import tkinter as tk
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from gantt_canvas import (LEFT_MARGIN, ROW_HEIGHT, TOP_MARGIN, BAR_HALF_HEIGHT, BLOCK_WIDTH, DIVIDER_MIN_WIDTH,
+                          axis_step, row_task_ids, state_style)
+
+# Códigos de estado nas células da linha do tempo (0 = vazio)
+STATE_CODES = {"EXEC": 1, "READY": 2, "IO": 3, "MUTEX": 4}
+N_STATES = len(STATE_CODES)
+STATE_NAMES = {code: state for state, code in STATE_CODES.items()}
+TIE_ORDER = (1, 4, 3, 2)  # Em empate, EXEC > MUTEX > IO > READY
+
+MIN_PYRAMID_LEVEL = 3   # Abaixo de 2^3 ticks por pixel as células são lidas direto
+MAX_PYRAMID_LEVEL = 16
+
+# Níveis de zoom: (pixels por tick, ticks por pixel). O índice 0 é o vetorial.
+ZOOM_LEVELS = [(BLOCK_WIDTH, 1), (10, 1), (5, 1), (2, 1), (1, 1)] + \
+              [(1, 1 << k) for k in range(1, MAX_PYRAMID_LEVEL + 1)]
+
+TILE_WIDTH = 256
+TILE_ROWS = 16
+TILE_CACHE_SIZE = 128
+MIN_SHADE = 0.35        # Fração mínima de cor para um pixel pouco ocupado
+
+TAG_TILES = "tiles"
+TAG_VECTOR = "vector"  # Barras vetoriais da área visível (100%)
+TAG_TILE_AXIS = "tile_axis"
+TAG_TILE_LABELS = "tile_labels"
+TAG_PLAYHEAD = "playhead"
+TAG_HIGHLIGHT = "highlight"
+
+IO_RGB = (0xbf, 0xbf, 0xbf)
+MUTEX_RGB = (0x99, 0x32, 0xcc)
+READY_TINT = 0.3  # Pronta = cor da tarefa clareada
+
+
+class _RowTimeline:
+    """Células de estado de uma tarefa no trecho [offset, offset+len) e a pirâmide de contagens."""
+
+    __slots__ = ('offset', 'cells', 'levels')
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        self.cells = bytearray()
+        # levels[j] guarda, para o nível k = MIN_PYRAMID_LEVEL + j, N_STATES
+        # contadores por bloco de 2^k ticks, a partir do bloco offset >> k
+        self.levels = [array('I') for _ in range(MIN_PYRAMID_LEVEL, MAX_PYRAMID_LEVEL + 1)]
+
+    def get(self, time: int) -> int:
+        i = time - self.offset
+        return self.cells[i] if 0 <= i < len(self.cells) else 0
+
+    def set(self, time: int, code: int) -> int:
+        """Grava o código no tick e atualiza a pirâmide; devolve o código anterior."""
+        if time < self.offset:
+            self._rebase(time)
+        i = time - self.offset
+        if i >= len(self.cells):
+            self.cells.extend(bytes(i + 1 - len(self.cells)))
+        old = self.cells[i]
+        if old == code:
+            return old
+        self.cells[i] = code
+        for j, counts in enumerate(self.levels):
+            k = MIN_PYRAMID_LEVEL + j
+            base = ((time >> k) - (self.offset >> k)) * N_STATES
+            if base >= len(counts):
+                counts.extend([0] * (base + N_STATES - len(counts)))
+            if old:
+                counts[base + old - 1] -= 1
+            if code:
+                counts[base + code - 1] += 1
+        return old
+
+    def counts(self, first: int, k: int) -> List[int]:
+        """Contagens por estado no bloco de 2^k ticks que começa em first."""
+        if k < MIN_PYRAMID_LEVEL:
+            result = [0] * N_STATES
+            for time in range(first, first + (1 << k)):
+                code = self.get(time)
+                if code:
+                    result[code - 1] += 1
+            return result
+        counts = self.levels[k - MIN_PYRAMID_LEVEL]
+        base = ((first >> k) - (self.offset >> k)) * N_STATES
+        if base < 0 or base >= len(counts):
+            return [0] * N_STATES
+        return list(counts[base:base + N_STATES])
+
+    def _rebase(self, time: int):
+        """Recria o trecho começando em time (chegada de registro anterior ao início)."""
+        old_offset, old_cells = self.offset, self.cells
+        self.offset = time
+        self.cells = bytearray()
+        self.levels = [array('I') for _ in self.levels]
+        for i, code in enumerate(old_cells):
+            if code:
+                self.set(old_offset + i, code)
+
+
+class GanttTimeline:
+    """
+    Estado por (tarefa, tick) construído incrementalmente a partir de gantt_data.
+
+    Guarda um log por registro para desfazer quando gantt_data é truncado
+    (step_back) e o menor tick alterado desde a última consulta, usado para
+    invalidar os tiles afetados.
+    """
+
+    def __init__(self, task_ids):
+        self.rows: Dict[int, _RowTimeline] = {}
+        self.colors: Dict[int, Tuple[int, int, int]] = {}
+        self.task_ids = tuple(task_ids)
+        self._known = set(self.task_ids)
+        self._log: list = []          # Por registro: (tid, tick, código anterior) ou None
+        self._prefix_max: List[int] = []
+        self._dirty_from: Optional[int] = None
+
+    @property
+    def records(self) -> int:
+        """Quantidade de registros de gantt_data já incorporados."""
+        return len(self._log)
+
+    @property
+    def total_ticks(self) -> int:
+        """Ticks cobertos pelo Gantt (maior tempo + 1)."""
+        return self._prefix_max[-1] + 1 if self._prefix_max else 0
+
+    def feed(self, gantt_data):
+        """Incorpora os registros novos (ou desfaz os removidos) de gantt_data."""
+        if len(gantt_data) < len(self._log):
+            self._truncate(len(gantt_data))
+        for index in range(len(self._log), len(gantt_data)):
+            self._apply(gantt_data[index])
+
+    def truncate(self, length: int):
+        """Desfaz os registros a partir de `length` (o trace mudou dali em diante)."""
+        if length < len(self._log):
+            self._truncate(length)
+
+    def state_at(self, tid, time: int) -> int:
+        """Código de estado da tarefa no tick (0 se vazio)."""
+        row = self.rows.get(tid)
+        return row.get(time) if row else 0
+
+    def span(self, tid) -> Tuple[int, int]:
+        """Trecho [início, fim) em que a tarefa tem células."""
+        row = self.rows.get(tid)
+        if row is None:
+            return 0, 0
+        return row.offset, row.offset + len(row.cells)
+
+    def counts(self, tid, first: int, k: int) -> List[int]:
+        """Contagens por estado da tarefa no bloco de 2^k ticks que começa em first."""
+        row = self.rows.get(tid)
+        return row.counts(first, k) if row else [0] * N_STATES
+
+    def take_dirty(self) -> Optional[int]:
+        """Devolve o menor tick alterado desde a última chamada (ou None) e zera a marca."""
+        dirty, self._dirty_from = self._dirty_from, None
+        return dirty
+
+    def _mark(self, time: int):
+        if self._dirty_from is None or time < self._dirty_from:
+            self._dirty_from = time
+
+    def _apply(self, entry):
+        time, tid, rgb = entry[0], entry[1], entry[2]
+        state = entry[3] if len(entry) == 4 else "EXEC"
+        previous = self._prefix_max[-1] if self._prefix_max else -1
+        self._prefix_max.append(max(previous, time))
+
+        code = STATE_CODES.get(state)
+        if tid == "IDLE" or code is None or tid not in self._known:
+            self._log.append(None)
+            self._mark(time)
+            return
+        self.colors[tid] = tuple(rgb)
+        row = self.rows.get(tid)
+        if row is None:
+            row = self.rows[tid] = _RowTimeline(time)
+        self._log.append((tid, time, row.set(time, code)))
+        self._mark(time)
+
+    def _truncate(self, length: int):
+        for index in range(len(self._log) - 1, length - 1, -1):
+            change = self._log[index]
+            if change is not None:
+                tid, time, old = change
+                self.rows[tid].set(time, old)
+                self._mark(time)
+        del self._log[length:]
+        del self._prefix_max[length:]
+        self._mark(self.total_ticks)
+
+
+def dominant(counts: List[int]) -> int:
+    """Código do estado dominante nas contagens (0 se todas forem zero)."""
+    best, best_count = 0, 0
+    for code in TIE_ORDER:
+        if counts[code - 1] > best_count:
+            best, best_count = code, counts[code - 1]
+    return best
+
+
+def _blend(rgb, amount: float) -> Tuple[int, int, int]:
+    """Mistura a cor com branco: amount=1 mantém a cor, 0 vira branco."""
+    return tuple(int(round(255 - (255 - c) * amount)) for c in rgb)
+
+
+def cell_color(code: int, rgb, fraction: float = 1.0) -> str:
+    """Cor #rrggbb de um pixel com estado dominante code e ocupação fraction."""
+    if code == 0 or fraction <= 0:
+        return "#ffffff"
+    if code == STATE_CODES["IO"]:
+        base = IO_RGB
+    elif code == STATE_CODES["MUTEX"]:
+        base = MUTEX_RGB
+    elif code == STATE_CODES["READY"]:
+        base = _blend(rgb, READY_TINT)
+    else:
+        base = tuple(rgb)
+    if fraction < 1:
+        base = _blend(base, max(fraction, MIN_SHADE))
+    return "#%02x%02x%02x" % base
+
+
+def column_ticks(zoom: Tuple[int, int], column: int) -> int:
+    """Primeiro tick coberto pela coluna de pixel (coordenada a partir da margem)."""
+    ppt, tpp = zoom
+    return column * tpp // ppt
+
+
+def row_pixels(timeline: GanttTimeline, tid, zoom: Tuple[int, int], first_column: int,
+               width: int = TILE_WIDTH) -> Optional[List[str]]:
+    """
+    Cores das colunas [first_column, first_column + width) da linha da tarefa.
+
+    Returns:
+        Lista de cores, ou None se a tarefa não tem células nesse trecho
+    """
+    ppt, tpp = zoom
+    start, end = timeline.span(tid)
+    first_tick = column_ticks(zoom, first_column)
+    last_tick = column_ticks(zoom, first_column + width - 1) + tpp
+    if end <= first_tick or start >= last_tick:
+        return None
+
+    rgb = timeline.colors.get(tid, (0, 0, 0))
+    k = tpp.bit_length() - 1
+    pixels = []
+    cached_tick, cached_color = None, None
+    for column in range(first_column, first_column + width):
+        tick = column_ticks(zoom, column)
+        if tick != cached_tick:
+            if tpp == 1:
+                cached_color = cell_color(timeline.state_at(tid, tick), rgb)
+            else:
+                counts = timeline.counts(tid, tick, k)
+                cached_color = cell_color(dominant(counts), rgb, sum(counts) / tpp)
+            cached_tick = tick
+        pixels.append(cached_color)
+    return pixels
+
+
+class GanttZoomView:
+    """
+    Gantt do App com zoom: vetorial (só a área visível) em 100% e em tiles
+    nos demais níveis.
+
+    Uso:
+        view = GanttZoomView(canvas)
+        view.sync(simulator)      # a cada update_ui()
+        view.zoom_in(anchor_x)    # botões / Ctrl+roda do mouse
+        view.refresh()            # após rolar o Canvas
+    """
+
+    def __init__(self, canvas, image_factory=None, fit_on_open: bool = True):
+        self.canvas = canvas
+        self.fit_on_open = fit_on_open  # Trace que não cabe na janela ao abrir começa no zoom que o mostra inteiro
+        self.timeline: Optional[GanttTimeline] = None
+        self.zoom_index = 0
+        self._simulator = None
+        self._records = None
+        self._playhead: Optional[int] = None
+        self._highlight: Optional[tuple] = None
+        self._row_cache = (None, (), {})  # (simulador, ids de cima para baixo, linha por id)
+        self._timeline_owner = None  # Simulador que originou self.timeline
+        self._fit_pending = False    # Ajustar o zoom ao trace no primeiro quadro de um simulador novo
+        self._cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self._placed: Dict[tuple, int] = {}
+        self._image_factory = image_factory or (
+            lambda w, h: tk.PhotoImage(master=canvas, width=w, height=h))
+
+    @property
+    def zoom(self) -> Tuple[int, int]:
+        """Nível atual como (pixels por tick, ticks por pixel)."""
+        return ZOOM_LEVELS[self.zoom_index]
+
+    @property
+    def is_vector(self) -> bool:
+        return self.zoom_index == 0
+
+    def zoom_percent(self) -> float:
+        """Zoom atual em porcentagem de 20 px por tick."""
+        ppt, tpp = self.zoom
+        return 100.0 * ppt / (tpp * BLOCK_WIDTH)
+
+    def sync(self, simulator, records=None):
+        """
+        Atualiza o gráfico para refletir o simulador.
+
+        Args:
+            simulator: Simulador a desenhar
+            records: Registros a desenhar no lugar de simulator.gantt_data
+        """
+        self._simulator = simulator
+        self._records = records
+        self._sync_timeline()
+        self._draw_overlays()
+
+    def adopt(self, simulator, records: int):
+        """
+        Passa a desenhar outro simulador cujo trace coincide com o desenhado
+        nos primeiros `records` registros: só os tiles a partir do primeiro
+        tick alterado são descartados (ver GanttCanvasRenderer.adopt).
+        """
+        if self.timeline is not None and self._timeline_owner is not None:
+            task_ids = row_task_ids(simulator)
+            if task_ids == self.timeline.task_ids:
+                self._timeline_owner = simulator
+                self.timeline.truncate(records)
+        self._simulator = simulator
+
+    def set_playhead(self, time: Optional[int]):
+        """Desenha (ou remove, com None) a linha vertical que marca o tick atual."""
+        self._playhead = time
+        self._draw_overlays()
+
+    def set_highlight(self, tid, start: int = 0, end: int = 0):
+        """Destaca a linha da tarefa no trecho [start, end) (tid None remove o destaque)."""
+        self._highlight = None if tid is None else (tid, start, end)
+        self._draw_overlays()
+
+    def locate(self, x: float, y: float) -> Optional[Tuple[object, int]]:
+        """
+        Tarefa e tick sob um ponto do Canvas (coordenadas do Canvas, não da janela).
+
+        Returns:
+            (id da tarefa, tick) ou None fora das barras
+        """
+        task_ids = self._row_ids()
+        if not task_ids or x < LEFT_MARGIN:
+            return None
+        row = int(round((y - TOP_MARGIN) / ROW_HEIGHT))
+        if not 0 <= row < len(task_ids) or abs(y - (row * ROW_HEIGHT + TOP_MARGIN)) > BAR_HALF_HEIGHT:
+            return None
+        ppt, tpp = self.zoom
+        return task_ids[row], int((x - LEFT_MARGIN) * tpp // ppt)
+
+    def row_y(self, tid) -> Optional[int]:
+        """Centro vertical da linha da tarefa."""
+        self._row_ids()
+        row = self._row_cache[2].get(tid)
+        return None if row is None else row * ROW_HEIGHT + TOP_MARGIN
+
+    def zoom_in(self, anchor_x: Optional[int] = None):
+        self.set_zoom(self.zoom_index - 1, anchor_x)
+
+    def zoom_out(self, anchor_x: Optional[int] = None):
+        self.set_zoom(self.zoom_index + 1, anchor_x)
+
+    def set_zoom(self, index: int, anchor_x: Optional[int] = None):
+        """
+        Muda o nível de zoom mantendo fixo o tick sob anchor_x (x na janela).
+
+        Args:
+            index: Índice em ZOOM_LEVELS
+            anchor_x: Coluna da janela que fica parada (padrão: borda esquerda)
+        """
+        index = max(0, min(index, len(ZOOM_LEVELS) - 1))
+        if index == self.zoom_index:
+            return
+        anchor_x = anchor_x or 0
+        ppt, tpp = self.zoom
+        anchor_tick = max(0.0, (self.canvas.canvasx(anchor_x) - LEFT_MARGIN) * tpp / ppt)
+
+        self.zoom_index = index
+        # A linha do tempo não depende do zoom: só a área visível é redesenhada
+        self.sync(self._simulator, self._records)
+
+        ppt, tpp = self.zoom
+        region = self.canvas.cget("scrollregion").split()
+        width = float(region[2]) if len(region) == 4 else 0
+        if width > 0:
+            left = LEFT_MARGIN + anchor_tick * ppt / tpp - anchor_x
+            self.canvas.xview_moveto(max(0.0, left) / width)
+        self.refresh()
+
+    def zoom_to_fit(self):
+        """Passa ao maior zoom em que o trace inteiro cabe na largura da janela."""
+        if self.timeline is None:
+            return
+        self.set_zoom(self._fit_index(self.timeline.total_ticks))
+
+    def refresh(self):
+        """Redesenha a área visível: barras (100%) ou tiles, rótulos e eixo."""
+        if self.timeline is None:
+            return
+        x0 = self.canvas.canvasx(0)
+        x1 = self.canvas.canvasx(self.canvas.winfo_width())
+        y0 = self.canvas.canvasy(0)
+        y1 = self.canvas.canvasy(self.canvas.winfo_height())
+        if self.is_vector:
+            self._remove_placed_tiles()
+            self._draw_vector(x0, x1, y0, y1)
+        else:
+            self.canvas.delete(TAG_VECTOR)
+            self._place_tiles(x0, x1, y0, y1)
+        self._draw_labels(x0, x1, y0, y1)
+        self._draw_overlays()
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _row_ids(self) -> tuple:
+        simulator = self._simulator
+        if simulator is None:
+            return ()
+        task_ids = row_task_ids(simulator)
+        if self._row_cache[1] is not task_ids:
+            self._row_cache = (simulator, task_ids, {tid: i for i, tid in enumerate(task_ids)})
+        return task_ids
+
+    def _draw_overlays(self):
+        """Linha do tick atual e destaque de tarefa, sempre por cima dos tiles."""
+        self.canvas.delete(TAG_PLAYHEAD)
+        self.canvas.delete(TAG_HIGHLIGHT)
+        task_ids = self._row_ids()
+        if not task_ids:
+            return
+        ppt, tpp = self.zoom
+        if self._highlight is not None:
+            tid, start, end = self._highlight
+            y = self.row_y(tid)
+            if y is not None:
+                pad = BAR_HALF_HEIGHT + 3
+                self.canvas.create_rectangle(LEFT_MARGIN + start * ppt / tpp - 2, y - pad,
+                                             LEFT_MARGIN + end * ppt / tpp + 2, y + pad,
+                                             outline="#0078D7", width=3, tags=(TAG_HIGHLIGHT,))
+        if self._playhead is not None:
+            x = LEFT_MARGIN + self._playhead * ppt / tpp
+            bottom = len(task_ids) * ROW_HEIGHT + TOP_MARGIN
+            self.canvas.create_line(x, 0, x, bottom, fill="red", width=2, tags=(TAG_PLAYHEAD,))
+
+    def _sync_timeline(self):
+        simulator = self._simulator
+        if simulator is None or not simulator.all_tasks:
+            self._clear_tiles()
+            self.timeline = None
+            return
+        task_ids = row_task_ids(simulator)
+        if self.timeline is None or self.timeline.task_ids != task_ids or simulator is not self._timeline_owner:
+            self._clear_tiles()
+            self.timeline = GanttTimeline(task_ids)
+            self._timeline_owner = simulator
+            self._fit_pending = self.fit_on_open
+
+        records = simulator.gantt_data if self._records is None else self._records
+        self.timeline.feed(records or [])
+        dirty = self.timeline.take_dirty()
+        if dirty is not None:
+            self._invalidate(dirty)
+        if self._fit_pending:
+            # Trace já longo ao abrir (execução salva, simulação concluída): começa inteiro na janela
+            self._fit_pending = False
+            if self.timeline.total_ticks:
+                self.zoom_index = self._fit_index(self.timeline.total_ticks)
+
+        ppt, tpp = self.zoom
+        total = max(self.timeline.total_ticks, simulator.time + 1)
+        width = LEFT_MARGIN + -(-total * ppt // tpp) + 50
+        self.canvas.config(scrollregion=(0, 0, width, self._axis_y() + 40))
+        self.refresh()
+
+    def _axis_y(self) -> int:
+        return (len(self.timeline.task_ids) - 1) * ROW_HEIGHT + TOP_MARGIN + ROW_HEIGHT
+
+    def _fit_index(self, total_ticks: int) -> int:
+        """Menor índice de zoom (mais detalhe) em que total_ticks cabem na janela (o atual se ela não tem tamanho)."""
+        width = self.canvas.winfo_width() - LEFT_MARGIN - 50
+        if width <= 1:
+            return self.zoom_index
+        for index, (ppt, tpp) in enumerate(ZOOM_LEVELS):
+            if total_ticks * ppt <= width * tpp:
+                return index
+        return len(ZOOM_LEVELS) - 1
+
+    def _visible_rows(self, y0, y1) -> Tuple[int, int]:
+        """Primeira e última linha (índices) que aparecem entre y0 e y1."""
+        first_row = max(0, int((y0 - TOP_MARGIN) // ROW_HEIGHT))
+        last_row = min(len(self.timeline.task_ids) - 1, int((y1 - TOP_MARGIN) // ROW_HEIGHT) + 1)
+        return first_row, last_row
+
+    def _draw_vector(self, x0, x1, y0, y1):
+        """Barras da área visível em 100%: um retângulo e uma polilinha de divisórias por trecho no mesmo estado."""
+        self.canvas.delete(TAG_VECTOR)
+        timeline = self.timeline
+        ppt, tpp = self.zoom
+        first_tick = max(0, int((x0 - LEFT_MARGIN) * tpp // ppt))
+        end_tick = min(timeline.total_ticks, int((x1 - LEFT_MARGIN) * tpp // ppt) + 1)
+        first_row, last_row = self._visible_rows(y0, y1)
+        for i in range(first_row, last_row + 1):
+            tid = timeline.task_ids[i]
+            start, end = timeline.span(tid)
+            tick, end = max(start, first_tick), min(end, end_tick)
+            rgb = timeline.colors.get(tid, (0, 0, 0))
+            y = i * ROW_HEIGHT + TOP_MARGIN
+            while tick < end:
+                code = timeline.state_at(tid, tick)
+                run_end = tick + 1
+                while run_end < end and timeline.state_at(tid, run_end) == code:
+                    run_end += 1
+                if code:
+                    self._draw_run(y, tick, run_end, *state_style(STATE_NAMES[code], rgb))
+                tick = run_end
+
+    def _draw_run(self, y: int, start: int, end: int, fill: str, outline: str):
+        ppt = self.zoom[0]
+        x0 = LEFT_MARGIN + start * ppt
+        top, bottom = y - BAR_HALF_HEIGHT, y + BAR_HALF_HEIGHT
+        self.canvas.create_rectangle(x0, top, LEFT_MARGIN + end * ppt, bottom, fill=fill, outline=outline, width=1,
+                                     tags=(TAG_VECTOR,))
+        if end - start < 2 or ppt < DIVIDER_MIN_WIDTH:
+            return
+        points = []
+        for j in range(1, end - start):
+            x = x0 + j * ppt
+            points.extend((x, top, x, bottom) if j % 2 else (x, bottom, x, top))
+        self.canvas.create_line(*points, fill=outline, width=1, tags=(TAG_VECTOR,))
+
+    def _tile_ticks(self, tile_x: int) -> Tuple[int, int]:
+        """Trecho de ticks [início, fim) coberto pela coluna de tiles."""
+        zoom = self.zoom
+        first = column_ticks(zoom, tile_x * TILE_WIDTH)
+        last = column_ticks(zoom, (tile_x + 1) * TILE_WIDTH - 1) + zoom[1]
+        return first, last
+
+    def _invalidate(self, dirty_tick: int):
+        """Descarta os tiles em cache que cobrem ticks >= dirty_tick."""
+        for key in list(self._cache):
+            zoom_index, tile_x, _ = key
+            if zoom_index == self.zoom_index and self._tile_ticks(tile_x)[1] <= dirty_tick:
+                continue
+            del self._cache[key]
+            item = self._placed.pop(key, None)
+            if item is not None:
+                self.canvas.delete(item)
+
+    def _clear_tiles(self):
+        self.canvas.delete(TAG_TILES)
+        self.canvas.delete(TAG_VECTOR)
+        self.canvas.delete(TAG_TILE_AXIS)
+        self.canvas.delete(TAG_TILE_LABELS)
+        self._placed.clear()
+        self._cache.clear()
+
+    def _visible_keys(self, x0, x1, y0, y1) -> List[tuple]:
+        n_rows = len(self.timeline.task_ids)
+        tile_h = TILE_ROWS * ROW_HEIGHT
+        ppt, tpp = self.zoom
+        total = self.timeline.total_ticks
+        last_x = max(0, (-(-total * ppt // tpp) - 1) // TILE_WIDTH)
+        first_x = max(0, int((x0 - LEFT_MARGIN) // TILE_WIDTH))
+        end_x = min(last_x, int((x1 - LEFT_MARGIN) // TILE_WIDTH))
+        first_r = max(0, int(y0 // tile_h))
+        end_r = min((n_rows - 1) // TILE_ROWS, int(y1 // tile_h))
+        return [(self.zoom_index, tx, tr) for tr in range(first_r, end_r + 1) for tx in range(first_x, end_x + 1)]
+
+    def _remove_placed_tiles(self):
+        """Tira os tiles do Canvas (continuam no cache)."""
+        for item in self._placed.values():
+            self.canvas.delete(item)
+        self._placed.clear()
+
+    def _place_tiles(self, x0, x1, y0, y1):
+        visible = set(self._visible_keys(x0, x1, y0, y1))
+        for key in [k for k in self._placed if k not in visible]:
+            self.canvas.delete(self._placed.pop(key))
+        for key in visible:
+            if key in self._placed:
+                continue
+            image = self._tile_image(key)
+            _, tile_x, tile_row = key
+            self._placed[key] = self.canvas.create_image(
+                LEFT_MARGIN + tile_x * TILE_WIDTH, tile_row * TILE_ROWS * ROW_HEIGHT,
+                image=image, anchor=tk.NW, tags=(TAG_TILES,))
+
+    def _tile_image(self, key):
+        """Devolve o tile do cache ou o renderiza, respeitando o limite do LRU."""
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+            return image
+        image = self._render_tile(key)
+        self._cache[key] = image
+        while len(self._cache) > TILE_CACHE_SIZE:
+            oldest = next((k for k in self._cache if k not in self._placed), None)
+            if oldest is None:
+                break
+            del self._cache[oldest]
+        return image
+
+    def _render_tile(self, key):
+        _, tile_x, tile_row = key
+        height = TILE_ROWS * ROW_HEIGHT
+        image = self._image_factory(TILE_WIDTH, height)
+        image.put("#ffffff", to=(0, 0, TILE_WIDTH, height))
+        task_ids = self.timeline.task_ids
+        bar_top = ROW_HEIGHT // 2 - BAR_HALF_HEIGHT
+        for i in range(TILE_ROWS):
+            row = tile_row * TILE_ROWS + i
+            if row >= len(task_ids):
+                break
+            pixels = row_pixels(self.timeline, task_ids[row], self.zoom, tile_x * TILE_WIDTH)
+            if pixels is None:
+                continue
+            top = i * ROW_HEIGHT + bar_top
+            image.put("{" + " ".join(pixels) + "}", to=(0, top, TILE_WIDTH, top + 2 * BAR_HALF_HEIGHT))
+        return image
+
+    def _draw_labels(self, x0, x1, y0, y1):
+        """Rótulos das tarefas visíveis e eixo do tempo adaptativo da área visível."""
+        self.canvas.delete(TAG_TILE_LABELS)
+        self.canvas.delete(TAG_TILE_AXIS)
+        task_ids = self.timeline.task_ids
+        first_row, last_row = self._visible_rows(y0, y1)
+        for i in range(first_row, last_row + 1):
+            self.canvas.create_text(max(20, x0 + 5), i * ROW_HEIGHT + TOP_MARGIN, anchor=tk.W,
+                                    text=f"T{task_ids[i]}", tags=(TAG_TILE_LABELS,))
+
+        ppt, tpp = self.zoom
+        axis_y = self._axis_y()
+        total = max(self.timeline.total_ticks, 1)
+        x_end = LEFT_MARGIN + total * ppt / tpp
+        self.canvas.create_line(max(LEFT_MARGIN, x0), axis_y, min(x_end, x1), axis_y, width=2, tags=(TAG_TILE_AXIS,))
+
+        step = axis_step(self.zoom)
+        first_tick = max(0, int((x0 - LEFT_MARGIN) * tpp / ppt))
+        tick = -(-first_tick // step) * step
+        while tick <= total:
+            x = LEFT_MARGIN + tick * ppt / tpp
+            if x > x1:
+                break
+            self.canvas.create_line(x, axis_y - 6, x, axis_y + 6, tags=(TAG_TILE_AXIS,))
+            self.canvas.create_text(x, axis_y + 18, text=str(tick), anchor=tk.N, font=("Arial", 9),
+                                    tags=(TAG_TILE_AXIS,))
+            tick += step
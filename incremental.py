@@ -0,0 +1,117 @@
+"""
+Re-simulação incremental depois de editar tarefas.
+
+Uma tarefa só influencia a simulação a partir da sua chegada: antes disso
+ela não está em nenhuma fila, não gera registros no Gantt e não segura
+mutexes. Então, ao editar tarefas (mesmo algoritmo e parâmetros), os ticks
+anteriores à primeira chegada afetada (a menor entre a chegada antiga e a
+nova de cada tarefa alterada, incluída ou removida) são idênticos.
+
+resimulate() aproveita isso: o KeyframeIndex da simulação antiga é
+"bifurcado" para o simulador novo (KeyframeIndex.fork) no último keyframe
+antes desse tick, e só o trecho seguinte é reexecutado até o tempo em que
+a simulação antiga estava. Depois compara o trace novo com o antigo a
+partir do keyframe reaproveitado e informa quantos registros coincidem,
+para o Gantt redesenhar só a parte que mudou.
+
+Uso:
+    result = resimulate(keyframes, Simulator(escalonador, tarefas_novas),
+                        definicoes_antes, definicoes_depois, target=sim_antigo.time)
+    gantt_view.adopt(result.keyframes.simulator, result.common_records)
+"""
+
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+# Campos que definem uma tarefa (o resto é estado da simulação)
+DEFINITION_FIELDS = ('RGB', 'inicio', 'duracao', 'prio_s', 'io_events', 'ml_events', 'mu_events')
+
+
+def task_definition(task) -> tuple:
+    """Definição de uma tarefa (TCB ou dicionário com os mesmos campos), comparável."""
+    get = task.get if isinstance(task, dict) else lambda name: getattr(task, name)
+    return tuple(tuple(map(_freeze, get(name) or ())) if name.endswith('_events') else _freeze(get(name))
+                 for name in DEFINITION_FIELDS)
+
+
+def _freeze(value):
+    return tuple(value) if isinstance(value, (list, tuple)) else value
+
+
+def _task_id(task):
+    return task['id'] if isinstance(task, dict) else task.id
+
+
+def _arrival(task) -> int:
+    return task['inicio'] if isinstance(task, dict) else task.inicio
+
+
+def changed_tasks(before: Iterable, after: Iterable) -> Dict[object, int]:
+    """
+    Tarefas cuja definição mudou (ou que foram incluídas/removidas).
+
+    Returns:
+        Dicionário id -> primeiro tick que a mudança pode afetar
+    """
+    old = {_task_id(t): t for t in before}
+    new = {_task_id(t): t for t in after}
+    changed = {}
+    for tid in old.keys() | new.keys():
+        if tid in old and tid in new:
+            if task_definition(old[tid]) != task_definition(new[tid]):
+                changed[tid] = min(_arrival(old[tid]), _arrival(new[tid]))
+        else:
+            changed[tid] = _arrival(old[tid] if tid in old else new[tid])
+    return changed
+
+
+def earliest_change(before: Iterable, after: Iterable) -> Optional[int]:
+    """Primeiro tick afetado pelas edições (None se nada mudou)."""
+    changed = changed_tasks(before, after)
+    return min(changed.values()) if changed else None
+
+
+def first_divergence(old_records, new_records, start: int = 0) -> int:
+    """Quantidade de registros iniciais iguais nos dois traces (supondo iguais antes de `start`)."""
+    end = min(len(old_records), len(new_records))
+    index = start
+    while index < end and old_records[index] == new_records[index]:
+        index += 1
+    return index
+
+
+class Resimulation(NamedTuple):
+    """Resultado de resimulate()."""
+    keyframes: object        # KeyframeIndex do simulador novo
+    checkpoint: int          # Tempo do keyframe reaproveitado
+    replayed: int            # Passos reexecutados
+    common_records: int      # Registros iniciais iguais aos do trace antigo
+    divergence: Optional[int]  # Tick do primeiro registro diferente (None: nenhum até agora)
+
+
+def resimulate(keyframes, simulator, before, after, target: int,
+               attach: Optional[Callable] = None) -> Resimulation:
+    """
+    Leva um simulador novo (tarefas editadas, mesmo escalonador) ao tempo `target`
+    reaproveitando os keyframes da simulação antiga.
+
+    Args:
+        keyframes: KeyframeIndex da simulação antiga
+        simulator: Simulator novo, no tempo inicial
+        before: Definições das tarefas antes da edição (TCBs ou dicionários)
+        after: Definições depois da edição
+        target: Tempo em que o simulador novo deve ficar
+        attach: Chamado com o KeyframeIndex novo antes da reexecução
+            (para registrar outros observadores do simulador novo)
+    """
+    changed = changed_tasks(before, after)
+    tick = min(changed.values()) if changed else target
+    index = keyframes.fork(simulator, min(tick, target), changed)
+    checkpoint = simulator.time
+    start = len(simulator.gantt_data)
+    if attach is not None:
+        attach(index)
+    index.seek(target)
+    replayed = simulator.time - checkpoint
+    common = first_divergence(keyframes.trace, index.trace, start)
+    divergence = index.trace[common][0] if common < len(index.trace) else None
+    return Resimulation(index, checkpoint, replayed, common, divergence)
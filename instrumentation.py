@@ -0,0 +1,250 @@
+"""
+Módulo de instrumentação do simulador (modo de perfilamento opcional).
+
+Mede, por fase de Simulator.step, o tempo de parede acumulado e o número de
+chamadas, mantém um histograma de latência das decisões do escalonador e
+conta eventos da simulação (trocas de contexto, preempções, quantum esgotado,
+contenção de mutex) além de amostrar o tamanho das filas a cada passo.
+
+A instrumentação é instalada envolvendo os métodos das fases na própria
+instância do simulador (e do escalonador). Quando desativada os wrappers são
+removidos, então o caminho normal não paga nenhum custo extra.
+
+Uso:
+    profile = simulator.enable_profiling()
+    simulator.run_full()
+    print(profile.report())
+"""
+
+import time
+from functools import wraps
+from typing import Callable, Dict, List
+
+# Fases do passo da simulação: nome exibido -> método do Simulator
+PHASES = {
+    'step': 'step',
+    'save_state': '_save_state',
+    'arrivals': '_check_for_new_arrivals',
+    'io_unblock': '_check_io_unblock',
+    'quantum_check': '_check_quantum_expiry',
+    'context_switch': '_switch_context',
+    'record_ready': '_record_ready_tasks',
+    'mutex_lock': '_handle_mutex_lock_event',
+    'mutex_unlock': '_handle_mutex_unlock_event',
+    'io_event': '_handle_io_event',
+}
+
+# Eventos contados (nome do evento do simulador -> contador)
+COUNTED_EVENTS = {
+    'dispatch': 'context_switches',
+    'preempt': 'preemptions',
+    'quantum_expired': 'quantum_expiries',
+    'mutex_contended': 'mutex_contentions',
+    'mutex_acquire': 'mutex_acquisitions',
+    'deadlock': 'deadlocks',
+}
+
+# Filas amostradas ao fim de cada passo
+SAMPLED_QUEUES = ('ready_queue', 'blocked_io_queue', 'blocked_mutex_queue')
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências em baldes de potência de 2 (nanossegundos).
+
+    O balde k conta as amostras com 2^(k-1) <= ns < 2^k.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, ns: int):
+        """Registra uma amostra de latência."""
+        bucket = ns.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def to_dict(self) -> dict:
+        """Retorna o histograma como dicionário serializável."""
+        return {
+            'count': self.count,
+            'total_ns': self.total_ns,
+            'mean_ns': self.total_ns / self.count if self.count else 0,
+            'max_ns': self.max_ns,
+            # Chave = limite superior do balde em ns
+            'buckets': {1 << k: n for k, n in sorted(self.buckets.items())},
+        }
+
+
+class SimulatorProfile:
+    """
+    Coletor de métricas de desempenho de um Simulator.
+
+    Atributos:
+        phases (Dict[str, List[int]]): fase -> [chamadas, tempo total em ns]
+        decisions (Dict[str, LatencyHistogram]): política -> latência de select_next_task
+        counters (Dict[str, int]): contadores de eventos da simulação
+        queue_samples (Dict[str, List[int]]): fila -> [amostras, soma, máximo]
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, List[int]] = {name: [0, 0] for name in PHASES}
+        self.phases['select_next_task'] = [0, 0]
+        self.decisions: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTED_EVENTS.values()}
+        self.queue_samples: Dict[str, List[int]] = {name: [0, 0, 0] for name in SAMPLED_QUEUES}
+
+        self._simulator = None
+        self._scheduler = None
+        self._installed: List[str] = []
+
+    # ------------------------------------------------------------------
+    # Instalação
+    # ------------------------------------------------------------------
+
+    @property
+    def installed(self) -> bool:
+        """Indica se os wrappers estão instalados em algum simulador."""
+        return self._simulator is not None
+
+    def install(self, simulator):
+        """
+        Instala os wrappers de medição no simulador e no seu escalonador.
+
+        Args:
+            simulator: Instância de Simulator a ser instrumentada
+        """
+        self._simulator = simulator
+        for phase, method_name in PHASES.items():
+            original = getattr(simulator, method_name)
+            setattr(simulator, method_name, self._timed(phase, original))
+            self._installed.append(method_name)
+
+        self._scheduler = simulator.scheduler
+        policy = type(self._scheduler).__name__
+        histogram = self.decisions.setdefault(policy, LatencyHistogram())
+        self._scheduler.select_next_task = self._timed_decision(
+            self._scheduler.select_next_task, histogram)
+
+        simulator.add_listener(self._on_event)
+
+    def uninstall(self):
+        """Remove os wrappers, restaurando os métodos originais."""
+        sim = self._simulator
+        if sim is None:
+            return
+        for method_name in self._installed:
+            sim.__dict__.pop(method_name, None)
+        self._installed = []
+        self._scheduler.__dict__.pop('select_next_task', None)
+        sim.remove_listener(self._on_event)
+        self._simulator = None
+        self._scheduler = None
+
+    def _timed(self, phase: str, func: Callable) -> Callable:
+        """Envolve uma fase acumulando chamadas e tempo de parede."""
+        slot = self.phases[phase]
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                slot[0] += 1
+                slot[1] += clock() - start
+        return wrapper
+
+    def _timed_decision(self, func: Callable, histogram: LatencyHistogram) -> Callable:
+        """Envolve select_next_task registrando a latência de cada decisão."""
+        slot = self.phases['select_next_task']
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            result = func(*args, **kwargs)
+            elapsed = clock() - start
+            slot[0] += 1
+            slot[1] += elapsed
+            histogram.add(elapsed)
+            return result
+        return wrapper
+
+    def _on_event(self, event: str, time_: int, info: dict):
+        """Conta eventos e amostra filas ao fim de cada passo."""
+        counter = COUNTED_EVENTS.get(event)
+        if counter is not None:
+            self.counters[counter] += 1
+        elif event == 'step':
+            sim = self._simulator
+            for name in SAMPLED_QUEUES:
+                length = len(getattr(sim, name))
+                sample = self.queue_samples[name]
+                sample[0] += 1
+                sample[1] += length
+                if length > sample[2]:
+                    sample[2] = length
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        """
+        Retorna todas as métricas coletadas.
+
+        Returns:
+            Dicionário com 'phases', 'decisions', 'counters' e 'queues'
+        """
+        return {
+            'phases': {
+                name: {'calls': calls, 'total_ns': total,
+                       'mean_ns': total / calls if calls else 0}
+                for name, (calls, total) in self.phases.items()
+            },
+            'decisions': {policy: hist.to_dict() for policy, hist in self.decisions.items()},
+            'counters': dict(self.counters),
+            'queues': {
+                name: {'samples': n, 'mean': total / n if n else 0, 'max': peak}
+                for name, (n, total, peak) in self.queue_samples.items()
+            },
+        }
+
+    def report(self) -> str:
+        """
+        Monta um relatório em texto das métricas coletadas.
+
+        Returns:
+            Relatório formatado para exibição no terminal
+        """
+        data = self.to_dict()
+        step_total = data['phases']['step']['total_ns'] or 1
+        lines = ["Perfil da simulação", "=" * 60,
+                 f"{'Fase':<18}{'Chamadas':>10}{'Total (ms)':>13}{'Média (µs)':>12}{'%':>7}"]
+        for name, phase in sorted(data['phases'].items(), key=lambda kv: -kv[1]['total_ns']):
+            lines.append(f"{name:<18}{phase['calls']:>10}{phase['total_ns'] / 1e6:>13.3f}"
+                         f"{phase['mean_ns'] / 1e3:>12.3f}{100 * phase['total_ns'] / step_total:>7.1f}")
+
+        lines += ["", "Latência das decisões (select_next_task)"]
+        for policy, hist in data['decisions'].items():
+            lines.append(f"  {policy}: {hist['count']} decisões, média {hist['mean_ns'] / 1e3:.3f} µs, "
+                         f"máx {hist['max_ns'] / 1e3:.3f} µs")
+            for upper, n in hist['buckets'].items():
+                lines.append(f"    < {upper:>10} ns: {n}")
+
+        lines += ["", "Contadores"]
+        for name, value in data['counters'].items():
+            lines.append(f"  {name:<20}{value:>10}")
+
+        lines += ["", "Filas (amostradas por passo)"]
+        for name, q in data['queues'].items():
+            lines.append(f"  {name:<20} média {q['mean']:.2f}, máx {q['max']}")
+        return "\n".join(lines)
@@ -0,0 +1,199 @@
+"""
+Keyframes para navegar no tempo da simulação (barra de rolagem do tempo).
+
+KeyframeIndex escuta o evento 'step' do simulador e guarda, a cada
+`interval` ticks, um estado completo (Simulator.capture_state()). Também
+guarda o trace completo já conhecido (a simulação é determinística, então
+gantt_data em qualquer tempo é um prefixo desse trace).
+
+seek(alvo):
+    - para trás (ou para frente, quando há keyframe mais perto do alvo do
+      que o tempo atual): restaura o último keyframe <= alvo e reexecuta só
+      a diferença;
+    - para frente: executa os passos sem histórico e sem redesenhar.
+
+O custo de um seek fica limitado a um intervalo de keyframes. O intervalo
+se adapta ao custo medido dos passos (alvo KEYFRAME_SECONDS); trechos
+reexecutados ganham keyframes novos se o intervalo diminuiu. A quantidade
+de keyframes é limitada a MAX_KEYFRAMES descartando um a cada dois quando
+o limite é atingido.
+
+Uso:
+    index = KeyframeIndex(simulator)   # antes do primeiro passo
+    ...
+    index.seek(1500)
+    desenha(simulator)   # gantt_data volta a ser o prefixo do trace até o tick 1500
+"""
+
+import time
+from bisect import bisect_right
+
+DEFAULT_INTERVAL = 64      # Ticks entre keyframes antes da primeira medição
+MIN_INTERVAL = 8
+MAX_INTERVAL = 1 << 16
+MAX_KEYFRAMES = 1024
+KEYFRAME_SECONDS = 0.03    # Custo alvo para reexecutar um intervalo
+MANUAL_STEP_SECONDS = 0.1  # Acima disso por passo, a medição inclui espera do usuário
+
+
+class KeyframeIndex:
+    """Guarda estados periódicos de um Simulator e posiciona a simulação em qualquer tick."""
+
+    def __init__(self, simulator, interval: int = DEFAULT_INTERVAL,
+                 max_keyframes: int = MAX_KEYFRAMES, adaptive: bool = True):
+        self.simulator = simulator
+        self.interval = interval
+        self.max_keyframes = max_keyframes
+        self.adaptive = adaptive
+        self.trace = list(simulator.gantt_data)  # Trace completo conhecido
+        self.frontier = simulator.time           # Maior tempo já simulado
+        self.replayed = 0                        # Passos reexecutados no último seek
+        self._times = [simulator.time]
+        self._states = [simulator.capture_state()]
+        self._window_steps = 0
+        self._window_started = time.perf_counter()
+        simulator.add_listener(self._on_event)
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def times(self):
+        """Tempos dos keyframes guardados (crescentes)."""
+        return list(self._times)
+
+    def seek(self, target: int) -> int:
+        """
+        Posiciona a simulação no tick `target`.
+
+        Para antes se a simulação terminar ou entrar em deadlock. O
+        histórico de desfazer do simulador é limpo.
+
+        Returns:
+            Tempo alcançado
+        """
+        simulator = self.simulator
+        target = max(int(target), self._times[0])
+        if target != simulator.time:
+            index = bisect_right(self._times, target) - 1
+            if not (self._times[index] <= simulator.time <= target):
+                self._restore(index)
+            self._replay(target)
+            simulator.history.clear()
+        return simulator.time
+
+    def fork(self, simulator, time: int, changed_ids=()) -> "KeyframeIndex":
+        """
+        Índice para outro Simulator que se comporta igual a este até `time`.
+
+        Usado depois de editar tarefas: o novo simulador (recém-criado, no
+        tempo inicial) reaproveita os keyframes <= time e o trace até o
+        último deles, e é posicionado nesse keyframe. Nos estados
+        reaproveitados (mais o estado atual deste simulador, se ainda
+        estiver antes de `time`), as tarefas de `changed_ids`, as tarefas
+        novas e os mutexes novos ficam como no estado inicial do novo
+        simulador; tarefas e mutexes que deixaram de existir são descartados.
+
+        Returns:
+            KeyframeIndex do novo simulador
+        """
+        fork = KeyframeIndex(simulator, self.interval, self.max_keyframes, self.adaptive)
+        initial = fork._states[0]
+        count = bisect_right(self._times, time)
+        if count == 0 or self._times[0] != initial['time']:
+            return fork
+        changed = set(changed_ids)
+        times, states = self._times[:count], self._states[:count]
+        if times[-1] < self.simulator.time <= time:
+            # O estado atual do simulador antigo também serve (evita reexecutar)
+            times.append(self.simulator.time)
+            states.append(self.simulator.capture_state())
+        fork._times = times
+        fork._states = [_patch_state(state, initial, changed) for state in states]
+        fork.trace = self.trace[:fork._states[-1]['gantt_count']]
+        fork.frontier = fork._times[-1]
+        fork._restore(len(times) - 1)
+        simulator.history.clear()
+        return fork
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _on_event(self, event, sim_time, info):
+        if event != 'step':
+            return
+        simulator = self.simulator
+        if sim_time > self.frontier:
+            self.trace.extend(simulator.gantt_data[len(self.trace):])
+            self.frontier = sim_time
+        self._window_steps += 1
+        # Também insere keyframes em trechos reexecutados quando o intervalo
+        # diminuiu desde que foram simulados pela primeira vez
+        times = self._times
+        index = bisect_right(times, sim_time)
+        if sim_time - times[index - 1] < self.interval:
+            return
+        if index < len(times) and times[index] - sim_time < self.interval:
+            return
+        self._adapt_from_window()
+        times.insert(index, sim_time)
+        self._states.insert(index, simulator.capture_state())
+        if len(times) > self.max_keyframes:
+            self._thin()
+
+    def _adapt_from_window(self):
+        """Ajusta o intervalo pelo custo médio dos passos desde o último keyframe."""
+        now = time.perf_counter()
+        steps, self._window_steps = self._window_steps, 0
+        elapsed, self._window_started = now - self._window_started, now
+        per_step = elapsed / steps if steps else 0.0
+        # Passos manuais (ou o play lento) incluem a espera do usuário: ignorados
+        if self.adaptive and 0 < per_step < MANUAL_STEP_SECONDS:
+            self._fit_interval(per_step)
+
+    def _fit_interval(self, per_step: float):
+        fits = int(KEYFRAME_SECONDS / per_step) if per_step > 0 else MAX_INTERVAL
+        self.interval = max(MIN_INTERVAL, min(fits, MAX_INTERVAL))
+
+    def _thin(self):
+        """Descarta um keyframe a cada dois e dobra o intervalo."""
+        self._times = self._times[::2]
+        self._states = self._states[::2]
+        self.interval = min(self.interval * 2, MAX_INTERVAL)
+
+    def _restore(self, index: int):
+        state = self._states[index]
+        gantt_data = self.simulator.gantt_data
+        if len(gantt_data) < state['gantt_count']:
+            gantt_data.extend(self.trace[len(gantt_data):state['gantt_count']])
+        self.simulator.restore_state(state)
+
+    def _replay(self, target: int):
+        """Executa passos sem histórico até target (ou fim/deadlock)."""
+        simulator = self.simulator
+        saved_history = simulator.max_history
+        simulator.max_history = 0
+        steps = 0
+        started = time.perf_counter()
+        try:
+            while simulator.time < target and not simulator.is_finished():
+                simulator.step()
+                steps += 1
+                if simulator.is_deadlocked():
+                    break
+        finally:
+            simulator.max_history = saved_history
+        self.replayed = steps
+        if self.adaptive and steps >= MIN_INTERVAL:
+            self._fit_interval((time.perf_counter() - started) / steps)
+
+
+def _patch_state(state: dict, initial: dict, changed: set) -> dict:
+    """Cópia de um estado capturado com as tarefas/mutexes alterados no estado inicial do novo simulador."""
+    tasks_state = {tid: initial['tasks_state'][tid] if tid in changed else entry
+                   for tid, entry in state['tasks_state'].items() if tid in initial['tasks_state']}
+    for tid, entry in initial['tasks_state'].items():
+        tasks_state.setdefault(tid, entry)
+    mutexes = {mid: state['mutexes'].get(mid, entry) for mid, entry in initial['mutexes'].items()}
+    return dict(state, tasks_state=tasks_state, mutexes=mutexes)
@@ -0,0 +1,92 @@
+"""
+Estatísticas ao vivo da simulação.
+
+SimulationCounters guarda contadores que o Simulator atualiza em O(1) nos
+pontos onde os eventos acontecem (troca de contexto, preempção, quantum
+esgotado, contenção de mutex, tick ocioso, término de tarefa). O painel
+da interface monta o resumo (live_summary) só a partir desses contadores
+e do tamanho das filas, sem percorrer as tarefas nem o Gantt.
+
+Os contadores fazem parte do estado salvo (capture_state/restore_state),
+então voltar um passo ou navegar no tempo também os volta.
+"""
+
+COUNTER_FIELDS = (
+    'idle_ticks',         # Ticks com a CPU ociosa
+    'context_switches',   # Tarefas colocadas em execução
+    'preemptions',        # Tarefas tiradas da CPU pelo escalonador (evento 'preempt')
+    'quantum_expiries',   # Quantum esgotado (não conta como preempção)
+    'mutex_contentions',  # Tentativas de lock em mutex ocupado
+    'mutex_wait_ticks',   # Soma, por tick, das tarefas bloqueadas em mutex
+    'completed',          # Tarefas concluídas
+    'sum_turnaround',
+    'sum_waiting',
+    'sum_response',
+)
+
+
+class SimulationCounters:
+    """Contadores incrementais da simulação."""
+
+    __slots__ = COUNTER_FIELDS
+
+    def __init__(self):
+        for name in COUNTER_FIELDS:
+            setattr(self, name, 0)
+
+    def snapshot(self) -> tuple:
+        return tuple(getattr(self, name) for name in COUNTER_FIELDS)
+
+    def restore(self, values: tuple):
+        for name, value in zip(COUNTER_FIELDS, values):
+            setattr(self, name, value)
+
+    def task_finished(self, task):
+        """Acumula os tempos de uma tarefa que acabou de terminar (mesmas definições de get_statistics)."""
+        turnaround = task.fim - task.inicio
+        self.completed += 1
+        self.sum_turnaround += turnaround
+        self.sum_waiting += turnaround - task.duracao
+        self.sum_response += task.inicioExec - task.inicio if task.ativacoes > 0 else 0
+
+
+def live_summary(simulator) -> dict:
+    """
+    Resumo da simulação até o tick atual, em O(1).
+
+    Returns:
+        Dicionário com tempo, tarefas concluídas, médias das concluídas,
+        tamanho das filas, utilização da CPU e os contadores
+    """
+    counters = simulator.counters
+    completed = counters.completed
+    elapsed = simulator.time
+    summary = {name: getattr(counters, name) for name in COUNTER_FIELDS}
+    summary.update({
+        'time': elapsed,
+        'total_tasks': simulator.task_count,
+        'avg_turnaround': counters.sum_turnaround / completed if completed else 0.0,
+        'avg_waiting': counters.sum_waiting / completed if completed else 0.0,
+        'avg_response': counters.sum_response / completed if completed else 0.0,
+        'ready': len(simulator.ready_queue),
+        'blocked_io': len(simulator.blocked_io_queue),
+        'blocked_mutex': len(simulator.blocked_mutex_queue),
+        'cpu_utilization': (elapsed - counters.idle_ticks) / elapsed if elapsed else 0.0,
+    })
+    return summary
+
+
+def format_live_summary(summary: dict) -> str:
+    """Texto do painel de estatísticas ao vivo."""
+    return "\n".join([
+        f"Tempo: {summary['time']}",
+        f"Concluídas: {summary['completed']}/{summary['total_tasks']}",
+        f"Turnaround médio: {summary['avg_turnaround']:.2f}",
+        f"Espera média: {summary['avg_waiting']:.2f}",
+        f"Resposta média: {summary['avg_response']:.2f}",
+        f"Filas — prontos: {summary['ready']}  I/O: {summary['blocked_io']}  mutex: {summary['blocked_mutex']}",
+        f"CPU: {100 * summary['cpu_utilization']:.1f}% (ociosa {summary['idle_ticks']} ticks)",
+        f"Trocas de contexto: {summary['context_switches']}",
+        f"Preempções: {summary['preemptions']}  Quantum esgotado: {summary['quantum_expiries']}",
+        f"Contenção de mutex: {summary['mutex_contentions']} (espera {summary['mutex_wait_ticks']} ticks)",
+    ])
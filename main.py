@@ -1,15 +1,30 @@
 import tkinter as tk
 from tkinter import (
     filedialog, Canvas, Label, Frame, 
-    Toplevel, Entry, Button, Text, messagebox
+    Toplevel, Entry, Button, Text, messagebox, simpledialog, ttk
 )
+import contextlib
 
-from config_loader import load_simulation_config
-from scheduler import FIFOScheduler, SRTFScheduler, PriorityScheduler, RoundRobinScheduler, PRIOPEnvScheduler, PRIOPEnvTickScheduler
+from breakpoints import BreakpointSet, Breakpoint, EVENTS, at_time, ready_longer_than
+from gantt_index import TraceIndex, MutexHistory
+from gantt_tiles import GanttZoomView
+from incremental import resimulate
+from keyframes import KeyframeIndex
+from live_stats import live_summary, format_live_summary
+from scheduler import SCHEDULER_FACTORY
 from simulador import Simulator
+from sim_worker import SimulationWorker, estimate_horizon
+from task_table import VirtualTaskTable, COLUMNS, COLUMN_IDS, TABLE_ROWS
+from playback import PlaybackController, PLAY_SPEEDS, DEFAULT_SPEED
+from png_render import save_png
+from saved_run import DEFAULT_WINDOW, RunWindow, SavedRun, save_run
+from svg_export import export_svg
+from workload_cache import load_cached_config
+from workload_gen import WorkloadSpec, validate_spec, write_text
 import random
 import os
 import sys
+import time
 
 # Configurar PATH do Ghostscript embutido (para executável PyInstaller)
 def setup_ghostscript_path():
@@ -40,17 +55,10 @@ def setup_ghostscript_path():
 # Configura o Ghostscript ao iniciar
 setup_ghostscript_path()
 
-# Mapeamento de nomes de algoritmos para classes de escalonadores
-SCHEDULER_FACTORY = {
-    "FIFO": FIFOScheduler,
-    "FCFS": FIFOScheduler,
-    "SRTF": SRTFScheduler,
-    "PRIO": PriorityScheduler,
-    "PRIOP": PriorityScheduler,
-    "RR": RoundRobinScheduler,
-    "PRIOPENV": PRIOPEnvScheduler,  # Prioridade com envelhecimento (chegada/término)
-    "PRIOPENV-T": PRIOPEnvTickScheduler,  # Prioridade com envelhecimento por tick
-}
+RUN_ALL_MAX_ITERATIONS = 1_000_000  # Limite de passos do "Executar Tudo" (em segundo plano)
+WORKER_POLL_MS = 100                # Intervalo de atualização da tela durante a execução
+MAX_MUTEXES_SHOWN = 6               # Mutexes listados na barra de status
+
 
 class App(tk.Tk):
     """
@@ -66,15 +74,19 @@ class App(tk.Tk):
         self.simulator = None
         self.loaded_tasks = []
         self.original_tasks_data = []  # NOVO: Guarda os dados ORIGINAIS das tarefas (não modificados)
+        self._edited_task_ids = set()  # Tarefas alteradas no editor desde os dados originais
         self.current_algo = None
         self.current_quantum = None
         self.current_alpha = None
         self.current_filepath = None  # NOVO: Guarda o caminho do arquivo carregado
+        self.saved_run: SavedRun | None = None  # Execução salva aberta (sem simulador)
+        self.run_window: RunWindow | None = None
 
         # --- Janelas popup (para evitar múltiplas instâncias) ---
         self.create_window: Toplevel | None = None
         self.task_window: Toplevel | None = None
         self.edit_window: Toplevel | None = None
+        self.breakpoint_window: Toplevel | None = None
         
         # --- Layout da UI ---
         # Frame para os controles (primeira linha)
@@ -96,6 +108,18 @@ class App(tk.Tk):
         
         self.btn_run = tk.Button(control_frame, text="⏩ Executar Tudo", command=self.run_all, state=tk.DISABLED)
         self.btn_run.pack(side=tk.LEFT, padx=5)
+
+        # Modo play: animação contínua na velocidade escolhida (ticks/s)
+        self.playback = PlaybackController()
+        self._play_job = None
+        self.btn_play = tk.Button(control_frame, text="⏯ Play", command=self.toggle_play, state=tk.DISABLED)
+        self.btn_play.pack(side=tk.LEFT, padx=5)
+        self.cmb_speed = ttk.Combobox(control_frame, values=PLAY_SPEEDS, width=6, state="readonly")
+        self.cmb_speed.set(DEFAULT_SPEED)
+        self.cmb_speed.bind("<<ComboboxSelected>>", lambda e: self.playback.set_speed(float(self.cmb_speed.get())))
+        self.cmb_speed.pack(side=tk.LEFT)
+        self.lbl_play_rate = Label(control_frame, text="ticks/s", width=14, anchor=tk.W)
+        self.lbl_play_rate.pack(side=tk.LEFT, padx=(2, 5))
         
         self.btn_reset = tk.Button(control_frame, text="🔄 Reiniciar", command=self.reset_simulation, state=tk.DISABLED)
         self.btn_reset.pack(side=tk.LEFT, padx=5)
@@ -122,6 +146,24 @@ class App(tk.Tk):
         self.btn_export_svg = tk.Button(control_frame2, text="🖼️ Salvar SVG", command=self.export_gantt_svg, state=tk.DISABLED)
         self.btn_export_svg.pack(side=tk.LEFT, padx=5)
 
+        # Execuções salvas: trace e estatísticas, reabertos sem simular
+        self.btn_save_run = tk.Button(control_frame2, text="📼 Salvar Execução", command=self.save_current_run)
+        self.btn_save_run.pack(side=tk.LEFT, padx=5)
+        self.btn_open_run = tk.Button(control_frame2, text="📼 Abrir Execução", command=self.open_saved_run)
+        self.btn_open_run.pack(side=tk.LEFT, padx=5)
+
+        # Breakpoints: condições que param o "Continuar" (e o play)
+        self.btn_breakpoints = tk.Button(control_frame2, text="🔴 Breakpoints", command=self.open_breakpoints_window)
+        self.btn_breakpoints.pack(side=tk.LEFT, padx=5)
+
+        # Zoom do Gantt
+        self.btn_zoom_out = tk.Button(control_frame2, text="🔍−", command=lambda: self.zoom_gantt(+1))
+        self.btn_zoom_out.pack(side=tk.LEFT, padx=(15, 2))
+        self.lbl_zoom = Label(control_frame2, text="Zoom: 100%", width=12)
+        self.lbl_zoom.pack(side=tk.LEFT)
+        self.btn_zoom_in = tk.Button(control_frame2, text="🔍+", command=lambda: self.zoom_gantt(-1))
+        self.btn_zoom_in.pack(side=tk.LEFT, padx=2)
+
         
         # Frame para exibir o status
         status_frame = Frame(self, pady=5)
@@ -132,28 +174,56 @@ class App(tk.Tk):
         self.lbl_current_task.pack(side=tk.LEFT, padx=10)
         self.lbl_ready_queue = Label(status_frame, text="Fila de Prontos: []")
         self.lbl_ready_queue.pack(side=tk.LEFT, padx=10)
+        self.lbl_mutexes = Label(status_frame, text="Mutexes: -")
+        self.lbl_mutexes.pack(side=tk.LEFT, padx=10)
 
         self.lbl_algo_name = Label(status_frame, text="Algoritmo: N/A")
         self.lbl_algo_name.pack(side=tk.LEFT, padx=10)
 
+        # Progresso da execução em segundo plano (visível só durante "Executar Tudo")
+        self.worker: SimulationWorker | None = None
+        self.run_frame = Frame(status_frame)
+        self.progress_bar = ttk.Progressbar(self.run_frame, length=160, maximum=100)
+        self.progress_bar.pack(side=tk.LEFT, padx=5)
+        self.lbl_progress = Label(self.run_frame, text="", width=28, anchor=tk.W)
+        self.lbl_progress.pack(side=tk.LEFT)
+        self.btn_cancel = tk.Button(self.run_frame, text="⏹ Cancelar", command=self.cancel_run)
+        self.btn_cancel.pack(side=tk.LEFT, padx=5)
+
+        # Tabela de tarefas (esquerda) e painel de estatísticas ao vivo (direita)
+        middle_frame = Frame(self)
+        middle_frame.pack(fill=tk.BOTH, expand=False, padx=10)
+
+        stats_frame = tk.LabelFrame(middle_frame, text="Estatísticas ao vivo", padx=8, pady=4)
+        stats_frame.pack(side=tk.RIGHT, fill=tk.Y, pady=5)
+        self.lbl_live_stats = Label(stats_frame, text="-", justify=tk.LEFT, anchor=tk.NW, font=("Courier", 9))
+        self.lbl_live_stats.pack(fill=tk.BOTH, expand=True)
+
         # Frame para a tabela de tarefas carregadas
-        table_frame = Frame(self, pady=5)
-        table_frame.pack(fill=tk.BOTH, expand=False, padx=10)
+        table_frame = Frame(middle_frame, pady=5)
+        table_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
         Label(table_frame, text="Tarefas Carregadas:", font=("Arial", 10, "bold")).pack(anchor=tk.W)
         
-        # Texto com scroll para exibir as tarefas
+        # Tabela virtualizada: só as linhas visíveis existem no Treeview
         table_text_frame = Frame(table_frame)
         table_text_frame.pack(fill=tk.BOTH, expand=False)
         
         table_scrollbar = tk.Scrollbar(table_text_frame)
         table_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.tasks_table = Text(table_text_frame, height=6, font=("Courier", 9), 
-                                yscrollcommand=table_scrollbar.set, state=tk.DISABLED, 
-                                bg="#F5F5F5")
+        self.tasks_table = ttk.Treeview(table_text_frame, columns=COLUMN_IDS, show="headings",
+                                        height=TABLE_ROWS, selectmode="none")
+        for column, title, width in COLUMNS:
+            self.tasks_table.heading(column, text=title)
+            self.tasks_table.column(column, width=width, anchor=tk.W if column == "io" else tk.CENTER)
         self.tasks_table.pack(fill=tk.BOTH, expand=True)
-        table_scrollbar.config(command=self.tasks_table.yview)
+        self.task_table = VirtualTaskTable(self.tasks_table, table_scrollbar)
+        table_scrollbar.config(command=self.task_table.yview)
+        self.tasks_table.bind("<MouseWheel>", lambda e: self.task_table.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.tasks_table.bind("<Button-4>", lambda e: self.task_table.yview("scroll", -1, "units"))
+        self.tasks_table.bind("<Button-5>", lambda e: self.task_table.yview("scroll", 1, "units"))
+        self.tasks_table.bind("<Button-1>", self._on_table_click)
 
        # ===== SCROLLABLE GANTT CONTAINER =====
         gantt_container = Frame(self)
@@ -166,12 +236,23 @@ class App(tk.Tk):
         # Scrollbar vertical
         vbar = tk.Scrollbar(gantt_container, orient=tk.VERTICAL)
         vbar.pack(side=tk.RIGHT, fill=tk.Y)
-        vbar.config(command=self.gantt_canvas.yview)
+        vbar.config(command=self._scroll_gantt_y)
+
+        # Barra do tempo: posiciona a simulação em qualquer tick (keyframes + reexecução)
+        self.keyframes: KeyframeIndex | None = None
+        self._horizon = (None, 1)  # (simulador, estimate_horizon das suas tarefas)
+        self._scrubber_to = None   # Alcance atual da barra do tempo
+        self.breakpoints: BreakpointSet | None = None
+        self._seek_target = None
+        self._seek_job = None
+        self.scale_time = tk.Scale(self, from_=0, to=1, orient=tk.HORIZONTAL, showvalue=True,
+                                   label="Tempo", command=self._on_scrub, state=tk.DISABLED)
+        self.scale_time.pack(side=tk.BOTTOM, fill=tk.X, padx=10)
 
         # Scrollbar horizontal
         hbar = tk.Scrollbar(self, orient=tk.HORIZONTAL)
         hbar.pack(side=tk.BOTTOM, fill=tk.X)
-        hbar.config(command=self.gantt_canvas.xview)
+        hbar.config(command=self._scroll_gantt_x)
 
         # Vincular scroll do canvas
         self.gantt_canvas.config(
@@ -179,6 +260,21 @@ class App(tk.Tk):
             xscrollcommand=hbar.set,
             scrollregion=(0, 0, 2000, 2000)
         )
+        self.gantt_view = GanttZoomView(self.gantt_canvas)
+        self.gantt_canvas.bind("<Configure>", lambda e: self.gantt_view.refresh())
+        # Ctrl + roda do mouse: zoom centrado no cursor (Windows/macOS e X11)
+        self.gantt_canvas.bind("<Control-MouseWheel>", lambda e: self.zoom_gantt(-1 if e.delta > 0 else +1, e.x))
+        self.gantt_canvas.bind("<Control-Button-4>", lambda e: self.zoom_gantt(-1, e.x))
+        self.gantt_canvas.bind("<Control-Button-5>", lambda e: self.zoom_gantt(+1, e.x))
+        # Inspeção: passar o mouse mostra detalhes do bloco; clicar destaca a tarefa
+        self.trace_index: TraceIndex | None = None
+        self.mutex_history: MutexHistory | None = None
+        self._highlighted = None
+        self.lbl_hover = Label(self.gantt_canvas, bg="#FFFFE0", relief=tk.SOLID, bd=1,
+                               justify=tk.LEFT, font=("Arial", 9))
+        self.gantt_canvas.bind("<Motion>", self._on_gantt_hover)
+        self.gantt_canvas.bind("<Leave>", lambda e: self.lbl_hover.place_forget())
+        self.gantt_canvas.bind("<Button-1>", self._on_gantt_click)
 
 
 
@@ -190,7 +286,7 @@ class App(tk.Tk):
             return
         
         try:
-            algo_name, quantum, alpha, tasks = load_simulation_config(filepath)
+            algo_name, quantum, alpha, tasks = load_cached_config(filepath)
             scheduler_class = SCHEDULER_FACTORY.get(algo_name)
             if not scheduler_class:
                 messagebox.showerror("Erro", f"Algoritmo '{algo_name}' não suportado.")
@@ -228,6 +324,7 @@ class App(tk.Tk):
 
             self.btn_step.config(state=tk.NORMAL)
             self.btn_run.config(state=tk.NORMAL)
+            self.btn_play.config(state=tk.NORMAL)
             self.btn_edit.config(state=tk.NORMAL)
             self.btn_reset.config(state=tk.NORMAL)
             self.btn_back.config(state=tk.DISABLED)  # NOVO: Inicia desabilitado
@@ -244,33 +341,11 @@ class App(tk.Tk):
             self.lbl_algo_name.config(text="Algoritmo: N/A")
 
     def update_tasks_table(self, tasks):
-        """Atualiza a tabela mostrando as tarefas carregadas."""
-        self.tasks_table.config(state=tk.NORMAL)
-        self.tasks_table.delete("1.0", tk.END)
-        
-        # Verifica se é PRIOPEnv ou PRIOPEnv-T para mostrar prioridade dinâmica
+        """Atualiza a tabela mostrando as tarefas carregadas (só as linhas visíveis são desenhadas)."""
+        # PRIOPEnv e PRIOPEnv-T mostram também a prioridade dinâmica
         is_priopenv = self.current_algo in ("PRIOPENV", "PRIOPENV-T")
-        
-        # Cabeçalho
-        if is_priopenv:
-            header = f"{'ID':<6} {'Cor':<8} {'Cheg':<6} {'Dur':<5} {'PrioS':<6} {'PrioD':<6} {'I/O Events':<20}\n"
-            self.tasks_table.insert(tk.END, header)
-            self.tasks_table.insert(tk.END, "=" * 70 + "\n")
-        else:
-            header = f"{'ID':<8} {'Cor':<8} {'Chegada':<9} {'Duração':<9} {'Prioridade':<11} {'I/O Events':<30}\n"
-            self.tasks_table.insert(tk.END, header)
-            self.tasks_table.insert(tk.END, "=" * 80 + "\n")
-        
-        # Dados das tarefas
-        for task in sorted(tasks, key=lambda t: t.id):
-            io_str = ", ".join([f"{t}-{d}" for t, d in task.io_events]) if task.io_events else ""
-            if is_priopenv:
-                line = f"{task.id:<6} {task.RGB[0]:02x}{task.RGB[1]:02x}{task.RGB[2]:02x}  {task.inicio:<6} {task.duracao:<5} {task.prio_s:<6} {task.prio_d:<6} {io_str:<20}\n"
-            else:
-                line = f"{task.id:<8} {task.RGB[0]:02x}{task.RGB[1]:02x}{task.RGB[2]:02x}  {task.inicio:<9} {task.duracao:<9} {task.prio_s:<11} {io_str:<30}\n"
-            self.tasks_table.insert(tk.END, line)
-        
-        self.tasks_table.config(state=tk.DISABLED)
+        self.task_table.set_tasks(tasks, show_prio_d=is_priopenv)
+        self.task_table.refresh()
 
     def do_step_back(self):
         """Volta um passo na simulação."""
@@ -282,6 +357,7 @@ class App(tk.Tk):
                 if not self.simulator.is_finished():
                     self.btn_step.config(state=tk.NORMAL)
                     self.btn_run.config(state=tk.NORMAL)
+                    self.btn_play.config(state=tk.NORMAL)
                     self.btn_stats.config(state=tk.DISABLED)
                     self.btn_export_gantt.config(state=tk.DISABLED)
                     self.btn_export_svg.config(state=tk.DISABLED)
@@ -303,27 +379,92 @@ class App(tk.Tk):
             self.simulator.step()
             self.update_ui()
             self._update_back_button()  # NOVO: Atualiza botão voltar
-            
-            # Verifica se há deadlock
-            deadlock_info = self.simulator.get_deadlock_info()
-            if deadlock_info:
-                self._show_deadlock_notification(deadlock_info)
-                return
-            
-            # Verifica se a simulação terminou
-            if self.simulator.is_finished():
-                self.btn_step.config(state=tk.DISABLED)
-                self.btn_run.config(state=tk.DISABLED)
-                self.btn_stats.config(state=tk.NORMAL)
-                self.btn_export_gantt.config(state=tk.NORMAL)
-                self.btn_export_svg.config(state=tk.NORMAL)  # ADICIONADO
-                messagebox.showinfo("Simulação Completa", "A simulação foi concluída!")
-                self.show_statistics()
+            self._check_run_end()
+
+    def _check_run_end(self) -> bool:
+        """Trata deadlock ou fim da simulação após passos; retorna True se a execução acabou."""
+        # Verifica se há deadlock
+        deadlock_info = self.simulator.get_deadlock_info()
+        if deadlock_info:
+            self._show_deadlock_notification(deadlock_info)
+            return True
+        
+        # Verifica se a simulação terminou
+        if self.simulator.is_finished():
+            self.btn_step.config(state=tk.DISABLED)
+            self.btn_run.config(state=tk.DISABLED)
+            self.btn_play.config(state=tk.DISABLED)
+            self.btn_stats.config(state=tk.NORMAL)
+            self.btn_export_gantt.config(state=tk.NORMAL)
+            self.btn_export_svg.config(state=tk.NORMAL)  # ADICIONADO
+            messagebox.showinfo("Simulação Completa", "A simulação foi concluída!")
+            self.show_statistics()
+            return True
+        return False
+
+    def toggle_play(self):
+        """Inicia ou pausa a animação contínua."""
+        if self.playback.playing:
+            self.pause_play()
+            return
+        if not self.simulator or self.worker:
+            return
+        self.playback.set_speed(float(self.cmb_speed.get()))
+        self.playback.start()
+        self._lock_controls(True)
+        self.btn_play.config(state=tk.NORMAL, text="⏸ Pausar")
+        self._play_job = self.after(self.playback.frame_ms, self._play_frame)
+
+    def pause_play(self):
+        """Pausa a animação e devolve os comandos."""
+        if self._play_job is not None:
+            self.after_cancel(self._play_job)
+            self._play_job = None
+        self.playback.pause()
+        self.btn_play.config(text="⏯ Play")
+        self.lbl_play_rate.config(text="ticks/s")
+        self._lock_controls(False)
+        self._update_back_button()
+
+    def _play_frame(self):
+        """Um quadro da animação: executa os passos devidos e redesenha uma única vez."""
+        self._play_job = None
+        if not self.playback.playing or not self.simulator:
+            return
+        start = time.perf_counter()
+        steps = 0
+        self._keyframes()
+        breakpoints = self.breakpoints
+        breakpoints.pending = []
+        for _ in range(self.playback.steps_due(start)):
+            if self.simulator.is_finished() or self.simulator.is_deadlocked():
+                break
+            self.simulator.step()
+            steps += 1
+            if breakpoints.pending:
+                break
+        stepped = time.perf_counter()
+        if steps:
+            self.update_ui()
+        rendered = time.perf_counter()
+        self.playback.record_frame(stepped - start, rendered - stepped, steps)
+        self.lbl_play_rate.config(text=f"ticks/s (real {self.playback.achieved_rate:,.0f})")
+
+        if breakpoints.pending:
+            self.pause_play()
+            self._show_breakpoint_hits(breakpoints.pending)
+            return
+        if self.simulator.is_finished() or self.simulator.is_deadlocked():
+            self.pause_play()
+            self._check_run_end()
+            return
+        self._play_job = self.after(self.playback.next_delay_ms(rendered - start), self._play_frame)
     
     def _show_deadlock_notification(self, deadlock_info: dict):
         """Mostra notificação de deadlock detectado."""
         self.btn_step.config(state=tk.DISABLED)
         self.btn_run.config(state=tk.DISABLED)
+        self.btn_play.config(state=tk.DISABLED)
         self.btn_stats.config(state=tk.NORMAL)
         self.btn_export_gantt.config(state=tk.NORMAL)
         self.btn_export_svg.config(state=tk.NORMAL)
@@ -352,6 +493,7 @@ class App(tk.Tk):
     def _save_original_tasks_data(self):
         """Salva os dados originais das tarefas para permitir reset correto."""
         self.original_tasks_data = []
+        self._edited_task_ids = set()
         for task in self.loaded_tasks:
             self.original_tasks_data.append({
                 'id': task.id,
@@ -406,6 +548,7 @@ class App(tk.Tk):
                 
                 self.btn_step.config(state=tk.NORMAL)
                 self.btn_run.config(state=tk.NORMAL)
+                self.btn_play.config(state=tk.NORMAL)
                 self.btn_back.config(state=tk.DISABLED)  # NOVO: Reset desabilita voltar
                 self.btn_stats.config(state=tk.DISABLED)
                 self.btn_export_gantt.config(state=tk.DISABLED)
@@ -590,6 +733,8 @@ class App(tk.Tk):
             if mu_text:
                 task.mu_events = [int(x.strip()) for x in mu_text.split(",") if x.strip()]
             
+            self._edited_task_ids.add(task.id)
+            
             # DEBUG
             print(f"[DEBUG] Tarefa {task.id} atualizada: dur={task.duracao}, prio={task.prio_s}")
             
@@ -769,6 +914,11 @@ class App(tk.Tk):
             for t in self.loaded_tasks:
                 print(f"        T{t.id}: inicio={t.inicio}, dur={t.duracao}, prio={t.prio_s}")
             
+            # Configuração anterior: com o mesmo escalonador a simulação é
+            # recalculada só a partir da primeira chegada afetada
+            previous_config = (self.current_algo, self.current_quantum, self.current_alpha)
+            previous_tasks_data = self.original_tasks_data
+            
             # 1. Atualiza configuração do algoritmo
             self.current_algo = self.edit_algo_var.get()
             
@@ -801,9 +951,25 @@ class App(tk.Tk):
             self.edit_window = None
             
             # 5. Recria as tarefas com os valores atualizados (cópia limpa para simulação)
+            # Tarefas não editadas vêm dos dados originais: as da simulação
+            # já tiveram eventos de I/O e mutex consumidos
             from tasks import TCB
+            originals = {data['id']: data for data in previous_tasks_data}
             fresh_tasks = []
             for task in self.loaded_tasks:
+                data = originals.get(task.id) if task.id not in self._edited_task_ids else None
+                if data is not None:
+                    fresh_tasks.append(TCB(
+                        id=data['id'],
+                        RGB=list(data['RGB']),
+                        inicio=data['inicio'],
+                        duracao=data['duracao'],
+                        prio_s=data['prio_s'],
+                        io_events=list(data['io_events']),
+                        ml_events=list(data['ml_events']),
+                        mu_events=list(data['mu_events'])
+                    ))
+                    continue
                 new_task = TCB(
                     id=task.id,
                     RGB=list(task.RGB),
@@ -840,19 +1006,29 @@ class App(tk.Tk):
                 else:
                     scheduler = scheduler_class()
                 
+                old_simulator, old_keyframes = self.simulator, self.keyframes
                 self.simulator = Simulator(scheduler, self.loaded_tasks)
                 
                 # 7. Atualiza UI
-                self.btn_step.config(state=tk.NORMAL)
-                self.btn_run.config(state=tk.NORMAL)
-                self.btn_stats.config(state=tk.DISABLED)
-                self.btn_export_gantt.config(state=tk.DISABLED)
-                self.btn_export_svg.config(state=tk.DISABLED)
-                
                 self.update_tasks_table(self.loaded_tasks)
-                self.update_ui()
+                if (previous_config == (self.current_algo, self.current_quantum, self.current_alpha)
+                        and old_keyframes is not None and old_keyframes.simulator is old_simulator
+                        and old_simulator.time > 0):
+                    result = self._resimulate(old_keyframes, previous_tasks_data, old_simulator.time)
+                    self._after_seek()
+                    msg = (f"Configuração aplicada! Simulação recalculada a partir de t={result.checkpoint} "
+                           f"({result.replayed} passos reexecutados).")
+                else:
+                    self.btn_step.config(state=tk.NORMAL)
+                    self.btn_run.config(state=tk.NORMAL)
+                    self.btn_play.config(state=tk.NORMAL)
+                    self.btn_stats.config(state=tk.DISABLED)
+                    self.btn_export_gantt.config(state=tk.DISABLED)
+                    self.btn_export_svg.config(state=tk.DISABLED)
+                    self.update_ui()
+                    msg = "Configuração aplicada e simulação reiniciada!"
+                self._update_back_button()
                 
-                msg = "Configuração aplicada e simulação reiniciada!"
                 if saved and self.current_filepath:
                     msg += f"\n\nArquivo atualizado:\n{self.current_filepath}"
                 messagebox.showinfo("Sucesso", msg)
@@ -866,107 +1042,166 @@ class App(tk.Tk):
             traceback.print_exc()
             messagebox.showerror("Erro", f"Erro ao aplicar: {e}", parent=self.edit_window)
 
-    def run_all(self):
-        """Executa a simulação completa até o fim ou deadlock."""
-        if self.simulator:
-            finished_ok = self.simulator.run_full()
+    def run_all(self, should_stop=None):
+        """Executa a simulação até o fim ou deadlock numa thread, com progresso e cancelamento."""
+        if not self.simulator or self.worker:
+            return
+        self.worker = SimulationWorker(self.simulator, max_iterations=RUN_ALL_MAX_ITERATIONS,
+                                       should_stop=should_stop)
+        self._set_running(True)
+        self.worker.start()
+        self.after(WORKER_POLL_MS, self._poll_worker)
+
+    def cancel_run(self):
+        """Pede o cancelamento da execução em segundo plano."""
+        if self.worker:
+            self.worker.cancel()
+            self.btn_cancel.config(state=tk.DISABLED)
+
+    def _sim_lock(self):
+        """Trava do simulador enquanto a thread de execução está ativa."""
+        return self.worker.lock if self.worker else contextlib.nullcontext()
+
+    def _lock_controls(self, locked: bool):
+        """Bloqueia (ou libera) os comandos que alteram o simulador."""
+        state = tk.DISABLED if locked else tk.NORMAL
+        for btn in (self.btn_load, self.btn_edit, self.btn_step, self.btn_run, self.btn_play,
+                    self.btn_reset, self.btn_random, self.btn_create, self.scale_time,
+                    self.btn_breakpoints, self.btn_save_run, self.btn_open_run):
+            btn.config(state=state)
+        if locked:
+            self.btn_back.config(state=tk.DISABLED)
+
+    def _set_running(self, running: bool):
+        """Mostra o progresso e bloqueia os comandos que alteram o simulador."""
+        self._lock_controls(running)
+        if running:
+            self.btn_cancel.config(state=tk.NORMAL)
+            self.progress_bar['value'] = 0
+            self.lbl_progress.config(text="")
+            self.run_frame.pack(side=tk.RIGHT, padx=10)
+        else:
+            self.run_frame.pack_forget()
+
+    def _poll_worker(self):
+        """Atualiza a tela com o estado da thread (chamado via after())."""
+        worker = self.worker
+        with worker.lock:
             self.update_ui()
-            self._update_back_button()  # NOVO: Atualiza botão voltar
-            
-            # Verifica se houve deadlock
-            deadlock_info = self.simulator.get_deadlock_info()
-            if deadlock_info:
-                self._show_deadlock_notification(deadlock_info)
+        progress = worker.progress()
+        self.progress_bar['value'] = 100 * progress['fraction']
+        self.lbl_progress.config(
+            text=f"t={progress['time']}/~{progress['horizon']}  {progress['ticks_per_sec']:,.0f} ticks/s")
+        if worker.done:
+            self._finish_run()
+        else:
+            self.after(WORKER_POLL_MS, self._poll_worker)
+
+    def _finish_run(self):
+        """Encerra a execução em segundo plano e mostra o resultado."""
+        worker, self.worker = self.worker, None
+        self._set_running(False)
+        self.update_ui()
+        self._update_back_button()
+
+        if worker.error is not None:
+            messagebox.showerror("Erro", f"Erro durante a simulação:\n{worker.error}")
+            return
+        if worker.cancelled:
+            messagebox.showinfo("Cancelado", f"Execução cancelada em t={self.simulator.time}.")
+            return
+        if worker.stopped:
+            self._show_breakpoint_hits(self.breakpoints.pending)
+            if not self.simulator.is_finished():
                 return
-            
-            self.btn_step.config(state=tk.DISABLED)
-            self.btn_run.config(state=tk.DISABLED)
-            self.btn_stats.config(state=tk.NORMAL)
-            self.btn_export_gantt.config(state=tk.NORMAL)
-            self.btn_export_svg.config(state=tk.NORMAL)
-            messagebox.showinfo("Simulação Completa", "A simulação foi concluída!")
-            self.show_statistics()
+
+        # Verifica se houve deadlock
+        deadlock_info = self.simulator.get_deadlock_info()
+        if deadlock_info:
+            self._show_deadlock_notification(deadlock_info)
+            return
+
+        if not worker.finished_ok:
+            messagebox.showwarning("Aviso", f"Limite de {worker.max_iterations} passos atingido.")
+            return
+
+        self.btn_step.config(state=tk.DISABLED)
+        self.btn_run.config(state=tk.DISABLED)
+        self.btn_play.config(state=tk.DISABLED)
+        self.btn_stats.config(state=tk.NORMAL)
+        self.btn_export_gantt.config(state=tk.NORMAL)
+        self.btn_export_svg.config(state=tk.NORMAL)
+        messagebox.showinfo("Simulação Completa", "A simulação foi concluída!")
+        self.show_statistics()
 
     def export_gantt_svg(self):
-        if not self.simulator:
+        if not self.simulator and not self.run_window:
             messagebox.showwarning("Aviso", "Nenhuma simulação carregada.")
             return
         filepath = filedialog.asksaveasfilename(defaultextension=".svg", filetypes=[("SVG", "*.svg")], initialfile="gantt.svg")
         if not filepath:
             return
-        self.gantt_canvas.update_idletasks()
-        bbox = self.gantt_canvas.bbox("all")
-        if not bbox:
-            messagebox.showerror("Erro", "Nada para exportar.")
-            return
-        self._save_canvas_as_svg(filepath, *bbox)
-
-    def _save_canvas_as_svg(self, filepath, x0, y0, x1, y1, silent=False):
-        import xml.etree.ElementTree as ET
-        import xml.dom.minidom as md
-        width, height = x1 - x0 + 20, y1 - y0 + 40
-        svg = ET.Element("svg", width=str(width), height=str(height), version="1.1", xmlns="http://www.w3.org/2000/svg")
-        ET.SubElement(svg, "rect", x="0", y="0", width=str(width), height=str(height), fill="white")
-        for item in self.gantt_canvas.find_all():
-            itype = self.gantt_canvas.type(item)
-            coords = self.gantt_canvas.coords(item)
-            adj = [coords[i] - (x0 if i%2==0 else y0) for i in range(len(coords))]
-            if itype == "rectangle":
-                fill = self.gantt_canvas.itemcget(item, "fill")
-                ET.SubElement(svg, "rect", x=str(adj[0]), y=str(adj[1]), width=str(adj[2]-adj[0]), height=str(adj[3]-adj[1]), fill=fill if fill else "none", stroke="black")
-            elif itype == "line":
-                ET.SubElement(svg, "line", x1=str(adj[0]), y1=str(adj[1]), x2=str(adj[2]), y2=str(adj[3]), stroke="black")
-            elif itype == "text":
-                txt = self.gantt_canvas.itemcget(item, "text")
-                el = ET.SubElement(svg, "text", x=str(adj[0]), y=str(adj[1]), fill="black")
-                el.text = txt
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(md.parseString(ET.tostring(svg)).toprettyxml())
-        if not silent:
+        if not self.simulator:
+            # Execução salva: só os blocos do trecho aberto são lidos
+            window = self.run_window
+            try:
+                export_svg(self.saved_run.intervals(window.t0, window.t1), filepath, task_ids=self.saved_run.task_ids,
+                           colors=self.saved_run.colors, t0=window.t0, t1=window.t1)
+            except OSError as e:
+                messagebox.showerror("Erro", f"Não foi possível salvar o SVG: {e}")
+                return
             messagebox.showinfo("Sucesso", f"SVG salvo: {filepath}")
+            return
+        # Escrito direto do trace, sem depender do Canvas
+        self._keyframes()
+        self.trace_index.feed(self.simulator.gantt_data)
+        try:
+            export_svg(self.trace_index, filepath, task_ids=[t.id for t in self.simulator.all_tasks])
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível salvar o SVG: {e}")
+            return
+        messagebox.showinfo("Sucesso", f"SVG salvo: {filepath}")
 
     def export_gantt_ps(self):
-        if not self.simulator:
+        if not self.simulator and not self.run_window:
             messagebox.showwarning("Aviso", "Nenhuma simulação carregada.")
             return
         filepath = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG", "*.png")], initialfile="gantt.png")
         if not filepath:
             return
-        try:
-            from PIL import Image, ImageDraw, ImageFont
-            bbox = self.gantt_canvas.bbox("all")
-            if not bbox:
-                return
-            w, h = bbox[2]-bbox[0]+20, bbox[3]-bbox[1]+20
-            img = Image.new('RGB', (w, h), 'white')
-            draw = ImageDraw.Draw(img)
+        if not self.simulator:
+            # Execução salva: o trecho aberto, deslocado para o início da imagem
+            window = self.run_window
+            shifted = {tid: [(start - window.t0, end - window.t0, state) for start, end, state in spans]
+                       for tid, spans in self.saved_run.intervals(window.t0, window.t1).items()}
             try:
-                font = ImageFont.truetype("arial.ttf", 12)
-            except:
-                font = ImageFont.load_default()
-            
-            task_ids = sorted([t.id for t in self.simulator.all_tasks], reverse=True)
-            task_y = {tid: i*40+30 for i, tid in enumerate(task_ids)}
-            for tid, y in task_y.items():
-                draw.text((10, y-6), f"T{tid}", fill='black', font=font)
-            
-            for entry in (self.simulator.gantt_data or []):
-                time, tid, rgb, state = entry if len(entry)==4 else (*entry, "EXEC")
-                if tid != "IDLE" and tid in task_y:
-                    y = task_y[tid]
-                    x = 50 + time * 20
-                    fill = {"EXEC": tuple(rgb), "IO": (191,191,191), "READY": (255,255,255), "MUTEX": (153,50,204)}.get(state, tuple(rgb))
-                    draw.rectangle([x, y-15, x+20, y+15], fill=fill, outline=(0,0,0))
-            img.save(filepath, 'PNG')
-            messagebox.showinfo("Sucesso", f"PNG salvo: {filepath}")
-        except ImportError:
-            messagebox.showerror("Erro", "Instale Pillow: pip install pillow")
+                width, height = save_png(shifted, filepath, task_ids=self.saved_run.task_ids,
+                                         colors=self.saved_run.colors)
+            except OSError as e:
+                messagebox.showerror("Erro", f"Não foi possível salvar o PNG: {e}")
+                return
+            messagebox.showinfo("Sucesso", f"PNG salvo: {filepath} ({width}x{height})")
+            return
+        # Renderizado direto do trace, sem depender do Canvas nem do Pillow
+        self._keyframes()
+        self.trace_index.feed(self.simulator.gantt_data)
+        try:
+            width, height = save_png(self.trace_index, filepath, task_ids=[t.id for t in self.simulator.all_tasks])
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível salvar o PNG: {e}")
+            return
+        messagebox.showinfo("Sucesso", f"PNG salvo: {filepath} ({width}x{height})")
 
     def show_statistics(self):
+        if not self.simulator and self.saved_run and self.saved_run.statistics is not None:
+            self._show_statistics_window(self.saved_run.statistics)
+            return
         if not self.simulator or not self.simulator.is_finished():
             messagebox.showwarning("Aviso", "Execute a simulação primeiro.")
             return
-        stats = self.simulator.get_statistics()
+        self._show_statistics_window(self.simulator.get_statistics())
+
+    def _show_statistics_window(self, stats: dict):
         win = Toplevel(self)
         win.title("📊 Estatísticas")
         win.geometry("600x400")
@@ -985,6 +1220,80 @@ class App(tk.Tk):
             txt.insert(tk.END, f"{t['id']:<6}{t['arrival']:<10}{t['completion']:<10}{t['turnaround_time']:<12}{t['waiting_time']:<10}\n")
         txt.config(state=tk.DISABLED)
 
+    def save_current_run(self):
+        """Salva o trace e as estatísticas da simulação atual (reabertos depois sem simular)."""
+        if not self.simulator or self.worker:
+            messagebox.showwarning("Aviso", "Nenhuma simulação carregada.")
+            return
+        filepath = filedialog.asksaveasfilename(defaultextension=".srun", filetypes=[("Execução salva", "*.srun")],
+                                                initialfile="execucao.srun")
+        if not filepath:
+            return
+        try:
+            chunks = save_run(filepath, self.simulator, self.current_algo, self.current_quantum, self.current_alpha)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível salvar a execução: {e}")
+            return
+        messagebox.showinfo("Sucesso", f"Execução salva: {filepath} ({chunks} blocos, t={self.simulator.time})")
+
+    def open_saved_run(self):
+        """Abre uma execução salva e mostra um trecho do Gantt (só os blocos do trecho são lidos)."""
+        if self.worker:
+            return
+        filepath = filedialog.askopenfilename(filetypes=[("Execução salva", "*.srun")])
+        if not filepath:
+            return
+        try:
+            run = SavedRun(filepath)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Erro", f"Erro ao abrir a execução:\n{e}")
+            return
+        end = run.end
+        text = simpledialog.askstring("Trecho", f"Janela de tempo (INICIO:FIM, até {end}):",
+                                      initialvalue=f"0:{min(end, DEFAULT_WINDOW)}", parent=self)
+        if text is None:
+            run.close()
+            return
+        start, _, stop = text.partition(":")
+        try:
+            t0, t1 = int(start or 0), int(stop) if stop else end
+        except ValueError:
+            run.close()
+            messagebox.showerror("Erro", f"Janela inválida: {text}")
+            return
+
+        self.pause_play()
+        if self.saved_run is not None:
+            self.saved_run.close()
+        self.saved_run = run
+        self.run_window = RunWindow(run, t0, max(t0, t1))
+        # Sem simulador: só visualização, estatísticas e exportação
+        self.simulator = None
+        self.keyframes = None
+        self._highlighted = None
+        for btn in (self.btn_step, self.btn_run, self.btn_play, self.btn_back, self.btn_edit, self.btn_reset):
+            btn.config(state=tk.DISABLED)
+        self.scale_time.config(state=tk.DISABLED)
+        for btn in (self.btn_export_gantt, self.btn_export_svg):
+            btn.config(state=tk.NORMAL)
+        self.btn_stats.config(state=tk.NORMAL if run.statistics is not None else tk.DISABLED)
+        self.task_table.set_tasks([])
+        self.task_table.refresh()
+
+        algo_info = f"Algoritmo: {run.algorithm}"
+        if run.quantum:
+            algo_info += f" (Q={run.quantum})"
+        if run.alpha:
+            algo_info += f" (α={run.alpha})"
+        self.lbl_algo_name.config(text=algo_info + " [salva]")
+        self.lbl_time.config(text=f"Tempo: {self.run_window.t0}–{self.run_window.t1} de {run.final_time}")
+        self.lbl_current_task.config(text="Executando: -")
+        self.lbl_ready_queue.config(text="Fila de Prontos: -")
+        self.lbl_mutexes.config(text="Mutexes: -")
+        self.gantt_view.set_highlight(None)
+        self.gantt_view.sync(self.run_window, self.run_window.gantt_data)
+        self._update_zoom_label()
+
     def open_create_txt_window(self):
         if self.create_window and self.create_window.winfo_exists():
             self.create_window.lift()
@@ -1074,17 +1383,22 @@ class App(tk.Tk):
             dmin, dmax = int(entries["Dur Min:"].get()), int(entries["Dur Max:"].get())
             amax = int(entries["Chegada Max:"].get())
             
-            content = f"{algo};{q}\n#id;cor;chegada;duracao;prioridade\n"
-            for i in range(n):
-                cor = f"{random.randint(0,255):02x}{random.randint(0,255):02x}{random.randint(0,255):02x}"
-                content += f"t{i+1:02d};{cor};{random.randint(0,amax)};{random.randint(dmin,dmax)};{random.randint(1,10)}\n"
+            # Chegadas de Poisson espalhadas em média até amax (e limitadas a amax), durações uniformes
+            spec = WorkloadSpec(n_tasks=n, rate=n / max(amax, 1), service="uniform", min_service=dmin, max_service=dmax,
+                                max_arrival=amax)
+            try:
+                validate_spec(spec)
+                quantum = int(q) if q.strip() else None
+            except ValueError as e:
+                messagebox.showerror("Erro", str(e))
+                return
             
             fp = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text", "*.txt")], initialfile=f"teste_{n}tasks.txt")
             if fp:
-                with open(fp, "w") as f:
-                    f.write(content)
+                write_text(fp, spec, seed=random.randrange(2 ** 31), algo=algo.upper(), quantum=quantum,
+                           header="#id;cor;chegada;duracao;prioridade")
                 win.destroy()
-                algo_name, quantum, alpha, tasks = load_simulation_config(fp)
+                algo_name, quantum, alpha, tasks = load_cached_config(fp)
                 self.current_algo, self.current_quantum, self.current_alpha, self.loaded_tasks = algo_name, quantum, alpha, tasks
                 self.current_filepath = fp
                 self._save_original_tasks_data()  # NOVO: Salva dados originais
@@ -1100,6 +1414,7 @@ class App(tk.Tk):
                     self.lbl_algo_name.config(text=f"Algoritmo: {algo_name}")
                     self.btn_step.config(state=tk.NORMAL)
                     self.btn_run.config(state=tk.NORMAL)
+                    self.btn_play.config(state=tk.NORMAL)
                     self.btn_edit.config(state=tk.NORMAL)
                     self.btn_reset.config(state=tk.NORMAL)
                     self.btn_back.config(state=tk.DISABLED)
@@ -1119,86 +1434,318 @@ class App(tk.Tk):
         
         ready_ids = [t.id for t in self.simulator.ready_queue]
         self.lbl_ready_queue.config(text=f"Fila de Prontos: {ready_ids}")
+        self.lbl_mutexes.config(text=f"Mutexes: {self._format_mutexes()}")
+        self.lbl_live_stats.config(text=format_live_summary(live_summary(self.simulator)))
         
         # Atualiza tabela de tarefas (para mostrar prioridade dinâmica atualizada)
+        # Só as linhas visíveis com tarefas alteradas são reescritas
         if self.current_algo in ("PRIOPENV", "PRIOPENV-T"):
-            self.update_tasks_table(self.simulator.all_tasks)
+            if self.task_table.source is not self.simulator.all_tasks:
+                self.task_table.set_tasks(self.simulator.all_tasks, show_prio_d=True)
+            self.task_table.refresh(self.simulator.take_dirty_tasks())
         
         self.draw_gantt()
 
     def draw_gantt(self):
-        self.gantt_canvas.delete("all")
-        if not self.simulator or not self.simulator.all_tasks:
+        """Sincroniza o Canvas com o Gantt (desenha só o que mudou desde o último quadro)."""
+        self._keyframes()
+        # Desenha o gantt_data atual: depois de voltar no tempo (step_back ou
+        # barra do tempo) os itens dos ticks desfeitos saem do gráfico
+        self.gantt_view.sync(self.simulator)
+        self._update_zoom_label()
+        if self._highlighted is not None:
+            # O trecho destacado acompanha a tarefa enquanto ela ainda roda
+            self.trace_index.feed(self.simulator.gantt_data)
+            self._highlight_task(self._highlighted)
+        self._update_scrubber()
+
+    def _keyframes(self) -> KeyframeIndex:
+        """Índices do simulador atual: keyframes, intervalos, mutexes e breakpoints (criados no primeiro desenho)."""
+        if self.keyframes is None or self.keyframes.simulator is not self.simulator:
+            self.keyframes = KeyframeIndex(self.simulator)
+            self.trace_index = TraceIndex()
+            self.mutex_history = MutexHistory(self.simulator)
+            self._attach_breakpoints(self.simulator)
+            self._highlighted = None
+            self.gantt_view.set_highlight(None)
+        return self.keyframes
+
+    def _attach_breakpoints(self, simulator):
+        """Os breakpoints definidos continuam valendo num simulador novo."""
+        previous = list(self.breakpoints) if self.breakpoints else ()
+        if self.breakpoints:
+            self.breakpoints.detach()
+        self.breakpoints = BreakpointSet(simulator, previous)
+
+    def _resimulate(self, old_keyframes, previous_tasks_data, target: int):
+        """
+        Leva o simulador novo (tarefas editadas) ao tempo `target` reaproveitando
+        os keyframes do antigo até a primeira chegada afetada; o Gantt e os
+        índices só descartam o que vem depois do primeiro registro diferente.
+        """
+        old_history = self.mutex_history
+
+        def attach(index):
+            self.keyframes = index
+            self.mutex_history = old_history.fork(index.simulator, index.simulator.time)
+            self._attach_breakpoints(index.simulator)
+            self.breakpoints.muted = True  # A reexecução não conta disparos
+
+        result = resimulate(old_keyframes, self.simulator, previous_tasks_data,
+                            self.original_tasks_data, target, attach)
+        self.breakpoints.muted = False
+        self.breakpoints.resync()
+        self.trace_index.truncate(result.common_records)
+        self.gantt_view.adopt(self.simulator, result.common_records)
+        return result
+
+    def _inspect(self, x: float, y: float):
+        """Tarefa, tick e intervalo sob um ponto do Canvas (ou None)."""
+        if not self.simulator or self.worker:
+            return None
+        located = self.gantt_view.locate(x, y)
+        if located is None:
+            return None
+        tid, tick = located
+        # Alimentado sob demanda: só os registros novos desde a última consulta
+        self.trace_index.feed(self.simulator.gantt_data)
+        interval = self.trace_index.at(tid, tick)
+        return (tid, tick, interval) if interval else None
+
+    def _on_gantt_hover(self, event):
+        """Mostra tarefa, estado, trecho, tempo restante, prio_d e mutexes do bloco sob o mouse."""
+        found = self._inspect(self.gantt_canvas.canvasx(event.x), self.gantt_canvas.canvasy(event.y))
+        if found is None:
+            self.lbl_hover.place_forget()
             return
-        
-        task_ids = sorted([t.id for t in self.simulator.all_tasks], reverse=True)
-        task_y_positions = {tid: i * 40 + 20 for i, tid in enumerate(task_ids)}
-        
-        for tid, y in task_y_positions.items():
-            self.gantt_canvas.create_text(20, y, anchor=tk.W, text=f"T{tid}")
-        
-        block_width = 20
-        left_margin = 50
-        max_time = -1
-        gantt_data = getattr(self.simulator, "gantt_data", []) or []
-        
-        for entry in gantt_data:
-            if len(entry) == 4:
-                time, tid, rgb, state = entry
+        tid, tick, (start, end, state) = found
+        task = self.simulator.get_task(tid)
+        executed = self.trace_index.totals(tid, 0, tick + 1)["EXEC"]
+        held = self.mutex_history.held_at(tid, tick)
+        lines = [f"T{tid} — {state}",
+                 f"Tick {tick}  (trecho {start}–{end - 1})",
+                 f"Restante: {task.duracao - executed}",
+                 f"PrioD (agora): {task.prio_d}",
+                 f"Mutexes: {held or '-'}"]
+        self.lbl_hover.config(text="\n".join(lines))
+        self.lbl_hover.place(x=event.x + 14, y=event.y + 14)
+        self.lbl_hover.lift()
+
+    def _on_gantt_click(self, event):
+        """Clique numa barra destaca toda a linha do tempo da tarefa; fora das barras remove o destaque."""
+        found = self._inspect(self.gantt_canvas.canvasx(event.x), self.gantt_canvas.canvasy(event.y))
+        self._highlight_task(found[0] if found else None)
+
+    def _on_table_click(self, event):
+        """Clique numa linha da tabela destaca a tarefa no Gantt."""
+        tid = self.task_table.task_at(self.tasks_table.identify_row(event.y))
+        if tid is not None and self.simulator and not self.worker:
+            self.trace_index.feed(self.simulator.gantt_data)
+            self._highlight_task(None if tid == self._highlighted else tid)
+
+    def _highlight_task(self, tid):
+        span = self.trace_index.span(tid) if tid is not None else None
+        self._highlighted = tid if span else None
+        if span:
+            self.gantt_view.set_highlight(tid, *span)
+        else:
+            self.gantt_view.set_highlight(None)
+
+    def _format_mutexes(self) -> str:
+        """Dono e fila de espera de cada mutex em uso, para a barra de status."""
+        parts = []
+        for mutex_id, mutex in sorted(self.simulator.mutexes.items()):
+            if mutex.owner is None and not mutex.waiting_queue:
+                continue
+            owner = mutex.owner.id if mutex.owner else "livre"
+            waiting = [t.id for t in mutex.waiting_queue]
+            parts.append(f"M{mutex_id}={owner}" + (f" {waiting}" if waiting else ""))
+        if len(parts) > MAX_MUTEXES_SHOWN:
+            parts = parts[:MAX_MUTEXES_SHOWN] + [f"+{len(parts) - MAX_MUTEXES_SHOWN}"]
+        return "  ".join(parts) or "-"
+
+    def _update_scrubber(self):
+        """Ajusta o alcance e a posição da barra do tempo sem disparar um seek."""
+        if self._horizon[0] is not self.simulator:
+            # A estimativa percorre todas as tarefas: uma vez por simulador
+            self._horizon = (self.simulator, estimate_horizon(self.simulator.all_tasks))
+        horizon = max(self.keyframes.frontier, self._horizon[1])
+        if horizon != self._scrubber_to:
+            # Só muda quando o simulador troca ou a fronteira dos keyframes passa da estimativa
+            self._scrubber_to = horizon
+            self.scale_time.config(to=horizon)
+        self.scale_time.set(self.simulator.time)
+        if not self.worker and not self.playback.playing:
+            self.scale_time.config(state=tk.NORMAL)
+
+    def _on_scrub(self, value):
+        """Arraste da barra do tempo: agrupa os movimentos e faz um seek por ciclo ocioso."""
+        if not self.simulator or self.worker or self.playback.playing:
+            return
+        target = int(float(value))
+        if target == self.simulator.time:
+            return
+        self._seek_target = target
+        if self._seek_job is None:
+            self._seek_job = self.after_idle(self._do_seek)
+
+    def _do_seek(self):
+        """Posiciona a simulação no último tick pedido pela barra do tempo."""
+        self._seek_job = None
+        target, self._seek_target = self._seek_target, None
+        if target is None or not self.simulator or self.worker or self.playback.playing:
+            return
+        self._keyframes().seek(target)
+        self._after_seek()
+
+    def _after_seek(self):
+        """Redesenha e ajusta os botões depois de posicionar a simulação em outro tick."""
+        self.update_ui()
+        finished = self.simulator.is_finished()
+        for btn in (self.btn_step, self.btn_run, self.btn_play):
+            btn.config(state=tk.DISABLED if finished else tk.NORMAL)
+        for btn in (self.btn_stats, self.btn_export_gantt, self.btn_export_svg):
+            btn.config(state=tk.NORMAL if finished else tk.DISABLED)
+        self._update_back_button()
+
+    def open_breakpoints_window(self):
+        """Janela de breakpoints: adicionar/remover condições, continuar e voltar ao disparo anterior."""
+        if self.breakpoint_window and self.breakpoint_window.winfo_exists():
+            self.breakpoint_window.lift()
+            return
+        self.breakpoint_window = Toplevel(self)
+        self.breakpoint_window.title("🔴 Breakpoints")
+        self.breakpoint_window.geometry("420x380")
+
+        fr = Frame(self.breakpoint_window, padx=10, pady=10)
+        fr.pack(fill=tk.BOTH, expand=True)
+
+        # Tipos: eventos do simulador + tempo e tamanho da fila de prontos
+        self._bp_kinds = {label: event for event, label in EVENTS.items() if event != 'step'}
+        self._bp_kinds["Tempo ="] = "time"
+        self._bp_kinds["Fila de prontos >"] = "ready"
+        Label(fr, text="Condição:").grid(row=0, column=0, sticky=tk.W)
+        self.cmb_bp_kind = ttk.Combobox(fr, values=list(self._bp_kinds), state="readonly")
+        self.cmb_bp_kind.current(1)
+        self.cmb_bp_kind.grid(row=0, column=1, columnspan=3, sticky=tk.EW)
+
+        self.bp_entries = {}
+        for col, name in enumerate(("Tarefa", "Mutex", "Valor")):
+            Label(fr, text=f"{name}:").grid(row=1, column=col, sticky=tk.W)
+            e = Entry(fr, width=8)
+            e.grid(row=2, column=col, sticky=tk.W, padx=(0, 5))
+            self.bp_entries[name] = e
+        Button(fr, text="Adicionar", command=self._add_breakpoint).grid(row=2, column=3, sticky=tk.EW)
+
+        self.lst_breakpoints = tk.Listbox(fr, height=8)
+        self.lst_breakpoints.grid(row=3, column=0, columnspan=4, sticky=tk.NSEW, pady=5)
+
+        btn_frame = Frame(fr)
+        btn_frame.grid(row=4, column=0, columnspan=4, sticky=tk.EW)
+        Button(btn_frame, text="Remover", command=self._remove_breakpoint).pack(side=tk.LEFT)
+        Button(btn_frame, text="⏮ Anterior", command=self.reverse_to_breakpoint).pack(side=tk.RIGHT, padx=2)
+        Button(btn_frame, text="⏭ Continuar", command=self.continue_to_breakpoint,
+               bg="#4CAF50", fg="white").pack(side=tk.RIGHT, padx=2)
+
+        self.lbl_breakpoint_hit = Label(fr, text="", anchor=tk.W, justify=tk.LEFT)
+        self.lbl_breakpoint_hit.grid(row=5, column=0, columnspan=4, sticky=tk.EW, pady=5)
+        fr.columnconfigure(3, weight=1)
+        fr.rowconfigure(3, weight=1)
+        self._refresh_breakpoint_list()
+
+    def _add_breakpoint(self):
+        """Cria o breakpoint descrito nos campos da janela."""
+        if not self.simulator:
+            messagebox.showwarning("Aviso", "Carregue uma simulação antes.", parent=self.breakpoint_window)
+            return
+
+        def number(name):
+            text = self.bp_entries[name].get().strip()
+            return int(text) if text else None
+        try:
+            kind = self._bp_kinds[self.cmb_bp_kind.get()]
+            task_id, mutex_id, value = number("Tarefa"), number("Mutex"), number("Valor")
+            if kind in ("time", "ready") and value is None:
+                raise ValueError("informe o Valor")
+            if kind == "time":
+                bp = at_time(value)
+            elif kind == "ready":
+                bp = ready_longer_than(value)
             else:
-                time, tid, rgb = entry
-                state = "EXEC"
-            
-            if time > max_time:
-                max_time = time
-            
-            if tid != "IDLE" and tid in task_y_positions:
-                y_pos = task_y_positions[tid]
-                x_start = left_margin + time * block_width
-                color = f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
-                
-                if state == "EXEC":
-                    fill_color = color
-                    outline_color = "black"
-                elif state == "IO":
-                    fill_color = "#bfbfbf"
-                    outline_color = "black"
-                elif state == "READY":
-                    fill_color = ""
-                    outline_color = color
-                elif state == "MUTEX":
-                    fill_color = "#9932CC"
-                    outline_color = "black"
-                else:
-                    fill_color = color
-                    outline_color = "black"
-                
-                self.gantt_canvas.create_rectangle(
-                    x_start, y_pos - 15,
-                    x_start + block_width, y_pos + 15,
-                    fill=fill_color,
-                    outline=outline_color,
-                    width=1
-                )
-        
-        if max_time < 0:
-            max_time = self.simulator.time if self.simulator else 1
-        
-        total_time = max_time + 1
-        x_end = left_margin + total_time * block_width
-        max_y = max(task_y_positions.values()) if task_y_positions else 0
-        eixo_y = max_y + 40
-        
-        self.gantt_canvas.create_line(left_margin, eixo_y, x_end, eixo_y, width=2)
-        
-        for t in range(1, total_time + 1):
-            x_start = left_margin + (t - 1) * block_width
-            self.gantt_canvas.create_line(x_start, eixo_y - 6, x_start, eixo_y + 6)
-            self.gantt_canvas.create_line(x_start + block_width, eixo_y - 6, x_start + block_width, eixo_y + 6)
-            self.gantt_canvas.create_text(x_start + block_width / 2, eixo_y + 18, text=str(t), anchor=tk.N, font=("Arial", 9))
-        
-        self.gantt_canvas.config(scrollregion=(0, 0, x_end + 50, eixo_y + 40))
+                bp = Breakpoint(kind, task_id=task_id, mutex_id=mutex_id)
+        except ValueError as e:
+            messagebox.showerror("Erro", f"Breakpoint inválido: {e}", parent=self.breakpoint_window)
+            return
+        with self._sim_lock():
+            self._keyframes()
+            self.breakpoints.add(bp)
+        for e in self.bp_entries.values():
+            e.delete(0, tk.END)
+        self._refresh_breakpoint_list()
+
+    def _remove_breakpoint(self):
+        selection = self.lst_breakpoints.curselection()
+        if selection and self.breakpoints:
+            with self._sim_lock():
+                self.breakpoints.remove(self.breakpoints.breakpoints[selection[0]])
+            self._refresh_breakpoint_list()
+
+    def _refresh_breakpoint_list(self):
+        if not (self.breakpoint_window and self.breakpoint_window.winfo_exists()):
+            return
+        self.lst_breakpoints.delete(0, tk.END)
+        for bp in self.breakpoints or ():
+            self.lst_breakpoints.insert(tk.END, f"{bp.description}  ({bp.hits} disparos)")
+
+    def continue_to_breakpoint(self):
+        """Executa em segundo plano até o próximo disparo de breakpoint (ou fim/deadlock)."""
+        if not self.simulator or self.worker or self.playback.playing:
+            return
+        self._keyframes()
+        breakpoints = self.breakpoints
+        breakpoints.pending = []
+        breakpoints.resync()
+        self.run_all(should_stop=lambda: bool(breakpoints.pending))
+
+    def reverse_to_breakpoint(self):
+        """Volta ao disparo de breakpoint anterior ao tempo atual (reexecutando a partir dos keyframes)."""
+        if not self.simulator or self.worker or self.playback.playing:
+            return
+        keyframes = self._keyframes()
+        hits = self.breakpoints.reverse_continue(keyframes)
+        self._after_seek()
+        if hits:
+            self._show_breakpoint_hits(hits)
+        else:
+            messagebox.showinfo("Breakpoints", "Nenhum disparo antes do tempo atual.",
+                                parent=self.breakpoint_window)
+
+    def _show_breakpoint_hits(self, hits):
+        """Mostra quais breakpoints pararam a simulação."""
+        text = f"Parou em t={self.simulator.time}: " + ", ".join(hit.breakpoint.description for hit in hits)
+        if self.breakpoint_window and self.breakpoint_window.winfo_exists():
+            self.lbl_breakpoint_hit.config(text=text)
+            self._refresh_breakpoint_list()
+        else:
+            messagebox.showinfo("Breakpoint", text)
+
+    def zoom_gantt(self, direction: int, anchor_x=None):
+        """Aproxima (direction=-1) ou afasta (+1) o Gantt mantendo fixo o tick sob anchor_x."""
+        with self._sim_lock():
+            self.gantt_view.set_zoom(self.gantt_view.zoom_index + direction, anchor_x)
+        self._update_zoom_label()
+
+    def _update_zoom_label(self):
+        """Mostra o zoom atual (a visão pode ajustá-lo sozinha ao abrir um trace longo)."""
+        self.lbl_zoom.config(text=f"Zoom: {self.gantt_view.zoom_percent():g}%")
+
+    def _scroll_gantt_x(self, *args):
+        self.gantt_canvas.xview(*args)
+        self.gantt_view.refresh()
 
+    def _scroll_gantt_y(self, *args):
+        self.gantt_canvas.yview(*args)
+        self.gantt_view.refresh()
 
 if __name__ == "__main__":
     app = App()
@@ -0,0 +1,103 @@
+"""
+Controle do modo "play" (animação contínua da simulação).
+
+A interface chama o controlador uma vez por quadro (via after()):
+    - steps_due() diz quantos passos executar neste quadro para manter a
+      velocidade alvo em ticks por segundo;
+    - record_frame() informa quanto custaram os passos e o redesenho, e o
+      controlador ajusta o tamanho máximo do lote para o quadro caber no
+      orçamento de tempo;
+    - next_delay_ms() dá o atraso até o próximo quadro.
+
+Em velocidades baixas a maioria dos quadros tem 0 passos (e a interface não
+redesenha); em velocidades altas vários passos são agrupados num único
+redesenho. Se a máquina não acompanha a velocidade pedida, o atraso não é
+acumulado: a animação roda na velocidade possível.
+"""
+
+import time
+
+PLAY_SPEEDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+DEFAULT_SPEED = 10
+FRAME_MS = 33          # ~30 quadros por segundo
+FRAME_BUDGET = 0.8     # Fração do quadro disponível para passos + redesenho
+SMOOTHING = 0.3        # Peso da medição mais recente nas médias móveis
+
+
+class PlaybackController:
+    """Calcula passos por quadro e adapta o lote ao custo medido."""
+
+    def __init__(self, speed: float = DEFAULT_SPEED, frame_ms: int = FRAME_MS, clock=time.perf_counter):
+        self.speed = speed
+        self.frame_ms = frame_ms
+        self.clock = clock
+        self.playing = False
+        self.max_batch = max(1, int(speed * frame_ms / 1000))
+        self.achieved_rate = 0.0  # Ticks por segundo efetivos (média móvel)
+        self._carry = 0.0         # Fração de passo devida entre quadros
+        self._last = None
+        self._elapsed = 0.0       # Intervalo entre os dois últimos quadros
+        self._step_cost = None    # Segundos por passo (média móvel)
+        self._render_cost = 0.0   # Segundos por redesenho (média móvel)
+
+    def start(self):
+        """Inicia (ou retoma) a animação."""
+        self.playing = True
+        self._last = self.clock()
+        self._carry = 0.0
+
+    def pause(self):
+        self.playing = False
+
+    def set_speed(self, speed: float):
+        """Muda a velocidade alvo sem perder o ritmo atual."""
+        self.speed = max(speed, 0.001)
+        self._carry = min(self._carry, 1.0)
+        self.max_batch = min(self.max_batch, self._speed_limit())
+
+    def _speed_limit(self) -> int:
+        """Maior lote útil: o dobro dos passos que a velocidade pede por quadro."""
+        return int(2 * self.speed * self.frame_ms / 1000) + 1
+
+    def steps_due(self, now=None) -> int:
+        """
+        Quantos passos executar neste quadro.
+
+        A dívida de passos é limitada a um lote: se o quadro anterior
+        atrasou, a animação não tenta recuperar o tempo perdido.
+        """
+        now = self.clock() if now is None else now
+        elapsed = now - self._last if self._last is not None else 0.0
+        self._last = now
+        self._elapsed = elapsed
+        due = self._carry + self.speed * elapsed
+        steps = min(int(due), self.max_batch)
+        self._carry = min(due - steps, float(self.max_batch))
+        return steps
+
+    def record_frame(self, step_seconds: float, render_seconds: float, steps: int):
+        """
+        Registra o custo do quadro e ajusta o lote máximo.
+
+        Args:
+            step_seconds: Tempo gasto executando os passos
+            render_seconds: Tempo gasto redesenhando (0 se não redesenhou)
+            steps: Passos executados
+        """
+        if steps > 0:
+            cost = step_seconds / steps
+            self._step_cost = cost if self._step_cost is None else \
+                (1 - SMOOTHING) * self._step_cost + SMOOTHING * cost
+            self._render_cost = (1 - SMOOTHING) * self._render_cost + SMOOTHING * render_seconds
+            budget = self.frame_ms / 1000 * FRAME_BUDGET - self._render_cost
+            fits = int(budget / self._step_cost) if self._step_cost > 0 else self.max_batch * 2
+            # O lote cresce no máximo 2x por quadro para não saltar com medições ruidosas,
+            # e nunca passa do dobro do que a velocidade pede por quadro
+            self.max_batch = max(1, min(fits, self.max_batch * 2, self._speed_limit()))
+        if self._elapsed > 0:
+            rate = steps / self._elapsed
+            self.achieved_rate = (1 - SMOOTHING) * self.achieved_rate + SMOOTHING * rate
+
+    def next_delay_ms(self, frame_seconds: float) -> int:
+        """Atraso até o próximo quadro descontando o tempo já gasto neste."""
+        return max(1, int(self.frame_ms - frame_seconds * 1000))
@@ -0,0 +1,387 @@
+"""
+Renderização do gráfico de Gantt em PNG sem interface gráfica.
+
+Diferente de App.export_gantt_ps (que precisa do Canvas do Tk e desenha um
+retângulo do Pillow por intervalo), aqui o gráfico é pintado direto num
+buffer RGB (bytearray), linha de pixels por linha de pixels:
+    - cada tarefa vira duas linhas de pixels (borda e miolo da barra),
+      preenchidas por atribuição de fatias (uma por intervalo); as demais
+      linhas da barra são cópias delas;
+    - os rótulos T<id> usam uma fonte bitmap embutida;
+    - o PNG é gravado com zlib da biblioteca padrão, linha a linha, então
+      save_png() usa memória proporcional à largura da imagem, não à área.
+
+Imagens largas demais para um arquivo só podem ser divididas em tiles de
+largura fixa (save_tiles), e vários gráficos (relatórios em lote) podem ser
+renderizados em paralelo num pool de processos (render_many).
+
+Pillow e NumPy são opcionais: Raster.to_image() embrulha o buffer numa
+imagem do Pillow uma única vez no fim e Raster.as_array() devolve uma
+visão NumPy (altura, largura, 3) sem cópia.
+
+O trace pode vir por tick (registros de Simulator.gantt_data), como um
+TraceIndex, ou por intervalos ({tarefa: [(início, fim, estado), ...]}).
+
+Uso:
+    save_png(simulator.gantt_data, "gantt.png", task_ids=[t.id for t in simulator.all_tasks])
+    save_tiles(simulator.gantt_data, "tiles/", tile_width=4096)
+    render_many([(sim.gantt_data, f"run{i}.png") for i, sim in enumerate(sims)], processes=4)
+"""
+
+import os
+import struct
+import zlib
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from gantt_index import TraceIndex
+
+# Mesma geometria do Gantt do Canvas (gantt_canvas), sem depender do Tk
+BLOCK_WIDTH = 20
+LEFT_MARGIN = 50
+ROW_HEIGHT = 40
+TOP_MARGIN = 10
+BAR_HALF_HEIGHT = 15
+RIGHT_MARGIN = 20
+OUTLINE_MIN_WIDTH = 3   # Intervalos mais estreitos (em pixels) não têm contorno
+LABEL_X = 10
+
+WHITE = b"\xff\xff\xff"
+BLACK = b"\x00\x00\x00"
+IO_RGB = (0xbf, 0xbf, 0xbf)
+MUTEX_RGB = (0x99, 0x32, 0xcc)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_SIZE = 1 << 16  # Tamanho máximo de cada bloco IDAT gravado
+
+# Fonte bitmap 3x5 dos rótulos (desenhada em escala FONT_SCALE)
+FONT = {
+    "0": ("111", "101", "101", "101", "111"),
+    "1": ("010", "110", "010", "010", "111"),
+    "2": ("111", "001", "111", "100", "111"),
+    "3": ("111", "001", "111", "001", "111"),
+    "4": ("101", "101", "111", "001", "001"),
+    "5": ("111", "100", "111", "001", "111"),
+    "6": ("111", "100", "111", "101", "111"),
+    "7": ("111", "001", "001", "001", "001"),
+    "8": ("111", "101", "111", "101", "111"),
+    "9": ("111", "101", "111", "001", "111"),
+    "T": ("111", "010", "010", "010", "010"),
+    "-": ("000", "000", "111", "000", "000"),
+}
+FONT_SCALE = 2
+GLYPH_WIDTH = 3 * FONT_SCALE
+GLYPH_HEIGHT = 5 * FONT_SCALE
+GLYPH_SPACING = FONT_SCALE
+
+
+class GanttRow(NamedTuple):
+    """Intervalos de uma tarefa, ordenados por início (picklable para o pool)."""
+    tid: object
+    rgb: Tuple[int, int, int]
+    starts: List[int]
+    ends: List[int]
+    states: List[str]
+
+
+def gantt_rows(trace, task_ids: Optional[Iterable] = None,
+               colors: Optional[Dict[object, Sequence[int]]] = None) -> List[GanttRow]:
+    """
+    Normaliza um trace nas linhas do gráfico (ids em ordem decrescente, como no App).
+
+    Args:
+        trace: Registros (tempo, tarefa, cor, estado), TraceIndex ou
+            dicionário tarefa -> [(início, fim, estado), ...]
+        task_ids: Tarefas a mostrar (inclusive sem registros); padrão: as do trace
+        colors: Cor de cada tarefa (obrigatória só no formato por intervalos)
+    """
+    colors = colors or {}
+    if isinstance(trace, dict):
+        intervals = {tid: sorted(spans) for tid, spans in trace.items()}
+        rgb_of = lambda tid: colors.get(tid, (0, 0, 0))
+    else:
+        if not isinstance(trace, TraceIndex):
+            index = TraceIndex()
+            index.feed(trace)
+            trace = index
+        intervals = {tid: trace.intervals(tid) for tid in trace.tasks}
+        rgb_of = lambda tid: colors.get(tid) or trace.color(tid) or (0, 0, 0)
+    ids = intervals.keys() if task_ids is None else task_ids
+    rows = []
+    for tid in sorted(ids, reverse=True):
+        spans = intervals.get(tid, ())
+        rows.append(GanttRow(tid, tuple(rgb_of(tid)), [s[0] for s in spans], [s[1] for s in spans],
+                             [s[2] for s in spans]))
+    return rows
+
+
+class Layout(NamedTuple):
+    """Geometria da imagem."""
+    scale: float = BLOCK_WIDTH   # Pixels por tick
+    end: int = 0                 # Último tick desenhado (exclusivo)
+    rows: int = 0                # Quantidade de tarefas
+
+    @property
+    def width(self) -> int:
+        return LEFT_MARGIN + self.x(self.end) + RIGHT_MARGIN
+
+    @property
+    def height(self) -> int:
+        return TOP_MARGIN * 2 + self.rows * ROW_HEIGHT
+
+    def x(self, time: int) -> int:
+        """Coluna do tick, a partir da margem esquerda."""
+        return int(round(time * self.scale))
+
+
+def make_layout(rows: List[GanttRow], scale: float = BLOCK_WIDTH) -> Layout:
+    end = max((row.ends[-1] for row in rows if row.ends), default=0)
+    return Layout(scale, end, len(rows))
+
+
+def _state_colors(state: str, rgb) -> Tuple[bytes, bytes]:
+    """(preenchimento, contorno) do intervalo, como no Canvas."""
+    color = bytes(rgb)
+    if state == "IO":
+        return bytes(IO_RGB), BLACK
+    if state == "READY":
+        return WHITE, color
+    if state == "MUTEX":
+        return bytes(MUTEX_RGB), BLACK
+    return color, BLACK
+
+
+def _fill(line: bytearray, a: int, b: int, color: bytes, width: int):
+    """Pinta as colunas [a, b) da linha de pixels, cortando na largura."""
+    a, b = max(a, 0), min(b, width)
+    if a < b:
+        line[a * 3:b * 3] = color * (b - a)
+
+
+def _paint_row(row: GanttRow, layout: Layout, x0: int, width: int) -> Tuple[bytearray, bytearray]:
+    """Linhas de pixels de borda e de miolo da barra da tarefa nas colunas [x0, x0 + width)."""
+    edge = bytearray(WHITE * width)
+    body = bytearray(edge)
+    scale = layout.scale
+    # Ticks que podem aparecer na janela (um de folga para o arredondamento)
+    first_tick = int((x0 - LEFT_MARGIN) / scale) - 1
+    last_tick = int((x0 + width - LEFT_MARGIN) / scale) + 1
+    origin = LEFT_MARGIN - x0
+    i = bisect_left(row.ends, first_tick)
+    while i < len(row.starts) and row.starts[i] <= last_tick:
+        a = origin + layout.x(row.starts[i])
+        b = origin + layout.x(row.ends[i])
+        fill, outline = _state_colors(row.states[i], row.rgb)
+        if b - a >= OUTLINE_MIN_WIDTH:
+            # Contorno nas colunas a e b (inclusivo, como o retângulo do Pillow)
+            _fill(edge, a, b + 1, outline, width)
+            _fill(body, a + 1, b, fill, width)
+            _fill(body, a, a + 1, outline, width)
+            _fill(body, b, b + 1, outline, width)
+        else:
+            b = max(b, a + 1)
+            _fill(edge, a, b, fill, width)
+            _fill(body, a, b, fill, width)
+        i += 1
+    return edge, body
+
+
+def _label_lines(text: str, base: bytearray, x: int, width: int) -> List[bytearray]:
+    """Linhas de pixels com o rótulo escrito sobre `base`, a partir da coluna x."""
+    glyphs = [FONT[ch] for ch in text if ch in FONT]
+    lines = []
+    for glyph_row in range(5):
+        line = bytearray(base)
+        column = x
+        for glyph in glyphs:
+            for bit, on in enumerate(glyph[glyph_row]):
+                if on == "1":
+                    left = column + bit * FONT_SCALE
+                    _fill(line, left, left + FONT_SCALE, BLACK, width)
+            column += GLYPH_WIDTH + GLYPH_SPACING
+        lines.extend([line] * FONT_SCALE)
+    return lines
+
+
+def scanlines(rows: List[GanttRow], layout: Layout, x0: int = 0,
+              width: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Gera as linhas de pixels (RGB, de cima para baixo) das colunas [x0, x0 + width).
+
+    Linhas repetidas são o mesmo objeto: quem consome não deve alterá-las.
+    """
+    if width is None:
+        width = layout.width - x0
+    blank = bytes(WHITE * width)
+    for _ in range(TOP_MARGIN):
+        yield blank
+    label_x = LABEL_X - x0
+    for row in rows:
+        edge, body = _paint_row(row, layout, x0, width)
+        center = ROW_HEIGHT // 2
+        top, bottom = center - BAR_HALF_HEIGHT, center + BAR_HALF_HEIGHT
+        label_top = center - GLYPH_HEIGHT // 2
+        label = [bytes(line) for line in _label_lines(f"T{row.tid}", body, label_x, width)]
+        edge, body = bytes(edge), bytes(body)
+        for y in range(ROW_HEIGHT):
+            if label_top <= y < label_top + len(label):
+                yield label[y - label_top]
+            elif y == top or y == bottom:
+                yield edge
+            elif top < y < bottom:
+                yield body
+            else:
+                yield blank
+    for _ in range(TOP_MARGIN):
+        yield blank
+
+
+class Raster:
+    """Imagem RGB num bytearray (linhas de cima para baixo, 3 bytes por pixel)."""
+
+    def __init__(self, width: int, height: int, data: Optional[bytearray] = None):
+        self.width = width
+        self.height = height
+        self.data = data if data is not None else bytearray(WHITE * (width * height))
+
+    def pixel(self, x: int, y: int) -> Tuple[int, int, int]:
+        offset = (y * self.width + x) * 3
+        return tuple(self.data[offset:offset + 3])
+
+    def row(self, y: int) -> bytes:
+        stride = self.width * 3
+        return bytes(self.data[y * stride:(y + 1) * stride])
+
+    def as_array(self):
+        """Visão NumPy (altura, largura, 3) do buffer, sem cópia (requer NumPy)."""
+        import numpy as np
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(self.height, self.width, 3)
+
+    def to_image(self):
+        """Imagem do Pillow com o conteúdo do buffer (requer Pillow)."""
+        from PIL import Image
+        return Image.frombuffer("RGB", (self.width, self.height), bytes(self.data), "raw", "RGB", 0, 1)
+
+    def save(self, filepath: str):
+        stride = self.width * 3
+        write_png(filepath, self.width, self.height,
+                  (self.data[y * stride:(y + 1) * stride] for y in range(self.height)))
+
+
+def render(trace, task_ids: Optional[Iterable] = None, scale: float = BLOCK_WIDTH,
+           x0: int = 0, width: Optional[int] = None, colors=None) -> Raster:
+    """Renderiza o trace (ou só as colunas [x0, x0 + width)) num Raster."""
+    rows = trace if _is_rows(trace) else gantt_rows(trace, task_ids, colors)
+    layout = make_layout(rows, scale)
+    if width is None:
+        width = layout.width - x0
+    data = bytearray()
+    for line in scanlines(rows, layout, x0, width):
+        data += line
+    return Raster(width, layout.height, data)
+
+
+def write_png(filepath: str, width: int, height: int, lines: Iterable[bytes], level: int = 6):
+    """Grava um PNG RGB de 8 bits a partir das linhas de pixels, sem guardar a imagem inteira."""
+    compressor = zlib.compressobj(level)
+    pending = bytearray()
+    count = 0
+    with open(filepath, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        _write_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        for line in lines:
+            pending += compressor.compress(b"\x00")  # Filtro 0 (nenhum) em cada linha
+            pending += compressor.compress(line)
+            count += 1
+            if len(pending) >= IDAT_SIZE:
+                _write_chunk(f, b"IDAT", bytes(pending))
+                pending.clear()
+        if count != height:
+            raise ValueError(f"Esperadas {height} linhas de pixels, recebidas {count}")
+        pending += compressor.flush()
+        _write_chunk(f, b"IDAT", bytes(pending))
+        _write_chunk(f, b"IEND", b"")
+
+
+def _write_chunk(f, kind: bytes, payload: bytes):
+    f.write(struct.pack(">I", len(payload)))
+    f.write(kind)
+    f.write(payload)
+    f.write(struct.pack(">I", zlib.crc32(kind + payload) & 0xffffffff))
+
+
+def _is_rows(trace) -> bool:
+    return isinstance(trace, list) and bool(trace) and isinstance(trace[0], GanttRow)
+
+
+def save_png(trace, filepath: str, task_ids: Optional[Iterable] = None, scale: float = BLOCK_WIDTH,
+             colors=None) -> Tuple[int, int]:
+    """
+    Grava o gráfico inteiro em PNG, linha a linha.
+
+    Returns:
+        (largura, altura) da imagem
+    """
+    rows = trace if _is_rows(trace) else gantt_rows(trace, task_ids, colors)
+    layout = make_layout(rows, scale)
+    write_png(filepath, layout.width, layout.height, scanlines(rows, layout))
+    return layout.width, layout.height
+
+
+def _save_tile(rows, layout, x0, width, filepath):
+    write_png(filepath, width, layout.height, scanlines(rows, layout, x0, width))
+    return filepath
+
+
+def save_tiles(trace, directory: str, tile_width: int = 4096, task_ids: Optional[Iterable] = None,
+               scale: float = BLOCK_WIDTH, colors=None, processes: Optional[int] = 1) -> List[str]:
+    """
+    Divide o gráfico em PNGs de tile_width pixels de largura (gantt_0000.png, ...).
+
+    Args:
+        processes: Processos para renderizar os tiles (1 = no processo atual,
+            None = um por CPU)
+
+    Returns:
+        Caminhos dos tiles, da esquerda para a direita
+
+    Raises:
+        ValueError: Se tile_width não for positivo
+    """
+    if tile_width <= 0:
+        raise ValueError("tile_width deve ser positivo")
+    rows = trace if _is_rows(trace) else gantt_rows(trace, task_ids, colors)
+    layout = make_layout(rows, scale)
+    os.makedirs(directory, exist_ok=True)
+    jobs = []
+    for n, x0 in enumerate(range(0, layout.width, tile_width)):
+        path = os.path.join(directory, f"gantt_{n:04d}.png")
+        jobs.append((rows, layout, x0, min(tile_width, layout.width - x0), path))
+    return _run_jobs(_save_tile, jobs, processes)
+
+
+def _render_job(trace, filepath, options):
+    return save_png(trace, filepath, **options)
+
+
+def render_many(jobs: Iterable[tuple], processes: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Renderiza vários gráficos em paralelo (relatórios em lote).
+
+    Args:
+        jobs: Tuplas (trace, caminho) ou (trace, caminho, opções de save_png)
+        processes: Processos do pool (1 = no processo atual, None = um por CPU)
+
+    Returns:
+        (largura, altura) de cada imagem, na ordem dos jobs
+    """
+    normalized = [(job[0], job[1], job[2] if len(job) > 2 else {}) for job in jobs]
+    return _run_jobs(_render_job, normalized, processes)
+
+
+def _run_jobs(function, jobs: List[tuple], processes: Optional[int]) -> list:
+    if processes == 1 or len(jobs) <= 1:
+        return [function(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(function, *zip(*jobs)))
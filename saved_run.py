@@ -0,0 +1,556 @@
+"""
+Execuções salvas: o trace do Gantt em blocos comprimidos e indexados.
+
+Reabrir uma execução exigia simular de novo. Aqui o trace é gravado num
+arquivo (.srun) que os exportadores e a interface leem sem o Simulator:
+    - o tempo é dividido em blocos de chunk_ticks ticks; cada bloco guarda
+      os trechos (tarefa, início, duração, estado) de ticks consecutivos no
+      mesmo estado, em colunas (arrays de ids, inícios, durações e estados),
+      comprimidas com zlib ou lzma;
+    - índice de tempo: o primeiro tick, a posição e o tamanho de cada bloco
+      (blocos sem registros não são gravados), então uma janela [t0, t1)
+      descomprime só os blocos que a cruzam;
+    - tabela de tarefas: cor e primeiro/último bloco de cada tarefa, para
+      consultas por tarefa;
+    - metadados: hash SHA-256 da carga (workload_hash), algoritmo, quantum,
+      alpha, tempo final, deadlock e as estatísticas finais
+      (Simulator.get_statistics()).
+
+Uso:
+    save_run("execucao.srun", simulator, "RR", 2, None)     # depois de run_full()
+
+    with SavedRunWriter("execucao.srun", "RR", 2, None) as writer:
+        writer.attach(simulator, drain=True)                 # em fluxo, memória limitada
+        simulator.run_full()
+        writer.finish(simulator)
+
+    with SavedRun("execucao.srun") as run:
+        export_svg(run.intervals(1000, 2000), "trecho.svg", task_ids=run.task_ids, colors=run.colors,
+                   t0=1000, t1=2000)
+        run.state_at(7, 1500), run.totals(1000, 2000), run.statistics
+
+Layout (little-endian):
+    cabeçalho (HEADER): MAGIC, versão, compressão, posição e tamanho do
+                        índice (regravado ao fechar)
+    blocos comprimidos, um após o outro
+    índice comprimido: INDEX, metadados em JSON e os arrays dos blocos
+                       (primeiro tick, posição, tamanho, trechos, trechos
+                       ociosos) e das tarefas (id, cor, primeiro e último bloco)
+
+Os metadados ficam no fim porque as estatísticas só existem quando a
+execução termina; o cabeçalho aponta para eles.
+"""
+
+import hashlib
+import json
+import lzma
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
+
+from workload_cache import pack_workload
+
+MAGIC = b"SRN1"
+VERSION = 1
+SAVED_RUN_SUFFIX = ".srun"
+CHUNK_TICKS = 4096
+CHUNK_CACHE_SIZE = 8
+DEFAULT_WINDOW = 2000   # Ticks mostrados ao abrir uma execução na interface
+
+# Estados no trace; IDLE (CPU ociosa) tem código 0 e id de tarefa 0
+STATES = ("IDLE", "EXEC", "READY", "IO", "MUTEX")
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+IDLE_RGB = [200, 200, 200]
+
+CODECS = {"zlib": 0, "lzma": 1}
+
+HEADER = struct.Struct("<4sHBxQQ")       # magic, versão, compressão, posição do índice, tamanho do índice
+INDEX = struct.Struct("<QQQQ")           # ticks por bloco, blocos, tarefas, tamanho dos metadados
+
+# Colunas de um bloco, na ordem em que são gravadas (typecode, bytes por trecho)
+_RUN_COLUMNS = (("tids", "q"), ("starts", "I"), ("lengths", "I"), ("states", "B"))
+_CHUNK_COLUMNS = ("t0", "offset", "size", "runs", "idle")
+_TASK_COLUMNS = ("ids", "first", "last")
+
+Interval = Tuple[int, int, str]
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    return lzma.compress(data) if codec == CODECS["lzma"] else zlib.compress(data, 6)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    return lzma.decompress(data) if codec == CODECS["lzma"] else zlib.decompress(data)
+
+
+def _pack_arrays(columns) -> bytes:
+    parts = []
+    for column in columns:
+        if sys.byteorder != "little":
+            column = array(column.typecode, column)
+            column.byteswap()
+        parts.append(column.tobytes())
+    return b"".join(parts)
+
+
+def _unpack_arrays(data: bytes, typecodes, count: int, offset: int = 0) -> List[array]:
+    columns = []
+    for typecode in typecodes:
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(data[offset:offset + size])
+        if sys.byteorder != "little":
+            column.byteswap()
+        columns.append(column)
+        offset += size
+    return columns
+
+
+def workload_hash(tasks) -> str:
+    """SHA-256 da carga (tarefas em ordem de id), o mesmo para qualquer algoritmo."""
+    return hashlib.sha256(pack_workload("", None, None, sorted(tasks, key=lambda t: t.id))).hexdigest()
+
+
+def is_saved_run(path: str) -> bool:
+    """Se o arquivo é uma execução salva (pelo cabeçalho)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class SavedRunWriter:
+    """
+    Grava o trace de uma execução em blocos comprimidos.
+
+    Os registros (tempo, tarefa, cor, estado) podem chegar fora de ordem
+    dentro dos blocos ainda abertos: o simulador grava o I/O à frente do
+    tempo atual. Um registro que não é de I/O no tick t garante que os
+    seguintes são de ticks >= t, então os blocos anteriores a t são
+    comprimidos e gravados na hora. O destino precisa aceitar seek().
+    """
+
+    def __init__(self, target: Union[str, IO[bytes]], algo: str, quantum: Optional[int] = None,
+                 alpha: Optional[int] = None, chunk_ticks: int = CHUNK_TICKS, codec: str = "zlib"):
+        if codec not in CODECS:
+            raise ValueError(f"Compressão inválida: {codec} (use {', '.join(CODECS)})")
+        if chunk_ticks <= 0:
+            raise ValueError("Os blocos precisam ter pelo menos um tick")
+        self.algo = algo
+        self.quantum = quantum
+        self.alpha = alpha
+        self.chunk_ticks = chunk_ticks
+        self.codec = CODECS[codec]
+        self._owned = isinstance(target, str)
+        self._target = open(target, "wb") if self._owned else target
+        self._start = self._target.tell()
+        self._target.write(HEADER.pack(MAGIC, VERSION, self.codec, 0, 0))
+
+        self._buckets: Dict[int, list] = {}        # bloco -> [(ocioso, tarefa, tempo, estado), ...]
+        self._flushed = 0                           # Blocos anteriores a este já foram gravados
+        self._chunks = {name: array("q") for name in _CHUNK_COLUMNS}  # Posições relativas ao cabeçalho
+        self._tasks: Dict[object, list] = {}        # tarefa -> [cor, primeiro bloco, último bloco] (-1 = nenhum)
+        self.records = 0
+        self.simulator = None
+        self._drain = False
+        self._cursor = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Entrada de dados
+    # ------------------------------------------------------------------
+
+    def feed(self, records):
+        """Acrescenta registros de gantt_data."""
+        ticks = self.chunk_ticks
+        buckets = self._buckets
+        safe = None
+        for entry in records:
+            time, tid, rgb, state = entry if len(entry) == 4 else (*entry, "EXEC")
+            chunk = time // ticks
+            if chunk < self._flushed:
+                raise ValueError(f"Registro do tick {time} chegou depois de gravado o bloco que o contém")
+            idle = tid == "IDLE"
+            if not idle and tid not in self._tasks:
+                self._tasks[tid] = [rgb, -1, -1]
+            bucket = buckets.get(chunk)
+            if bucket is None:
+                bucket = buckets[chunk] = []
+            bucket.append((0 if idle else 1, 0 if idle else tid, time, STATE_CODES[state]))
+            if state != "IO":
+                safe = time
+            self.records += 1
+        if safe is not None:
+            self._flush(safe // ticks)
+
+    def attach(self, simulator, drain: bool = False):
+        """
+        Consome o trace do simulador a cada passo.
+
+        Args:
+            simulator: Simulador acompanhado
+            drain: Se True, descarta os registros já gravados (memória limitada;
+                   desativa o histórico de step_back)
+        """
+        self.simulator = simulator
+        self._drain = drain
+        self._cursor = 0
+        if drain:
+            simulator.max_history = 0
+            simulator.history.clear()
+        simulator.add_listener(self._on_event)
+
+    def detach(self):
+        """Consome os registros pendentes e desanexa o escritor do simulador."""
+        if self.simulator is None:
+            return
+        self._consume()
+        self.simulator.remove_listener(self._on_event)
+        self.simulator = None
+
+    @property
+    def chunk_count(self) -> int:
+        """Blocos já gravados."""
+        return len(self._chunks["t0"])
+
+    def _on_event(self, event: str, time: int, info: dict):
+        if event == 'step':
+            self._consume()
+
+    def _consume(self):
+        records = self.simulator.gantt_data
+        if self._cursor < len(records):
+            self.feed(records[self._cursor:])
+            if self._drain:
+                del records[:]
+                self._cursor = 0
+            else:
+                self._cursor = len(records)
+
+    # ------------------------------------------------------------------
+    # Gravação
+    # ------------------------------------------------------------------
+
+    def _flush(self, before: int):
+        """Grava os blocos anteriores ao bloco `before`."""
+        for chunk in sorted(k for k in self._buckets if k < before):
+            self._write_chunk(chunk, self._buckets.pop(chunk))
+        self._flushed = max(self._flushed, before)
+
+    def _write_chunk(self, chunk: int, entries: list):
+        entries.sort()
+        t0 = chunk * self.chunk_ticks
+        columns = {name: array(typecode) for name, typecode in _RUN_COLUMNS}
+        tids, starts, lengths, states = (columns[name] for name, _ in _RUN_COLUMNS)
+        idle = 0
+        last = None
+        for group, tid, time, code in entries:
+            key = (group, tid, code)
+            if key == last and starts[-1] + lengths[-1] == time - t0:
+                lengths[-1] += 1
+                continue
+            tids.append(tid)
+            starts.append(time - t0)
+            lengths.append(1)
+            states.append(code)
+            idle += group == 0
+            last = key
+        position = len(self._chunks["t0"])
+        for tid in set(tids[idle:]):
+            entry = self._tasks[tid]
+            if entry[1] < 0:
+                entry[1] = position
+            entry[2] = position
+        payload = _compress(self.codec, _pack_arrays(columns.values()))
+        for name, value in zip(_CHUNK_COLUMNS, (t0, self._target.tell() - self._start, len(payload), len(tids), idle)):
+            self._chunks[name].append(value)
+        self._target.write(payload)
+
+    def finish(self, simulator=None, statistics: Optional[dict] = None, tasks=None):
+        """
+        Grava os blocos restantes e o índice.
+
+        Args:
+            simulator: Simulador da execução (tempo final, estatísticas, deadlock e,
+                       fora do sistema aberto, as tarefas e o hash da carga)
+            statistics: Estatísticas, no lugar das do simulador
+            tasks: Tarefas da carga (hash e linhas do Gantt), no lugar das do simulador
+        """
+        if self._closed:
+            return
+        self.detach()
+        self._flush(max(self._buckets, default=0) + 1)
+
+        meta = {"algorithm": self.algo, "quantum": self.quantum, "alpha": self.alpha, "workload_hash": None,
+                "final_time": None, "completed": None, "task_count": None, "deadlock": None,
+                "statistics": statistics}
+        if simulator is not None:
+            if tasks is None and simulator.source is None:
+                tasks = simulator.all_tasks
+            meta.update(final_time=simulator.time, completed=simulator.counters.completed,
+                        task_count=simulator.task_count, deadlock=simulator.detect_deadlock())
+            if statistics is None:
+                meta["statistics"] = simulator.get_statistics()
+        if tasks is not None:
+            meta["workload_hash"] = workload_hash(tasks)
+            for task in tasks:
+                # Tarefas sem registros (não chegaram) também têm linha no Gantt
+                self._tasks.setdefault(task.id, [task.RGB, -1, -1])
+
+        task_columns = {"ids": array("q"), "rgb": array("B"), "first": array("q"), "last": array("q")}
+        for tid in sorted(self._tasks):
+            rgb, first, last = self._tasks[tid]
+            task_columns["ids"].append(tid)
+            task_columns["rgb"].extend(rgb[:3])
+            task_columns["first"].append(first)
+            task_columns["last"].append(last)
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        index = _compress(self.codec, INDEX.pack(self.chunk_ticks, len(self._chunks["t0"]), len(self._tasks),
+                                                 len(meta_bytes)) + meta_bytes
+                          + _pack_arrays(self._chunks.values())
+                          + _pack_arrays(task_columns[name] for name in _TASK_COLUMNS)
+                          + task_columns["rgb"].tobytes())
+        index_offset = self._target.tell() - self._start
+        self._target.write(index)
+        end = self._target.tell()
+        self._target.seek(self._start)
+        self._target.write(HEADER.pack(MAGIC, VERSION, self.codec, index_offset, len(index)))
+        self._target.seek(end)
+        self._closed = True
+        if self._owned:
+            self._target.close()
+
+    def close(self):
+        """Fecha o arquivo (sem estatísticas, se finish() não foi chamado)."""
+        self.finish()
+
+
+def save_run(target: Union[str, IO[bytes]], simulator, algo: str, quantum: Optional[int] = None,
+             alpha: Optional[int] = None, records=None, chunk_ticks: int = CHUNK_TICKS, codec: str = "zlib") -> int:
+    """
+    Salva uma execução já simulada.
+
+    Args:
+        records: Trace a gravar no lugar de simulator.gantt_data (ex.: KeyframeIndex.trace)
+
+    Returns:
+        Número de blocos gravados
+    """
+    with SavedRunWriter(target, algo, quantum, alpha, chunk_ticks, codec) as writer:
+        writer.feed(simulator.gantt_data if records is None else records)
+        writer.finish(simulator)
+    return writer.chunk_count
+
+
+class SavedRun:
+    """
+    Execução salva, lida sob demanda.
+
+    Só o índice é lido ao abrir; os blocos são descomprimidos quando uma
+    consulta cruza o seu trecho de tempo (os CHUNK_CACHE_SIZE mais recentes
+    ficam em memória). chunks_read conta as descompressões.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            magic, version, codec, index_offset, index_size = HEADER.unpack(self._file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} não é uma execução salva (versão {VERSION})")
+            if index_offset == 0:
+                raise ValueError(f"{path} está incompleto (a gravação não terminou)")
+            self.codec = codec
+            self._file.seek(index_offset)
+            index = _decompress(codec, self._file.read(index_size))
+        except (ValueError, struct.error, zlib.error, lzma.LZMAError) as e:
+            self._file.close()
+            raise ValueError(f"Execução salva inválida: {e}") from None
+        self.chunk_ticks, n_chunks, n_tasks, meta_size = INDEX.unpack_from(index)
+        offset = INDEX.size
+        meta = json.loads(index[offset:offset + meta_size].decode("utf-8"))
+        offset += meta_size
+        self.algorithm: str = meta["algorithm"]
+        self.quantum: Optional[int] = meta["quantum"]
+        self.alpha: Optional[int] = meta["alpha"]
+        self.workload_hash: Optional[str] = meta["workload_hash"]
+        self.final_time: Optional[int] = meta["final_time"]
+        self.completed: Optional[int] = meta["completed"]
+        self.task_count: Optional[int] = meta["task_count"]
+        self.deadlock: Optional[List[int]] = meta["deadlock"]
+        self.statistics: Optional[dict] = meta["statistics"]
+
+        chunks = _unpack_arrays(index, "qqqqq", n_chunks, offset)
+        self._t0, self._offsets, self._sizes, self._runs, self._idle = chunks
+        offset += sum(column.itemsize * n_chunks for column in chunks)
+        ids, self._first, self._last = _unpack_arrays(index, "qqq", n_tasks, offset)
+        offset += 24 * n_tasks
+        rgb = index[offset:offset + 3 * n_tasks]
+        self.task_ids: List[int] = list(ids)
+        self.colors: Dict[int, List[int]] = {tid: list(rgb[3 * i:3 * i + 3]) for i, tid in enumerate(ids)}
+        self._task_pos = {tid: i for i, tid in enumerate(ids)}
+        self._cache: "OrderedDict[int, List[array]]" = OrderedDict()
+        self.chunks_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._t0)
+
+    @property
+    def end(self) -> int:
+        """Fim (exclusivo) do último trecho gravado."""
+        if not self._t0:
+            return 0
+        _, starts, lengths, _ = self._chunk(len(self._t0) - 1)
+        return self._t0[-1] + max((s + n for s, n in zip(starts, lengths)), default=0)
+
+    # ------------------------------------------------------------------
+    # Blocos
+    # ------------------------------------------------------------------
+
+    def chunk_range(self, t0: int = 0, t1: Optional[int] = None) -> range:
+        """Blocos que cruzam [t0, t1)."""
+        first = bisect_right(self._t0, t0 - self.chunk_ticks)
+        last = len(self._t0) if t1 is None else bisect_left(self._t0, t1)
+        return range(first, max(first, last))
+
+    def _chunk(self, index: int) -> List[array]:
+        """Colunas (ids, inícios relativos, durações, estados) de um bloco."""
+        columns = self._cache.get(index)
+        if columns is not None:
+            self._cache.move_to_end(index)
+            return columns
+        self._file.seek(self._offsets[index])
+        data = _decompress(self.codec, self._file.read(self._sizes[index]))
+        columns = _unpack_arrays(data, [typecode for _, typecode in _RUN_COLUMNS], self._runs[index])
+        self.chunks_read += 1
+        self._cache[index] = columns
+        if len(self._cache) > CHUNK_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return columns
+
+    def _runs_in(self, index: int, lo: int, hi: int, t0: int, t1: Optional[int]) -> Iterator[Tuple[int, int, int, str]]:
+        """Trechos lo..hi do bloco, cortados em [t0, t1): (tarefa, início, fim, estado)."""
+        tids, starts, lengths, states = self._chunk(index)
+        base = self._t0[index]
+        for i in range(lo, hi):
+            start = base + starts[i]
+            end = start + lengths[i]
+            start, end = max(start, t0), end if t1 is None else min(end, t1)
+            if start < end:
+                yield tids[i], start, end, STATES[states[i]]
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def intervals(self, t0: int = 0, t1: Optional[int] = None, task_ids=None) -> Dict[int, List[Interval]]:
+        """
+        Intervalos (início, fim, estado) de cada tarefa em [t0, t1), no formato
+        aceito por png_render/svg_export (com colors=self.colors).
+        """
+        wanted = None if task_ids is None else set(task_ids)
+        result: Dict[int, List[Interval]] = {}
+        for index in self.chunk_range(t0, t1):
+            for tid, start, end, state in self._runs_in(index, self._idle[index], self._runs[index], t0, t1):
+                if wanted is not None and tid not in wanted:
+                    continue
+                spans = result.get(tid)
+                if spans is None:
+                    result[tid] = [(start, end, state)]
+                elif spans[-1][1] == start and spans[-1][2] == state:
+                    # Trecho continua no bloco seguinte
+                    spans[-1] = (spans[-1][0], end, state)
+                else:
+                    spans.append((start, end, state))
+        return result
+
+    def task_intervals(self, tid, t0: int = 0, t1: Optional[int] = None) -> List[Interval]:
+        """Intervalos de uma tarefa em [t0, t1), lendo só os blocos em que ela aparece."""
+        pos = self._task_pos.get(tid)
+        if pos is None or self._first[pos] < 0:
+            return []
+        window = self.chunk_range(t0, t1)
+        spans: List[Interval] = []
+        for index in range(max(window.start, self._first[pos]), min(window.stop, self._last[pos] + 1)):
+            tids = self._chunk(index)[0]
+            lo = bisect_left(tids, tid, self._idle[index])
+            hi = bisect_right(tids, tid, lo)
+            for _, start, end, state in self._runs_in(index, lo, hi, t0, t1):
+                if spans and spans[-1][1] == start and spans[-1][2] == state:
+                    spans[-1] = (spans[-1][0], end, state)
+                else:
+                    spans.append((start, end, state))
+        return spans
+
+    def state_at(self, tid, time: int) -> Optional[str]:
+        """Estado da tarefa ('IDLE' = CPU) no tick, ou None se não há registro."""
+        if tid == "IDLE":
+            for index in self.chunk_range(time, time + 1):
+                for _ in self._runs_in(index, 0, self._idle[index], time, time + 1):
+                    return "IDLE"
+            return None
+        for _, _, state in self.task_intervals(tid, time, time + 1):
+            return state
+        return None
+
+    def totals(self, t0: int = 0, t1: Optional[int] = None) -> Dict[object, Dict[str, int]]:
+        """Ticks em cada estado por tarefa em [t0, t1) ('IDLE' = CPU ociosa)."""
+        totals: Dict[object, Dict[str, int]] = {}
+        for index in self.chunk_range(t0, t1):
+            for tid, start, end, state in self._runs_in(index, 0, self._runs[index], t0, t1):
+                key = "IDLE" if state == "IDLE" else tid
+                counts = totals.get(key)
+                if counts is None:
+                    counts = totals[key] = dict.fromkeys(STATES[1:] if key != "IDLE" else ("IDLE",), 0)
+                counts[state] += end - start
+        return totals
+
+    def records(self, t0: int = 0, t1: Optional[int] = None) -> List[Tuple[int, object, List[int], str]]:
+        """Registros (tempo, tarefa, cor, estado) de gantt_data em [t0, t1), em ordem de tempo."""
+        records = []
+        for index in self.chunk_range(t0, t1):
+            for tid, start, end, state in self._runs_in(index, 0, self._runs[index], t0, t1):
+                if state == "IDLE":
+                    tid, rgb = "IDLE", IDLE_RGB
+                else:
+                    rgb = self.colors[tid]
+                records.extend((time, tid, rgb, state) for time in range(start, end))
+        records.sort(key=lambda record: record[0])
+        return records
+
+
+class RunWindow:
+    """
+    Trecho [t0, t1) de uma execução salva no lugar do Simulator para os
+    renderizadores do Gantt (gantt_canvas/gantt_tiles): all_tasks, gantt_data e time.
+    """
+
+    def __init__(self, run: SavedRun, t0: int = 0, t1: Optional[int] = None):
+        self.run = run
+        self.t0 = t0
+        self.t1 = run.end if t1 is None else t1
+        self.time = self.t1
+        self.all_tasks = [SimpleNamespace(id=tid, RGB=run.colors[tid]) for tid in run.task_ids]
+        self.gantt_data = run.records(t0, self.t1)
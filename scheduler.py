@@ -267,4 +267,45 @@ class PRIOPEnvTickScheduler(PRIOPEnvScheduler):
 
 # Alias para compatibilidade
 PRIOPEnv = PRIOPEnvScheduler
-PRIOPEnvTick = PRIOPEnvTickScheduler
\ No newline at end of file
+PRIOPEnvTick = PRIOPEnvTickScheduler
+
+
+# Mapeamento de nomes de algoritmos (como aparecem no arquivo de configuração)
+# para classes de escalonadores
+SCHEDULER_FACTORY = {
+    "FIFO": FIFOScheduler,
+    "FCFS": FIFOScheduler,
+    "SRTF": SRTFScheduler,
+    "PRIO": PriorityScheduler,
+    "PRIOP": PriorityScheduler,
+    "RR": RoundRobinScheduler,
+    "PRIOPENV": PRIOPEnvScheduler,  # Prioridade com envelhecimento (chegada/término)
+    "PRIOPENV-T": PRIOPEnvTickScheduler,  # Prioridade com envelhecimento por tick
+}
+
+
+def create_scheduler(algo_name: str, quantum: Optional[int] = None, alpha: Optional[int] = None) -> Scheduler:
+    """
+    Instancia o escalonador correspondente a um nome de algoritmo.
+    
+    Args:
+        algo_name: Nome do algoritmo (ex: 'FIFO', 'RR', 'PRIOPENV')
+        quantum: Quantum de tempo (opcional)
+        alpha: Incremento de envelhecimento para PRIOPEnv/PRIOPEnv-T (opcional)
+    
+    Returns:
+        Instância do escalonador configurada
+    
+    Raises:
+        ValueError: Se o algoritmo não for suportado
+    """
+    scheduler_class = SCHEDULER_FACTORY.get(algo_name.upper())
+    if not scheduler_class:
+        raise ValueError(f"Algoritmo '{algo_name}' não suportado.")
+    
+    # PRIOPEnv e PRIOPEnv-T precisam de quantum e alpha
+    if issubclass(scheduler_class, PRIOPEnvScheduler):
+        return scheduler_class(quantum=quantum or 1, alpha=alpha or 1)
+    if quantum:
+        return scheduler_class(quantum=quantum)
+    return scheduler_class()
@@ -0,0 +1,155 @@
+"""
+Execução da simulação em uma thread de trabalho.
+
+O App usa SimulationWorker no lugar de Simulator.run_full() para que a
+janela continue respondendo em execuções longas. A thread executa passos
+em lotes curtos (até batch_seconds) segurando `lock`; a interface lê o
+simulador periodicamente via after(), também segurando `lock`, então nunca
+vê um passo pela metade. Entre lotes a trava é liberada, o que dá à thread
+principal a chance de redesenhar.
+
+Uso:
+    worker = SimulationWorker(simulator, max_iterations=100000)
+    worker.start()
+    ...
+    with worker.lock:
+        desenha(simulator)
+    progresso = worker.progress()
+    worker.cancel()
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+BATCH_SECONDS = 0.02  # Tempo máximo com a trava segurada por lote
+
+
+def estimate_horizon(tasks) -> int:
+    """
+    Estima o tempo final da simulação (uma CPU, sem contar I/O concorrente).
+
+    Returns:
+        Maior valor entre o término mais tardio possível de cada tarefa
+        isolada e a primeira chegada somada a todo o trabalho de CPU
+    """
+    if not tasks:
+        return 1
+    first_arrival = min(t.inicio for t in tasks)
+    total_work = sum(t.duracao for t in tasks)
+    latest_end = max(t.inicio + t.duracao for t in tasks)
+    return max(1, latest_end, first_arrival + total_work)
+
+
+class SimulationWorker:
+    """
+    Executa um Simulator até o fim em segundo plano, com progresso e cancelamento.
+
+    Tem a mesma semântica de Simulator.run_full(): para ao terminar, ao
+    detectar deadlock ou ao atingir max_iterations. Com `should_stop`
+    (chamado após cada passo), para também quando ele retorna True
+    (usado pelos breakpoints); nesse caso `stopped` fica True.
+    """
+
+    def __init__(self, simulator, max_iterations: int = 10000, batch_seconds: float = BATCH_SECONDS,
+                 should_stop: Optional[Callable[[], bool]] = None):
+        self.simulator = simulator
+        self.max_iterations = max_iterations
+        self.batch_seconds = batch_seconds
+        self.should_stop = should_stop
+        self.stopped = False
+        self.lock = threading.Lock()
+        # Com fonte de chegadas as tarefas ainda não são conhecidas: usa o horizonte do simulador
+        self.horizon = simulator.horizon or estimate_horizon(simulator.all_tasks)
+        self.steps = 0
+        self.finished_ok: Optional[bool] = None  # Resultado como em run_full (None enquanto roda)
+        self.error: Optional[BaseException] = None
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = None
+        self._ended_at = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def done(self) -> bool:
+        """Se a thread já terminou (por fim, deadlock, limite, cancelamento ou erro)."""
+        return self._thread is not None and not self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self):
+        """Inicia a thread de trabalho."""
+        if self._thread is not None:
+            raise RuntimeError("Worker já iniciado")
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="simulation-worker", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Pede o cancelamento; a thread para ao fim do lote atual."""
+        self._cancel.set()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def progress(self) -> dict:
+        """
+        Progresso atual (leitura sem trava; os valores são inteiros atômicos).
+
+        Returns:
+            Dicionário com 'time', 'horizon', 'fraction' (0..1), 'steps' e 'ticks_per_sec'
+        """
+        sim_time = self.simulator.time
+        if sim_time > self.horizon:
+            # A estimativa ignora ociosidade e espera; acompanha o tempo real
+            self.horizon = int(sim_time * 1.25) + 1
+        if self.done and self.finished_ok is not None:
+            fraction = 1.0
+        else:
+            fraction = min(sim_time / self.horizon, 0.99)
+        end = self._ended_at or time.perf_counter()
+        elapsed = end - self._started_at if self._started_at else 0.0
+        return {
+            'time': sim_time,
+            'horizon': self.horizon,
+            'fraction': fraction,
+            'steps': self.steps,
+            'ticks_per_sec': self.steps / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def _run(self):
+        simulator = self.simulator
+        try:
+            while not self._cancel.is_set():
+                with self.lock:
+                    deadline = time.perf_counter() + self.batch_seconds
+                    while True:
+                        if simulator.is_finished():
+                            self.finished_ok = True
+                            return
+                        if self.steps >= self.max_iterations:
+                            self.finished_ok = False
+                            return
+                        simulator.step()
+                        self.steps += 1
+                        if simulator.is_deadlocked():
+                            self.finished_ok = False
+                            return
+                        if self.should_stop is not None and self.should_stop():
+                            self.stopped = True
+                            self.finished_ok = simulator.is_finished()
+                            return
+                        if time.perf_counter() >= deadline:
+                            break
+                # Libera o GIL para a thread da interface entre os lotes
+                time.sleep(0)
+        except BaseException as e:  # Repassado à interface, que mostra o erro
+            self.error = e
+        finally:
+            self._ended_at = time.perf_counter()
@@ -5,7 +5,12 @@ Gerencia a execução das tarefas, eventos de I/O, sincronização com mutex e c
 
 from tasks import TCB, TCBQueue, STATE_NEW, STATE_READY, STATE_RUNNING, STATE_BLOCKED_IO, STATE_TERMINATED, STATE_BLOCKED_MUTEX
 from scheduler import Scheduler, RoundRobinScheduler, PRIOPEnvScheduler, PRIOPEnvTickScheduler
-from typing import List, Optional
+from instrumentation import SimulatorProfile
+from live_stats import SimulationCounters
+from arrival_sources import ArrivalSource
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Deque, List, Optional, Union
 
 
 class Mutex:
@@ -21,7 +26,9 @@ class Mutex:
         self.mutex_id = mutex_id              # ID do mutex
         self.locked = False                   # Estado do mutex: True = bloqueado, False = livre
         self.owner: Optional[TCB] = None      # Tarefa que possui o lock
-        self.waiting_queue = TCBQueue()       # Fila de tarefas aguardando o mutex
+        # Fila de tarefas aguardando o mutex. Não pode ser uma TCBQueue: as tarefas
+        # também estão em blocked_mutex_queue e os ponteiros prev/next são únicos
+        self.waiting_queue: Deque[TCB] = deque()
     
     def try_lock(self, task: TCB) -> bool:
         """
@@ -55,9 +62,9 @@ class Mutex:
                 task.held_mutexes.remove(self.mutex_id)
             
             # Verifica se há tarefas aguardando na fila
-            if not self.waiting_queue.is_empty():
+            if self.waiting_queue:
                 # Passa o mutex para a próxima tarefa na fila
-                next_task = self.waiting_queue.pop_front()
+                next_task = self.waiting_queue.popleft()
                 self.owner = next_task
                 next_task.held_mutexes.append(self.mutex_id)
                 return next_task
@@ -76,7 +83,7 @@ class Mutex:
             task: Tarefa a ser adicionada à fila de espera
         """
         task.mutex_wait_count += 1
-        self.waiting_queue.push_back(task)
+        self.waiting_queue.append(task)
     
     def is_free(self) -> bool:
         """Verifica se o mutex está livre."""
@@ -98,19 +105,45 @@ class Simulator:
     - Sincronização com mutex (lock/unlock)
     - Coleta de estatísticas de execução
     - Histórico para voltar passos (step_back)
+    - Sistema aberto: tarefas lidas sob demanda de uma ArrivalSource
     """
     
-    def __init__(self, scheduler: Scheduler, all_tasks: List[TCB]):
+    def __init__(self, scheduler: Scheduler, all_tasks: Union[List[TCB], ArrivalSource],
+                 horizon: Optional[int] = None, retire_finished: bool = False):
         """
         Inicializa o simulador.
         
         Args:
             scheduler: Algoritmo de escalonamento a ser utilizado
-            all_tasks: Lista de todas as tarefas da simulação
+            all_tasks: Lista de todas as tarefas da simulação, ou uma ArrivalSource
+                (ver arrival_sources) de onde as tarefas são admitidas conforme chegam
+            horizon: Tempo em que a simulação para, mesmo com tarefas pendentes (None = sem limite)
+            retire_finished: Descarta as tarefas concluídas, mantendo só seus totais nas
+                estatísticas (apenas com ArrivalSource; desliga o histórico de step_back)
         """
         self.scheduler = scheduler
-        # Ordena tarefas por tempo de chegada para processamento correto
-        self.all_tasks = sorted(all_tasks, key=lambda t: t.inicio)
+        self.horizon = horizon
+        if isinstance(all_tasks, ArrivalSource):
+            # Sistema aberto: all_tasks guarda só as tarefas já admitidas
+            self.source: Optional[ArrivalSource] = all_tasks
+            self.all_tasks = []
+        else:
+            if retire_finished:
+                raise ValueError("retire_finished exige uma ArrivalSource")
+            self.source = None
+            # Ordena tarefas por tempo de chegada para processamento correto
+            self.all_tasks = sorted(all_tasks, key=lambda t: t.inicio)
+        self.retire_finished = retire_finished
+        self.retired_count = 0
+        # Totais das tarefas descartadas: turnaround, espera, resposta, espera e esperas por mutex
+        self._retired_totals = [0, 0, 0, 0, 0]
+        # Estado de cada tarefa admitida da fonte, para restore_state() de antes da admissão
+        self._initial_states = {}
+        self._tasks_by_id = {task.id: task for task in self.all_tasks}
+        self.tasks_version = 0  # Muda a cada admissão ou descarte em all_tasks (ver gantt_canvas.row_task_ids)
+        # Cursor de chegadas: all_tasks[:_next_arrival] já tiveram o ingresso processado
+        self._arrival_times = [task.inicio for task in self.all_tasks]
+        self._next_arrival = 0
         
         self.time = 0  # Relógio da simulação
         self.current_task: Optional[TCB] = None  # Tarefa em execução
@@ -128,7 +161,94 @@ class Simulator:
         
         # Histórico para funcionalidade de voltar - OTIMIZADO
         self.history = []
-        self.max_history = 100  # Limita para economizar memória
+        self.max_history = 0 if retire_finished else 100  # Limita para economizar memória (0 = desativado)
+        
+        # Observadores de eventos (exportadores de trace, instrumentação...)
+        # Com a lista vazia nenhum evento é montado, então não há custo extra
+        self._listeners: List[Callable[[str, int, dict], None]] = []
+        self._deadlock_emitted = False  # 'deadlock' já emitido para o travamento atual
+        
+        # Instrumentação opcional (ver enable_profiling)
+        self.profile: Optional[SimulatorProfile] = None
+        
+        # Contadores O(1) para o painel de estatísticas ao vivo (ver live_stats)
+        self.counters = SimulationCounters()
+        
+        # Ids de tarefas cuja prioridade dinâmica mudou (ver take_dirty_tasks)
+        # None = rastreamento desligado
+        self.dirty_tasks: Optional[set] = None
+    
+    def enable_profiling(self) -> SimulatorProfile:
+        """
+        Ativa o modo de instrumentação (tempo por fase, contadores e filas).
+        
+        Returns:
+            Coletor de métricas instalado no simulador
+        """
+        if self.profile is None:
+            self.profile = SimulatorProfile()
+        if not self.profile.installed:
+            self.profile.install(self)
+        return self.profile
+    
+    def disable_profiling(self):
+        """Desativa a instrumentação, mantendo as métricas já coletadas em self.profile."""
+        if self.profile is not None:
+            self.profile.uninstall()
+    
+    def get_profile(self) -> Optional[dict]:
+        """Retorna as métricas de instrumentação como dicionário, ou None se nunca ativada."""
+        return self.profile.to_dict() if self.profile else None
+
+    def take_dirty_tasks(self) -> Optional[set]:
+        """
+        Ids das tarefas cuja prioridade dinâmica mudou desde a última chamada.
+        
+        A primeira chamada liga o rastreamento e retorna None (qualquer
+        tarefa pode ter mudado). Usado pela tabela de tarefas para
+        atualizar só as células alteradas.
+        """
+        dirty, self.dirty_tasks = self.dirty_tasks, set()
+        return dirty
+
+    def _mark_ready_dirty(self):
+        """Marca as tarefas prontas como alteradas (após envelhecimento)."""
+        if self.dirty_tasks is not None:
+            self.dirty_tasks.update(task.id for task in self.ready_queue)
+    
+    def add_listener(self, callback: Callable[[str, int, dict], None]):
+        """
+        Registra um observador de eventos da simulação.
+        
+        O callback recebe (evento, tempo, info), onde evento é um de:
+            - 'mutex_acquire': info = {'task_id', 'mutex_id', 'handoff'}
+              (handoff=True quando o mutex foi repassado no fim do ciclo)
+            - 'mutex_release': info = {'task_id', 'mutex_id', 'next_owner_id'}
+            - 'mutex_contended': info = {'task_id', 'mutex_id', 'owner_id'}
+            - 'dispatch': tarefa entrou em execução, info = {'task_id'}
+            - 'preempt': tarefa saiu da CPU sem terminar, info = {'task_id', 'by_task_id'}
+            - 'quantum_expired': info = {'task_id'}
+            - 'arrival': tarefa chegou (NEW -> READY), info = {'task_id'}
+            - 'io_block': tarefa entrou em I/O, info = {'task_id', 'until'}
+            - 'io_unblock': tarefa terminou o I/O, info = {'task_id'}
+            - 'finish': tarefa terminou, info = {'task_id'}
+            - 'deadlock': entrada em deadlock (uma vez, não a cada passo travado), info = {'task_ids'}
+            - 'step': fim de um passo, info = {} (tempo já incrementado)
+        
+        Args:
+            callback: Função chamada a cada evento
+        """
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, int, dict], None]):
+        """Remove um observador registrado com add_listener."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _emit(self, event: str, **info):
+        """Notifica os observadores registrados sobre um evento."""
+        for callback in self._listeners:
+            callback(event, self.time, info)
     
     def _init_mutexes(self):
         """Inicializa os mutexes necessários baseado nos eventos das tarefas."""
@@ -156,6 +276,23 @@ class Simulator:
         """
         Salva o estado atual da simulação no histórico.
         Salva apenas dados essenciais para economizar memória.
+        Não faz nada se o histórico estiver desativado (max_history <= 0).
+        """
+        if self.max_history <= 0:
+            return
+        
+        self.history.append(self.capture_state())
+        
+        # Limita tamanho do histórico
+        if len(self.history) > self.max_history:
+            self.history.pop(0)
+
+    def capture_state(self) -> dict:
+        """
+        Captura o estado atual da simulação (o mesmo usado pelo histórico).
+        
+        Returns:
+            Dicionário que pode ser passado a restore_state()
         """
         # Conta quantos registros de gantt existem ANTES deste passo
         gantt_count_before = len(self.gantt_data)
@@ -164,6 +301,7 @@ class Simulator:
             'time': self.time,
             'current_task_id': self.current_task.id if self.current_task else None,
             'gantt_count': gantt_count_before,  # Posição do gantt antes deste step
+            'counters': self.counters.snapshot(),
             'tasks_state': {},
             'ready_queue_ids': [t.id for t in self.ready_queue],
             'blocked_io_ids': [t.id for t in self.blocked_io_queue],
@@ -181,30 +319,51 @@ class Simulator:
         
         # Salva estado de cada tarefa (apenas campos que mudam)
         for task in self.all_tasks:
-            state['tasks_state'][task.id] = {
-                'state': task.state,
-                'tempo_restante': task.tempo_restante,
-                'tempo_exec_acumulado': task.tempo_exec_acumulado,
-                'io_blocked_until': task.io_blocked_until,
-                'io_events': list(task.io_events) if task.io_events else [],
-                'ml_events': list(task.ml_events) if task.ml_events else [],
-                'mu_events': list(task.mu_events) if task.mu_events else [],
-                'ativacoes': task.ativacoes,
-                'inicioExec': task.inicioExec,
-                'fimExec': task.fimExec,
-                'somaExec': task.somaExec,
-                'held_mutexes': list(task.held_mutexes) if task.held_mutexes else [],
-                'mutex_wait_time': task.mutex_wait_time,
-                'mutex_wait_count': task.mutex_wait_count,
-                'fim': task.fim,
-                'prio_d': task.prio_d
-            }
-        
-        self.history.append(state)
+            state['tasks_state'][task.id] = self._task_state(task)
         
-        # Limita tamanho do histórico
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
+        return state
+
+    @staticmethod
+    def _task_state(task: TCB) -> dict:
+        """Campos de uma tarefa que mudam durante a simulação (para capture_state)."""
+        return {
+            'state': task.state,
+            'tempo_restante': task.tempo_restante,
+            'tempo_exec_acumulado': task.tempo_exec_acumulado,
+            'io_blocked_until': task.io_blocked_until,
+            'io_events': list(task.io_events) if task.io_events else [],
+            'ml_events': list(task.ml_events) if task.ml_events else [],
+            'mu_events': list(task.mu_events) if task.mu_events else [],
+            'ativacoes': task.ativacoes,
+            'inicioExec': task.inicioExec,
+            'fimExec': task.fimExec,
+            'somaExec': task.somaExec,
+            'held_mutexes': list(task.held_mutexes) if task.held_mutexes else [],
+            'mutex_wait_time': task.mutex_wait_time,
+            'mutex_wait_count': task.mutex_wait_count,
+            'fim': task.fim,
+            'prio_d': task.prio_d
+        }
+
+    @staticmethod
+    def _apply_task_state(task: TCB, ts: dict):
+        """Restaura os campos salvos por _task_state()."""
+        task.state = ts['state']
+        task.tempo_restante = ts['tempo_restante']
+        task.tempo_exec_acumulado = ts['tempo_exec_acumulado']
+        task.io_blocked_until = ts['io_blocked_until']
+        task.io_events = list(ts['io_events'])
+        task.ml_events = list(ts['ml_events'])
+        task.mu_events = list(ts['mu_events'])
+        task.ativacoes = ts['ativacoes']
+        task.inicioExec = ts['inicioExec']
+        task.fimExec = ts['fimExec']
+        task.somaExec = ts['somaExec']
+        task.held_mutexes = list(ts['held_mutexes'])
+        task.mutex_wait_time = ts['mutex_wait_time']
+        task.mutex_wait_count = ts['mutex_wait_count']
+        task.fim = ts['fim']
+        task.prio_d = ts['prio_d']
 
     def step_back(self) -> bool:
         """
@@ -217,35 +376,29 @@ class Simulator:
             return False
         
         # Pega o estado anterior
-        state = self.history.pop()
+        self.restore_state(self.history.pop())
+        return True
+
+    def restore_state(self, state: dict):
+        """
+        Restaura um estado capturado por capture_state().
         
-        # Restaura tempo
+        O Gantt é truncado no ponto da captura; registros posteriores
+        precisam já estar em gantt_data (ver keyframes.KeyframeIndex).
+        """
+        # Restaura tempo (e o cursor de chegadas: ingressos a partir de time ainda não processados)
         self.time = state['time']
+        self._next_arrival = bisect_left(self._arrival_times, self.time)
         
         # Restaura quantum do scheduler
         if state['scheduler_quantum'] is not None and hasattr(self.scheduler, 'time_slice_remaining'):
             self.scheduler.time_slice_remaining = state['scheduler_quantum']
         
-        # Restaura estado de cada tarefa
+        # Restaura estado de cada tarefa (as admitidas da fonte depois da captura voltam ao estado inicial)
         for task in self.all_tasks:
-            if task.id in state['tasks_state']:
-                ts = state['tasks_state'][task.id]
-                task.state = ts['state']
-                task.tempo_restante = ts['tempo_restante']
-                task.tempo_exec_acumulado = ts['tempo_exec_acumulado']
-                task.io_blocked_until = ts['io_blocked_until']
-                task.io_events = list(ts['io_events'])
-                task.ml_events = list(ts['ml_events'])
-                task.mu_events = list(ts['mu_events'])
-                task.ativacoes = ts['ativacoes']
-                task.inicioExec = ts['inicioExec']
-                task.fimExec = ts['fimExec']
-                task.somaExec = ts['somaExec']
-                task.held_mutexes = list(ts['held_mutexes'])
-                task.mutex_wait_time = ts['mutex_wait_time']
-                task.mutex_wait_count = ts['mutex_wait_count']
-                task.fim = ts['fim']
-                task.prio_d = ts['prio_d']
+            ts = state['tasks_state'].get(task.id) or self._initial_states.get(task.id)
+            if ts is not None:
+                self._apply_task_state(task, ts)
         
         # Reconstrói filas baseado nos IDs salvos
         self._rebuild_queues(state)
@@ -259,21 +412,26 @@ class Simulator:
         # Restaura mutexes
         self._restore_mutexes(state['mutexes'])
         
-        # Remove registros do gantt adicionados neste passo
-        gantt_count = state['gantt_count']
-        self.gantt_data = self.gantt_data[:gantt_count]
+        self.counters.restore(state['counters'])
+        
+        # Remove registros do gantt adicionados depois da captura
+        del self.gantt_data[state['gantt_count']:]
         
         # Restaura done_tasks
         self.done_tasks = [self._find_task_by_id(tid) for tid in state['done_ids']]
         
-        return True
+        # Qualquer tarefa pode ter mudado: o próximo take_dirty_tasks() retorna None
+        self.dirty_tasks = None
+        # Voltando a um estado já travado, o deadlock não é emitido de novo
+        self._deadlock_emitted = self.detect_deadlock() is not None
+
+    def get_task(self, task_id) -> Optional[TCB]:
+        """Retorna a tarefa com o ID dado (O(1)), ou None."""
+        return self._tasks_by_id.get(task_id)
 
     def _find_task_by_id(self, task_id) -> Optional[TCB]:
         """Busca tarefa pelo ID."""
-        for task in self.all_tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._tasks_by_id.get(task_id)
 
     def _rebuild_queues(self, state: dict):
         """Reconstrói as filas de prontos e bloqueados."""
@@ -308,6 +466,12 @@ class Simulator:
 
     def _restore_mutexes(self, mutexes_state: dict):
         """Restaura o estado de todos os mutexes."""
+        # Mutexes criados depois da captura (tarefas admitidas da fonte) voltam a ficar livres
+        for mutex_id, mutex in self.mutexes.items():
+            if mutex_id not in mutexes_state:
+                mutex.locked = False
+                mutex.owner = None
+                mutex.waiting_queue = deque()
         for mutex_id, mutex_state in mutexes_state.items():
             mutex = self._get_mutex(mutex_id)
             mutex.locked = mutex_state['locked']
@@ -318,12 +482,11 @@ class Simulator:
                 mutex.owner = None
             
             # Reconstrói fila de espera do mutex
-            # Os ponteiros já foram limpos em _rebuild_queues
-            mutex.waiting_queue = TCBQueue()
+            mutex.waiting_queue = deque()
             for tid in mutex_state['waiting_ids']:
                 task = self._find_task_by_id(tid)
                 if task:
-                    mutex.waiting_queue.push_back(task)
+                    mutex.waiting_queue.append(task)
 
     def can_step_back(self) -> bool:
         """Verifica se é possível voltar um passo."""
@@ -341,19 +504,72 @@ class Simulator:
         Move tarefas de NEW (estado 1) para READY (estado 2).
         Aplica envelhecimento nas tarefas prontas quando nova tarefa chega (PRIOPEnv).
         """
+        if self.source is not None:
+            self._admit_arrivals()
         new_arrivals = []
-        for task in self.all_tasks:
+        tasks = self.all_tasks
+        index = self._next_arrival
+        while index < len(tasks) and tasks[index].inicio <= self.time:
+            task = tasks[index]
+            index += 1
             if task.state == STATE_NEW and task.inicio == self.time:
                 task.state = STATE_READY
                 task.prio_d = task.prio_s  # Reseta prioridade dinâmica ao chegar
                 self.ready_queue.push_back(task)
                 new_arrivals.append(task)
+                if self._listeners:
+                    self._emit('arrival', task_id=task.id)
+        self._next_arrival = index
         
         # Aplica envelhecimento APENAS se houve novas chegadas
         if new_arrivals and isinstance(self.scheduler, PRIOPEnvScheduler):
             for new_task in new_arrivals:
                 # Envelhece todas as tarefas prontas EXCETO a que acabou de chegar
                 self.scheduler.age_tasks(self.ready_queue, exclude_task=new_task)
+            self._mark_ready_dirty()
+            if self.dirty_tasks is not None:
+                self.dirty_tasks.update(task.id for task in new_arrivals)
+
+    def _admit_arrivals(self):
+        """Traz da fonte de chegadas as tarefas com ingresso até o tempo atual."""
+        for task in self.source.take_until(self.time):
+            if task.inicio < self.time:
+                raise ValueError(f"Tarefa {task.id} chega em {task.inicio}, antes do tempo atual ({self.time})")
+            if task.id in self._tasks_by_id:
+                raise ValueError(f"Id de tarefa repetido na fonte de chegadas: {task.id}")
+            self.all_tasks.append(task)
+            self.tasks_version += 1
+            self._arrival_times.append(task.inicio)
+            self._tasks_by_id[task.id] = task
+            for mutex_id, _ in task.ml_events + task.mu_events:
+                self._get_mutex(mutex_id)
+            if not self.retire_finished:
+                self._initial_states[task.id] = self._task_state(task)
+
+    def _retire(self, task: TCB):
+        """Descarta uma tarefa concluída, acumulando seus tempos (retire_finished)."""
+        index = bisect_left(self._arrival_times, task.inicio)
+        while self.all_tasks[index] is not task:
+            index += 1
+        del self.all_tasks[index]
+        self.tasks_version += 1
+        del self._arrival_times[index]
+        if index < self._next_arrival:
+            self._next_arrival -= 1
+        del self._tasks_by_id[task.id]
+        turnaround = task.fim - task.inicio
+        totals = self._retired_totals
+        totals[0] += turnaround
+        totals[1] += turnaround - task.duracao
+        totals[2] += task.inicioExec - task.inicio if task.ativacoes > 0 else 0
+        totals[3] += task.mutex_wait_time
+        totals[4] += task.mutex_wait_count
+        self.retired_count += 1
+
+    @property
+    def task_count(self) -> int:
+        """Tarefas que já fizeram parte da simulação (inclui as descartadas por retire_finished)."""
+        return len(self.all_tasks) + self.retired_count
 
     def _check_io_unblock(self):
         """
@@ -370,6 +586,8 @@ class Simulator:
             self.blocked_io_queue.remove(task)
             task.state = STATE_READY
             self.ready_queue.push_back(task)
+            if self._listeners:
+                self._emit('io_unblock', task_id=task.id)
 
     def _handle_io_event(self, task: TCB) -> bool:
         """
@@ -394,6 +612,8 @@ class Simulator:
             task.state = STATE_BLOCKED_IO
             self.ready_queue.remove(task)
             self.blocked_io_queue.push_back(task)
+            if self._listeners:
+                self._emit('io_block', task_id=task.id, until=task.io_blocked_until)
             
             # Registra o bloqueio no Gantt para os ciclos de I/O (começando no próximo)
             for t in range(duracao):
@@ -417,9 +637,15 @@ class Simulator:
             mutex = self._get_mutex(mutex_id)
             if mutex.try_lock(task):
                 # Conseguiu o lock, continua executando
+                if self._listeners:
+                    self._emit('mutex_acquire', task_id=task.id, mutex_id=mutex_id, handoff=False)
                 return False
             else:
                 # Mutex ocupado, bloqueia a tarefa
+                self.counters.mutex_contentions += 1
+                if self._listeners:
+                    self._emit('mutex_contended', task_id=task.id, mutex_id=mutex_id,
+                               owner_id=mutex.get_owner_id())
                 task.state = STATE_BLOCKED_MUTEX
                 task.mutex_blocked_until = 0  # Indefinido, aguarda unlock de outra tarefa
                 self.ready_queue.remove(task)
@@ -441,7 +667,10 @@ class Simulator:
         mutex_id = task.check_mutex_unlock_event()
         if mutex_id is not None:
             mutex = self._get_mutex(mutex_id)
+            was_owner = mutex.owner is task
             unblocked_task = mutex.unlock(task)
+            if self._listeners and was_owner:
+                self._emit_release(task, mutex_id, unblocked_task)
             if unblocked_task:
                 # Remove da fila de bloqueados por mutex e volta para prontos
                 self.blocked_mutex_queue.remove(unblocked_task)
@@ -450,13 +679,26 @@ class Simulator:
                 return unblocked_task
         return None
 
+    def _emit_release(self, task: TCB, mutex_id: int, next_owner: Optional[TCB]):
+        """Emite a liberação de um mutex e, se houver, a aquisição pelo próximo dono."""
+        next_owner_id = next_owner.id if next_owner else None
+        self._emit('mutex_release', task_id=task.id, mutex_id=mutex_id, next_owner_id=next_owner_id)
+        if next_owner:
+            self._emit('mutex_acquire', task_id=next_owner.id, mutex_id=mutex_id, handoff=True)
+
     def is_finished(self) -> bool:
         """
         Verifica se a simulação terminou.
         
         Returns:
-            True se todas as tarefas foram concluídas
+            True se todas as tarefas foram concluídas (com fonte de chegadas:
+            fonte esgotada e todas as admitidas concluídas) ou se o horizonte
+            de tempo foi atingido
         """
+        if self.horizon is not None and self.time >= self.horizon:
+            return True
+        if self.source is not None and not self.source.exhausted():
+            return False
         return len(self.done_tasks) == len(self.all_tasks)
     
     def detect_deadlock(self) -> Optional[List[int]]:
@@ -484,8 +726,11 @@ class Simulator:
         if self.blocked_mutex_queue.is_empty():
             return None
         
-        # Verificar se ainda há tarefas para chegar
-        for task in self.all_tasks:
+        # Verificar se ainda há tarefas para chegar (na fonte ou depois do cursor de chegadas)
+        if self.source is not None and not self.source.exhausted():
+            return None
+        for index in range(self._next_arrival, len(self.all_tasks)):
+            task = self.all_tasks[index]
             if task.state == STATE_NEW and task.inicio > self.time:
                 return None  # Ainda há tarefas que vão chegar
         
@@ -540,6 +785,63 @@ class Simulator:
         
         return info
 
+    def _check_quantum_expiry(self):
+        """
+        Verifica preempção por quantum esgotado (Round-Robin ou PRIOPEnv).
+        A tarefa atual volta para o fim da fila de prontos.
+        """
+        if isinstance(self.scheduler, (RoundRobinScheduler, PRIOPEnvScheduler)):
+            if self.current_task and self.scheduler.time_slice_remaining <= 0 and self.current_task.tempo_restante > 0:
+                self.counters.quantum_expiries += 1
+                if self._listeners:
+                    self._emit('quantum_expired', task_id=self.current_task.id)
+                # Quantum esgotado: move tarefa atual para o fim da fila
+                self.ready_queue.remove(self.current_task)
+                self.ready_queue.push_back(self.current_task)
+                # Força troca de contexto
+                self.current_task.state = STATE_READY
+                self.current_task.fimExec = self.time
+                self.current_task.somaExec += (self.time - self.current_task.inicioExec)
+                self.current_task = None
+
+    def _switch_context(self, next_task: Optional[TCB]):
+        """
+        Gerencia a troca de contexto para a tarefa escolhida pelo escalonador.
+        
+        Args:
+            next_task: Tarefa selecionada (ou None para CPU ociosa)
+        """
+        if self.current_task != next_task:
+            # Tarefa atual foi preemptada ou terminou
+            if self.current_task:
+                self.counters.preemptions += 1
+                if self._listeners:
+                    self._emit('preempt', task_id=self.current_task.id,
+                               by_task_id=next_task.id if next_task else None)
+                self.current_task.state = STATE_READY
+                self.current_task.fimExec = self.time
+                self.current_task.somaExec += (self.time - self.current_task.inicioExec)
+            
+            # Nova tarefa entra em execução
+            self.current_task = next_task
+            if self.current_task:
+                self.current_task.state = STATE_RUNNING
+                self.current_task.inicioExec = self.time
+                self.current_task.ativacoes += 1
+                self.counters.context_switches += 1
+                if self._listeners:
+                    self._emit('dispatch', task_id=self.current_task.id)
+                
+                # Reseta quantum para a nova tarefa
+                if hasattr(self.scheduler, 'reset_quantum'):
+                    self.scheduler.reset_quantum()
+
+    def _record_ready_tasks(self):
+        """Registra no Gantt as tarefas prontas (state = READY) que não estão executando."""
+        for task in self.all_tasks:
+            if task.state == STATE_READY and task != self.current_task:
+                self.gantt_data.append((self.time, task.id, task.RGB, "READY"))
+
     def step(self):
         """
         Executa um passo da simulação (1 unidade de tempo).
@@ -566,45 +868,18 @@ class Simulator:
         # 2. Desbloqueia tarefas que completaram I/O
         self._check_io_unblock()
         
-        # Verifica preempção por quantum esgotado (Round-Robin ou PRIOPEnv)
-        if isinstance(self.scheduler, (RoundRobinScheduler, PRIOPEnvScheduler)):
-            if self.current_task and self.scheduler.time_slice_remaining <= 0 and self.current_task.tempo_restante > 0:
-                # Quantum esgotado: move tarefa atual para o fim da fila
-                self.ready_queue.remove(self.current_task)
-                self.ready_queue.push_back(self.current_task)
-                # Força troca de contexto
-                self.current_task.state = STATE_READY
-                self.current_task.fimExec = self.time
-                self.current_task.somaExec += (self.time - self.current_task.inicioExec)
-                self.current_task = None
+        # 3. Verifica preempção por quantum esgotado (Round-Robin ou PRIOPEnv)
+        self._check_quantum_expiry()
         
         # 4. Seleciona a próxima tarefa a executar
         next_task = self.scheduler.select_next_task(self.ready_queue, self.current_task, self.time)
         
         # 5. Gerencia troca de contexto
-        if self.current_task != next_task:
-            # Tarefa atual foi preemptada ou terminou
-            if self.current_task:
-                self.current_task.state = STATE_READY
-                self.current_task.fimExec = self.time
-                self.current_task.somaExec += (self.time - self.current_task.inicioExec)
-            
-            # Nova tarefa entra em execução
-            self.current_task = next_task
-            if self.current_task:
-                self.current_task.state = STATE_RUNNING
-                self.current_task.inicioExec = self.time
-                self.current_task.ativacoes += 1
-                
-                # Reseta quantum para a nova tarefa
-                if hasattr(self.scheduler, 'reset_quantum'):
-                    self.scheduler.reset_quantum()
+        self._switch_context(next_task)
         
         # Registrar tarefas prontas (state = READY) - DEPOIS da troca de contexto
         # Isso garante que tarefas preemptadas também sejam registradas
-        for task in self.all_tasks:
-            if task.state == STATE_READY and task != self.current_task:
-                self.gantt_data.append((self.time, task.id, task.RGB, "READY"))
+        self._record_ready_tasks()
         
         # 6. Executa a tarefa atual
         if self.current_task:
@@ -623,6 +898,8 @@ class Simulator:
                 # NOVO: Reseta prioridade dinâmica após executar (PRIOPEnv)
                 if isinstance(self.scheduler, PRIOPEnvScheduler):
                     self.current_task.prio_d = self.current_task.prio_s
+                    if self.dirty_tasks is not None:
+                        self.dirty_tasks.add(self.current_task.id)
                 
                 # Decrementa quantum (se aplicável)
                 if hasattr(self.scheduler, 'decrement_quantum'):
@@ -647,47 +924,69 @@ class Simulator:
                         self.current_task.fim = self.time + 1
                         self.current_task.fimExec = self.time + 1
                         self.current_task.somaExec += ((self.time + 1) - self.current_task.inicioExec)
+                        self.counters.task_finished(self.current_task)
+                        if self._listeners:
+                            self._emit('finish', task_id=self.current_task.id)
                         
                         # Aplica envelhecimento quando tarefa TERMINA (PRIOPEnv)
                         if isinstance(self.scheduler, PRIOPEnvScheduler):
                             self.scheduler.age_tasks(self.ready_queue)
+                            self._mark_ready_dirty()
                         
                         # Se a tarefa ainda tinha mutex(es), libera todos
                         if self.current_task.held_mutexes:
                             for mutex_id in list(self.current_task.held_mutexes):
                                 mutex = self._get_mutex(mutex_id)
+                                was_owner = mutex.owner is self.current_task
                                 unblocked = mutex.unlock(self.current_task)
+                                if self._listeners and was_owner:
+                                    self._emit_release(self.current_task, mutex_id, unblocked)
                                 if unblocked:
                                     self.blocked_mutex_queue.remove(unblocked)
                                     unblocked.state = STATE_READY
                                     self.ready_queue.push_back(unblocked)
                         
-                        self.done_tasks.append(self.current_task)
                         self.ready_queue.remove(self.current_task)
+                        if self.retire_finished:
+                            self._retire(self.current_task)
+                        else:
+                            self.done_tasks.append(self.current_task)
                         self.current_task = None
         else:
             # CPU ociosa (IDLE)
             self.gantt_data.append((self.time, "IDLE", [200, 200, 200], "IDLE"))
+            self.counters.idle_ticks += 1
         
         # Atualiza tempo de espera por mutex para tarefas bloqueadas
+        self.counters.mutex_wait_ticks += len(self.blocked_mutex_queue)
         for task in self.blocked_mutex_queue:
             task.mutex_wait_time += 1
         
         # Envelhecimento por tick (PRIOPEnv-T): aplica a cada ciclo de clock
         if isinstance(self.scheduler, PRIOPEnvTickScheduler):
             self.scheduler.age_tasks_tick(self.ready_queue, self.current_task)
+            self._mark_ready_dirty()
 
         # 11. Incrementa o relógio
         self.time += 1
+        
+        if self._listeners:
+            deadlocked = self.detect_deadlock()
+            if deadlocked and not self._deadlock_emitted:
+                self._emit('deadlock', task_ids=deadlocked)
+            self._deadlock_emitted = deadlocked is not None
+            self._emit('step')
 
-    def run_full(self) -> bool:
+    def run_full(self, max_iterations: int = 10000) -> bool:
         """
         Executa a simulação completa até todas as tarefas terminarem ou deadlock.
         
+        Args:
+            max_iterations: Limite de segurança de passos executados
+        
         Returns:
             True se terminou normalmente, False se detectou deadlock
         """
-        max_iterations = 10000  # Limite de segurança
         iterations = 0
         
         while not self.is_finished() and iterations < max_iterations:
@@ -719,13 +1018,12 @@ class Simulator:
             }
         }
         
-        total_turnaround = 0
-        total_waiting = 0
-        total_response = 0
-        total_mutex_wait = 0
-        total_mutex_count = 0
+        # Tarefas descartadas (retire_finished) entram só nas médias
+        total_turnaround, total_waiting, total_response, total_mutex_wait, total_mutex_count = self._retired_totals
         
-        for task in self.all_tasks:
+        # Em sistema aberto ou com horizonte, só as tarefas concluídas
+        finished = self.all_tasks if self.source is None and self.horizon is None else self.done_tasks
+        for task in finished:
             turnaround = task.fim - task.inicio  # Tempo total no sistema
             waiting = turnaround - task.duracao  # Tempo esperando (inclui I/O e mutex)
             response = task.inicioExec - task.inicio if task.ativacoes > 0 else 0  # Tempo até primeira execução
@@ -748,7 +1046,7 @@ class Simulator:
             total_mutex_wait += task.mutex_wait_time
             total_mutex_count += task.mutex_wait_count
         
-        n = len(self.all_tasks)
+        n = len(finished) + self.retired_count
         if n > 0:
             stats['avg_turnaround'] = total_turnaround / n
             stats['avg_waiting'] = total_waiting / n
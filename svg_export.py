@@ -0,0 +1,132 @@
+"""
+Exportação do gráfico de Gantt em SVG direto do trace.
+
+A versão antiga (App._save_canvas_as_svg) percorria os itens do Canvas,
+montava um ElementTree inteiro, serializava e reformatava com minidom: o
+documento ficava na memória umas três vezes e a janela precisava estar
+aberta. Aqui o SVG é escrito em streaming, a partir dos intervalos do trace:
+    - ticks consecutivos no mesmo estado viram um único <rect>;
+    - as cores ficam numa folha de estilo (uma classe por tarefa e por
+      estado), não em atributos de cada elemento;
+    - uma janela de tempo [t0, t1) opcional corta o gráfico.
+
+A geometria (margens, altura das linhas, pixels por tick) é a mesma do
+png_render. O trace aceita os mesmos formatos (registros de gantt_data,
+TraceIndex ou intervalos por tarefa).
+
+Uso:
+    export_svg(simulator.gantt_data, "gantt.svg", task_ids=[t.id for t in simulator.all_tasks])
+    export_svg(trace_index, "trecho.svg", t0=1000, t1=2000)
+"""
+
+from bisect import bisect_right
+from typing import IO, Iterable, Optional, Union
+from xml.sax.saxutils import escape
+
+from png_render import (BAR_HALF_HEIGHT, BLOCK_WIDTH, IO_RGB, LEFT_MARGIN, MUTEX_RGB, RIGHT_MARGIN, ROW_HEIGHT,
+                        TOP_MARGIN, gantt_rows)
+
+AXIS_HEIGHT = 40          # Espaço abaixo das linhas para o eixo do tempo
+MIN_LABEL_SPACING = 40    # Pixels mínimos entre rótulos do eixo
+LABEL_X = 10
+
+
+def _hex(rgb) -> str:
+    return "#%02x%02x%02x" % tuple(rgb)
+
+
+def _num(value: float) -> str:
+    """Coordenada sem casas decimais desnecessárias."""
+    return str(int(value)) if value == int(value) else f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _label_step(scale: float) -> int:
+    """Menor passo 1, 2, 5, 10, ... (em ticks) com rótulos a pelo menos MIN_LABEL_SPACING px."""
+    magnitude = 1
+    while True:
+        for factor in (1, 2, 5):
+            if factor * magnitude * scale >= MIN_LABEL_SPACING:
+                return factor * magnitude
+        magnitude *= 10
+
+
+def _task_class(index: int, state: str) -> str:
+    if state == "IO":
+        return "io"
+    if state == "MUTEX":
+        return "mx"
+    if state == "READY":
+        return f"r{index}"
+    return f"t{index}"
+
+
+def export_svg(trace, target: Union[str, IO[str]], task_ids: Optional[Iterable] = None, colors=None,
+               t0: int = 0, t1: Optional[int] = None, scale: float = BLOCK_WIDTH) -> int:
+    """
+    Escreve o Gantt em SVG.
+
+    Args:
+        trace: Registros de gantt_data, TraceIndex ou {tarefa: [(início, fim, estado), ...]}
+        target: Caminho do arquivo ou objeto de arquivo aberto para escrita
+        task_ids: Tarefas a mostrar (padrão: as do trace)
+        colors: Cor de cada tarefa (obrigatória só no formato por intervalos)
+        t0, t1: Janela de tempo [t0, t1) (t1=None: até o fim do trace)
+        scale: Pixels por tick
+
+    Returns:
+        Número de retângulos de intervalo escritos
+    """
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8") as f:
+            return export_svg(trace, f, task_ids, colors, t0, t1, scale)
+
+    rows = gantt_rows(trace, task_ids, colors)
+    if t1 is None:
+        t1 = max((row.ends[-1] for row in rows if row.ends), default=t0)
+    t1 = max(t1, t0)
+    axis_y = TOP_MARGIN + len(rows) * ROW_HEIGHT
+    width = LEFT_MARGIN + (t1 - t0) * scale + RIGHT_MARGIN
+    height = axis_y + AXIS_HEIGHT
+    write = target.write
+
+    write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    write(f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="{_num(width)}" height="{_num(height)}" '
+          f'viewBox="0 0 {_num(width)} {_num(height)}">\n')
+    write("<style>\n")
+    write("rect{stroke:#000}\n.bg{fill:#fff;stroke:none}\n")
+    write(f".io{{fill:{_hex(IO_RGB)}}}\n.mx{{fill:{_hex(MUTEX_RGB)}}}\n")
+    for index, row in enumerate(rows):
+        color = _hex(row.rgb)
+        write(f".t{index}{{fill:{color}}}\n.r{index}{{fill:none;stroke:{color}}}\n")
+    write("text{font-family:Arial,sans-serif;font-size:12px}\n.tick{font-size:9px;text-anchor:middle}\n")
+    write("line{stroke:#000}\n</style>\n")
+    write(f'<rect class="bg" width="{_num(width)}" height="{_num(height)}"/>\n')
+
+    rects = 0
+    bar_height = _num(2 * BAR_HALF_HEIGHT)
+    for index, row in enumerate(rows):
+        center = TOP_MARGIN + index * ROW_HEIGHT + ROW_HEIGHT // 2
+        write(f'<text x="{LABEL_X}" y="{center + 4}">T{escape(str(row.tid))}</text>\n')
+        y = _num(center - BAR_HALF_HEIGHT)
+        write("<g>\n")
+        for i in range(bisect_right(row.ends, t0), len(row.starts)):
+            start, end, state = row.starts[i], row.ends[i], row.states[i]
+            if start >= t1:
+                break
+            start, end = max(start, t0), min(end, t1)
+            x = LEFT_MARGIN + (start - t0) * scale
+            write(f'<rect class="{_task_class(index, state)}" x="{_num(x)}" y="{y}" '
+                  f'width="{_num((end - start) * scale)}" height="{bar_height}"/>\n')
+            rects += 1
+        write("</g>\n")
+
+    # Eixo do tempo: linha e rótulos (1-based, como no Canvas) com passo adaptativo
+    write(f'<line x1="{LEFT_MARGIN}" y1="{axis_y}" x2="{_num(LEFT_MARGIN + (t1 - t0) * scale)}" '
+          f'y2="{axis_y}" stroke-width="2"/>\n<g>\n')
+    step = _label_step(scale)
+    first = (t0 // step + 1) * step
+    for tick in range(first, t1 + 1, step):
+        x = LEFT_MARGIN + (tick - t0 - 0.5) * scale
+        write(f'<text class="tick" x="{_num(x)}" y="{axis_y + 18}">{tick}</text>\n')
+    write("</g>\n</svg>\n")
+    return rects
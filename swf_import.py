@@ -0,0 +1,283 @@
+"""
+Importação de traces no Standard Workload Format (SWF).
+
+O SWF (Parallel Workloads Archive) tem um job por linha, com 18 campos
+numéricos separados por espaços (-1 = desconhecido), precedidos de linhas
+de comentário ';' com o cabeçalho ("; MaxJobs: 1000"). Campos usados:
+
+    1 número do job      -> id da tarefa
+    2 instante de envio  -> ingresso (relativo ao primeiro job, em segundos)
+    4 tempo de execução  -> duração
+    11 status, 12 usuário, 13 grupo, 14 executável,
+    15 fila, 16 partição -> prioridade e cor, conforme as opções
+
+Os tempos são multiplicados por time_scale (ticks por segundo do trace;
+ex.: 1/60 = um tick por minuto), com duração mínima de 1 tick. Jobs sem
+tempo de execução (cancelados antes de rodar, -1) são ignorados e contados
+em SwfTrace.skipped. A cor vem de um campo (por padrão o usuário), com
+matizes bem distribuídos: jobs do mesmo usuário têm a mesma cor.
+
+A leitura é em fluxo, linha a linha (também .swf.gz e entrada padrão):
+swf_source() entrega as tarefas ao simulador conforme ele avança, sem
+carregar o trace inteiro.
+
+Uso:
+    trace = SwfTrace("CTC-SP2-1996-3.1-cln.swf.gz", time_scale=1 / 60)
+    simulator = Simulator(create_scheduler("SRTF"), ArrivalSource(trace), retire_finished=True)
+
+    python swf_import.py trace.swf.gz carga.wlb --time-scale 0.01 --algo SRTF
+    python cli.py trace.swf.gz --stream --algo RR --quantum 5 --time-scale 0.01
+"""
+
+import argparse
+import colorsys
+import contextlib
+import gzip
+import sys
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
+
+from arrival_sources import ArrivalSource
+from config_loader import format_task_line, format_warning
+from tasks import TCB
+from workload_bin import BINARY_SUFFIX, WorkloadWriter
+
+SWF_SUFFIXES = (".swf", ".swf.gz")
+
+# Campos (índice a partir de 0) que podem definir a prioridade e a cor
+SWF_FIELDS = {"job": 0, "status": 10, "user": 11, "group": 12, "executable": 13, "queue": 14, "partition": 15}
+PRIORITY_FIELDS = ("queue", "partition", "user", "group", "none")
+COLOR_FIELDS = ("user", "group", "queue", "partition", "executable", "job")
+
+_GOLDEN_RATIO = 0.618033988749895
+
+
+def is_swf_trace(path: str) -> bool:
+    """Se o caminho é um trace SWF (pela extensão)."""
+    return path.lower().endswith(SWF_SUFFIXES)
+
+
+def field_color(value: int) -> List[int]:
+    """Cor RGB de um valor de campo: matizes pela razão áurea, distintos para valores próximos."""
+    if value < 0:
+        return [128, 128, 128]
+    r, g, b = colorsys.hsv_to_rgb((value * _GOLDEN_RATIO) % 1.0, 0.65, 0.95)
+    return [int(r * 255), int(g * 255), int(b * 255)]
+
+
+class SwfTrace:
+    """
+    Tarefas de um trace SWF, lidas sob demanda.
+
+    Iterável (uma passada por arquivo aberto: caminho, "-" ou objeto de
+    arquivo). O cabeçalho fica em header depois de lida a primeira tarefa
+    (ou após read_header()).
+    """
+
+    def __init__(self, trace: Union[str, IO[str]], time_scale: float = 1.0, priority: str = "queue",
+                 colors: str = "user", rebase: bool = True, limit: Optional[int] = None):
+        """
+        Args:
+            trace: Caminho (.swf ou .swf.gz), "-" (entrada padrão) ou arquivo de texto
+            time_scale: Ticks por segundo do trace
+            priority: Campo usado como prioridade estática ('none' = 0 para todos)
+            colors: Campo que define a cor da tarefa
+            rebase: Ingressos relativos ao envio do primeiro job (senão, o instante do trace)
+            limit: Número máximo de tarefas (None = todas)
+        """
+        if time_scale <= 0:
+            raise ValueError("A escala de tempo deve ser positiva")
+        if priority not in PRIORITY_FIELDS:
+            raise ValueError(f"Campo de prioridade inválido: {priority} (use {', '.join(PRIORITY_FIELDS)})")
+        if colors not in COLOR_FIELDS:
+            raise ValueError(f"Campo de cor inválido: {colors} (use {', '.join(COLOR_FIELDS)})")
+        self.trace = trace
+        self.time_scale = time_scale
+        self.priority = priority
+        self.colors = colors
+        self.rebase = rebase
+        self.limit = limit
+        self.header: Dict[str, str] = {}
+        self.read = 0      # Jobs convertidos em tarefas
+        self.skipped = 0   # Jobs ignorados (sem tempo de execução)
+        self._file: Optional[IO[str]] = None
+        self._owned = False
+        self._pending: Optional[Tuple[int, str]] = None  # Primeira linha de dados, lida por read_header()
+        self._line = 0
+
+    def _open(self) -> IO[str]:
+        if self._file is None:
+            if self.trace == "-":
+                self._file = sys.stdin
+            elif isinstance(self.trace, str):
+                opener = gzip.open if self.trace.lower().endswith(".gz") else open
+                self._file = opener(self.trace, "rt", encoding="utf-8", errors="replace")
+                self._owned = True
+            else:
+                self._file = self.trace
+        return self._file
+
+    def close(self):
+        """Fecha o arquivo, se foi aberto por esta instância."""
+        if self._owned and self._file is not None:
+            self._file.close()
+        self._owned = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_header(self) -> Dict[str, str]:
+        """Lê os comentários iniciais ("; Chave: valor") até a primeira linha de dados."""
+        f = self._open()
+        while self._pending is None:
+            raw = f.readline()
+            if not raw:
+                break
+            self._line += 1
+            line = raw.strip()
+            if not line:
+                continue
+            if line.startswith(";"):
+                key, sep, value = line[1:].partition(":")
+                if sep and key.strip():
+                    self.header[key.strip()] = value.strip()
+                continue
+            self._pending = (self._line, line)
+        return self.header
+
+    def _lines(self) -> Iterator[Tuple[int, str]]:
+        self.read_header()
+        if self._pending is not None:
+            yield self._pending
+            self._pending = None
+        for raw in self._file:
+            self._line += 1
+            line = raw.strip()
+            if line and not line.startswith(";"):
+                yield self._line, line
+
+    def __iter__(self) -> Iterator[TCB]:
+        scale = self.time_scale
+        prio_index = SWF_FIELDS.get(self.priority)
+        color_index = SWF_FIELDS[self.colors]
+        base = None
+        colors: Dict[int, List[int]] = {}
+        try:
+            for line_number, line in self._lines():
+                if self.limit is not None and self.read >= self.limit:
+                    break
+                fields = line.split()
+                try:
+                    job = int(fields[0])
+                    submit = float(fields[1])
+                    run_time = float(fields[3])
+                    prio = _int_field(fields, prio_index) if prio_index is not None else 0
+                    key = _int_field(fields, color_index)
+                except (ValueError, IndexError):
+                    print(format_warning(line_number, f"ignorando job mal formatado: '{line}'"))
+                    continue
+                if run_time <= 0 or submit < 0:
+                    self.skipped += 1
+                    continue
+                if base is None:
+                    base = submit if self.rebase else 0.0
+                color = colors.get(key)
+                if color is None:
+                    color = field_color(key)
+                    if self.colors != "job":
+                        # Poucos usuários/filas: uma cor calculada por valor
+                        colors[key] = color
+                prio = max(prio, 0)
+                self.read += 1
+                yield TCB(id=job, RGB=list(color), inicio=int((submit - base) * scale),
+                          duracao=max(1, round(run_time * scale)), prio_s=prio, prio_d=prio)
+        finally:
+            self.close()
+
+
+def _int_field(fields: List[str], index: int) -> int:
+    """Valor inteiro de um campo, -1 se ausente (linhas com menos de 18 campos)."""
+    if index >= len(fields):
+        return -1
+    return int(float(fields[index]))
+
+
+def swf_source(trace: Union[str, IO[str]], **options) -> ArrivalSource:
+    """Trace SWF como fonte de chegadas do simulador (opções de SwfTrace)."""
+    return ArrivalSource(SwfTrace(trace, **options))
+
+
+def convert(trace: SwfTrace, target: Union[str, IO[str]], algo: str = "FIFO", quantum: Optional[int] = None,
+            alpha: Optional[int] = None) -> int:
+    """
+    Grava o trace como configuração de texto ou carga binária (.wlb), em fluxo.
+
+    Returns:
+        Número de tarefas gravadas
+    """
+    if isinstance(target, str) and target.endswith(BINARY_SUFFIX):
+        with WorkloadWriter(target, algo, quantum, alpha) as writer:
+            for task in trace:
+                writer.add(task)
+        return writer.count
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8") as f:
+            return convert(trace, f, algo, quantum, alpha)
+    settings = [algo, "" if quantum is None else str(quantum)]
+    if alpha is not None:
+        settings.append(str(alpha))
+    target.write(";".join(settings) + "\n")
+    count = 0
+    for task in trace:
+        target.write(format_task_line(task) + "\n")
+        count += 1
+    return count
+
+
+def add_trace_arguments(parser: argparse.ArgumentParser):
+    """Opções de conversão do trace (compartilhadas com cli.py)."""
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="Ticks por segundo do trace SWF (ex.: 0.0167 = um tick por minuto)")
+    parser.add_argument("--swf-priority", choices=PRIORITY_FIELDS, default="queue",
+                        help="Campo SWF usado como prioridade (padrão: queue)")
+    parser.add_argument("--swf-colors", choices=COLOR_FIELDS, default="user",
+                        help="Campo SWF que define a cor das tarefas (padrão: user)")
+
+
+def trace_from_args(path: str, args) -> SwfTrace:
+    return SwfTrace(path, time_scale=args.time_scale, priority=args.swf_priority, colors=args.swf_colors,
+                    limit=getattr(args, "limit", None))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Converte traces SWF em cargas de trabalho do simulador")
+    parser.add_argument("trace", help="Trace SWF (.swf, .swf.gz ou - para a entrada padrão)")
+    parser.add_argument("saida", help="Arquivo gerado (.wlb = binário, demais = texto; - = saída padrão)")
+    parser.add_argument("--algo", default="FIFO", help="Algoritmo gravado na configuração")
+    parser.add_argument("--quantum", type=int)
+    parser.add_argument("--alpha", type=int)
+    parser.add_argument("--limit", type=int, help="Converte só os primeiros N jobs")
+    add_trace_arguments(parser)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    target = sys.stdout if args.saida == "-" else args.saida
+    try:
+        trace = trace_from_args(args.trace, args)
+        # Com a carga na saída padrão, os avisos vão para a saída de erro
+        with contextlib.redirect_stdout(sys.stderr) if args.saida == "-" else contextlib.nullcontext():
+            count = convert(trace, target, args.algo.upper(), args.quantum, args.alpha)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    if args.saida != "-":
+        print(f"{count} tarefas gravadas em {args.saida} ({trace.skipped} jobs ignorados)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
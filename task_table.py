@@ -0,0 +1,152 @@
+"""
+Tabela de tarefas virtualizada da janela principal.
+
+A tabela mostra milhares de tarefas usando um ttk.Treeview com uma
+quantidade fixa de linhas (as visíveis). Rolar apenas troca os valores
+dessas linhas; passos da simulação atualizam só as células das linhas
+visíveis cujas tarefas estão no conjunto "sujo" informado pelo simulador
+(Simulator.take_dirty_tasks()). Nenhuma operação percorre a lista inteira
+de tarefas, exceto a ordenação por ID ao carregar.
+
+Uso:
+    tree = ttk.Treeview(frame, columns=[c for c, _, _ in COLUMNS], show="headings", height=TABLE_ROWS)
+    table = VirtualTaskTable(tree, scrollbar)
+    table.set_tasks(simulator.all_tasks, show_prio_d=True)   # ao carregar
+    table.refresh(simulator.take_dirty_tasks())              # a cada passo
+"""
+
+from typing import List, Optional, Sequence
+
+TABLE_ROWS = 6  # Linhas visíveis
+
+# (coluna, título, largura)
+COLUMNS = (
+    ("id", "ID", 60),
+    ("cor", "Cor", 70),
+    ("inicio", "Chegada", 70),
+    ("duracao", "Duração", 70),
+    ("prio_s", "Prioridade", 80),
+    ("prio_d", "PrioD", 60),
+    ("io", "I/O Events", 240),
+)
+COLUMN_IDS = tuple(c for c, _, _ in COLUMNS)
+
+
+def task_row(task) -> tuple:
+    """Valores de uma linha da tabela, na ordem de COLUMNS."""
+    io_str = ", ".join(f"{t}-{d}" for t, d in task.io_events) if task.io_events else ""
+    color = f"{task.RGB[0]:02x}{task.RGB[1]:02x}{task.RGB[2]:02x}"
+    return (task.id, color, task.inicio, task.duracao, task.prio_s, task.prio_d, io_str)
+
+
+class VirtualTaskTable:
+    """
+    Janela de TABLE_ROWS linhas sobre uma lista de tarefas ordenada por ID.
+
+    Args:
+        tree: ttk.Treeview com as colunas COLUMN_IDS
+        scrollbar: Barra de rolagem vertical (opcional); seu `command`
+            deve ser `table.yview`
+        rows: Quantidade de linhas visíveis
+    """
+
+    def __init__(self, tree, scrollbar=None, rows: int = TABLE_ROWS):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows = rows
+        self.offset = 0
+        self.show_prio_d = False
+        self.cell_writes = 0  # Células escritas (para testes e medições)
+        self.source = None    # Lista recebida em set_tasks
+        self._tasks: List = []
+        self._slots: List[str] = []
+        self._shown: List[Optional[tuple]] = []
+
+    def set_tasks(self, tasks: Sequence, show_prio_d: bool = False):
+        """Troca (ou recarrega, após edições) a lista de tarefas exibida."""
+        self.source = tasks
+        self._tasks = sorted(tasks, key=lambda t: t.id)
+        if show_prio_d != self.show_prio_d or not self._slots:
+            self.show_prio_d = show_prio_d
+            self.tree.configure(displaycolumns=[c for c in COLUMN_IDS if show_prio_d or c != "prio_d"])
+        self.offset = min(self.offset, self._max_offset())
+        self._render(None)
+
+    def refresh(self, dirty_ids: Optional[set] = None):
+        """
+        Atualiza as linhas visíveis.
+
+        Args:
+            dirty_ids: Ids das tarefas que mudaram; None atualiza todas as visíveis
+        """
+        if dirty_ids is not None and not dirty_ids:
+            return
+        self._render(dirty_ids)
+
+    def task_at(self, iid) -> Optional[object]:
+        """Id da tarefa mostrada numa linha do Treeview (ou None)."""
+        try:
+            shown = self._shown[self._slots.index(iid)]
+        except ValueError:
+            return None
+        return shown[0] if shown else None
+
+    def yview(self, *args):
+        """Comando da barra de rolagem ('moveto', fração) ou ('scroll', n, 'units'|'pages')."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            offset = int(round(float(args[1]) * len(self._tasks)))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            offset = self.offset + (amount * self.rows if args[2] == "pages" else amount)
+        else:
+            return
+        self.scroll_to(offset)
+
+    def scroll_to(self, offset: int):
+        """Mostra as linhas a partir de `offset`."""
+        offset = max(0, min(offset, self._max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self._render(None)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _max_offset(self) -> int:
+        return max(0, len(self._tasks) - self.rows)
+
+    def _ensure_slots(self):
+        """Cria as linhas fixas do Treeview na primeira renderização."""
+        while len(self._slots) < self.rows:
+            self._slots.append(self.tree.insert("", "end", values=()))
+            self._shown.append(None)
+
+    def _render(self, dirty_ids: Optional[set]):
+        self._ensure_slots()
+        window = self._tasks[self.offset:self.offset + self.rows]
+        for index, slot in enumerate(self._slots):
+            task = window[index] if index < len(window) else None
+            shown = self._shown[index]
+            if task is None:
+                if shown is not None:
+                    self.tree.item(slot, values=())
+                    self._shown[index] = None
+                continue
+            if dirty_ids is not None and shown is not None and shown[0] == task.id and task.id not in dirty_ids:
+                continue
+            row = task_row(task)
+            if shown is None:
+                self.tree.item(slot, values=row)
+                self.cell_writes += len(row)
+            else:
+                for column, old, new in zip(COLUMN_IDS, shown, row):
+                    if old != new:
+                        self.tree.set(slot, column, new)
+                        self.cell_writes += 1
+            self._shown[index] = row
+        if self.scrollbar is not None:
+            total = max(len(self._tasks), 1)
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
@@ -0,0 +1,216 @@
+"""
+Testes para as fontes de chegada (sistema aberto).
+
+Verifica:
+1. Simulação com fonte de chegadas igual à simulação com a lista completa
+2. Fonte fora de ordem (janela de reordenação), horizonte de tempo e deadlock com tarefas por chegar
+3. Fluxo de Poisson infinito com tarefas descartadas (memória constante)
+4. Voltar no tempo depois de admitir tarefas da fonte
+5. Configuração lida sob demanda (arquivo, carga binária e linha de comando)
+
+Execute com: python3 tests_arrival_sources.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import cli
+from arrival_sources import ArrivalSource, mapped_source, open_config_source, poisson_source
+from benchmark import generate_workload
+from scheduler import create_scheduler
+from simulador import Simulator
+from tasks import TCB
+from workload_bin import MappedWorkload, write_workload
+
+CONFIG = """RR;2
+t01;#ff0000;0;5;2;IO:2-1;ML01:1;MU01:3
+t02;00ff00;1;3;1
+t04;#123456;1;2;0;IO:1-1;IO:3-2
+t03;#0000ff;4;6;2;ML01:0;MU01:2
+"""
+
+
+def _sorted_workload(n_tasks, mix, seed):
+    return sorted(generate_workload(n_tasks, mix, seed=seed), key=lambda t: t.inicio)
+
+
+class TestArrivalSource(unittest.TestCase):
+    """Testes da fonte e do simulador em sistema aberto."""
+
+    def test_matches_task_list(self):
+        for algo, mix in (("RR", "io"), ("PRIOPENV", "mutex"), ("SRTF", "cpu")):
+            with self.subTest(algo=algo, mix=mix):
+                expected = Simulator(create_scheduler(algo, quantum=2, alpha=1), _sorted_workload(50, mix, 3))
+                source = ArrivalSource(iter(_sorted_workload(50, mix, 3)))
+                simulator = Simulator(create_scheduler(algo, quantum=2, alpha=1), source)
+                self.assertEqual(simulator.all_tasks, [])
+                self.assertTrue(expected.run_full(max_iterations=100000))
+                self.assertTrue(simulator.run_full(max_iterations=100000))
+                self.assertEqual(simulator.gantt_data, expected.gantt_data)
+                stats, full = simulator.get_statistics(), expected.get_statistics()
+                # Em sistema aberto as tarefas aparecem na ordem de conclusão
+                self.assertEqual(sorted(stats.pop('tasks'), key=lambda t: t['id']),
+                                 sorted(full.pop('tasks'), key=lambda t: t['id']))
+                self.assertEqual(stats, full)
+                self.assertEqual(source.taken, 50)
+
+    def test_out_of_order_and_horizon(self):
+        tasks = [TCB(id=1, RGB=[0, 0, 0], inicio=5, duracao=2), TCB(id=2, RGB=[0, 0, 0], inicio=3, duracao=2)]
+        simulator = Simulator(create_scheduler("FIFO"), ArrivalSource(tasks))
+        with self.assertRaises(ValueError):
+            simulator.run_full()
+        # Com janela, tarefas fora de ordem são entregues por ingresso (empates na ordem da fonte)
+        shuffled = [TCB(id=tid, RGB=[0, 0, 0], inicio=inicio, duracao=1)
+                    for tid, inicio in ((1, 4), (2, 1), (3, 4), (4, 0), (5, 9), (6, 6))]
+        self.assertEqual([t.id for t in ArrivalSource(shuffled, window=3)], [4, 2, 1, 3, 6, 5])
+        with self.assertRaises(ValueError):
+            list(ArrivalSource(shuffled, window=1))
+        with self.assertRaises(ValueError):
+            ArrivalSource(shuffled, window=-1)
+
+        simulator = Simulator(create_scheduler("FIFO"), poisson_source(0.5, seed=1), horizon=200)
+        self.assertTrue(simulator.run_full(max_iterations=1000))
+        self.assertEqual(simulator.time, 200)
+        stats = simulator.get_statistics()
+        self.assertEqual(len(stats['tasks']), len(simulator.done_tasks))
+        self.assertLess(len(simulator.done_tasks), len(simulator.all_tasks))
+        self.assertTrue(all(t['completion'] > 0 for t in stats['tasks']))
+
+    def test_deadlock_waits_for_source(self):
+        tasks = [TCB(id=1, RGB=[0, 0, 0], inicio=0, duracao=4, ml_events=[(1, 0), (2, 1)], mu_events=[(2, 2)]),
+                 TCB(id=2, RGB=[0, 0, 0], inicio=0, duracao=4, ml_events=[(2, 0), (1, 1)], mu_events=[(1, 2)]),
+                 TCB(id=3, RGB=[0, 0, 0], inicio=30, duracao=1)]
+        simulator = Simulator(create_scheduler("RR", quantum=1), ArrivalSource(tasks))
+        for _ in range(10):
+            simulator.step()
+        self.assertIsNone(simulator.detect_deadlock())
+        self.assertFalse(simulator.run_full(max_iterations=100))
+        self.assertEqual(sorted(simulator.detect_deadlock()), [1, 2])
+        self.assertEqual(simulator.time, 31)
+
+    def test_infinite_poisson_retired(self):
+        """Testa que, descartando as concluídas, a memória não cresce com o fluxo."""
+        simulator = Simulator(create_scheduler("RR", quantum=3), poisson_source(0.15, mean_duration=5, seed=9),
+                              retire_finished=True)
+        self.assertEqual(simulator.max_history, 0)
+        peak = 0
+        for _ in range(20000):
+            simulator.step()
+            del simulator.gantt_data[:]
+            peak = max(peak, len(simulator.all_tasks))
+        self.assertFalse(simulator.is_finished())
+        self.assertGreater(simulator.retired_count, 2500)
+        self.assertLess(peak, 100)
+        self.assertEqual(simulator.done_tasks, [])
+        self.assertEqual(len(simulator._tasks_by_id), len(simulator.all_tasks))
+        stats = simulator.get_statistics()
+        counters = simulator.counters
+        self.assertEqual(counters.completed, simulator.retired_count)
+        self.assertAlmostEqual(stats['avg_turnaround'], counters.sum_turnaround / counters.completed)
+        self.assertAlmostEqual(stats['avg_waiting'], counters.sum_waiting / counters.completed)
+        with self.assertRaises(ValueError):
+            Simulator(create_scheduler("RR", quantum=3), [], retire_finished=True)
+
+    def test_retired_run_matches_statistics(self):
+        expected = Simulator(create_scheduler("PRIOPENV", quantum=2, alpha=1), _sorted_workload(40, "mutex", 6))
+        simulator = Simulator(create_scheduler("PRIOPENV", quantum=2, alpha=1),
+                              ArrivalSource(_sorted_workload(40, "mutex", 6)), retire_finished=True)
+        expected.run_full(max_iterations=100000)
+        self.assertTrue(simulator.run_full(max_iterations=100000))
+        self.assertEqual((simulator.all_tasks, simulator.task_count), ([], 40))
+        stats, full = simulator.get_statistics(), expected.get_statistics()
+        for key in ('avg_turnaround', 'avg_waiting', 'avg_response', 'avg_mutex_wait', 'mutex_info'):
+            self.assertEqual(stats[key], full[key])
+        self.assertEqual(simulator.gantt_data, expected.gantt_data)
+
+    def test_restore_before_admission(self):
+        simulator = Simulator(create_scheduler("RR", quantum=2), ArrivalSource(_sorted_workload(30, "mutex", 8)))
+        simulator.max_history = 10 ** 6
+        early = None
+        for _ in range(40):
+            if simulator.time == 10:
+                early = simulator.capture_state()
+            simulator.step()
+        simulator.run_full(max_iterations=100000)
+        expected = list(simulator.gantt_data)
+        stats = simulator.get_statistics()
+        admitted = len(simulator.all_tasks)
+        simulator.restore_state(early)
+        self.assertEqual(len(simulator.all_tasks), admitted)
+        simulator.run_full(max_iterations=100000)
+        self.assertEqual(simulator.gantt_data, expected)
+        while simulator.step_back():
+            pass
+        self.assertEqual(simulator.time, 0)
+        simulator.run_full(max_iterations=100000)
+        self.assertEqual(simulator.gantt_data, expected)
+        self.assertEqual(simulator.get_statistics(), stats)
+
+
+class TestConfigSource(unittest.TestCase):
+    """Testes das fontes lidas de arquivo."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmp.name, "config.txt")
+        with open(self.config, "w", encoding="utf-8") as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_config_and_mapped_sources(self):
+        algo, quantum, alpha, source = open_config_source(self.config)
+        self.assertEqual((algo, quantum, alpha, source.next_arrival()), ("RR", 2, None, 0))
+        streamed = Simulator(create_scheduler(algo, quantum), source)
+        streamed.run_full()
+        self.assertTrue(source.exhausted())
+
+        binary = os.path.join(self.tmp.name, "carga.wlb")
+        _, _, _, tasks = open_config_source(io.StringIO(CONFIG))
+        write_workload(binary, "RR", 2, None, tasks)
+        with MappedWorkload(binary) as workload:
+            mapped = Simulator(create_scheduler("RR", 2), mapped_source(workload))
+            mapped.run_full()
+        self.assertEqual(mapped.gantt_data, streamed.gantt_data)
+
+    def test_cli_stream(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(cli.main([self.config, "--quiet", "--no-cache"]), 0)
+            self.assertEqual(cli.main([self.config, "--stream"]), 0)
+            with mock.patch("sys.stdin", io.StringIO(CONFIG)):
+                self.assertEqual(cli.main(["-", "--stream"]), 0)
+        reports = [block for block in out.getvalue().split("Tempo final") if block.strip()]
+        self.assertEqual(len(reports), 3)
+        self.assertEqual(reports[0], reports[1])
+        self.assertEqual(reports[1], reports[2])
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(cli.main([self.config, "--horizon", "5", "--quiet", "--no-cache"]), 0)
+        self.assertIn("Tempo final: 5", out.getvalue())
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(cli.main([self.config, "--stream", "--png", "x.png"]), 2)
+
+    def test_cli_stream_out_of_order(self):
+        """Testa arquivos fora de ordem: reordenados na janela, ou erro sem traceback."""
+        shuffled = CONFIG.splitlines()
+        shuffled = "\n".join(shuffled[:1] + shuffled[:0:-1]) + "\n"
+        with open(self.config, "w", encoding="utf-8") as f:
+            f.write(shuffled)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(cli.main([self.config, "--quiet", "--no-cache"]), 0)
+            self.assertEqual(cli.main([self.config, "--stream"]), 0)
+        reports = [block for block in out.getvalue().split("Tempo final") if block.strip()]
+        self.assertEqual(reports[0], reports[1])
+        with mock.patch("cli.open_config_source", lambda config: open_config_source(config, window=0)), \
+                contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(cli.main([self.config, "--stream"]), 1)
+        self.assertTrue(err.getvalue().startswith("Erro: Fonte de chegadas fora de ordem"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
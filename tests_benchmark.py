@@ -0,0 +1,107 @@
+"""
+Testes para o benchmark dos escalonadores.
+
+Verifica:
+1. Geração determinística de cargas (mesma semente, mesmas tarefas)
+2. Eventos de I/O e mutex válidos para cada mix
+3. Medição de um caso pequeno
+4. Comparação com linha de base aponta regressões
+
+Execute com: python3 tests_benchmark.py
+"""
+
+import unittest
+
+from benchmark import generate_workload, benchmark_case, compare_results, MIXES
+from scheduler import create_scheduler
+from simulador import Simulator
+
+
+def _signature(tasks):
+    """Resume uma lista de tarefas para comparação."""
+    return [(t.id, t.inicio, t.duracao, t.prio_s, t.io_events, t.ml_events, t.mu_events) for t in tasks]
+
+
+class TestGenerateWorkload(unittest.TestCase):
+    """Testes do gerador de cargas do benchmark."""
+
+    def test_same_seed_same_workload(self):
+        """Testa que a mesma semente gera a mesma carga."""
+        for mix in MIXES:
+            self.assertEqual(_signature(generate_workload(50, mix, seed=7)),
+                             _signature(generate_workload(50, mix, seed=7)))
+
+    def test_different_seed_changes_workload(self):
+        """Testa que sementes diferentes geram cargas diferentes."""
+        self.assertNotEqual(_signature(generate_workload(50, "cpu", seed=1)),
+                            _signature(generate_workload(50, "cpu", seed=2)))
+
+    def test_io_events_within_duration(self):
+        """Testa que os I/Os ocorrem dentro da execução da tarefa."""
+        for task in generate_workload(200, "io"):
+            self.assertTrue(task.io_events)
+            for tempo, duracao in task.io_events:
+                self.assertTrue(0 < tempo < task.duracao)
+                self.assertGreater(duracao, 0)
+
+    def test_mutex_sections_are_balanced(self):
+        """Testa que cada lock tem unlock posterior no mesmo mutex."""
+        for task in generate_workload(200, "mutex"):
+            (ml_id, lock_at), = task.ml_events
+            (mu_id, unlock_at), = task.mu_events
+            self.assertEqual(ml_id, mu_id)
+            self.assertLess(lock_at, unlock_at)
+            self.assertLessEqual(unlock_at, task.duracao)
+
+    def test_mutex_workload_completes(self):
+        """Testa que a carga com mutex não gera deadlock."""
+        simulator = Simulator(create_scheduler("RR", quantum=2), generate_workload(30, "mutex"))
+        self.assertTrue(simulator.run_full())
+
+    def test_invalid_mix(self):
+        """Testa que mix desconhecido gera ValueError."""
+        with self.assertRaises(ValueError):
+            generate_workload(10, "gpu")
+
+
+class TestBenchmarkCase(unittest.TestCase):
+    """Testes da medição de um caso."""
+
+    def test_case_metrics(self):
+        """Testa que um caso pequeno produz todas as métricas."""
+        case = benchmark_case("FIFO", 10, "cpu", repeat=1)
+        self.assertTrue(case['finished'])
+        self.assertGreater(case['ticks'], 0)
+        self.assertGreater(case['ticks_per_sec'], 0)
+        for key in ('peak_memory_kb', 'save_state_overhead', 'trace_overhead'):
+            self.assertIn(key, case)
+
+
+class TestCompareResults(unittest.TestCase):
+    """Testes da comparação com a linha de base."""
+
+    def _result(self, ticks_per_sec, memory):
+        return {'results': [{'algo': 'RR', 'mix': 'cpu', 'n_tasks': 10,
+                             'ticks_per_sec': ticks_per_sec, 'peak_memory_kb': memory}]}
+
+    def test_no_regression_within_threshold(self):
+        """Testa que variações pequenas não são apontadas."""
+        self.assertEqual(compare_results(self._result(1000, 100), self._result(950, 105), 0.10), [])
+
+    def test_throughput_regression(self):
+        """Testa que queda de vazão acima do limiar é apontada."""
+        regressions = compare_results(self._result(1000, 100), self._result(800, 100), 0.10)
+        self.assertEqual([r['metric'] for r in regressions], ['ticks_per_sec'])
+
+    def test_memory_regression(self):
+        """Testa que aumento de memória acima do limiar é apontado."""
+        regressions = compare_results(self._result(1000, 100), self._result(1000, 150), 0.10)
+        self.assertEqual([r['metric'] for r in regressions], ['peak_memory_kb'])
+
+    def test_improvement_is_not_regression(self):
+        """Testa que melhorias não são apontadas."""
+        self.assertEqual(compare_results(self._result(1000, 100), self._result(2000, 50), 0.10), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,177 @@
+"""
+Testes para breakpoints e "executar até".
+
+Verifica:
+1. Para no fim do passo do evento pedido (tarefa, mutex, tempo, fila, deadlock)
+2. Continuar de novo vai para o próximo disparo
+3. Condições de estado disparam só na subida
+4. Voltar ao disparo anterior chega ao mesmo estado da ida
+5. Eventos novos do simulador (chegada, I/O, término)
+6. A thread de execução para no breakpoint
+7. Disparos pendentes não se acumulam numa execução sem paradas
+
+Execute com: python3 tests_breakpoints.py
+"""
+
+import unittest
+from functools import partial
+
+from breakpoints import BreakpointSet, Breakpoint, at_time, ready_longer_than
+from keyframes import KeyframeIndex
+from scheduler import create_scheduler
+from sim_worker import SimulationWorker
+from simulador import Simulator
+from tasks import TCB
+from tests_helpers import make_simulator
+
+
+_make_simulator = partial(make_simulator, n_tasks=25, mix="mutex", seed=6)
+
+
+def _event_ticks(mix, event, **match):
+    """Tempos (fim do passo) de todos os eventos pedidos numa execução completa."""
+    simulator = _make_simulator(mix=mix)
+    found = []
+
+    def listener(name, time, info):
+        if name == event and all(info.get(k) == v for k, v in match.items()):
+            found.append(time + 1)
+    simulator.add_listener(listener)
+    simulator.run_full()
+    return found
+
+
+class TestRunUntil(unittest.TestCase):
+    """Testes de execução até um breakpoint."""
+
+    def test_stops_at_each_dispatch(self):
+        """Testa que cada continuar para no próximo despacho da tarefa."""
+        expected = _event_ticks("io", 'dispatch', task_id=3)
+        simulator = _make_simulator(mix="io")
+        breakpoints = BreakpointSet(simulator, [Breakpoint('dispatch', task_id=3)])
+        stops = []
+        while True:
+            hits = breakpoints.run_until()
+            if not hits:
+                break
+            self.assertEqual(hits[0].info['task_id'], 3)
+            stops.append(simulator.time)
+        self.assertEqual(stops, expected)
+        self.assertTrue(simulator.is_finished())
+        self.assertEqual(breakpoints.breakpoints[0].hits, len(expected))
+
+    def test_mutex_contention(self):
+        expected = _event_ticks("mutex", 'mutex_contended', mutex_id=1)
+        self.assertTrue(expected)
+        simulator = _make_simulator(mix="mutex")
+        breakpoints = BreakpointSet(simulator, [Breakpoint('mutex_contended', mutex_id=1)])
+        hits = breakpoints.run_until()
+        self.assertEqual(simulator.time, expected[0])
+        self.assertEqual(hits[0].info['mutex_id'], 1)
+
+    def test_time_and_queue(self):
+        """Testa tempo exato e fila de prontos (só na subida)."""
+        simulator = _make_simulator(mix="cpu", n_tasks=40)
+        breakpoints = BreakpointSet(simulator, [at_time(17)])
+        breakpoints.run_until()
+        self.assertEqual(simulator.time, 17)
+
+        breakpoints.clear()
+        breakpoints.add(ready_longer_than(5))
+        previous = None
+        while breakpoints.run_until():
+            self.assertGreater(len(simulator.ready_queue), 5)
+            if previous is not None:
+                # Entre dois disparos a fila voltou a ficar <= 5
+                self.assertGreater(simulator.time, previous + 1)
+            previous = simulator.time
+
+    def test_deadlock(self):
+        t1 = TCB(id=1, RGB=[0, 0, 0], inicio=0, duracao=5, ml_events=[(1, 0), (2, 2)], mu_events=[(1, 4), (2, 4)])
+        t2 = TCB(id=2, RGB=[0, 0, 0], inicio=0, duracao=5, ml_events=[(2, 0), (1, 2)], mu_events=[(1, 4), (2, 4)])
+        simulator = Simulator(create_scheduler("RR", quantum=1), [t1, t2])
+        breakpoints = BreakpointSet(simulator, [Breakpoint('deadlock', task_id=2)])
+        hits = breakpoints.run_until()
+        self.assertEqual([hit.event for hit in hits], ['deadlock'])
+        self.assertTrue(simulator.is_deadlocked())
+
+    def test_new_events(self):
+        """Testa chegada, entrada/saída de I/O e término."""
+        task = TCB(id=1, RGB=[0, 0, 0], inicio=2, duracao=4, io_events=[(1, 3)])
+        simulator = Simulator(create_scheduler("FIFO"), [task])
+        breakpoints = BreakpointSet(simulator, [Breakpoint(event, task_id=1) for event in
+                                                ('arrival', 'io_block', 'io_unblock', 'finish')])
+        stops = []
+        while True:
+            hits = breakpoints.run_until()
+            if not hits:
+                break
+            stops.extend((simulator.time, hit.event) for hit in hits)
+        # Chega e entra em I/O no mesmo passo: os dois disparos são informados
+        self.assertEqual(stops[:2], [(3, 'arrival'), (3, 'io_block')])
+        self.assertEqual([event for _, event in stops[2:]], ['io_unblock', 'finish'])
+        self.assertEqual(stops[-1][0], task.fim)
+
+    def test_pending_only_last_step(self):
+        """Testa que, executando sem run_until, pending guarda só os disparos do último passo."""
+        expected = _event_ticks("io", 'dispatch', task_id=3)
+        simulator = _make_simulator(mix="io")
+        breakpoints = BreakpointSet(simulator, [Breakpoint('dispatch', task_id=3)])
+        largest = 0
+        while not simulator.is_finished():
+            simulator.step()
+            largest = max(largest, len(breakpoints.pending))
+            self.assertEqual(bool(breakpoints.pending), simulator.time in expected)
+        self.assertEqual(largest, 1)
+        self.assertEqual(breakpoints.breakpoints[0].hits, len(expected))
+
+    def test_unknown_event(self):
+        with self.assertRaises(ValueError):
+            Breakpoint('explode')
+        with self.assertRaises(ValueError):
+            Breakpoint('dispatch', time=3)
+
+
+class TestReverseContinue(unittest.TestCase):
+    """Testes de voltar ao disparo anterior."""
+
+    def test_matches_forward_stops(self):
+        """Testa que voltar para nos mesmos tempos e estados da ida."""
+        simulator = _make_simulator(mix="mutex")
+        keyframes = KeyframeIndex(simulator, interval=16, adaptive=False)
+        breakpoints = BreakpointSet(simulator, [Breakpoint('mutex_acquire', mutex_id=1)])
+        forward = []
+        while breakpoints.run_until():
+            forward.append((simulator.time, len(simulator.gantt_data), simulator.counters.snapshot()))
+        self.assertGreater(len(forward), 1)
+        backward = []
+        while breakpoints.reverse_continue(keyframes):
+            backward.append((simulator.time, len(simulator.gantt_data), simulator.counters.snapshot()))
+        self.assertEqual(backward, forward[::-1])
+
+    def test_no_previous_keeps_position(self):
+        simulator = _make_simulator(mix="io")
+        keyframes = KeyframeIndex(simulator, interval=16, adaptive=False)
+        breakpoints = BreakpointSet(simulator, [at_time(5)])
+        for _ in range(40):
+            simulator.step()
+        self.assertEqual(breakpoints.reverse_continue(keyframes)[0].time, 5)
+        self.assertEqual(simulator.time, 5)
+        self.assertEqual(breakpoints.reverse_continue(keyframes), [])
+        self.assertEqual(simulator.time, 5)
+
+
+class TestWorker(unittest.TestCase):
+    def test_worker_stops_on_breakpoint(self):
+        expected = _event_ticks("io", 'dispatch', task_id=3)
+        simulator = _make_simulator(mix="io")
+        breakpoints = BreakpointSet(simulator, [Breakpoint('dispatch', task_id=3)])
+        worker = SimulationWorker(simulator, should_stop=lambda: bool(breakpoints.pending))
+        worker.start()
+        worker.join(30)
+        self.assertTrue(worker.stopped)
+        self.assertEqual(simulator.time, expected[0])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+"""
+Testes para o perfilador empírico de complexidade.
+
+Verifica:
+1. Ajuste do expoente em escala log-log
+2. Progressão geométrica de tamanhos (e parâmetros inválidos)
+3. Varredura pequena produz expoentes e fases
+4. Fases super-lineares são apontadas pelo limiar
+
+Execute com: python3 tests_complexity.py
+"""
+
+import contextlib
+import io
+import unittest
+
+import complexity
+from complexity import fit_exponent, geometric_sizes, analyze, superlinear_phases, unique_algorithms
+from scheduler import SCHEDULER_FACTORY
+
+
+class TestFitExponent(unittest.TestCase):
+    """Testes do ajuste de expoente."""
+
+    def test_exact_power_laws(self):
+        """Testa que leis de potência exatas recuperam o expoente."""
+        sizes = [8, 16, 32, 64]
+        self.assertAlmostEqual(fit_exponent(sizes, [3.0] * 4), 0.0)
+        self.assertAlmostEqual(fit_exponent(sizes, [2.0 * n for n in sizes]), 1.0)
+        self.assertAlmostEqual(fit_exponent(sizes, [0.5 * n * n for n in sizes]), 2.0)
+
+    def test_insufficient_points(self):
+        """Testa que menos de dois pontos válidos retorna None."""
+        self.assertIsNone(fit_exponent([10], [5.0]))
+        self.assertIsNone(fit_exponent([10, 20], [0.0, 5.0]))
+        self.assertIsNone(fit_exponent([10, 10], [1.0, 2.0]))
+
+
+class TestSweep(unittest.TestCase):
+    """Testes da varredura."""
+
+    def test_geometric_sizes(self):
+        """Testa a progressão geométrica."""
+        self.assertEqual(geometric_sizes(16, 128), [16, 32, 64, 128])
+        self.assertEqual(geometric_sizes(10, 100, 3), [10, 30, 90])
+        for minimum, factor in ((0, 2), (-4, 2), (16, 1), (16, 0)):
+            with self.assertRaises(ValueError):
+                geometric_sizes(minimum, 128, factor)
+        for argv in (["--factor", "1"], ["--min", "0"]):
+            with contextlib.redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit):
+                complexity.main(argv)
+            self.assertIn(argv[0], err.getvalue())
+
+    def test_unique_algorithms_skip_aliases(self):
+        """Testa que cada classe aparece uma única vez."""
+        names = unique_algorithms()
+        self.assertEqual(len({SCHEDULER_FACTORY[n] for n in names}), len(names))
+        self.assertEqual(len(names), len(set(SCHEDULER_FACTORY.values())))
+
+    def test_small_analysis(self):
+        """Testa que uma varredura pequena produz expoentes e fases."""
+        for sweep in ("tasks", "depth"):
+            result = analyze("SRTF", [8, 16, 32], sweep, max_ticks=50)
+            self.assertEqual([p['n'] for p in result['points']], [8, 16, 32])
+            self.assertIsNotNone(result['time_exponent'])
+            self.assertIsNotNone(result['memory_exponent'])
+            self.assertIn('select_next_task', result['phase_exponents'])
+            self.assertIn('save_state', result['phase_exponents'])
+
+    def test_depth_sweep_fills_ready_queue(self):
+        """Testa que a varredura 'depth' mantém a fila de prontos profunda."""
+        result = analyze("FIFO", [8, 32], "depth", max_ticks=20)
+        self.assertGreater(result['points'][1]['mean_ready'], result['points'][0]['mean_ready'])
+
+
+class TestSuperlinearPhases(unittest.TestCase):
+    """Testes da seleção de fases super-lineares."""
+
+    def test_threshold_and_ordering(self):
+        """Testa que só fases acima do limiar aparecem, ordenadas por peso."""
+        result = {
+            'points': [{'phases': {'step': 100.0, 'a': 10.0, 'b': 60.0, 'c': 30.0}}],
+            'phase_exponents': {'step': 1.5, 'a': 1.2, 'b': 0.9, 'c': 0.1},
+        }
+        found = superlinear_phases(result, threshold=0.5)
+        self.assertEqual([name for name, _, _ in found], ['b', 'a'])
+        self.assertAlmostEqual(found[0][2], 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
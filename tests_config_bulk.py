@@ -0,0 +1,114 @@
+"""
+Testes para a carga em lote de configurações (load_simulation_config(bulk=True)).
+
+Verifica:
+1. Divisão do arquivo em blocos que terminam em fim de linha
+2. Mesmas tarefas da carga linha a linha, em ordem de ingresso (estável)
+3. Avisos de linhas mal formatadas com o número original da linha
+4. Pool de processos, linha de comando e arquivos sem tarefas
+
+Execute com: python3 tests_config_bulk.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import cli
+from benchmark import generate_workload
+from config_bulk import chunk_bounds, load_config_bulk
+from config_loader import format_task_line, load_simulation_config
+from tests_helpers import task_fields
+
+HEADER = "PRIOPENV;3;1\n"
+EXTRA = """# comentário no meio
+t901;#zz0000;7;2;1;ML01:0;MU01:1
+lixo;sem;numeros
+t902;#00ff00;3;2;;IO:x-1;IO:1-1
+
+t903..t910;#ff0000,#0000ff;2+3;uniform(1,5);choice(1,9);ML02:0;MU02:1
+"""
+
+
+def _load(function, *args):
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        workload = function(*args)
+    return workload, out.getvalue()
+
+
+class TestConfigBulk(unittest.TestCase):
+    """Testes da carga em lote."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmp.name, "config.txt")
+        lines = [format_task_line(t) for t in generate_workload(300, "mutex", seed=11)]
+        lines[100:100] = EXTRA.splitlines()
+        lines[250:250] = [line.replace("t", "t1", 1) for line in EXTRA.splitlines()]
+        # Último bloco sem fim de linha, com \r\n no meio
+        self.text = HEADER + "\n".join(lines[:200]) + "\r\n" + "\n".join(lines[200:])
+        with open(self.config, "w", encoding="utf-8", newline="") as f:
+            f.write(self.text)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunk_bounds(self):
+        data = self.text.encode("utf-8")
+        start = len(HEADER)
+        for size in (1, 37, 1000, 10 ** 6):
+            with self.subTest(size=size):
+                bounds = chunk_bounds(data, start, size)
+                self.assertEqual(bounds[0][0], start)
+                self.assertEqual(bounds[-1][1], len(data))
+                for (_, end), (next_start, _) in zip(bounds, bounds[1:]):
+                    self.assertEqual(end, next_start)
+                    self.assertEqual(data[end - 1:end], b"\n")
+        self.assertEqual(len(chunk_bounds(data, start, 10 ** 6)), 1)
+        self.assertEqual(chunk_bounds(b"RR;2\n", 5), [])
+
+    def test_matches_serial(self):
+        (algo, quantum, alpha, serial), serial_out = _load(load_simulation_config, self.config)
+        expected = task_fields(sorted(serial, key=lambda t: t.inicio))
+        for processes, size in ((1, 10 ** 6), (1, 300), (2, 700)):
+            with self.subTest(processes=processes, size=size):
+                workload, out = _load(load_config_bulk, self.config, processes, size)
+                self.assertEqual(workload[:3], (algo, quantum, alpha))
+                self.assertEqual(task_fields(workload[3]), expected)
+                self.assertEqual(out, serial_out)
+        workload, _ = _load(load_simulation_config, self.config, True, 1)
+        self.assertEqual(task_fields(workload[3]), expected)
+
+    def test_warning_line_numbers(self):
+        _, out = _load(load_config_bulk, self.config, 2, 500)
+        # Cabeçalho + 100 tarefas + comentário: os trechos extras começam nas linhas 102 e 252
+        expected = [(103, "'zz0000'"), (104, "'lixo;sem;numeros'"), (105, "'IO:x-1'"), (253, "tarefa 1901"),
+                    (254, "'lixo;sem;numeros'"), (255, "'IO:x-1'"), (257, "Intervalo de ids vazio: 't1903..t910'")]
+        warnings = out.splitlines()
+        self.assertEqual(len(warnings), len(expected))
+        for warning, (line_number, snippet) in zip(warnings, expected):
+            self.assertTrue(warning.startswith(f"Aviso: linha {line_number}: "), warning)
+            self.assertIn(snippet, warning)
+
+    def test_cli_and_edge_files(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(cli.main([self.config, "--quiet", "--no-cache", "--max-iter", "100000"]), 0)
+            self.assertEqual(cli.main([self.config, "--quiet", "--no-cache", "--jobs", "2", "--max-iter", "100000"]),
+                             0)
+        report = "\n".join(line for line in out.getvalue().splitlines() if not line.startswith("Aviso"))
+        reports = [block.strip() for block in report.split("Tempo final") if block.strip()]
+        self.assertEqual(len(reports), 2)
+        self.assertEqual(reports[0], reports[1])
+        only_header = os.path.join(self.tmp.name, "so_cabecalho.txt")
+        with open(only_header, "w", encoding="utf-8") as f:
+            f.write("RR;2")
+        self.assertEqual(load_config_bulk(only_header), ("RR", 2, None, []))
+        empty = os.path.join(self.tmp.name, "vazio.txt")
+        open(empty, "w").close()
+        self.assertEqual(load_config_bulk(empty), load_simulation_config(empty))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
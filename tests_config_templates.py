@@ -0,0 +1,121 @@
+"""
+Testes para as linhas-modelo da configuração.
+
+Verifica:
+1. Expansão de ids, cores em ciclo, progressões e eventos repetidos
+2. Sorteios reprodutíveis pela semente da linha
+3. Linhas comuns, comentários e linhas-modelo inválidas
+4. Duração e prioridade com as mesmas regras das linhas comuns
+5. Expansão sob demanda pela fonte de chegadas (arquivo pequeno, carga grande)
+
+Execute com: python3 tests_config_templates.py
+"""
+
+import contextlib
+import io
+import itertools
+import os
+import tempfile
+import unittest
+
+from arrival_sources import open_config_source
+from config_loader import TaskTemplate, is_template_line, load_simulation_config, parse_task_line
+from scheduler import create_scheduler
+from simulador import Simulator
+from tests_helpers import task_fields
+
+CONFIG = """RR;2
+# t1..t3 comentário com reticências
+t1..t5;#ff0000,#00ff00;0+2;4;1;IO:1-1
+t6..t8@3;random;10+exp(2);uniform(1,9);choice(1,5);ML01:0;MU01:1
+t9;#000000;20;3;2
+t10..t11;#0000ff;30;2,5;IO:1-1
+"""
+
+
+class TestConfigTemplates(unittest.TestCase):
+    """Testes das linhas-modelo."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmp.name, "config.txt")
+        with open(self.config, "w", encoding="utf-8") as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_expansion(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            algo, quantum, _, tasks = load_simulation_config(self.config)
+        self.assertEqual(out.getvalue(), "")
+        self.assertEqual((algo, quantum), ("RR", 2))
+        self.assertEqual([t.id for t in tasks], list(range(1, 12)))
+        first = task_fields(tasks[:5])
+        self.assertEqual([f[1] for f in first], [[255, 0, 0], [0, 255, 0]] * 2 + [[255, 0, 0]])
+        self.assertEqual([f[2] for f in first], [0, 2, 4, 6, 8])
+        self.assertTrue(all((f[3], f[4], f[7]) == (4, 1, [(1, 1)]) for f in first))
+        # Eventos repetidos, mas cada tarefa com sua lista
+        self.assertIsNot(tasks[0].io_events, tasks[1].io_events)
+        drawn = tasks[5:8]
+        self.assertEqual([t.inicio for t in drawn], sorted(t.inicio for t in drawn))
+        self.assertEqual(drawn[0].inicio, 10)
+        self.assertTrue(all(1 <= t.duracao <= 9 and t.prio_s in (1, 5) for t in drawn))
+        self.assertTrue(all(t.ml_events == [(1, 0)] and t.mu_events == [(1, 1)] for t in drawn))
+        self.assertEqual(task_fields(tasks[8:9]), [(9, [0, 0, 0], 20, 3, 2, 2, 1, [], [], [])])
+        self.assertEqual([(t.duracao, t.prio_s, t.io_events) for t in tasks[9:]],
+                         [(2, 0, [(1, 1)]), (5, 0, [(1, 1)])])
+
+    def test_seeded_draws(self):
+        line = "t1..t200@42;random;0+exp(3);uniform(1,20);choice(1,2,3)"
+        template = TaskTemplate(line)
+        self.assertEqual(len(template), 200)
+        self.assertEqual(task_fields(template), task_fields(TaskTemplate(line)))
+        # Iterar de novo recomeça a sequência
+        self.assertEqual(task_fields(template), task_fields(template))
+        self.assertNotEqual(task_fields(template), task_fields(TaskTemplate(line.replace("@42", "@43"))))
+        # Sem semente explícita usa o primeiro id
+        self.assertEqual(task_fields(TaskTemplate("t5..t9;random;0;exp(2)")),
+                         task_fields(TaskTemplate("t5..t9@5;random;0;exp(2)")))
+
+    def test_invalid_templates(self):
+        self.assertTrue(is_template_line("t1..t3;#ff0000;0;1"))
+        self.assertFalse(is_template_line("t1;#ff0000;0;1"))
+        self.assertFalse(is_template_line("# t1..t3;#ff0000;0;1"))
+        for bad in ("t5..t1;#ff0000;0;1", "x1..t3;#ff0000;0;1", "t1..t3;#zz0000;0;1",
+                    "t1..t3;#ff0000;uniform(5,1);1", "t1..t3;#ff0000;0;exp(0)", "t1..t3;#ff0000;0"):
+            with self.subTest(bad=bad), self.assertRaises((ValueError, IndexError)):
+                TaskTemplate(bad)
+        with open(self.config, "a", encoding="utf-8") as f:
+            f.write("t20..t10;#ff0000;0;1\n")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            _, _, _, tasks = load_simulation_config(self.config)
+        self.assertEqual(len(tasks), 11)
+        self.assertIn("ignorando linha mal formatada: 't20..t10", out.getvalue())
+
+    def test_plain_line_rules(self):
+        """Testa duração zero e prioridade inválida como nas linhas comuns."""
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            template = TaskTemplate("t1..t2;#ff0000;0;0;abc")
+            plain = parse_task_line("t3;#ff0000;0;0;abc")
+        self.assertEqual([(t.duracao, t.prio_s, t.prio_d) for t in template], [(0, 0, 0), (0, 0, 0)])
+        self.assertEqual((plain.duracao, plain.prio_s), (0, 0))
+        # Só a linha-modelo avisa; a linha comum continua silenciosa
+        self.assertEqual(out.getvalue().splitlines(), ["Aviso: Prioridade inválida 'abc' para tarefa t1..t2. Usando 0."])
+
+    def test_lazy_stream(self):
+        """Testa que um arquivo de três linhas alimenta a simulação sem expandir tudo."""
+        text = "FIFO;\nt1..t1000000000;#ff0000,#00ff00;0+3;2;1\n"
+        _, _, _, source = open_config_source(io.StringIO(text))
+        head = list(itertools.islice(source, 5))
+        self.assertEqual([(t.id, t.inicio) for t in head], [(1, 0), (2, 3), (3, 6), (4, 9), (5, 12)])
+        _, _, _, source = open_config_source(io.StringIO(text))
+        simulator = Simulator(create_scheduler("FIFO"), source, horizon=3000, retire_finished=True)
+        self.assertTrue(simulator.run_full(max_iterations=10000))
+        self.assertEqual(simulator.retired_count, 1000)
+        self.assertEqual(source.taken, 1000)
+        self.assertEqual(simulator.counters.idle_ticks, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,276 @@
+"""
+Testes para o desenho incremental do Gantt no Canvas.
+
+Usa o Canvas em memória de tests_helpers, com a mesma interface mínima do tk.Canvas
+(create_*, delete por tag, coords, config), então roda sem display.
+
+Verifica:
+1. Só os registros novos são desenhados a cada sincronização
+2. O eixo é estendido sem recriar as marcas existentes
+3. Voltar um passo apaga apenas os itens dos registros removidos
+4. O resultado incremental é igual ao desenho do zero
+5. Troca de simulador redesenha tudo; ids das linhas em cache por simulador
+6. Segmentos mesclados cobrem os mesmos ticks e estilos dos registros
+7. A mesclagem e o eixo compacto reduzem o total de itens do Canvas
+
+Execute com: python3 tests_gantt_canvas.py
+"""
+
+import unittest
+
+from arrival_sources import ArrivalSource
+from gantt_canvas import (AXIS_CHUNK, DIVIDER_CHUNK, GanttCanvasRenderer, TAG_AXIS, axis_step, row_task_ids,
+                          state_style)
+from scheduler import RoundRobinScheduler
+from simulador import Simulator
+from tasks import TCB
+from tests_helpers import MemoryCanvas, make_simulator
+
+
+def _make_simulator():
+    tasks = [
+        TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=5, io_events=[(2, 2)]),
+        TCB(id=2, RGB=[0, 255, 0], inicio=1, duracao=3),
+        TCB(id=3, RGB=[0, 0, 255], inicio=3, duracao=2),
+    ]
+    return Simulator(RoundRobinScheduler(quantum=2), tasks)
+
+
+def _full_render(simulator, **options):
+    canvas = MemoryCanvas()
+    GanttCanvasRenderer(canvas, **options).sync(simulator)
+    return canvas
+
+
+def _expected_cells(simulator):
+    """Estilo esperado por (linha, tick), como no desenho de um retângulo por registro."""
+    cells = {}
+    for time, tid, rgb, state in simulator.gantt_data:
+        if tid != "IDLE":
+            cells[(tid, time)] = state_style(state, rgb)
+    return cells
+
+
+def _rendered_cells(canvas, renderer):
+    """Estilo por (linha, tick) lido dos retângulos do Canvas."""
+    rows = {y: tid for tid, y in renderer._rows.items()}
+    bw = renderer.block_width
+    cells = {}
+    for item in canvas.items.values():
+        if item['type'] != 'rectangle':
+            continue
+        x0, y0, x1, _ = item['coords']
+        tid = rows[y0 + 15]
+        style = (item['options']['fill'], item['options']['outline'])
+        for tick in range(int((x0 - renderer.left_margin) // bw), int((x1 - renderer.left_margin) // bw)):
+            cells[(tid, tick)] = style
+    return cells
+
+
+def _divider_xs(canvas):
+    """Posições x das divisórias verticais desenhadas pelas polilinhas."""
+    xs = []
+    for item in canvas.items.values():
+        coords = item['coords']
+        if item['type'] == 'line' and TAG_AXIS not in item['tags']:
+            xs.extend(coords[i] for i in range(0, len(coords), 4))
+    return sorted(xs)
+
+
+class TestIncrementalRender(unittest.TestCase):
+    """Testes do desenho incremental."""
+
+    def test_step_draws_only_new_records(self):
+        """Testa que cada passo cria só os itens dos registros e ticks novos."""
+        simulator = _make_simulator()
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        renderer.sync(simulator)
+
+        for _ in range(6):
+            before_items = canvas.created
+            before_records = len(simulator.gantt_data)
+            before_ticks = renderer._axis_ticks
+            simulator.step()
+            renderer.sync(simulator)
+            new_records = len(simulator.gantt_data) - before_records
+            new_ticks = renderer._axis_ticks - before_ticks
+            # No máximo uma polilinha de marcas e um rótulo novos por tick
+            self.assertLessEqual(canvas.created - before_items, new_records + 2 * new_ticks)
+
+    def test_incremental_matches_full_redraw(self):
+        """Testa que o desenho incremental é igual ao desenho do zero."""
+        simulator = _make_simulator()
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        while not simulator.is_finished():
+            simulator.step()
+            renderer.sync(simulator)
+        self.assertEqual(canvas.snapshot(), _full_render(simulator).snapshot())
+
+    def test_axis_line_is_extended(self):
+        """Testa que a linha do eixo é a mesma e só muda de comprimento."""
+        simulator = _make_simulator()
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        simulator.step()
+        renderer.sync(simulator)
+        axis_line = renderer._axis_line
+        simulator.step()
+        renderer.sync(simulator)
+        self.assertEqual(renderer._axis_line, axis_line)
+        self.assertEqual(canvas.coords(axis_line)[2], 50 + renderer._axis_ticks * 20)
+
+
+class TestStepBack(unittest.TestCase):
+    """Testes do desfazer."""
+
+    def test_step_back_deletes_only_removed_records(self):
+        """Testa que voltar um passo remove apenas os itens do passo desfeito."""
+        simulator = _make_simulator()
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        for _ in range(4):
+            simulator.step()
+            renderer.sync(simulator)
+        kept = {i for i in canvas.items if canvas.items[i]['type'] == 'rectangle'}
+
+        simulator.step()
+        renderer.sync(simulator)
+        simulator.step_back()
+        renderer.sync(simulator)
+
+        rectangles = {i for i in canvas.items if canvas.items[i]['type'] == 'rectangle'}
+        self.assertEqual(rectangles, kept)
+        self.assertEqual(canvas.snapshot(), _full_render(simulator).snapshot())
+
+    def test_step_back_shrinks_axis(self):
+        """Testa que as marcas dos ticks desfeitos saem do eixo."""
+        simulator = _make_simulator()
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas, block_width=60)  # Um rótulo por tick
+        for _ in range(6):
+            simulator.step()
+            renderer.sync(simulator)
+        for _ in range(3):
+            simulator.step_back()
+            renderer.sync(simulator)
+        labels = [canvas.items[i]['options']['text'] for i in canvas.find_withtag(TAG_AXIS)
+                  if canvas.items[i]['type'] == 'text']
+        self.assertEqual(labels, [str(tick) for tick in range(1, renderer._axis_ticks + 1)])
+        self.assertEqual(canvas.snapshot(), _full_render(simulator, block_width=60).snapshot())
+
+
+class TestSegmentMerging(unittest.TestCase):
+    """Testes da mesclagem de registros em segmentos."""
+
+    def test_cells_match_records(self):
+        """Testa que os segmentos pintam os mesmos ticks e estilos dos registros."""
+        simulator = _make_simulator()
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        while not simulator.is_finished():
+            simulator.step()
+            renderer.sync(simulator)
+        self.assertEqual(_rendered_cells(canvas, renderer), _expected_cells(simulator))
+
+    def test_long_run_uses_few_items(self):
+        """Testa que uma tarefa longa vira poucos itens, com todas as divisórias."""
+        simulator = Simulator(RoundRobinScheduler(quantum=1000),
+                              [TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=500),
+                               TCB(id=2, RGB=[0, 0, 255], inicio=0, duracao=10)])
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        while not simulator.is_finished():
+            simulator.step()
+            renderer.sync(simulator)
+
+        bars = [i for i in canvas.items.values() if TAG_AXIS not in i['tags'] and i['type'] != 'text']
+        self.assertLess(len(bars), len(simulator.gantt_data) // 10)
+        self.assertEqual(renderer.segments, 3)  # t1 executando, t2 pronta, t2 executando
+        expected = sum(n - 1 for n in (500, 500, 10))
+        self.assertEqual(len(_divider_xs(canvas)), expected)
+        self.assertLessEqual(len(bars), 3 + expected // DIVIDER_CHUNK + 3)
+
+    def test_total_items_on_benchmark_workload(self):
+        """Testa o total de itens do Canvas (barras, divisórias, eixo e rótulos) contra os registros."""
+        for n_tasks, ratio in ((100, 7), (20, 2)):
+            with self.subTest(n_tasks=n_tasks):
+                simulator = make_simulator(n_tasks, "io", seed=1, steps=None)
+                canvas = MemoryCanvas()
+                renderer = GanttCanvasRenderer(canvas)
+                renderer.sync(simulator)
+                records = len(simulator.gantt_data)
+                self.assertLess(len(canvas.items) * ratio, records)
+                axis = canvas.find_withtag(TAG_AXIS)
+                ticks = renderer._axis_ticks
+                # Linha, polilinhas de marcas e um rótulo a cada axis_step() ticks
+                self.assertEqual(len(axis), 1 + (ticks // AXIS_CHUNK + 1) + ticks // axis_step((renderer.block_width, 1)))
+
+    def test_dividers_follow_step_back(self):
+        """Testa que desfazer encurta o segmento e suas divisórias."""
+        simulator = Simulator(RoundRobinScheduler(quantum=1000), [TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=80)])
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        for _ in range(DIVIDER_CHUNK + 3):
+            simulator.step()
+            renderer.sync(simulator)
+        for _ in range(5):
+            simulator.step_back()
+            renderer.sync(simulator)
+        self.assertEqual(canvas.snapshot(), _full_render(simulator).snapshot())
+        self.assertEqual(len(_divider_xs(canvas)), DIVIDER_CHUNK + 3 - 5 - 1)
+
+    def test_dividers_omitted_at_low_zoom(self):
+        """Testa que blocos estreitos não recebem divisórias."""
+        simulator = _make_simulator()
+        simulator.run_full()
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas, block_width=2)
+        renderer.sync(simulator)
+        self.assertFalse(renderer.show_dividers)
+        self.assertEqual(_divider_xs(canvas), [])
+        self.assertEqual(_rendered_cells(canvas, renderer), _expected_cells(simulator))
+
+
+class TestRedraw(unittest.TestCase):
+    """Testes de redesenho completo."""
+
+    def test_new_simulator_redraws(self):
+        """Testa que trocar de simulador descarta o desenho anterior."""
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        first = _make_simulator()
+        first.run_full()
+        renderer.sync(first)
+
+        second = _make_simulator()
+        renderer.sync(second)
+        self.assertEqual(renderer.drawn_records, 0)
+        self.assertEqual(canvas.snapshot(), _full_render(second).snapshot())
+
+    def test_row_ids_cached_per_simulator(self):
+        """Testa que os ids das linhas só são reordenados quando a lista de tarefas muda."""
+        simulator = _make_simulator()
+        task_ids = row_task_ids(simulator)
+        self.assertEqual(task_ids, tuple(sorted((t.id for t in simulator.all_tasks), reverse=True)))
+        simulator.run_full()
+        self.assertIs(row_task_ids(simulator), task_ids)
+        # Sistema aberto: cada admissão invalida o cache
+        tasks = [TCB(id=i, RGB=[0, 0, 0], inicio=2 * i, duracao=1) for i in (1, 2, 3)]
+        open_system = Simulator(RoundRobinScheduler(quantum=2), ArrivalSource(tasks))
+        self.assertEqual(row_task_ids(open_system), ())
+        open_system.run_full()
+        self.assertEqual(row_task_ids(open_system), (3, 2, 1))
+
+    def test_none_clears_canvas(self):
+        """Testa que sem simulador o Canvas fica vazio."""
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        renderer.sync(_make_simulator())
+        renderer.sync(None)
+        self.assertEqual(canvas.items, {})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
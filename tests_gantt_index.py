@@ -0,0 +1,141 @@
+"""
+Testes para o índice de intervalos do Gantt.
+
+Verifica:
+1. at() bate com uma busca direta em gantt_data
+2. intervals() e totals() numa janela de tempo batem com a contagem direta
+3. Truncar (voltar passos) deixa o índice igual a um construído do zero
+4. Registros fora de ordem
+5. Histórico de mutexes a partir dos eventos do simulador (sem duplicar reexecuções)
+
+Execute com: python3 tests_gantt_index.py
+"""
+
+import random
+import unittest
+from functools import partial
+
+from gantt_index import TraceIndex, MutexHistory, STATES
+from scheduler import create_scheduler
+from simulador import Simulator
+from tasks import TCB
+from tests_helpers import make_simulator
+
+
+_run = partial(make_simulator, n_tasks=15, mix="io", seed=11, quantum=3, steps=None)
+
+
+def _cells(gantt_data):
+    cells = {}
+    for time, tid, rgb, state in gantt_data:
+        if tid != "IDLE":
+            cells[(tid, time)] = state
+    return cells
+
+
+def _task_ids(simulator):
+    return [t.id for t in simulator.all_tasks]
+
+
+class TestTraceIndex(unittest.TestCase):
+    """Testes das consultas do índice."""
+
+    def test_at_matches_scan(self):
+        """Testa o estado em cada tick contra a busca direta."""
+        simulator = _run()
+        index = TraceIndex()
+        index.feed(simulator.gantt_data)
+        cells = _cells(simulator.gantt_data)
+        for tid in _task_ids(simulator):
+            for time in range(simulator.time + 2):
+                found = index.at(tid, time)
+                self.assertEqual(found[2] if found else None, cells.get((tid, time)), (tid, time))
+                if found:
+                    self.assertTrue(found[0] <= time < found[1])
+
+    def test_range_queries(self):
+        """Testa intervals() e totals() em janelas aleatórias."""
+        simulator = _run()
+        index = TraceIndex()
+        index.feed(simulator.gantt_data)
+        cells = _cells(simulator.gantt_data)
+        rng = random.Random(2)
+        for _ in range(300):
+            tid = rng.choice(_task_ids(simulator))
+            t0 = rng.randrange(simulator.time)
+            t1 = t0 + rng.randrange(1, 40)
+            expected = {state: 0 for state in STATES}
+            for time in range(t0, t1):
+                if (tid, time) in cells:
+                    expected[cells[(tid, time)]] += 1
+            self.assertEqual(index.totals(tid, t0, t1), expected, (tid, t0, t1))
+            covered = {state: 0 for state in STATES}
+            for start, end, state in index.intervals(tid, t0, t1):
+                self.assertTrue(t0 <= start < end <= t1)
+                covered[state] += end - start
+            self.assertEqual(covered, expected)
+
+    def test_span_and_merging(self):
+        """Testa que ticks consecutivos no mesmo estado viram um intervalo."""
+        index = TraceIndex()
+        index.feed([(t, 1, [255, 0, 0], "EXEC") for t in range(2, 6)] + [(6, 1, [255, 0, 0], "READY")])
+        self.assertEqual(index.intervals(1), [(2, 6, "EXEC"), (6, 7, "READY")])
+        self.assertEqual(index.span(1), (2, 7))
+        self.assertIsNone(index.span(2))
+        self.assertEqual(index.totals(1)["EXEC"], 4)
+
+    def test_truncate_matches_fresh(self):
+        """Testa que voltar passos desfaz o índice."""
+        simulator = _run(steps=80)
+        index = TraceIndex()
+        index.feed(simulator.gantt_data)
+        for _ in range(30):
+            simulator.step_back()
+        index.feed(simulator.gantt_data)
+        fresh = TraceIndex()
+        fresh.feed(simulator.gantt_data)
+        for tid in _task_ids(simulator):
+            self.assertEqual(index.intervals(tid), fresh.intervals(tid))
+            self.assertEqual(index.totals(tid, 0, 40), fresh.totals(tid, 0, 40))
+
+    def test_out_of_order_record(self):
+        index = TraceIndex()
+        index.feed([(5, 1, [0, 0, 0], "EXEC"), (6, 1, [0, 0, 0], "EXEC"), (2, 1, [0, 0, 0], "IO")])
+        self.assertEqual(index.at(1, 2), (2, 3, "IO"))
+        self.assertEqual(index.totals(1, 0, 10), {"EXEC": 2, "READY": 0, "IO": 1, "MUTEX": 0})
+        index.feed([(5, 1, [0, 0, 0], "EXEC"), (6, 1, [0, 0, 0], "EXEC")])
+        self.assertIsNone(index.at(1, 2))
+        self.assertEqual(index.totals(1)["IO"], 0)
+
+
+class TestMutexHistory(unittest.TestCase):
+    """Testes do histórico de mutexes."""
+
+    def test_holds_follow_events(self):
+        """Testa que a tarefa segura o mutex entre o lock e o unlock."""
+        task = TCB(id=1, RGB=[0, 0, 0], inicio=0, duracao=6, ml_events=[(1, 1)], mu_events=[(1, 4)])
+        simulator = Simulator(create_scheduler("FIFO"), [task])
+        history = MutexHistory(simulator)
+        simulator.run_full()
+        held = [t for t in range(simulator.time) if history.held_at(1, t) == [1]]
+        self.assertTrue(held)
+        self.assertEqual(held, list(range(held[0], held[-1] + 1)))
+        self.assertEqual(history.held_at(1, held[-1] + 1), [])
+
+        self.assertEqual(len(history.holds[1]), 1)
+
+    def test_replay_is_not_recorded_twice(self):
+        """Testa que reexecutar ticks já vistos (após voltar) não duplica trechos."""
+        task = TCB(id=1, RGB=[0, 0, 0], inicio=0, duracao=6, ml_events=[(1, 1)], mu_events=[(1, 4)])
+        simulator = Simulator(create_scheduler("FIFO"), [task])
+        history = MutexHistory(simulator)
+        simulator.run_full()
+        while simulator.step_back():
+            pass
+        simulator.run_full()
+        self.assertEqual(len(history.holds[1]), 1)
+        self.assertIsNotNone(history.holds[1][0][2])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,353 @@
+"""
+Testes para a visão do Gantt com zoom e tiles.
+
+Verifica:
+1. A linha do tempo incremental reproduz os estados de gantt_data
+2. A pirâmide de contagens bate com a contagem direta
+3. Voltar um passo desfaz as células e marca os ticks alterados
+4. Pixels agregados usam o estado dominante e a ocupação
+5. Passo adaptativo do eixo
+6. Só os tiles visíveis são renderizados e o cache é reaproveitado
+7. Voltar no tempo (step_back ou keyframes) tira do gráfico os ticks desfeitos
+8. Em 100% só a área visível vira itens vetoriais, com o eixo adaptativo
+9. Trace longo abre no zoom que cabe na janela
+
+Execute com: python3 tests_gantt_tiles.py
+"""
+
+import random
+import unittest
+from functools import partial
+
+from gantt_canvas import state_style
+from gantt_tiles import (GanttTimeline, GanttZoomView, STATE_CODES, STATE_NAMES, N_STATES, TILE_WIDTH,
+                         ZOOM_LEVELS, row_pixels, cell_color, dominant, axis_step)
+from keyframes import KeyframeIndex
+from tests_helpers import FakeImage, ViewportCanvas, make_simulator
+
+
+_run = partial(make_simulator, n_tasks=12, mix="io", seed=5, quantum=3, steps=None)
+
+
+def _task_ids(simulator):
+    return sorted((t.id for t in simulator.all_tasks), reverse=True)
+
+
+def _brute_cells(gantt_data):
+    cells = {}
+    for time, tid, rgb, state in gantt_data:
+        if tid != "IDLE":
+            cells[(tid, time)] = STATE_CODES[state]
+    return cells
+
+
+class TestTimeline(unittest.TestCase):
+    """Testes da linha do tempo incremental."""
+
+    def test_cells_match_gantt(self):
+        """Testa que cada célula tem o estado do registro correspondente."""
+        simulator = _run()
+        timeline = GanttTimeline(_task_ids(simulator))
+        timeline.feed(simulator.gantt_data)
+        cells = _brute_cells(simulator.gantt_data)
+        for tid in _task_ids(simulator):
+            for time in range(timeline.total_ticks):
+                self.assertEqual(timeline.state_at(tid, time), cells.get((tid, time), 0), (tid, time))
+
+    def test_pyramid_counts(self):
+        """Testa as contagens por bloco contra a contagem direta."""
+        simulator = _run()
+        timeline = GanttTimeline(_task_ids(simulator))
+        timeline.feed(simulator.gantt_data)
+        cells = _brute_cells(simulator.gantt_data)
+        rng = random.Random(1)
+        for _ in range(200):
+            tid = rng.choice(_task_ids(simulator))
+            k = rng.randint(1, 7)
+            first = rng.randrange(0, timeline.total_ticks) >> k << k
+            expected = [0] * N_STATES
+            for time in range(first, first + (1 << k)):
+                code = cells.get((tid, time), 0)
+                if code:
+                    expected[code - 1] += 1
+            self.assertEqual(timeline.counts(tid, first, k), expected, (tid, first, k))
+
+    def test_step_back_matches_fresh_timeline(self):
+        """Testa que desfazer deixa a linha do tempo igual a uma construída do zero."""
+        simulator = _run(steps=40)
+        timeline = GanttTimeline(_task_ids(simulator))
+        timeline.feed(simulator.gantt_data)
+        timeline.take_dirty()
+        for _ in range(10):
+            simulator.step_back()
+        timeline.feed(simulator.gantt_data)
+
+        fresh = GanttTimeline(_task_ids(simulator))
+        fresh.feed(simulator.gantt_data)
+        self.assertEqual(timeline.total_ticks, fresh.total_ticks)
+        for tid in _task_ids(simulator):
+            for time in range(45):
+                self.assertEqual(timeline.state_at(tid, time), fresh.state_at(tid, time))
+            self.assertEqual(timeline.counts(tid, 0, 5), fresh.counts(tid, 0, 5))
+        self.assertLessEqual(timeline.take_dirty(), 30)
+
+    def test_dirty_marks_only_new_ticks(self):
+        """Testa que um passo marca só ticks a partir do tempo do passo."""
+        simulator = _run(steps=20)
+        timeline = GanttTimeline(_task_ids(simulator))
+        timeline.feed(simulator.gantt_data)
+        self.assertEqual(timeline.take_dirty(), 0)
+        simulator.step()
+        timeline.feed(simulator.gantt_data)
+        self.assertEqual(timeline.take_dirty(), 20)
+        self.assertIsNone(timeline.take_dirty())
+
+
+class TestPixels(unittest.TestCase):
+    """Testes da agregação em pixels."""
+
+    def test_full_resolution_pixels(self):
+        """Testa que com 1 px por tick cada coluna é o estado do tick."""
+        simulator = _run()
+        timeline = GanttTimeline(_task_ids(simulator))
+        timeline.feed(simulator.gantt_data)
+        tid = _task_ids(simulator)[0]
+        start, _ = timeline.span(tid)
+        pixels = row_pixels(timeline, tid, (1, 1), start, width=32)
+        rgb = timeline.colors[tid]
+        self.assertEqual(pixels, [cell_color(timeline.state_at(tid, start + i), rgb) for i in range(32)])
+
+    def test_aggregated_pixels_use_dominant_state(self):
+        """Testa o estado dominante e o sombreamento pela ocupação."""
+        simulator = _run()
+        timeline = GanttTimeline(_task_ids(simulator))
+        timeline.feed(simulator.gantt_data)
+        for tid in _task_ids(simulator):
+            pixels = row_pixels(timeline, tid, (1, 8), 0, width=TILE_WIDTH)
+            if pixels is None:
+                continue
+            rgb = timeline.colors[tid]
+            for column, color in enumerate(pixels):
+                counts = timeline.counts(tid, column * 8, 3)
+                self.assertEqual(color, cell_color(dominant(counts), rgb, sum(counts) / 8))
+
+    def test_row_outside_span(self):
+        """Testa que um trecho sem células não gera pixels."""
+        timeline = GanttTimeline([1])
+        timeline.feed([(1000, 1, [255, 0, 0], "EXEC")])
+        self.assertIsNone(row_pixels(timeline, 1, (1, 1), 0))
+        self.assertIsNotNone(row_pixels(timeline, 1, (1, 4), 0))
+
+    def test_dominant_and_colors(self):
+        """Testa o desempate e as cores por estado."""
+        self.assertEqual(dominant([2, 2, 0, 0]), STATE_CODES["EXEC"])
+        self.assertEqual(dominant([0, 3, 1, 0]), STATE_CODES["READY"])
+        self.assertEqual(dominant([0, 0, 0, 0]), 0)
+        self.assertEqual(cell_color(STATE_CODES["EXEC"], (255, 0, 0)), "#ff0000")
+        self.assertEqual(cell_color(STATE_CODES["IO"], (255, 0, 0)), "#bfbfbf")
+        self.assertEqual(cell_color(0, (255, 0, 0)), "#ffffff")
+        self.assertEqual(cell_color(STATE_CODES["EXEC"], (0, 0, 0), 0.5), "#808080")
+
+    def test_axis_step(self):
+        """Testa o passo adaptativo dos rótulos."""
+        self.assertEqual(axis_step((20, 1)), 5)
+        self.assertEqual(axis_step((1, 1)), 100)
+        self.assertEqual(axis_step((1, 64)), 5000)
+
+
+class TestZoomView(unittest.TestCase):
+    """Testes da visão com tiles."""
+
+    def _view(self, simulator, zoom_index):
+        canvas = ViewportCanvas()
+        images = []
+
+        def factory(w, h):
+            images.append(FakeImage(w, h))
+            return images[-1]
+
+        view = GanttZoomView(canvas, image_factory=factory, fit_on_open=False)
+        view.sync(simulator)
+        view.set_zoom(zoom_index)
+        return canvas, view, images
+
+    def test_only_visible_tiles_rendered(self):
+        """Testa que só os tiles da janela são criados, independente do tamanho do trace."""
+        simulator = _run(n_tasks=200, steps=700)
+        canvas, view, images = self._view(simulator, ZOOM_LEVELS.index((1, 1)))
+        placed = [i for i in canvas.items.values() if i['type'] == 'image']
+        self.assertEqual(len(placed), len(images))
+        self.assertLessEqual(len(images), (800 // TILE_WIDTH + 2) * 2)
+        self.assertFalse([i for i in canvas.items.values() if i['type'] == 'rectangle'])
+
+    def test_cache_reused_when_scrolling_back(self):
+        """Testa que voltar a uma área já vista reaproveita os tiles."""
+        simulator = _run(n_tasks=200, steps=700)
+        canvas, view, images = self._view(simulator, ZOOM_LEVELS.index((2, 1)))
+        rendered = len(images)
+        canvas.x_offset = 2 * TILE_WIDTH
+        view.refresh()
+        scrolled = len(images)
+        self.assertGreater(scrolled, rendered)
+        canvas.x_offset = 0
+        view.refresh()
+        self.assertEqual(len(images), scrolled)
+
+    def test_step_invalidates_only_last_tiles(self):
+        """Testa que um passo só re-renderiza tiles que cobrem o tick novo."""
+        simulator = _run(n_tasks=40, steps=600)
+        canvas, view, images = self._view(simulator, ZOOM_LEVELS.index((1, 1)))
+        rendered = len(images)
+        simulator.step()
+        view.sync(simulator)
+        tile_rows = len({k[2] for k in view._placed})
+        self.assertLessEqual(len(images) - rendered, tile_rows)
+
+    def test_back_to_vector(self):
+        """Testa que voltar a 100% remove os tiles e redesenha os retângulos."""
+        simulator = _run(n_tasks=10)
+        canvas, view, images = self._view(simulator, 5)
+        view.set_zoom(0)
+        self.assertTrue(view.is_vector)
+        self.assertFalse([i for i in canvas.items.values() if i['type'] == 'image'])
+        self.assertTrue([i for i in canvas.items.values() if i['type'] == 'rectangle'])
+        self.assertEqual(view.zoom_percent(), 100)
+
+    def test_records_override_and_playhead(self):
+        """Testa que o trace conhecido é desenhado mesmo depois de voltar, com a linha do tick atual."""
+        simulator = _run(n_tasks=10, steps=30)
+        trace = list(simulator.gantt_data)
+        for _ in range(10):
+            simulator.step_back()
+        canvas, view, images = self._view(simulator, 0)
+        view.sync(simulator, trace)
+        self.assertEqual(view.timeline.records, len(trace))
+        view.set_playhead(simulator.time)
+        lines = [i for i in canvas.items.values() if "playhead" in i['tags']]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['coords'][0], 50 + 20 * simulator.time)
+        view.set_playhead(None)
+        self.assertFalse([i for i in canvas.items.values() if "playhead" in i['tags']])
+
+    def test_rewind_removes_undone_items(self):
+        """Testa que, desenhando gantt_data, voltar no tempo deixa o gráfico igual ao de uma execução direta."""
+        def drawn(canvas):
+            return sorted((i['type'], tuple(i['coords'])) for i in canvas.items.values())
+
+        simulator = _run(n_tasks=10, steps=0)
+        keyframes = KeyframeIndex(simulator, interval=8, adaptive=False)
+        canvas, view, images = self._view(simulator, 0)
+        for _ in range(60):
+            simulator.step()
+            view.sync(simulator)
+        for _ in range(5):
+            simulator.step_back()
+        view.sync(simulator)
+        self.assertEqual(drawn(canvas), drawn(self._view(_run(n_tasks=10, steps=55), 0)[0]))
+        keyframes.seek(20)
+        view.sync(simulator)
+        self.assertEqual(drawn(canvas), drawn(self._view(_run(n_tasks=10, steps=20), 0)[0]))
+        # Com zoom (tiles), a linha do tempo também volta
+        view.set_zoom(ZOOM_LEVELS.index((2, 1)))
+        keyframes.seek(50)
+        view.sync(simulator)
+        keyframes.seek(12)
+        view.sync(simulator)
+        fresh = self._view(_run(n_tasks=10, steps=12), ZOOM_LEVELS.index((2, 1)))[1]
+        self.assertEqual(view.timeline.total_ticks, fresh.timeline.total_ticks)
+        for tid in _task_ids(simulator):
+            self.assertEqual([view.timeline.state_at(tid, t) for t in range(60)],
+                             [fresh.timeline.state_at(tid, t) for t in range(60)])
+
+    def test_locate_and_highlight(self):
+        """Testa a conversão de ponto para (tarefa, tick) e o destaque sobre os tiles."""
+        simulator = _run(n_tasks=10, steps=30)
+        canvas, view, images = self._view(simulator, ZOOM_LEVELS.index((2, 1)))
+        top = _task_ids(simulator)[0]
+        self.assertEqual(view.locate(50 + 2 * 7 + 1, 20), (top, 7))
+        self.assertEqual(view.locate(50 + 2 * 7, 20 + 40), (_task_ids(simulator)[1], 7))
+        self.assertIsNone(view.locate(50 + 2 * 7, 20 + 20))  # Entre as barras
+        self.assertIsNone(view.locate(10, 20))
+
+        view.set_highlight(top, 3, 9)
+        view.refresh()
+        items = list(canvas.items.values())
+        highlight = [i for i in items if "highlight" in i['tags']]
+        self.assertEqual(len(highlight), 1)
+        self.assertEqual(highlight[0]['coords'][0], 50 + 2 * 3 - 2)
+        last_tile = max(k for k, i in canvas.items.items() if i['type'] == 'image')
+        self.assertGreater(max(k for k, i in canvas.items.items() if "highlight" in i['tags']), last_tile)
+        view.set_highlight(None)
+        self.assertFalse([i for i in canvas.items.values() if "highlight" in i['tags']])
+
+    def test_vector_window_bounded(self):
+        """Testa que em 100% os itens criados dependem da janela, não do tamanho do trace."""
+        bound = (400 // 40 + 2) * (800 // 20 + 2) * 2
+        for steps in (100, 700):
+            simulator = _run(n_tasks=200, steps=steps)
+            canvas, view, images = self._view(simulator, 0)
+            vector = canvas.find_withtag("vector")
+            self.assertTrue(vector)
+            self.assertLessEqual(len(vector), bound, steps)
+            self.assertFalse(images)
+            # Voltar a 100% a partir de um zoom menor também só desenha a janela
+            view.set_zoom(5)
+            self.assertFalse(canvas.find_withtag("vector"))
+            created = canvas.created
+            view.set_zoom(0)
+            self.assertLessEqual(canvas.created - created, bound + 200, steps)
+
+    def test_vector_matches_states(self):
+        """Testa que cada tick visível fica coberto por um retângulo no estilo do seu estado."""
+        simulator = _run(n_tasks=10, steps=30)
+        canvas, view, images = self._view(simulator, 0)
+        rects = [i for i in canvas.items.values() if i['type'] == 'rectangle' and "vector" in i['tags']]
+        for row, tid in enumerate(_task_ids(simulator)):
+            rgb = view.timeline.colors.get(tid)
+            y = 20 + 40 * row
+            for tick in range(view.timeline.total_ticks):
+                code = view.timeline.state_at(tid, tick)
+                x = 50 + 20 * tick + 10
+                covering = [r for r in rects if r['coords'][0] < x < r['coords'][2] and r['coords'][1] < y < r['coords'][3]]
+                if not code:
+                    self.assertFalse(covering, (tid, tick))
+                    continue
+                self.assertEqual(len(covering), 1, (tid, tick))
+                self.assertEqual(covering[0]['options']['fill'], state_style(STATE_NAMES[code], rgb)[0])
+
+    def test_vector_axis_labels_stepped(self):
+        """Testa que em 100% o eixo só rotula os ticks do passo adaptativo da área visível."""
+        simulator = _run(n_tasks=10, steps=200)
+        canvas, view, images = self._view(simulator, 0)
+        canvas.x_offset = 1000
+        view.refresh()
+        step = axis_step(ZOOM_LEVELS[0])
+        labels = [int(i['options']['text']) for i in canvas.items.values()
+                  if i['type'] == 'text' and "tile_axis" in i['tags']]
+        self.assertTrue(labels)
+        self.assertTrue(all(t % step == 0 for t in labels))
+        self.assertGreaterEqual(min(labels), (1000 - 50) // 20)
+        self.assertLessEqual(max(labels), (1800 - 50) // 20)
+
+    def test_fit_on_open(self):
+        """Testa que um trace que não cabe na janela abre no maior zoom em que cabe, e um curto fica em 100%."""
+        view = GanttZoomView(ViewportCanvas(), image_factory=FakeImage)
+        view.sync(_run(n_tasks=10, steps=20))
+        self.assertTrue(view.is_vector)
+
+        view = GanttZoomView(ViewportCanvas(), image_factory=FakeImage)
+        simulator = _run(n_tasks=40, steps=600)
+        view.sync(simulator)
+        ppt, tpp = view.zoom
+        self.assertLessEqual(view.timeline.total_ticks * ppt / tpp, 800 - 100)
+        ppt, tpp = ZOOM_LEVELS[view.zoom_index - 1]
+        self.assertGreater(view.timeline.total_ticks * ppt / tpp, 800 - 100)
+        # Só no primeiro quadro: depois o zoom escolhido pelo usuário é mantido
+        view.set_zoom(0)
+        simulator.step()
+        view.sync(simulator)
+        self.assertTrue(view.is_vector)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,134 @@
+"""
+Funções auxiliares e dublês compartilhados pelos arquivos de teste (sem testes próprios).
+
+Cada arquivo fixa os seus padrões com functools.partial, por exemplo:
+    _make_simulator = partial(make_simulator, n_tasks=20, mix="io", seed=7)
+
+MemoryCanvas, ViewportCanvas e FakeImage substituem o tk.Canvas e o
+tk.PhotoImage nos testes do Gantt, que rodam sem display.
+"""
+
+from typing import Optional
+
+from benchmark import generate_workload
+from scheduler import create_scheduler
+from simulador import Simulator
+
+
+def task_fields(tasks) -> list:
+    """Campos comparáveis de cada tarefa (para comparar cargas lidas de formatos diferentes)."""
+    return [(t.id, list(t.RGB), t.inicio, t.duracao, t.prio_s, t.prio_d, t.state, list(t.io_events),
+             list(t.ml_events), list(t.mu_events)) for t in tasks]
+
+
+def make_simulator(n_tasks: int, mix: str, seed: int, algo: str = "RR", quantum: int = 2,
+                   steps: Optional[int] = 0) -> Simulator:
+    """
+    Simulador com uma carga sintética do benchmark.
+
+    Args:
+        n_tasks: Número de tarefas
+        mix: Perfil da carga ('cpu', 'io', 'mutex', ...)
+        seed: Semente da carga
+        algo: Algoritmo de escalonamento
+        quantum: Quantum do escalonador
+        steps: Passos executados antes de retornar (None = até o fim)
+    """
+    simulator = Simulator(create_scheduler(algo, quantum=quantum), generate_workload(n_tasks, mix, seed=seed))
+    if steps is None:
+        simulator.run_full(max_iterations=100000)
+    else:
+        for _ in range(steps):
+            simulator.step()
+    return simulator
+
+
+class MemoryCanvas:
+    """Canvas mínimo em memória com tags, compatível com o uso do renderizador."""
+
+    def __init__(self):
+        self.items = {}
+        self.next_id = 1
+        self.created = 0
+        self.options = {}
+
+    def _create(self, kind, coords, kw):
+        item = self.next_id
+        self.next_id += 1
+        self.created += 1
+        tags = kw.pop('tags', ())
+        self.items[item] = {'type': kind, 'coords': list(coords), 'tags': set(tags), 'options': kw}
+        return item
+
+    def create_rectangle(self, *coords, **kw):
+        return self._create('rectangle', coords, kw)
+
+    def create_line(self, *coords, **kw):
+        return self._create('line', coords, kw)
+
+    def create_text(self, *coords, **kw):
+        return self._create('text', coords, kw)
+
+    def find_withtag(self, tag):
+        return [i for i, item in self.items.items() if tag in item['tags']]
+
+    def delete(self, tag):
+        if isinstance(tag, int):
+            self.items.pop(tag, None)
+            return
+        for item in self.find_withtag(tag):
+            del self.items[item]
+
+    def coords(self, item, *coords):
+        if coords:
+            self.items[item]['coords'] = list(coords)
+        return self.items[item]['coords']
+
+    def config(self, **kw):
+        self.options.update(kw)
+
+    def snapshot(self):
+        """Conteúdo visível, independente de ids e tags de controle."""
+        return sorted((item['type'], tuple(item['coords']), tuple(sorted(item['options'].items())))
+                      for item in self.items.values())
+
+
+class FakeImage:
+    """Imagem em memória que conta as escritas."""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.puts = []
+
+    def put(self, data, to=None):
+        self.puts.append((data, to))
+
+
+class ViewportCanvas(MemoryCanvas):
+    """Canvas em memória com janela de visualização rolável."""
+
+    def __init__(self, width=800, height=400):
+        super().__init__()
+        self.width, self.height = width, height
+        self.x_offset = 0
+
+    def create_image(self, *coords, **kw):
+        return self._create('image', coords, kw)
+
+    def canvasx(self, x):
+        return self.x_offset + x
+
+    def canvasy(self, y):
+        return y
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def cget(self, option):
+        return " ".join(str(v) for v in self.options.get(option, ()))
+
+    def xview_moveto(self, fraction):
+        self.x_offset = fraction * float(self.cget("scrollregion").split()[2])
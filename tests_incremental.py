@@ -0,0 +1,210 @@
+"""
+Testes para a re-simulação incremental depois de editar tarefas.
+
+Verifica:
+1. Detecção das tarefas alteradas e do primeiro tick afetado
+2. O simulador recalculado fica igual a uma execução do zero com as tarefas editadas
+3. Só o trecho depois da chegada da tarefa editada é reexecutado
+4. Tarefas incluídas e removidas
+5. O Gantt e o histórico de mutexes só descartam o que mudou
+
+Execute com: python3 tests_incremental.py
+"""
+
+import unittest
+
+from benchmark import generate_workload
+from gantt_canvas import GanttCanvasRenderer
+from gantt_index import MutexHistory
+from gantt_tiles import GanttTimeline, GanttZoomView, ZOOM_LEVELS
+from incremental import changed_tasks, earliest_change, first_divergence, resimulate
+from keyframes import KeyframeIndex
+from scheduler import create_scheduler
+from simulador import Simulator
+from tasks import TCB
+from tests_helpers import FakeImage, MemoryCanvas, ViewportCanvas
+
+
+def _definitions(tasks):
+    return [{'id': t.id, 'RGB': list(t.RGB), 'inicio': t.inicio, 'duracao': t.duracao, 'prio_s': t.prio_s,
+             'io_events': list(t.io_events), 'ml_events': list(t.ml_events), 'mu_events': list(t.mu_events)}
+            for t in tasks]
+
+
+def _tasks(definitions):
+    return [TCB(id=d['id'], RGB=list(d['RGB']), inicio=d['inicio'], duracao=d['duracao'], prio_s=d['prio_s'],
+                io_events=list(d['io_events']), ml_events=list(d['ml_events']), mu_events=list(d['mu_events']))
+            for d in definitions]
+
+
+def _simulator(definitions, algo="RR"):
+    return Simulator(create_scheduler(algo, quantum=2, alpha=1), _tasks(definitions))
+
+
+def _run_to(simulator, target):
+    while simulator.time < target and not simulator.is_finished():
+        simulator.step()
+    return simulator
+
+
+class TestChangedTasks(unittest.TestCase):
+    """Testes da detecção de mudanças."""
+
+    def test_detection(self):
+        before = _definitions(generate_workload(10, "io", seed=1))
+        after = [dict(d) for d in before]
+        self.assertEqual(changed_tasks(before, after), {})
+        self.assertIsNone(earliest_change(before, after))
+
+        after[3]['RGB'] = [1, 2, 3]
+        after[5]['inicio'] = before[5]['inicio'] + 50
+        after[6]['io_events'] = [(1, 4)]
+        del after[8]
+        after.append(dict(before[0], id=99, inicio=7))
+        expected = {before[3]['id']: before[3]['inicio'], before[5]['id']: before[5]['inicio'],
+                    before[6]['id']: before[6]['inicio'], before[8]['id']: before[8]['inicio'], 99: 7}
+        self.assertEqual(changed_tasks(before, after), expected)
+        self.assertEqual(earliest_change(before, after), min(expected.values()))
+
+    def test_tcb_and_dict_agree(self):
+        tasks = generate_workload(5, "mutex", seed=2)
+        self.assertEqual(changed_tasks(tasks, _definitions(tasks)), {})
+
+    def test_first_divergence(self):
+        self.assertEqual(first_divergence([1, 2, 3, 4], [1, 2, 5]), 2)
+        self.assertEqual(first_divergence([1, 2], [1, 2, 3]), 2)
+
+
+class TestResimulate(unittest.TestCase):
+    """Testes da re-simulação a partir dos keyframes."""
+
+    def _check(self, before, after, target, algo="RR"):
+        old = _simulator(before, algo)
+        keyframes = KeyframeIndex(old, interval=16, adaptive=False)
+        old.run_full(max_iterations=100000)
+        keyframes.seek(target)
+
+        new = _simulator(after, algo)
+        result = resimulate(keyframes, new, before, after, target)
+        fresh = _run_to(_simulator(after, algo), target)
+        self.assertEqual(new.time, fresh.time)
+        self.assertEqual(new.gantt_data, fresh.gantt_data)
+        self.assertEqual(new.capture_state(), fresh.capture_state())
+        self.assertEqual(result.keyframes.trace, fresh.gantt_data)
+        # A continuação também bate
+        new.run_full(max_iterations=100000)
+        fresh.run_full(max_iterations=100000)
+        self.assertEqual(new.gantt_data, fresh.gantt_data)
+        self.assertEqual(new.get_statistics(), fresh.get_statistics())
+        return result, keyframes
+
+    def test_late_task_edit_reuses_prefix(self):
+        """Testa que editar a última tarefa a chegar só reexecuta depois da chegada."""
+        before = _definitions(generate_workload(30, "io", seed=3))
+        last = max(before, key=lambda d: d['inicio'])
+        after = [dict(d, duracao=d['duracao'] + 5) if d is last else d for d in before]
+        target = last['inicio'] + 40
+        result, _ = self._check(before, after, target)
+        self.assertLessEqual(result.checkpoint, last['inicio'])
+        self.assertGreater(result.checkpoint, last['inicio'] - 16 - 1)
+        self.assertLess(result.replayed, target)
+        self.assertGreaterEqual(result.common_records, len(_run_to(_simulator(before), result.checkpoint).gantt_data))
+
+    def test_edits_for_every_algorithm(self):
+        before = _definitions(generate_workload(20, "mutex", seed=4))
+        middle = sorted(before, key=lambda d: d['inicio'])[10]
+        after = [dict(d, prio_s=d['prio_s'] + 3, mu_events=list(d['mu_events'])) if d is middle else d
+                 for d in before]
+        for algo in ("FIFO", "SRTF", "PRIO", "PRIOPENV", "PRIOPENV-T"):
+            self._check(before, after, 10_000, algo)
+
+    def test_added_and_removed_tasks(self):
+        before = _definitions(generate_workload(20, "io", seed=5))
+        by_arrival = sorted(before, key=lambda d: d['inicio'])
+        removed = by_arrival[-3]
+        after = [d for d in before if d is not removed]
+        after.append(dict(by_arrival[-1], id=500, inicio=by_arrival[-1]['inicio'] + 3))
+        self._check(before, after, by_arrival[-1]['inicio'] + 30)
+
+    def test_no_change_replays_nothing(self):
+        before = _definitions(generate_workload(15, "io", seed=6))
+        result, keyframes = self._check(before, before, 60)
+        self.assertEqual(result.replayed, 0)
+        self.assertIsNone(result.divergence)
+
+
+class TestAdoption(unittest.TestCase):
+    """Testes do aproveitamento do desenho e do histórico de mutexes."""
+
+    def test_renderer_keeps_common_prefix(self):
+        """Testa que o Gantt só redesenha depois do primeiro registro diferente."""
+        before = _definitions(generate_workload(20, "io", seed=7))
+        last = max(before, key=lambda d: d['inicio'])
+        after = [dict(d, RGB=[9, 9, 9]) if d is last else d for d in before]
+        target = last['inicio'] + 20
+
+        old = _simulator(before)
+        keyframes = KeyframeIndex(old, interval=16, adaptive=False)
+        _run_to(old, target)
+        canvas = MemoryCanvas()
+        renderer = GanttCanvasRenderer(canvas)
+        renderer.sync(old, keyframes.trace)
+
+        new = _simulator(after)
+        result = resimulate(keyframes, new, before, after, target)
+        created = canvas.created
+        renderer.adopt(new, result.common_records)
+        renderer.sync(new, result.keyframes.trace)
+
+        full = MemoryCanvas()
+        GanttCanvasRenderer(full).sync(new, result.keyframes.trace)
+        self.assertEqual(canvas.snapshot(), full.snapshot())
+        self.assertLess(canvas.created - created, full.created // 2)
+
+    def test_tiles_keep_common_prefix(self):
+        """Testa que a linha do tempo dos tiles fica igual a uma construída do zero."""
+        before = _definitions(generate_workload(20, "io", seed=9))
+        last = max(before, key=lambda d: d['inicio'])
+        after = [dict(d, io_events=[(1, 3)]) if d is last else d for d in before]
+        target = last['inicio'] + 25
+
+        old = _simulator(before)
+        keyframes = KeyframeIndex(old, interval=16, adaptive=False)
+        _run_to(old, target)
+        view = GanttZoomView(ViewportCanvas(), image_factory=FakeImage)
+        view.set_zoom(ZOOM_LEVELS.index((2, 1)))
+        view.sync(old, keyframes.trace)
+
+        new = _simulator(after)
+        result = resimulate(keyframes, new, before, after, target)
+        view.adopt(new, result.common_records)
+        view.sync(new, result.keyframes.trace)
+        fresh = GanttTimeline(view.timeline.task_ids)
+        fresh.feed(result.keyframes.trace)
+        self.assertEqual(view.timeline.total_ticks, fresh.total_ticks)
+        for tid in fresh.task_ids:
+            for time in range(fresh.total_ticks + 5):
+                self.assertEqual(view.timeline.state_at(tid, time), fresh.state_at(tid, time))
+
+    def test_mutex_history_fork(self):
+        before = _definitions(generate_workload(20, "mutex", seed=8))
+        last = max(before, key=lambda d: d['inicio'])
+        after = [dict(d, duracao=d['duracao'] + 2) if d is last else d for d in before]
+
+        old = _simulator(before)
+        keyframes = KeyframeIndex(old, interval=16, adaptive=False)
+        history = MutexHistory(old)
+        old.run_full()
+
+        new = _simulator(after)
+        forked = {}
+        resimulate(keyframes, new, before, after, old.time,
+                   attach=lambda index: forked.setdefault('history', history.fork(new, new.time)))
+        fresh = _simulator(after)
+        fresh_history = MutexHistory(fresh)
+        _run_to(fresh, new.time)
+        self.assertEqual(forked['history'].holds, fresh_history.holds)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
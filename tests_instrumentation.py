@@ -0,0 +1,156 @@
+"""
+Testes para o modo de instrumentação do simulador.
+
+Verifica:
+1. Fases são cronometradas e contadas a cada passo
+2. Histograma de latência por política de escalonamento
+3. Contadores de troca de contexto, preempção, quantum e mutex
+4. Amostragem do tamanho das filas
+5. Desativar a instrumentação remove os wrappers
+6. A instrumentação não altera o resultado da simulação
+
+Execute com: python3 tests_instrumentation.py
+"""
+
+import unittest
+
+from tasks import TCB
+from scheduler import FIFOScheduler, SRTFScheduler, RoundRobinScheduler, create_scheduler, SCHEDULER_FACTORY
+from simulador import Simulator
+
+
+def _make_tasks():
+    """Cria um conjunto pequeno de tarefas com chegadas escalonadas."""
+    return [
+        TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=6, prio_s=1),
+        TCB(id=2, RGB=[0, 255, 0], inicio=1, duracao=2, prio_s=5),
+        TCB(id=3, RGB=[0, 0, 255], inicio=2, duracao=3, prio_s=3),
+    ]
+
+
+class TestProfilePhases(unittest.TestCase):
+    """Testes das métricas por fase."""
+
+    def test_phase_calls_match_steps(self):
+        """Testa que cada fase principal é chamada uma vez por passo."""
+        simulator = Simulator(FIFOScheduler(), _make_tasks())
+        profile = simulator.enable_profiling()
+        simulator.run_full()
+
+        data = profile.to_dict()
+        steps = simulator.time
+        for phase in ('step', 'save_state', 'arrivals', 'io_unblock', 'select_next_task', 'record_ready'):
+            self.assertEqual(data['phases'][phase]['calls'], steps, phase)
+            self.assertGreaterEqual(data['phases'][phase]['total_ns'], 0)
+
+    def test_decision_histogram_per_policy(self):
+        """Testa o histograma de latência indexado pela política."""
+        simulator = Simulator(SRTFScheduler(), _make_tasks())
+        simulator.enable_profiling()
+        simulator.run_full()
+
+        decisions = simulator.get_profile()['decisions']
+        self.assertIn('SRTFScheduler', decisions)
+        hist = decisions['SRTFScheduler']
+        self.assertEqual(hist['count'], simulator.time)
+        self.assertEqual(sum(hist['buckets'].values()), hist['count'])
+
+    def test_report_is_text(self):
+        """Testa que o relatório é gerado."""
+        simulator = Simulator(FIFOScheduler(), _make_tasks())
+        profile = simulator.enable_profiling()
+        simulator.run_full()
+        report = profile.report()
+        self.assertIn('select_next_task', report)
+        self.assertIn('context_switches', report)
+
+
+class TestProfileCounters(unittest.TestCase):
+    """Testes dos contadores de eventos."""
+
+    def test_context_switches_match_activations(self):
+        """Testa que trocas de contexto correspondem às ativações."""
+        simulator = Simulator(RoundRobinScheduler(quantum=2), _make_tasks())
+        profile = simulator.enable_profiling()
+        simulator.run_full()
+
+        activations = sum(t.ativacoes for t in simulator.all_tasks)
+        self.assertEqual(profile.counters['context_switches'], activations)
+        self.assertGreater(profile.counters['quantum_expiries'], 0)
+
+    def test_preemption_counter(self):
+        """Testa que SRTF conta a preempção quando chega tarefa mais curta."""
+        simulator = Simulator(SRTFScheduler(), _make_tasks())
+        profile = simulator.enable_profiling()
+        simulator.run_full()
+        self.assertGreaterEqual(profile.counters['preemptions'], 1)
+
+    def test_mutex_contention_counter(self):
+        """Testa a contagem de contenção de mutex."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=4, ml_events=[(1, 0)], mu_events=[(1, 3)])
+        t2 = TCB(id=2, RGB=[0, 255, 0], inicio=0, duracao=2, ml_events=[(1, 0)], mu_events=[(1, 1)])
+        simulator = Simulator(RoundRobinScheduler(quantum=1), [t1, t2])
+        profile = simulator.enable_profiling()
+        simulator.run_full()
+        self.assertEqual(profile.counters['mutex_contentions'], 1)
+        self.assertEqual(profile.counters['mutex_acquisitions'], 2)
+
+    def test_queue_samples(self):
+        """Testa a amostragem da fila de prontos."""
+        simulator = Simulator(FIFOScheduler(), _make_tasks())
+        profile = simulator.enable_profiling()
+        simulator.run_full()
+
+        ready = profile.to_dict()['queues']['ready_queue']
+        self.assertEqual(ready['samples'], simulator.time)
+        self.assertGreaterEqual(ready['max'], 2)
+
+
+class TestProfileToggle(unittest.TestCase):
+    """Testes de ativação e desativação."""
+
+    def test_disable_removes_wrappers(self):
+        """Testa que desativar restaura os métodos originais."""
+        scheduler = FIFOScheduler()
+        simulator = Simulator(scheduler, _make_tasks())
+        simulator.enable_profiling()
+        simulator.disable_profiling()
+
+        self.assertNotIn('step', simulator.__dict__)
+        self.assertNotIn('select_next_task', scheduler.__dict__)
+        self.assertEqual(simulator._listeners, [])
+        self.assertIsNotNone(simulator.get_profile())
+
+    def test_disabled_by_default(self):
+        """Testa que a instrumentação vem desativada."""
+        simulator = Simulator(FIFOScheduler(), _make_tasks())
+        self.assertIsNone(simulator.get_profile())
+        self.assertEqual(simulator._listeners, [])
+
+    def test_same_result_with_profiling(self):
+        """Testa que o Gantt é idêntico com e sem instrumentação."""
+        for algo in SCHEDULER_FACTORY:
+            plain = Simulator(create_scheduler(algo, 2, 1), _make_tasks())
+            plain.run_full()
+            profiled = Simulator(create_scheduler(algo, 2, 1), _make_tasks())
+            profiled.enable_profiling()
+            profiled.run_full()
+            self.assertEqual(plain.gantt_data, profiled.gantt_data, algo)
+
+
+class TestCreateScheduler(unittest.TestCase):
+    """Testes da fábrica de escalonadores."""
+
+    def test_create_known_algorithms(self):
+        """Testa que todos os nomes da fábrica são instanciáveis."""
+        for algo, cls in SCHEDULER_FACTORY.items():
+            self.assertIsInstance(create_scheduler(algo, 3, 2), cls)
+
+    def test_unknown_algorithm(self):
+        """Testa que algoritmo desconhecido gera ValueError."""
+        with self.assertRaises(ValueError):
+            create_scheduler("XYZ")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,137 @@
+"""
+Testes para a navegação no tempo com keyframes.
+
+Verifica:
+1. Seek para trás e para frente reproduz o estado de uma execução direta
+2. Um seek para trás reexecuta no máximo um intervalo de keyframes
+3. A quantidade de keyframes fica limitada
+4. Seek para depois do fim para no fim
+5. capture_state()/restore_state() e o mapa de tarefas por id
+
+Execute com: python3 tests_keyframes.py
+"""
+
+import unittest
+from functools import partial
+
+from keyframes import KeyframeIndex
+from tests_helpers import make_simulator
+
+
+_make_simulator = partial(make_simulator, n_tasks=20, mix="io", seed=7)
+
+
+def _snapshot(simulator):
+    """Resumo comparável do estado da simulação."""
+    return (
+        simulator.time,
+        list(simulator.gantt_data),
+        simulator.current_task.id if simulator.current_task else None,
+        [t.id for t in simulator.ready_queue],
+        [(t.id, t.state, t.tempo_restante, t.held_mutexes) for t in simulator.all_tasks],
+        {mid: (m.owner.id if m.owner else None, [t.id for t in m.waiting_queue])
+         for mid, m in simulator.mutexes.items()},
+    )
+
+
+def _fresh_at(target, **kwargs):
+    simulator = _make_simulator(**kwargs)
+    while simulator.time < target and not simulator.is_finished():
+        simulator.step()
+    return simulator
+
+
+class TestSeek(unittest.TestCase):
+    """Testes do posicionamento no tempo."""
+
+    def test_seek_matches_direct_run(self):
+        """Testa seeks para trás e para frente contra execuções diretas."""
+        simulator = _make_simulator()
+        index = KeyframeIndex(simulator, interval=16, adaptive=False)
+        simulator.run_full()
+        end = simulator.time
+        for target in (end // 2, 3, end - 1, 0, end // 3, end):
+            self.assertEqual(index.seek(target), target)
+            self.assertEqual(_snapshot(simulator), _snapshot(_fresh_at(target)), target)
+
+    def test_backward_seek_replays_one_interval(self):
+        """Testa que voltar no tempo reexecuta no máximo um intervalo."""
+        simulator = _make_simulator()
+        index = KeyframeIndex(simulator, interval=16, adaptive=False)
+        simulator.run_full()
+        for target in (simulator.time - 5, 100, 37, 1):
+            index.seek(target)
+            self.assertLess(index.replayed, 16)
+
+    def test_forward_within_known_trace_uses_keyframe(self):
+        """Testa que avançar para longe usa o keyframe mais próximo do alvo."""
+        simulator = _make_simulator()
+        index = KeyframeIndex(simulator, interval=16, adaptive=False)
+        simulator.run_full()
+        end = simulator.time
+        index.seek(0)
+        index.seek(end - 3)
+        self.assertLess(index.replayed, 16)
+        self.assertEqual(simulator.gantt_data, index.trace[:len(simulator.gantt_data)])
+
+    def test_seek_past_end_stops_at_end(self):
+        """Testa que o seek para no fim da simulação."""
+        simulator = _make_simulator()
+        index = KeyframeIndex(simulator)
+        reached = index.seek(10 ** 6)
+        self.assertTrue(simulator.is_finished())
+        self.assertEqual(reached, simulator.time)
+        self.assertEqual(index.frontier, reached)
+        self.assertEqual(index.trace, simulator.gantt_data)
+
+    def test_keyframes_are_bounded(self):
+        """Testa que o limite de keyframes dobra o intervalo em vez de crescer."""
+        simulator = _make_simulator(n_tasks=40)
+        index = KeyframeIndex(simulator, interval=8, max_keyframes=10, adaptive=False)
+        simulator.run_full()
+        self.assertLessEqual(len(index), 10)
+        self.assertGreater(index.interval, 8)
+        self.assertEqual(index.times[0], 0)
+        index.seek(simulator.time // 2)
+        self.assertEqual(_snapshot(simulator), _snapshot(_fresh_at(simulator.time, n_tasks=40)))
+
+    def test_step_after_seek_continues_trace(self):
+        """Testa que passos manuais depois de voltar seguem o mesmo trace."""
+        simulator = _make_simulator()
+        index = KeyframeIndex(simulator, interval=16, adaptive=False)
+        simulator.run_full()
+        index.seek(50)
+        for _ in range(10):
+            simulator.step()
+        self.assertEqual(simulator.gantt_data, index.trace[:len(simulator.gantt_data)])
+        self.assertTrue(simulator.step_back())
+        self.assertEqual(simulator.time, 59)
+
+
+class TestStateCapture(unittest.TestCase):
+    """Testes de capture_state()/restore_state()."""
+
+    def test_restore_round_trip(self):
+        """Testa que restaurar e reexecutar reproduz o mesmo trace."""
+        simulator = _make_simulator()
+        for _ in range(30):
+            simulator.step()
+        state = simulator.capture_state()
+        for _ in range(30):
+            simulator.step()
+        later = _snapshot(simulator)
+        simulator.restore_state(state)
+        self.assertEqual(_snapshot(simulator), _snapshot(_fresh_at(30)))
+        for _ in range(30):
+            simulator.step()
+        self.assertEqual(_snapshot(simulator), later)
+
+    def test_find_task_by_id(self):
+        simulator = _make_simulator()
+        for task in simulator.all_tasks:
+            self.assertIs(simulator._find_task_by_id(task.id), task)
+        self.assertIsNone(simulator._find_task_by_id(-1))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
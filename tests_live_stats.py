@@ -0,0 +1,102 @@
+"""
+Testes para as estatísticas ao vivo.
+
+Verifica:
+1. Ao fim, as médias incrementais batem com get_statistics()
+2. Contadores batem com os eventos, com o Gantt e com a instrumentação
+3. Voltar um passo (e navegar no tempo) volta os contadores
+4. Resumo e texto do painel no meio da execução
+
+Execute com: python3 tests_live_stats.py
+"""
+
+import unittest
+from functools import partial
+
+from keyframes import KeyframeIndex
+from live_stats import live_summary, format_live_summary
+from tests_helpers import make_simulator
+
+
+_make_simulator = partial(make_simulator, n_tasks=25, mix="mutex", seed=4)
+
+
+class TestCounters(unittest.TestCase):
+    """Testes dos contadores do simulador."""
+
+    def test_final_averages_match_statistics(self):
+        """Testa que as médias incrementais batem com o cálculo completo."""
+        for algo in ("FIFO", "RR", "SRTF", "PRIOPENV"):
+            simulator = _make_simulator(mix="io", algo=algo)
+            self.assertTrue(simulator.run_full())
+            stats = simulator.get_statistics()
+            summary = live_summary(simulator)
+            self.assertEqual(summary['completed'], len(simulator.all_tasks))
+            self.assertAlmostEqual(summary['avg_turnaround'], stats['avg_turnaround'])
+            self.assertAlmostEqual(summary['avg_waiting'], stats['avg_waiting'])
+            self.assertAlmostEqual(summary['avg_response'], stats['avg_response'])
+
+    def test_counters_match_events_and_gantt(self):
+        """Testa os contadores contra os eventos emitidos e os registros IDLE."""
+        simulator = _make_simulator()
+        events = {}
+        simulator.add_listener(lambda event, time, info: events.__setitem__(event, events.get(event, 0) + 1))
+        simulator.run_full()
+        counters = simulator.counters
+        self.assertEqual(counters.context_switches, events.get('dispatch', 0))
+        self.assertEqual(counters.mutex_contentions, events.get('mutex_contended', 0))
+        self.assertEqual(counters.quantum_expiries, events.get('quantum_expired', 0))
+        self.assertEqual(counters.preemptions, events.get('preempt', 0))
+        idle = sum(1 for entry in simulator.gantt_data if entry[1] == "IDLE")
+        self.assertEqual(counters.idle_ticks, idle)
+        mutex_wait = sum(t.mutex_wait_time for t in simulator.all_tasks)
+        self.assertEqual(counters.mutex_wait_ticks, mutex_wait)
+
+    def test_counters_match_profile(self):
+        """Testa que os contadores e a instrumentação usam as mesmas definições."""
+        for algo, mix in (("RR", "cpu"), ("SRTF", "io"), ("PRIOPENV", "mutex")):
+            with self.subTest(algo=algo):
+                simulator = _make_simulator(n_tasks=20, mix=mix, algo=algo)
+                profile = simulator.enable_profiling()
+                simulator.run_full()
+                counters = simulator.counters
+                for name in ('context_switches', 'preemptions', 'quantum_expiries', 'mutex_contentions'):
+                    self.assertEqual(getattr(counters, name), profile.counters.get(name, 0), name)
+                if algo == "RR":
+                    self.assertGreater(counters.quantum_expiries, 0)
+
+    def test_step_back_and_seek_restore_counters(self):
+        """Testa que voltar no tempo volta os contadores."""
+        simulator = _make_simulator()
+        index = KeyframeIndex(simulator, interval=8, adaptive=False)
+        for _ in range(40):
+            simulator.step()
+        at_40 = simulator.counters.snapshot()
+        simulator.step()
+        simulator.step_back()
+        self.assertEqual(simulator.counters.snapshot(), at_40)
+        simulator.run_full()
+        index.seek(40)
+        self.assertEqual(simulator.counters.snapshot(), at_40)
+
+
+class TestSummary(unittest.TestCase):
+    """Testes do resumo do painel."""
+
+    def test_mid_run_summary(self):
+        simulator = _make_simulator()
+        self.assertEqual(live_summary(simulator)['cpu_utilization'], 0.0)
+        for _ in range(30):
+            simulator.step()
+        summary = live_summary(simulator)
+        self.assertEqual(summary['time'], 30)
+        self.assertEqual(summary['ready'], len(simulator.ready_queue))
+        self.assertEqual(summary['completed'], len(simulator.done_tasks))
+        self.assertAlmostEqual(summary['cpu_utilization'], 1 - simulator.counters.idle_ticks / 30)
+        text = format_live_summary(summary)
+        self.assertIn(f"Concluídas: {len(simulator.done_tasks)}/25", text)
+        self.assertIn("Trocas de contexto:", text)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
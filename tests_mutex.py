@@ -0,0 +1,72 @@
+"""
+Testes para a fila de espera dos mutexes.
+
+Verifica:
+1. Passagem do mutex na ordem de chegada à fila (FIFO)
+2. Esperas intercaladas em dois mutexes, com as tarefas também numa TCBQueue, sem corromper as filas
+3. Simulação com várias tarefas disputando dois mutexes termina, com os locks em ordem
+
+Execute com: python3 tests_mutex.py
+"""
+
+import unittest
+
+from config_loader import parse_events
+from scheduler import create_scheduler
+from simulador import Mutex, Simulator
+from tasks import STATE_TERMINATED, TCB, TCBQueue
+
+
+class TestMutexWaitingQueue(unittest.TestCase):
+    """Testes da fila de espera do mutex."""
+
+    def test_fifo_handoff(self):
+        tasks = [TCB(id=i, RGB=[0, 0, 0], state=1, inicio=0, duracao=5) for i in range(1, 7)]
+        mutexes = {1: Mutex(1), 2: Mutex(2)}
+        self.assertTrue(mutexes[1].try_lock(tasks[0]))
+        self.assertTrue(mutexes[2].try_lock(tasks[1]))
+        # As tarefas em espera também ficam numa única TCBQueue, como blocked_mutex_queue
+        # no simulador, intercaladas entre os dois mutexes
+        blocked = TCBQueue()
+        for task, mutex_id in zip(tasks[2:], (1, 2, 1, 2)):
+            self.assertFalse(mutexes[mutex_id].try_lock(task))
+            mutexes[mutex_id].add_to_waiting(task)
+            blocked.push_back(task)
+        self.assertEqual([t.id for t in mutexes[1].waiting_queue], [3, 5])
+        self.assertEqual([t.id for t in mutexes[2].waiting_queue], [4, 6])
+        self.assertEqual([t.id for t in blocked], [3, 4, 5, 6])
+
+        for mutex_id, owner, expected in ((1, tasks[0], [3, 5]), (2, tasks[1], [4, 6])):
+            mutex = mutexes[mutex_id]
+            handoffs = []
+            current = mutex.unlock(owner)
+            while current is not None:
+                handoffs.append(current.id)
+                blocked.remove(current)
+                self.assertEqual(mutex.get_owner_id(), current.id)
+                self.assertEqual(current.held_mutexes, [mutex_id])
+                current = mutex.unlock(current)
+            self.assertEqual(handoffs, expected)
+            self.assertTrue(mutex.is_free())
+        self.assertTrue(blocked.is_empty())
+        self.assertEqual([t.mutex_wait_count for t in tasks], [0, 0, 1, 1, 1, 1])
+
+    def test_contended_simulation(self):
+        tasks = []
+        for task_id, events in enumerate(("ML01:0;MU01:3", "ML02:0;MU02:3", "ML01:0;MU01:2",
+                                          "ML02:0;MU02:2", "ML01:0;MU01:2", "ML02:0;MU02:2"), 1):
+            _, ml_events, mu_events = parse_events(events)
+            tasks.append(TCB(id=task_id, RGB=[0, 0, 0], state=1, inicio=0, duracao=4 if task_id < 3 else 3,
+                             prio_s=1, prio_d=1, ml_events=ml_events, mu_events=mu_events))
+        simulator = Simulator(create_scheduler("RR", 1), tasks)
+        acquired = {1: [], 2: []}
+        simulator.add_listener(lambda event, time, info: acquired[info["mutex_id"]].append(info["task_id"])
+                               if event == "mutex_acquire" else None)
+        self.assertTrue(simulator.run_full(max_iterations=200))
+        self.assertEqual([t.state for t in simulator.all_tasks], [STATE_TERMINATED] * 6)
+        self.assertEqual(acquired, {1: [1, 3, 5], 2: [2, 4, 6]})
+        self.assertTrue(all(m.is_free() and not m.waiting_queue for m in simulator.mutexes.values()))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
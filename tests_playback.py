@@ -0,0 +1,105 @@
+"""
+Testes para o controlador do modo play.
+
+Verifica:
+1. Velocidade baixa: passos distribuídos entre quadros (sem redesenho extra)
+2. Velocidade alta: vários passos por quadro
+3. O lote máximo se adapta ao custo medido dos passos e do redesenho
+4. Atrasos não acumulam dívida de passos
+5. Atraso até o próximo quadro
+
+Execute com: python3 tests_playback.py
+"""
+
+import unittest
+
+from playback import PlaybackController, FRAME_MS, FRAME_BUDGET
+
+
+class FakeClock:
+    """Relógio controlado pelo teste."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _play(controller, clock, frames, frame_seconds=FRAME_MS / 1000, step_cost=0.0, render_cost=0.0):
+    """Simula quadros e devolve os passos de cada um."""
+    executed = []
+    for _ in range(frames):
+        clock.now += frame_seconds
+        steps = controller.steps_due()
+        controller.record_frame(step_cost * steps, render_cost if steps else 0.0, steps)
+        executed.append(steps)
+    return executed
+
+
+class TestStepsDue(unittest.TestCase):
+    """Testes do cálculo de passos por quadro."""
+
+    def test_slow_speed_spreads_steps(self):
+        """Testa que 1 tick/s executa um passo por segundo, um quadro por vez."""
+        clock = FakeClock()
+        controller = PlaybackController(speed=1, clock=clock)
+        controller.start()
+        executed = _play(controller, clock, frames=int(3 * 1000 / FRAME_MS) + 1)
+        self.assertEqual(sum(executed), 3)
+        self.assertEqual(max(executed), 1)
+
+    def test_fast_speed_batches_steps(self):
+        """Testa que 10k ticks/s agrupa centenas de passos por quadro quando o custo é baixo."""
+        clock = FakeClock()
+        controller = PlaybackController(speed=10000, clock=clock)
+        controller.start()
+        executed = _play(controller, clock, frames=30, step_cost=1e-6)
+        self.assertAlmostEqual(sum(executed) / (30 * FRAME_MS / 1000), 10000, delta=500)
+        self.assertGreater(max(executed), 100)
+
+    def test_no_debt_after_stall(self):
+        """Testa que um quadro muito atrasado não gera rajada de passos."""
+        clock = FakeClock()
+        controller = PlaybackController(speed=100, clock=clock)
+        controller.start()
+        _play(controller, clock, frames=10)
+        clock.now += 5.0  # Janela travada por 5 s
+        steps = controller.steps_due()
+        self.assertLessEqual(steps, controller.max_batch)
+        self.assertLess(steps, 100)
+
+
+class TestAdaptiveBatch(unittest.TestCase):
+    """Testes da adaptação do lote."""
+
+    def test_batch_fits_frame_budget(self):
+        """Testa que o lote cabe no orçamento do quadro dado o custo por passo."""
+        clock = FakeClock()
+        controller = PlaybackController(speed=10000, clock=clock)
+        controller.start()
+        _play(controller, clock, frames=40, step_cost=0.001, render_cost=0.005)
+        budget = FRAME_MS / 1000 * FRAME_BUDGET
+        self.assertLessEqual(controller.max_batch * 0.001 + 0.005, budget + 0.001)
+        self.assertGreaterEqual(controller.max_batch, 15)
+        self.assertLess(controller.achieved_rate, 10000)
+
+    def test_batch_recovers_when_cheaper(self):
+        """Testa que o lote volta a crescer quando os passos ficam baratos."""
+        clock = FakeClock()
+        controller = PlaybackController(speed=10000, clock=clock)
+        controller.start()
+        _play(controller, clock, frames=20, step_cost=0.01)
+        small = controller.max_batch
+        _play(controller, clock, frames=20, step_cost=1e-6)
+        self.assertGreater(controller.max_batch, small * 10)
+
+    def test_next_delay(self):
+        """Testa que o atraso desconta o tempo gasto e nunca é zero."""
+        controller = PlaybackController()
+        self.assertEqual(controller.next_delay_ms(0.010), FRAME_MS - 10)
+        self.assertEqual(controller.next_delay_ms(1.0), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
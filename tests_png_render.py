@@ -0,0 +1,181 @@
+"""
+Testes para a renderização do Gantt em PNG sem interface gráfica.
+
+Verifica:
+1. O PNG gravado (zlib da biblioteca padrão) decodifica para o buffer
+2. Cores por estado, contornos e rótulos nas posições do Gantt
+3. Traces por tick, TraceIndex e por intervalos dão a mesma imagem
+4. Tiles lado a lado formam a imagem inteira (largura inválida é rejeitada)
+5. Renderização em lote num pool de processos
+6. Exportação pela linha de comando
+
+Execute com: python3 tests_png_render.py
+"""
+
+import contextlib
+import io
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from functools import partial
+
+import cli
+from gantt_index import TraceIndex
+from png_render import (BAR_HALF_HEIGHT, BLOCK_WIDTH, IO_RGB, LEFT_MARGIN, MUTEX_RGB, ROW_HEIGHT, TOP_MARGIN,
+                        Raster, gantt_rows, render, render_many, save_png, save_tiles)
+from tests_helpers import make_simulator
+
+
+def read_png(filepath):
+    """Decodifica um PNG RGB de 8 bits sem filtros (o que write_png grava)."""
+    with open(filepath, "rb") as f:
+        data = f.read()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    offset, idat, header = 8, b"", None
+    while offset < len(data):
+        length, kind = struct.unpack(">I4s", data[offset:offset + 8])
+        payload = data[offset + 8:offset + 8 + length]
+        crc, = struct.unpack(">I", data[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(kind + payload) & 0xffffffff
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", payload)
+        elif kind == b"IDAT":
+            idat += payload
+        offset += 12 + length
+    width, height = header[:2]
+    raw = zlib.decompress(idat)
+    stride = width * 3 + 1
+    pixels = bytearray()
+    for y in range(height):
+        assert raw[y * stride] == 0
+        pixels += raw[y * stride + 1:(y + 1) * stride]
+    return Raster(width, height, pixels)
+
+
+_finished_simulator = partial(make_simulator, n_tasks=12, mix="mutex", seed=3, steps=None)
+
+
+def _center(tid_row, time, scale=BLOCK_WIDTH):
+    """Pixel no meio do tick `time` da linha `tid_row` (0 = primeira linha)."""
+    return LEFT_MARGIN + int(time * scale + scale / 2), TOP_MARGIN + tid_row * ROW_HEIGHT + ROW_HEIGHT // 2
+
+
+class TestRaster(unittest.TestCase):
+    """Testes do buffer e do PNG."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_png_round_trip(self):
+        simulator = _finished_simulator()
+        raster = render(simulator.gantt_data)
+        path = os.path.join(self.tmp.name, "a.png")
+        raster.save(path)
+        decoded = read_png(path)
+        self.assertEqual((decoded.width, decoded.height), (raster.width, raster.height))
+        self.assertEqual(decoded.data, raster.data)
+        # Gravação em streaming gera o mesmo arquivo
+        streamed = os.path.join(self.tmp.name, "b.png")
+        self.assertEqual(save_png(simulator.gantt_data, streamed), (raster.width, raster.height))
+        with open(path, "rb") as a, open(streamed, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_state_colors_and_outlines(self):
+        """Testa as cores de cada estado e o contorno dos intervalos."""
+        trace = {2: [(0, 3, "EXEC"), (3, 5, "IO"), (5, 6, "READY"), (6, 8, "MUTEX")], 1: [(1, 2, "EXEC")]}
+        raster = render(trace, colors={2: (10, 200, 30), 1: (250, 0, 0)})
+        self.assertEqual(raster.height, 2 * TOP_MARGIN + 2 * ROW_HEIGHT)
+        self.assertEqual(raster.pixel(*_center(0, 1)), (10, 200, 30))
+        self.assertEqual(raster.pixel(*_center(0, 4)), IO_RGB)
+        self.assertEqual(raster.pixel(*_center(0, 5)), (255, 255, 255))
+        self.assertEqual(raster.pixel(*_center(0, 7)), MUTEX_RGB)
+        self.assertEqual(raster.pixel(*_center(1, 1)), (250, 0, 0))
+        x, y = _center(0, 5)
+        # Pronta: contorno na cor da tarefa; demais: preto
+        self.assertEqual(raster.pixel(x, y - BAR_HALF_HEIGHT), (10, 200, 30))
+        self.assertEqual(raster.pixel(LEFT_MARGIN, y), (0, 0, 0))
+        self.assertEqual(raster.pixel(x, y - BAR_HALF_HEIGHT - 1), (255, 255, 255))
+        # Tarefa 1 sem registro no tick 0
+        self.assertEqual(raster.pixel(*_center(1, 0)), (255, 255, 255))
+        # Rótulo na margem esquerda
+        left = [raster.pixel(x, y) for x in range(LEFT_MARGIN - 5) for y in range(TOP_MARGIN, TOP_MARGIN + ROW_HEIGHT)]
+        self.assertIn((0, 0, 0), left)
+
+    def test_trace_forms_agree(self):
+        simulator = _finished_simulator(mix="io")
+        task_ids = [t.id for t in simulator.all_tasks]
+        index = TraceIndex()
+        index.feed(simulator.gantt_data)
+        per_tick = render(simulator.gantt_data, task_ids)
+        self.assertEqual(render(index, task_ids).data, per_tick.data)
+        intervals = {tid: index.intervals(tid) for tid in index.tasks}
+        colors = {tid: index.color(tid) for tid in index.tasks}
+        self.assertEqual(render(intervals, task_ids, colors=colors).data, per_tick.data)
+        self.assertEqual(len(gantt_rows(simulator.gantt_data, task_ids)), len(task_ids))
+
+    def test_small_scale_and_windows(self):
+        """Testa escala fracionária e que uma janela é um recorte da imagem inteira."""
+        simulator = _finished_simulator(mix="cpu", n_tasks=20)
+        full = render(simulator.gantt_data, scale=0.5)
+        self.assertLess(full.width, LEFT_MARGIN + simulator.time)
+        window = render(simulator.gantt_data, scale=0.5, x0=37, width=50)
+        for y in range(full.height):
+            self.assertEqual(window.row(y), full.row(y)[37 * 3:87 * 3])
+
+
+class TestTilesAndBatch(unittest.TestCase):
+    """Testes de tiles e do pool de processos."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_tiles_form_full_image(self):
+        simulator = _finished_simulator()
+        full = render(simulator.gantt_data)
+        for processes in (1, 2):
+            directory = os.path.join(self.tmp.name, f"tiles{processes}")
+            paths = save_tiles(simulator.gantt_data, directory, tile_width=300, processes=processes)
+            self.assertEqual(len(paths), -(-full.width // 300))
+            tiles = [read_png(path) for path in paths]
+            self.assertEqual(sum(tile.width for tile in tiles), full.width)
+            for y in range(full.height):
+                self.assertEqual(b"".join(tile.row(y) for tile in tiles), full.row(y))
+        # Largura inválida: erro antes de criar o diretório
+        directory = os.path.join(self.tmp.name, "invalido")
+        for width in (0, -300):
+            with self.subTest(width=width), self.assertRaisesRegex(ValueError, "tile_width deve ser positivo"):
+                save_tiles(simulator.gantt_data, directory, tile_width=width)
+        self.assertFalse(os.path.exists(directory))
+
+    def test_render_many(self):
+        traces = [_finished_simulator(seed=seed).gantt_data for seed in range(3)]
+        jobs = [(trace, os.path.join(self.tmp.name, f"run{i}.png"), {"scale": 4})
+                for i, trace in enumerate(traces)]
+        sizes = render_many(jobs, processes=2)
+        for (trace, path, _), size in zip(jobs, sizes):
+            expected = render(trace, scale=4)
+            self.assertEqual(size, (expected.width, expected.height))
+            self.assertEqual(read_png(path).data, expected.data)
+
+    def test_cli_png(self):
+        config = os.path.join(self.tmp.name, "config.txt")
+        with open(config, "w", encoding="utf-8") as f:
+            f.write("FIFO;2\nt01;#ff0000;0;3;1;\nt02;#00ff00;1;2;1;\n")
+        path = os.path.join(self.tmp.name, "cli.png")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(cli.main([config, "--quiet", "--png", path]), 0)
+        image = read_png(path)
+        self.assertEqual(image.height, 2 * TOP_MARGIN + 2 * ROW_HEIGHT)
+        self.assertEqual(image.width, LEFT_MARGIN + 5 * BLOCK_WIDTH + 20)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
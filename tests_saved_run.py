@@ -0,0 +1,174 @@
+"""
+Testes para as execuções salvas (saved_run).
+
+Verifica:
+1. Intervalos, totais, estados e registros iguais aos do trace simulado (zlib e lzma)
+2. Janelas e consultas por tarefa só descomprimem os blocos necessários
+3. Gravação em fluxo (drain), metadados, hash da carga e arquivos inválidos
+4. Linha de comando e renderização do Gantt sem o simulador
+
+Execute com: python3 tests_saved_run.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import cli
+from benchmark import generate_workload
+from gantt_index import TraceIndex
+from gantt_tiles import GanttZoomView
+from saved_run import RunWindow, SavedRun, SavedRunWriter, is_saved_run, save_run, workload_hash
+from scheduler import create_scheduler
+from simulador import Simulator
+from svg_export import export_svg
+from tests_helpers import FakeImage, ViewportCanvas
+
+
+def _simulate(n_tasks=150, mix="mutex", seed=3, algo="RR", quantum=2):
+    simulator = Simulator(create_scheduler(algo, quantum), generate_workload(n_tasks, mix, seed=seed))
+    simulator.run_full(max_iterations=10 ** 6)
+    return simulator
+
+
+def _records(records):
+    return sorted((time, str(tid), state) for time, tid, _, state in records)
+
+
+class TestSavedRun(unittest.TestCase):
+    """Testes das execuções salvas."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "execucao.srun")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        simulator = _simulate()
+        index = TraceIndex()
+        index.feed(simulator.gantt_data)
+        for codec in ("zlib", "lzma"):
+            with self.subTest(codec=codec):
+                save_run(self.path, simulator, "RR", 2, None, chunk_ticks=128, codec=codec)
+                with SavedRun(self.path) as run:
+                    self.assertEqual((run.algorithm, run.quantum, run.alpha), ("RR", 2, None))
+                    self.assertEqual(run.final_time, simulator.time)
+                    self.assertEqual(run.end, simulator.time)
+                    self.assertEqual(run.statistics, simulator.get_statistics())
+                    self.assertEqual(run.workload_hash, workload_hash(simulator.all_tasks))
+                    self.assertEqual(run.task_ids, sorted(t.id for t in simulator.all_tasks))
+                    self.assertEqual(run.colors, {t.id: list(t.RGB) for t in simulator.all_tasks})
+                    full = run.intervals()
+                    for tid in index.tasks:
+                        self.assertEqual(full[tid], index.intervals(tid))
+                        self.assertEqual(run.task_intervals(tid, 300, 700), index.intervals(tid, 300, 700))
+                    totals = run.totals(200, 900)
+                    for tid in index.tasks:
+                        self.assertEqual(totals.get(tid, dict.fromkeys(("EXEC", "READY", "IO", "MUTEX"), 0)),
+                                         index.totals(tid, 200, 900))
+                    self.assertEqual(_records(run.records()), _records(simulator.gantt_data))
+                    for time, tid, _, state in simulator.gantt_data[::97]:
+                        self.assertEqual(run.state_at(tid, time), state)
+                    self.assertIsNone(run.state_at(10 ** 6, 5))
+
+    def test_window_reads_only_needed_chunks(self):
+        simulator = _simulate(n_tasks=300, mix="io")
+        save_run(self.path, simulator, "RR", 2, None, chunk_ticks=100)
+        with SavedRun(self.path) as run:
+            self.assertGreater(run.n_chunks, 10)
+            self.assertEqual(run.chunks_read, 0)
+            window = run.intervals(450, 650)
+            self.assertEqual(run.chunks_read, 3)
+            self.assertTrue(all(450 <= start < end <= 650 for spans in window.values() for start, end, _ in spans))
+            self.assertEqual(list(run.chunk_range(450, 650)), [4, 5, 6])
+            # Os blocos recentes ficam em memória
+            run.intervals(500, 600)
+            self.assertEqual(run.chunks_read, 3)
+            # Consulta por tarefa: só os blocos em que ela aparece
+            first = min(simulator.all_tasks, key=lambda t: t.fim)
+            reads = run.chunks_read
+            run.task_intervals(first.id)
+            self.assertLessEqual(run.chunks_read - reads, first.fim // 100 + 1)
+
+    def test_streaming_writer(self):
+        simulator = Simulator(create_scheduler("SRTF"), generate_workload(200, "io", seed=5))
+        with SavedRunWriter(self.path, "SRTF", chunk_ticks=64, codec="lzma") as writer:
+            writer.attach(simulator, drain=True)
+            simulator.run_full(max_iterations=10 ** 6)
+            # Só o bloco atual fica pendente
+            self.assertEqual(simulator.gantt_data, [])
+            self.assertLessEqual(len(writer._buckets), 2)
+            writer.finish(simulator)
+        reference = _simulate(200, "io", seed=5, algo="SRTF", quantum=None)
+        other = os.path.join(self.tmp.name, "referencia.srun")
+        save_run(other, reference, "SRTF")
+        with SavedRun(self.path) as streamed, SavedRun(other) as saved:
+            self.assertEqual(streamed.intervals(), saved.intervals())
+            self.assertEqual(streamed.statistics, saved.statistics)
+            self.assertEqual(streamed.workload_hash, saved.workload_hash)
+        # Registro de um bloco já gravado
+        with SavedRunWriter(io.BytesIO(), "RR", chunk_ticks=10) as writer:
+            writer.feed([(3, 1, [0, 0, 0], "READY"), (25, 1, [0, 0, 0], "EXEC")])
+            with self.assertRaises(ValueError):
+                writer.feed([(7, 2, [0, 0, 0], "EXEC")])
+
+    def test_invalid_files(self):
+        with self.assertRaises(ValueError):
+            SavedRunWriter(self.path, "RR", codec="gzip")
+        writer = SavedRunWriter(self.path, "RR")
+        writer.feed([(0, 1, [1, 2, 3], "EXEC")])
+        writer._target.flush()
+        # Gravação interrompida: o cabeçalho ainda não aponta para o índice
+        with self.assertRaises(ValueError):
+            SavedRun(self.path)
+        writer.close()
+        with SavedRun(self.path) as run:
+            self.assertEqual(run.intervals(), {1: [(0, 1, "EXEC")]})
+            self.assertIsNone(run.statistics)
+        config = os.path.join(self.tmp.name, "config.txt")
+        with open(config, "w", encoding="utf-8") as f:
+            f.write("RR;2\n")
+        self.assertTrue(is_saved_run(self.path))
+        self.assertFalse(is_saved_run(config))
+        with self.assertRaises(ValueError):
+            SavedRun(config)
+
+    def test_cli_and_renderers(self):
+        config = os.path.join(self.tmp.name, "config.txt")
+        with open(config, "w", encoding="utf-8") as f:
+            f.write("PRIOPENV;3;1\nt1;#ff0000;0;6;1;IO:2-2\nt2;#00ff00;1;5;3;ML01:0;MU01:3\n"
+                    "t3;#0000ff;2;4;2;ML01:1;MU01:2\n")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(cli.main([config, "--no-cache", "--save-run", self.path]), 0)
+        simulated = out.getvalue().split("Execução salva")[0]
+        svg = os.path.join(self.tmp.name, "salva.svg")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(cli.main([self.path]), 0)
+            self.assertEqual(cli.main([self.path, "--window", "2:9", "--svg", svg]), 0)
+        self.assertIn(simulated.strip(), out.getvalue())
+        self.assertIn("Janela 2:9", out.getvalue())
+
+        simulator = Simulator(create_scheduler("PRIOPENV", 3, 1), cli.load_simulation_config(config)[3])
+        simulator.run_full()
+        expected = io.StringIO()
+        export_svg(simulator.gantt_data, expected, task_ids=[t.id for t in simulator.all_tasks], t0=2, t1=9)
+        with open(svg, encoding="utf-8") as f:
+            self.assertEqual(f.read(), expected.getvalue())
+
+        # O Gantt da execução salva é desenhado igual ao do simulador
+        with SavedRun(self.path) as run:
+            window = RunWindow(run)
+            canvases = []
+            for source in (simulator, window):
+                canvas = ViewportCanvas()
+                GanttZoomView(canvas, image_factory=FakeImage).sync(source, source.gantt_data)
+                canvases.append(sorted((item['type'], tuple(item['coords'])) for item in canvas.items.values()))
+            self.assertEqual(canvases[0], canvases[1])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,117 @@
+"""
+Testes para a execução da simulação em segundo plano.
+
+Verifica:
+1. A thread produz o mesmo resultado que run_full()
+2. Deadlock e limite de passos encerram como em run_full()
+3. Cancelamento interrompe a execução
+4. Progresso e estimativa de horizonte
+5. Leituras com a trava nunca veem um passo pela metade
+
+Execute com: python3 tests_sim_worker.py
+"""
+
+import time
+import unittest
+from functools import partial
+
+from scheduler import create_scheduler, FIFOScheduler
+from sim_worker import SimulationWorker, estimate_horizon
+from simulador import Simulator
+from tasks import TCB
+from tests_helpers import make_simulator
+
+
+_make_simulator = partial(make_simulator, n_tasks=30, mix="io", seed=3)
+
+
+def _run_worker(worker, timeout=30):
+    worker.start()
+    worker.join(timeout)
+    return worker
+
+
+class TestWorkerResult(unittest.TestCase):
+    """Testes do resultado da execução."""
+
+    def test_same_result_as_run_full(self):
+        """Testa que o Gantt e o resultado batem com run_full()."""
+        plain = _make_simulator()
+        expected = plain.run_full()
+
+        simulator = _make_simulator()
+        worker = _run_worker(SimulationWorker(simulator, batch_seconds=0.001))
+        self.assertTrue(worker.done)
+        self.assertEqual(worker.finished_ok, expected)
+        self.assertEqual(simulator.gantt_data, plain.gantt_data)
+        self.assertEqual(worker.progress()['fraction'], 1.0)
+
+    def test_deadlock_stops(self):
+        """Testa que o deadlock encerra com finished_ok False."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=5, ml_events=[(1, 0), (2, 2)], mu_events=[(2, 3), (1, 4)])
+        t2 = TCB(id=2, RGB=[0, 255, 0], inicio=0, duracao=5, ml_events=[(2, 0), (1, 2)], mu_events=[(1, 3), (2, 4)])
+        simulator = Simulator(create_scheduler("RR", quantum=1), [t1, t2])
+        worker = _run_worker(SimulationWorker(simulator))
+        self.assertFalse(worker.finished_ok)
+        self.assertTrue(simulator.is_deadlocked())
+
+    def test_iteration_limit(self):
+        """Testa que o limite de passos é respeitado."""
+        simulator = _make_simulator()
+        worker = _run_worker(SimulationWorker(simulator, max_iterations=7))
+        self.assertFalse(worker.finished_ok)
+        self.assertEqual(worker.steps, 7)
+        self.assertEqual(simulator.time, 7)
+
+    def test_error_is_reported(self):
+        """Testa que uma exceção na thread fica disponível para a interface."""
+        simulator = _make_simulator()
+
+        def broken():
+            raise ValueError("falha")
+        simulator.step = broken
+        worker = _run_worker(SimulationWorker(simulator))
+        self.assertIsInstance(worker.error, ValueError)
+        self.assertIsNone(worker.finished_ok)
+
+
+class TestWorkerControl(unittest.TestCase):
+    """Testes de cancelamento, progresso e trava."""
+
+    def test_cancel(self):
+        """Testa que cancelar interrompe a execução antes do fim."""
+        simulator = Simulator(FIFOScheduler(), [TCB(id=1, RGB=[0, 0, 0], inicio=0, duracao=10 ** 7)])
+        worker = SimulationWorker(simulator, max_iterations=10 ** 8, batch_seconds=0.001)
+        worker.start()
+        time.sleep(0.05)
+        worker.cancel()
+        worker.join(5)
+        self.assertTrue(worker.done)
+        self.assertTrue(worker.cancelled)
+        self.assertIsNone(worker.finished_ok)
+        self.assertFalse(simulator.is_finished())
+        self.assertLess(worker.progress()['fraction'], 1.0)
+
+    def test_locked_reads_are_consistent(self):
+        """Testa que, com a trava, o tempo do simulador bate com os passos executados."""
+        simulator = _make_simulator(n_tasks=200)
+        worker = SimulationWorker(simulator, batch_seconds=0.001)
+        worker.start()
+        while not worker.done:
+            with worker.lock:
+                self.assertEqual(simulator.time, worker.steps)
+            time.sleep(0.001)
+        self.assertGreater(worker.progress()['ticks_per_sec'], 0)
+
+    def test_estimate_horizon(self):
+        """Testa a estimativa do tempo final."""
+        tasks = [TCB(id=1, RGB=[0, 0, 0], inicio=2, duracao=3),
+                 TCB(id=2, RGB=[0, 0, 0], inicio=20, duracao=4)]
+        self.assertEqual(estimate_horizon(tasks), 24)
+        tasks.append(TCB(id=3, RGB=[0, 0, 0], inicio=2, duracao=30))
+        self.assertEqual(estimate_horizon(tasks), 39)
+        self.assertEqual(estimate_horizon([]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
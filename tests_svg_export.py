@@ -0,0 +1,122 @@
+"""
+Testes para a exportação do Gantt em SVG a partir do trace.
+
+Verifica:
+1. Um <rect> por trecho contínuo no mesmo estado
+2. Cores em classes CSS, sem atributos de cor nos retângulos
+3. Janela de tempo corta os intervalos e o eixo
+4. Arquivo, objeto de arquivo e linha de comando
+
+Execute com: python3 tests_svg_export.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from functools import partial
+
+import cli
+from gantt_index import TraceIndex
+from png_render import BLOCK_WIDTH, LEFT_MARGIN
+from svg_export import export_svg
+from tests_helpers import make_simulator
+
+NS = "{http://www.w3.org/2000/svg}"
+
+
+_finished_simulator = partial(make_simulator, n_tasks=15, mix="io", seed=5, steps=None)
+
+
+def _export(trace, **options):
+    buffer = io.StringIO()
+    count = export_svg(trace, buffer, **options)
+    return count, ET.fromstring(buffer.getvalue()), buffer.getvalue()
+
+
+def _bars(root):
+    return [el for el in root.iter(NS + "rect") if el.get("class") != "bg"]
+
+
+class TestSvgExport(unittest.TestCase):
+    """Testes do exportador SVG."""
+
+    def test_one_rect_per_interval(self):
+        simulator = _finished_simulator(mix="mutex")
+        index = TraceIndex()
+        index.feed(simulator.gantt_data)
+        intervals = sum(len(index.intervals(tid)) for tid in index.tasks)
+        count, root, _ = _export(simulator.gantt_data)
+        self.assertEqual(count, intervals)
+        self.assertEqual(len(_bars(root)), intervals)
+        self.assertLess(count, sum(1 for entry in simulator.gantt_data if entry[1] != "IDLE"))
+        # Ticks cobertos pelos retângulos = registros do Gantt
+        ticks = sum(float(el.get("width")) for el in _bars(root)) / BLOCK_WIDTH
+        self.assertEqual(ticks, sum(sum(index.totals(tid).values()) for tid in index.tasks))
+
+    def test_colors_in_stylesheet(self):
+        """Testa que as cores ficam no <style> e os retângulos só têm classe."""
+        trace = {1: [(0, 2, "EXEC"), (2, 3, "READY"), (3, 5, "IO"), (5, 6, "MUTEX")]}
+        count, root, text = _export(trace, colors={1: (0x12, 0x34, 0x56)})
+        self.assertEqual(count, 4)
+        style = root.find(NS + "style").text
+        self.assertIn(".t0{fill:#123456}", style)
+        self.assertIn(".r0{fill:none;stroke:#123456}", style)
+        self.assertIn(".io{fill:#bfbfbf}", style)
+        self.assertEqual([el.get("class") for el in _bars(root)], ["t0", "r0", "io", "mx"])
+        for el in _bars(root):
+            self.assertIsNone(el.get("fill"))
+            self.assertIsNone(el.get("stroke"))
+        self.assertEqual(text.count("#123456"), 2)
+        labels = [el.text for el in root.iter(NS + "text")]
+        self.assertIn("T1", labels)
+
+    def test_time_window(self):
+        simulator = _finished_simulator()
+        t0, t1 = 40, 90
+        count, root, _ = _export(simulator.gantt_data, t0=t0, t1=t1)
+        full_count, _, _ = _export(simulator.gantt_data)
+        self.assertLess(count, full_count)
+        self.assertEqual(float(root.get("width")), LEFT_MARGIN + (t1 - t0) * BLOCK_WIDTH + 20)
+        for el in _bars(root):
+            x, width = float(el.get("x")), float(el.get("width"))
+            self.assertGreaterEqual(x, LEFT_MARGIN)
+            self.assertLessEqual(x + width, LEFT_MARGIN + (t1 - t0) * BLOCK_WIDTH)
+            self.assertGreater(width, 0)
+        # Ticks da janela batem com o índice
+        index = TraceIndex()
+        index.feed(simulator.gantt_data)
+        expected = sum(sum(index.totals(tid, t0, t1).values()) for tid in index.tasks)
+        self.assertEqual(sum(float(el.get("width")) for el in _bars(root)) / BLOCK_WIDTH, expected)
+        ticks = [int(el.text) for el in root.iter(NS + "text") if el.get("class") == "tick"]
+        self.assertTrue(ticks)
+        self.assertTrue(all(t0 < tick <= t1 for tick in ticks))
+
+    def test_tasks_without_records_and_files(self):
+        simulator = _finished_simulator()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gantt.svg")
+            ids = [t.id for t in simulator.all_tasks] + [999]
+            export_svg(simulator.gantt_data, path, task_ids=ids)
+            root = ET.parse(path).getroot()
+            labels = [el.text for el in root.iter(NS + "text") if el.get("class") != "tick"]
+            self.assertEqual(labels, [f"T{tid}" for tid in sorted(ids, reverse=True)])
+
+    def test_cli_svg(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = os.path.join(tmp, "config.txt")
+            with open(config, "w", encoding="utf-8") as f:
+                f.write("FIFO;2\nt01;#ff0000;0;3;1;\nt02;#00ff00;1;2;1;\n")
+            path = os.path.join(tmp, "cli.svg")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(cli.main([config, "--quiet", "--svg", path, "--svg-window", "1:4"]), 0)
+            root = ET.parse(path).getroot()
+            self.assertEqual(float(root.get("width")), LEFT_MARGIN + 3 * BLOCK_WIDTH + 20)
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                cli.main([config, "--svg", path, "--svg-window", "a:b"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,125 @@
+"""
+Testes para a importação de traces SWF.
+
+Verifica:
+1. Mapeamento de job, envio, execução, fila e usuário para tarefas
+2. Escala de tempo, jobs ignorados, linhas mal formatadas e cabeçalho
+3. Leitura sob demanda como fonte de chegadas (.swf.gz)
+4. Conversão para texto/binário e linha de comando
+
+Execute com: python3 tests_swf_import.py
+"""
+
+import contextlib
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+import cli
+import swf_import
+from config_loader import load_simulation_config
+from scheduler import create_scheduler
+from simulador import Simulator
+from swf_import import SwfTrace, field_color, is_swf_trace, swf_source
+from workload_bin import MappedWorkload
+from tests_helpers import task_fields
+
+TRACE = """; Version: 2.2
+; Computer: Teste
+; MaxJobs: 6
+;
+1 100 5 60 4 -1 -1 4 120 -1 1 3 1 7 2 1 -1 -1
+2 130 0 30 1 -1 -1 1 60 -1 1 5 1 7 1 1 -1 -1
+3 160 -1 -1 2 -1 -1 2 60 -1 5 3 1 7 2 1 -1 -1
+; comentário no meio
+4 200 0 0.4 1 -1 -1 1 60 -1 0 3 1 7 -1 1 -1 -1
+x 210 0 10
+5 250 0 90 1
+"""
+
+
+class TestSwfImport(unittest.TestCase):
+    """Testes do importador SWF."""
+
+    def _read(self, **options):
+        trace = SwfTrace(io.StringIO(TRACE), **options)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            tasks = list(trace)
+        return trace, tasks, out.getvalue()
+
+    def test_mapping(self):
+        trace, tasks, out = self._read()
+        self.assertEqual([(t.id, t.inicio, t.duracao, t.prio_s) for t in tasks],
+                         [(1, 0, 60, 2), (2, 30, 30, 1), (4, 100, 1, 0), (5, 150, 90, 0)])
+        # Mesmo usuário, mesma cor; campo ausente = cinza
+        self.assertEqual(tasks[0].RGB, tasks[2].RGB)
+        self.assertNotEqual(tasks[0].RGB, tasks[1].RGB)
+        self.assertEqual(tasks[3].RGB, [128, 128, 128])
+        self.assertIsNot(tasks[0].RGB, tasks[2].RGB)
+        self.assertEqual((trace.read, trace.skipped), (4, 1))
+        self.assertEqual(trace.header, {"Version": "2.2", "Computer": "Teste", "MaxJobs": "6"})
+        self.assertEqual(out.splitlines(), ["Aviso: linha 10: ignorando job mal formatado: 'x 210 0 10'"])
+
+    def test_options(self):
+        _, tasks, _ = self._read(time_scale=0.1, priority="user", colors="job", rebase=False)
+        self.assertEqual([(t.inicio, t.duracao, t.prio_s) for t in tasks],
+                         [(10, 6, 3), (13, 3, 5), (20, 1, 3), (25, 9, 0)])
+        self.assertEqual([t.RGB for t in tasks], [field_color(tid) for tid in (1, 2, 4, 5)])
+        trace, tasks, _ = self._read(limit=2, priority="none")
+        self.assertEqual([(t.id, t.prio_s) for t in tasks], [(1, 0), (2, 0)])
+        for bad in (dict(time_scale=0), dict(priority="x"), dict(colors="x")):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                SwfTrace(io.StringIO(TRACE), **bad)
+        self.assertTrue(is_swf_trace("a/CTC-SP2.SWF.gz"))
+        self.assertFalse(is_swf_trace("config.txt"))
+
+    def test_stream_from_gzip(self):
+        """Testa um trace grande comprimido lido sob demanda pelo simulador."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grande.swf.gz")
+            with gzip.open(path, "wt") as f:
+                f.write("; MaxJobs: 100000\n")
+                for job in range(1, 100001):
+                    f.write(f"{job} {job * 10} 0 {job % 7 + 1} 1 -1 -1 1 -1 -1 1 {job % 13} 1 -1 1 1 -1 -1\n")
+            trace = SwfTrace(path, time_scale=0.5)
+            simulator = Simulator(create_scheduler("FIFO"), swf_source(path, time_scale=0.5), horizon=2000,
+                                  retire_finished=True)
+            self.assertTrue(simulator.run_full(max_iterations=10000))
+            # Só as chegadas até o horizonte foram lidas
+            self.assertLess(simulator.source.taken, 500)
+            self.assertEqual(simulator.retired_count, 400)
+            self.assertEqual(trace.read_header(), {"MaxJobs": "100000"})
+            trace.close()
+
+    def test_convert_and_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.swf")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(TRACE)
+            _, expected, _ = self._read()
+            text = os.path.join(tmp, "carga.txt")
+            binary = os.path.join(tmp, "carga.wlb")
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(swf_import.main([path, text, "--algo", "rr", "--quantum", "4"]), 0)
+                self.assertEqual(swf_import.main([path, binary]), 0)
+            self.assertIn("4 tarefas gravadas", out.getvalue())
+            self.assertIn("1 jobs ignorados", out.getvalue())
+            algo, quantum, _, tasks = load_simulation_config(text)
+            self.assertEqual((algo, quantum), ("RR", 4))
+            self.assertEqual(task_fields(tasks), task_fields(expected))
+            with MappedWorkload(binary) as workload:
+                self.assertEqual(workload.algorithm, "FIFO")
+                self.assertEqual(task_fields(workload.load()[3]), task_fields(expected))
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(cli.main([path, "--quiet"]), 0)
+                self.assertEqual(cli.main([path, "--stream", "--algo", "rr", "--quantum", "2"]), 0)
+                self.assertEqual(cli.main([text, "--quiet", "--no-cache", "--algo", "rr", "--quantum", "2"]), 0)
+            self.assertEqual(out.getvalue().count("Tarefas concluídas: 4/4"), 3)
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(swf_import.main([path, text, "--time-scale", "0"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
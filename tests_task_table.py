@@ -0,0 +1,162 @@
+"""
+Testes para a tabela de tarefas virtualizada.
+
+Verifica:
+1. Só as linhas visíveis existem no Treeview, independente da quantidade de tarefas
+2. Rolagem troca os valores das linhas fixas
+3. Um passo reescreve só as células alteradas das tarefas sujas
+4. O simulador informa as tarefas com prioridade dinâmica alterada
+
+Execute com: python3 tests_task_table.py
+"""
+
+import unittest
+
+from scheduler import create_scheduler
+from simulador import Simulator
+from task_table import VirtualTaskTable, COLUMN_IDS, TABLE_ROWS, task_row
+from tasks import TCB
+
+
+class FakeTree:
+    """Treeview em memória que registra as escritas."""
+
+    def __init__(self):
+        self.rows = {}
+        self.options = {}
+        self.writes = 0
+
+    def configure(self, **kw):
+        self.options.update(kw)
+
+    def insert(self, parent, index, values=()):
+        iid = f"I{len(self.rows)}"
+        self.rows[iid] = dict(zip(COLUMN_IDS, values))
+        return iid
+
+    def item(self, iid, values=()):
+        self.rows[iid] = dict(zip(COLUMN_IDS, values))
+        self.writes += 1
+
+    def set(self, iid, column, value):
+        self.rows[iid][column] = value
+        self.writes += 1
+
+    def visible(self):
+        return [row['id'] for row in self.rows.values() if row]
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.position = None
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+def _tasks(n):
+    return [TCB(id=i, RGB=[i % 256, 0, 0], inicio=i % 7, duracao=3, prio_s=i % 5) for i in range(n, 0, -1)]
+
+
+class TestVirtualTable(unittest.TestCase):
+    """Testes da janela de linhas."""
+
+    def test_only_visible_rows(self):
+        """Testa que 10 mil tarefas criam só TABLE_ROWS linhas, ordenadas por ID."""
+        tree = FakeTree()
+        table = VirtualTaskTable(tree)
+        table.set_tasks(_tasks(10000))
+        self.assertEqual(len(tree.rows), TABLE_ROWS)
+        self.assertEqual(tree.visible(), list(range(1, TABLE_ROWS + 1)))
+        self.assertNotIn("prio_d", tree.options['displaycolumns'])
+
+    def test_scrolling(self):
+        """Testa rolagem por unidades, páginas e posição absoluta."""
+        tree, bar = FakeTree(), FakeScrollbar()
+        table = VirtualTaskTable(tree, bar)
+        table.set_tasks(_tasks(100))
+        table.yview("scroll", 3, "units")
+        self.assertEqual(tree.visible()[0], 4)
+        table.yview("scroll", 1, "pages")
+        self.assertEqual(tree.visible()[0], 4 + TABLE_ROWS)
+        table.yview("moveto", 1.0)
+        self.assertEqual(tree.visible()[-1], 100)
+        self.assertEqual(bar.position[1], 1.0)
+        table.yview("moveto", 0.5)
+        self.assertEqual(tree.visible()[0], 51)
+        self.assertEqual(len(tree.rows), TABLE_ROWS)
+
+    def test_short_list_blanks_rows(self):
+        """Testa que recarregar com menos tarefas limpa as linhas que sobram."""
+        tree = FakeTree()
+        table = VirtualTaskTable(tree)
+        table.set_tasks(_tasks(20))
+        table.set_tasks(_tasks(2))
+        self.assertEqual(tree.visible(), [1, 2])
+
+    def test_refresh_writes_only_changed_cells(self):
+        """Testa que só as células alteradas das tarefas sujas visíveis são escritas."""
+        tasks = _tasks(1000)
+        tree = FakeTree()
+        table = VirtualTaskTable(tree)
+        table.set_tasks(tasks, show_prio_d=True)
+        by_id = {t.id: t for t in tasks}
+        tree.writes = 0
+
+        table.refresh(set())
+        self.assertEqual(tree.writes, 0)
+
+        by_id[2].prio_d += 1
+        by_id[500].prio_d += 1  # Fora da janela
+        table.refresh({2, 500})
+        self.assertEqual(tree.writes, 1)
+        self.assertEqual(list(tree.rows.values())[1]['prio_d'], by_id[2].prio_d)
+
+        table.refresh({3})  # Suja, mas sem mudança visível
+        self.assertEqual(tree.writes, 1)
+
+    def test_task_at(self):
+        """Testa o id da tarefa mostrada em cada linha fixa."""
+        tree = FakeTree()
+        table = VirtualTaskTable(tree)
+        table.set_tasks(_tasks(50))
+        table.scroll_to(10)
+        slots = list(tree.rows)
+        self.assertEqual(table.task_at(slots[0]), 11)
+        self.assertIsNone(table.task_at("outro"))
+
+    def test_task_row(self):
+        task = TCB(id=7, RGB=[255, 0, 16], inicio=2, duracao=5, prio_s=3, io_events=[(1, 2)])
+        self.assertEqual(task_row(task), (7, "ff0010", 2, 5, 3, 3, "1-2"))
+
+
+class TestDirtyTasks(unittest.TestCase):
+    """Testes do rastreamento de tarefas alteradas no simulador."""
+
+    def test_tracking_follows_aging(self):
+        """Testa que o envelhecimento por tick marca as tarefas prontas."""
+        tasks = [TCB(id=i, RGB=[0, 0, 0], inicio=0, duracao=5, prio_s=i) for i in range(1, 5)]
+        simulator = Simulator(create_scheduler("PRIOPENV-T", quantum=2, alpha=1), tasks)
+        self.assertIsNone(simulator.take_dirty_tasks())
+        simulator.step()
+        dirty = simulator.take_dirty_tasks()
+        self.assertEqual(dirty, {1, 2, 3, 4})
+        simulator.step()
+        ready = {t.id for t in simulator.ready_queue if t is not simulator.current_task}
+        self.assertTrue(ready <= simulator.take_dirty_tasks())
+
+    def test_no_tracking_until_requested(self):
+        simulator = Simulator(create_scheduler("PRIOPENV-T", quantum=2, alpha=1), _tasks(5))
+        simulator.step()
+        self.assertIsNone(simulator.dirty_tasks)
+
+    def test_step_back_marks_everything(self):
+        simulator = Simulator(create_scheduler("PRIOPENV", quantum=2, alpha=1), _tasks(5))
+        simulator.take_dirty_tasks()
+        simulator.step()
+        simulator.step_back()
+        self.assertIsNone(simulator.take_dirty_tasks())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,219 @@
+"""
+Testes para a exportação de traces no formato Chrome Trace Event.
+
+Verifica:
+1. O arquivo gerado é um JSON válido
+2. Ciclos consecutivos no mesmo estado viram um único intervalo
+3. Existe uma trilha para a CPU e uma para cada tarefa
+4. Posse de mutex aparece como fluxo (início e fim)
+5. Deadlock gera um único evento instantâneo, na entrada do travamento
+6. Modo drain não acumula registros no simulador
+7. Opção --chrome-trace da linha de comando (com e sem --stream)
+
+Execute com: python3 tests_trace_export.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import cli
+from tasks import TCB
+from scheduler import FIFOScheduler, RoundRobinScheduler
+from simulador import Simulator
+from trace_export import ChromeTraceWriter, export_chrome_trace, PID_CPU, PID_TASKS
+
+
+def _run_with_writer(simulator, **kwargs):
+    """Executa a simulação com o exportador anexado e retorna os eventos."""
+    buf = io.StringIO()
+    writer = ChromeTraceWriter(buf, **kwargs)
+    writer.attach(simulator)
+    simulator.run_full()
+    writer.close()
+    return json.loads(buf.getvalue())
+
+
+def _spans(events, pid, tid=None):
+    """Filtra os intervalos completos (ph 'X') de uma trilha."""
+    return [e for e in events
+            if e["ph"] == "X" and e["pid"] == pid and (tid is None or e["tid"] == tid)]
+
+
+class TestChromeTraceSpans(unittest.TestCase):
+    """Testes dos intervalos exportados."""
+
+    def test_fifo_spans_are_merged(self):
+        """Testa que execução contínua gera um único intervalo EXEC."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=3)
+        t2 = TCB(id=2, RGB=[0, 255, 0], inicio=0, duracao=2)
+        events = _run_with_writer(Simulator(FIFOScheduler(), [t1, t2]), tick_us=1)
+
+        t1_spans = _spans(events, PID_TASKS, 1)
+        self.assertEqual([(e["name"], e["ts"], e["dur"]) for e in t1_spans], [("EXEC", 0, 3)])
+
+        t2_spans = sorted(_spans(events, PID_TASKS, 2), key=lambda e: e["ts"])
+        self.assertEqual([(e["name"], e["ts"], e["dur"]) for e in t2_spans],
+                         [("READY", 0, 3), ("EXEC", 3, 2)])
+
+    def test_cpu_track(self):
+        """Testa a trilha da CPU, incluindo ociosidade."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=2, duracao=2)
+        events = _run_with_writer(Simulator(FIFOScheduler(), [t1]), tick_us=1)
+
+        cpu = sorted(_spans(events, PID_CPU, 0), key=lambda e: e["ts"])
+        self.assertEqual([(e["name"], e["ts"], e["dur"]) for e in cpu],
+                         [("IDLE", 0, 2), ("T1", 2, 2)])
+
+    def test_round_robin_alternates(self):
+        """Testa que a preempção por quantum fecha e reabre intervalos."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=4)
+        t2 = TCB(id=2, RGB=[0, 255, 0], inicio=0, duracao=4)
+        events = _run_with_writer(Simulator(RoundRobinScheduler(quantum=2), [t1, t2]), tick_us=1)
+
+        exec_t1 = [e for e in _spans(events, PID_TASKS, 1) if e["name"] == "EXEC"]
+        self.assertEqual(sum(e["dur"] for e in exec_t1), 4)
+        self.assertEqual(len(exec_t1), 2)
+
+    def test_io_span(self):
+        """Testa que o bloqueio por I/O aparece como intervalo IO."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=3, io_events=[(1, 2)])
+        events = _run_with_writer(Simulator(FIFOScheduler(), [t1]), tick_us=1)
+
+        io_spans = [e for e in _spans(events, PID_TASKS, 1) if e["name"] == "IO"]
+        self.assertEqual([(e["ts"], e["dur"]) for e in io_spans], [(1, 2)])
+
+    def test_thread_names(self):
+        """Testa que cada tarefa recebe uma trilha nomeada."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=1)
+        t2 = TCB(id=2, RGB=[0, 255, 0], inicio=0, duracao=1)
+        events = _run_with_writer(Simulator(FIFOScheduler(), [t1, t2]))
+
+        names = {e["tid"]: e["args"]["name"] for e in events
+                 if e["ph"] == "M" and e["name"] == "thread_name" and e["pid"] == PID_TASKS}
+        self.assertEqual(names, {1: "T1", 2: "T2"})
+
+
+class TestChromeTraceMutex(unittest.TestCase):
+    """Testes de eventos de mutex e deadlock."""
+
+    def test_mutex_flow(self):
+        """Testa que lock/unlock geram início e fim de fluxo."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=4,
+                 ml_events=[(1, 1)], mu_events=[(1, 3)])
+        events = _run_with_writer(Simulator(FIFOScheduler(), [t1]), tick_us=1)
+
+        starts = [e for e in events if e["ph"] == "s"]
+        ends = [e for e in events if e["ph"] == "f"]
+        self.assertEqual(len(starts), 1)
+        self.assertEqual(len(ends), 1)
+        self.assertEqual(starts[0]["id"], ends[0]["id"])
+        self.assertEqual(starts[0]["ts"], 1)
+
+    def test_deadlock_instant_event(self):
+        """Testa que um deadlock gera evento instantâneo."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=5,
+                 ml_events=[(1, 0), (2, 1)], mu_events=[(2, 3), (1, 4)])
+        t2 = TCB(id=2, RGB=[0, 255, 0], inicio=0, duracao=5,
+                 ml_events=[(2, 0), (1, 1)], mu_events=[(1, 3), (2, 4)])
+        simulator = Simulator(RoundRobinScheduler(quantum=1), [t1, t2])
+        events = _run_with_writer(simulator)
+
+        instants = [e for e in events if e["ph"] == "i"]
+        self.assertEqual(len(instants), 1)
+        self.assertEqual(sorted(instants[0]["args"]["tasks"]), ["T1", "T2"])
+
+    def test_deadlock_emitted_once(self):
+        """Testa que passos já travados (e voltar a eles) não repetem o evento."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=5,
+                 ml_events=[(1, 0), (2, 1)], mu_events=[(2, 3), (1, 4)])
+        t2 = TCB(id=2, RGB=[0, 255, 0], inicio=0, duracao=5,
+                 ml_events=[(2, 0), (1, 1)], mu_events=[(1, 3), (2, 4)])
+        simulator = Simulator(RoundRobinScheduler(quantum=1), [t1, t2])
+        deadlocks = []
+        simulator.add_listener(lambda event, time, info: event == 'deadlock' and deadlocks.append(time))
+        for _ in range(10):
+            simulator.step()
+        self.assertEqual(len(deadlocks), 1)
+        simulator.step_back()
+        simulator.step()
+        self.assertEqual(len(deadlocks), 1)
+        while simulator.is_deadlocked():
+            simulator.step_back()
+        simulator.step()
+        self.assertEqual(deadlocks, [deadlocks[0]] * 2)
+
+
+class TestChromeTraceStreaming(unittest.TestCase):
+    """Testes da escrita incremental."""
+
+    def test_drain_releases_gantt_data(self):
+        """Testa que drain=True esvazia gantt_data e mantém o trace completo."""
+        tasks = [TCB(id=i, RGB=[i, i, i], inicio=i, duracao=3) for i in range(1, 6)]
+        simulator = Simulator(FIFOScheduler(), tasks)
+        events = _run_with_writer(simulator, drain=True, tick_us=1)
+
+        self.assertEqual(simulator.gantt_data, [])
+        self.assertEqual(simulator.history, [])
+        exec_total = sum(e["dur"] for e in _spans(events, PID_TASKS) if e["name"] == "EXEC")
+        self.assertEqual(exec_total, 15)
+
+    def test_export_finished_simulation(self):
+        """Testa a exportação de uma simulação já concluída."""
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=2)
+        simulator = Simulator(FIFOScheduler(), [t1])
+        simulator.run_full()
+
+        buf = io.StringIO()
+        with ChromeTraceWriter(buf, tick_us=1) as writer:
+            writer.feed(simulator.gantt_data)
+        events = json.loads(buf.getvalue())
+        self.assertEqual(len(_spans(events, PID_TASKS, 1)), 1)
+
+    def test_export_chrome_trace_file(self):
+        """Testa a função utilitária que grava em arquivo."""
+        import os
+        import tempfile
+
+        t1 = TCB(id=1, RGB=[255, 0, 0], inicio=0, duracao=2)
+        simulator = Simulator(FIFOScheduler(), [t1])
+        simulator.run_full()
+
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            count = export_chrome_trace(simulator, path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(len(json.load(f)), count)
+        finally:
+            os.remove(path)
+
+
+class TestChromeTraceCli(unittest.TestCase):
+    """Testes da opção --chrome-trace."""
+
+    def test_cli_chrome_trace(self):
+        """Testa que a execução normal e a em fluxo gravam os mesmos intervalos."""
+        with tempfile.TemporaryDirectory() as tmp:
+            config = os.path.join(tmp, "config.txt")
+            with open(config, "w", encoding="utf-8") as f:
+                f.write("RR;2\nt1;#ff0000;0;6;1;ML01:1;MU01:3\nt2;#00ff00;1;5;3;ML01:0;MU01:2;IO:3-2\n")
+            traces = []
+            for extra in ([], ["--stream"], ["--stream", "--save-run", os.path.join(tmp, "run.srun")]):
+                path = os.path.join(tmp, "trace.json")
+                with contextlib.redirect_stdout(io.StringIO()) as out:
+                    self.assertEqual(cli.main([config, "--no-cache", "--quiet", "--chrome-trace", path] + extra), 0)
+                self.assertIn(f"Trace salvo em {path}", out.getvalue())
+                with open(path, encoding="utf-8") as f:
+                    events = json.load(f)
+                traces.append(sorted(json.dumps(e, sort_keys=True) for e in events))
+            self.assertTrue(any('"ph": "s"' in e for e in traces[0]))
+            self.assertEqual(traces[0], traces[1])
+            self.assertEqual(traces[0], traces[2])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,140 @@
+"""
+Testes para o formato binário de carga de trabalho.
+
+Verifica:
+1. Conversão texto -> binário -> texto preserva a carga
+2. Leitura direta do mapeamento (ingressos, busca de chegada, eventos)
+3. Simulação com a carga binária igual à da configuração de texto
+4. Cursor de chegadas do simulador depois de voltar no tempo
+5. Arquivos inválidos
+
+Execute com: python3 tests_workload_bin.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import cli
+import workload_bin
+
+from benchmark import generate_workload
+from config_loader import load_simulation_config
+from scheduler import create_scheduler
+from simulador import Simulator
+from workload_bin import MappedWorkload, binary_to_text, text_to_binary, write_workload
+from tests_helpers import task_fields
+
+CONFIG = """RR;3
+t03;#0000ff;4;6;2;ML02:0;MU02:2;IO:4-2
+t01;#ff0000;0;5;2;IO:2-1;ML01:1;MU01:3
+t02;00ff00;1;3;1
+t04;#123456;1;2;0;IO:1-1;IO:3-2
+"""
+
+
+class TestWorkloadBinary(unittest.TestCase):
+    """Testes do formato binário."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmp.name, "config.txt")
+        with open(self.config, "w", encoding="utf-8") as f:
+            f.write(CONFIG)
+        self.binary = os.path.join(self.tmp.name, "carga.wlb")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_text_round_trip(self):
+        algo, quantum, alpha, tasks = load_simulation_config(self.config)
+        self.assertEqual(text_to_binary(self.config, self.binary), 4)
+        back = os.path.join(self.tmp.name, "volta.txt")
+        self.assertEqual(binary_to_text(self.binary, back), 4)
+        algo2, quantum2, alpha2, tasks2 = load_simulation_config(back)
+        self.assertEqual((algo2, quantum2, alpha2), (algo, quantum, alpha))
+        by_arrival = sorted(tasks, key=lambda t: t.inicio)
+        self.assertEqual(task_fields(tasks2), task_fields(by_arrival))
+
+    def test_mapped_reads(self):
+        """Testa a leitura de ingressos, eventos e tarefas direto do mapeamento."""
+        text_to_binary(self.config, self.binary)
+        with MappedWorkload(self.binary) as workload:
+            self.assertEqual((workload.algorithm, workload.quantum, workload.alpha), ("RR", 3, None))
+            self.assertEqual(len(workload), 4)
+            self.assertEqual(list(workload.arrivals), [0, 1, 1, 4])
+            self.assertEqual(workload.first_arrival_at(1), 1)
+            self.assertEqual(workload.first_arrival_at(2), 3)
+            self.assertEqual(workload.first_arrival_at(5), 4)
+            self.assertEqual(workload.events(3), ([(4, 2)], [(2, 0)], [(2, 2)]))
+            self.assertEqual(workload.mutex_ids(), [1, 2])
+            self.assertEqual(workload.event_count, 8)
+            task = workload.task(2)
+            self.assertEqual((task.id, task.RGB, task.io_events), (4, [0x12, 0x34, 0x56], [(1, 1), (3, 2)]))
+            self.assertEqual(task.tempo_restante, 2)
+            with self.assertRaises(IndexError):
+                workload.task(4)
+
+    def test_simulation_matches_text(self):
+        tasks = generate_workload(60, "mutex", seed=7)
+        write_workload(self.binary, "PRIOPENV", 2, 1, tasks)
+        with MappedWorkload(self.binary) as workload:
+            algo, quantum, alpha, mapped = workload.load()
+        self.assertEqual((algo, quantum, alpha), ("PRIOPENV", 2, 1))
+        expected = Simulator(create_scheduler("PRIOPENV", quantum=2, alpha=1), generate_workload(60, "mutex", seed=7))
+        simulator = Simulator(create_scheduler(algo, quantum=quantum, alpha=alpha), mapped)
+        expected.run_full(max_iterations=100000)
+        simulator.run_full(max_iterations=100000)
+        self.assertEqual(simulator.gantt_data, expected.gantt_data)
+
+    def test_invalid_files(self):
+        empty = os.path.join(self.tmp.name, "vazio.wlb")
+        open(empty, "wb").close()
+        with self.assertRaises(ValueError):
+            MappedWorkload(empty)
+        write_workload(self.binary, "RR", 2, None, generate_workload(5, "io", seed=1))
+        with open(self.binary, "ab") as f:
+            f.write(b"\0")
+        with self.assertRaises(ValueError):
+            MappedWorkload(self.binary)
+        with self.assertRaises(ValueError):
+            write_workload(os.path.join(self.tmp.name, "x.wlb"), "X" * 17, None, None, [])
+
+    def test_command_lines(self):
+        """Testa o conversor e a linha de comando do simulador com a carga binária."""
+        back = os.path.join(self.tmp.name, "volta.txt")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(workload_bin.main([self.config, self.binary]), 0)
+            self.assertEqual(workload_bin.main([self.binary, back]), 0)
+            self.assertEqual(cli.main([self.binary, "--quiet"]), 0)
+            self.assertEqual(cli.main([back, "--quiet", "--no-cache"]), 0)
+        reports = [block for block in out.getvalue().split("Tempo final") if block.strip()][1:]
+        self.assertEqual(len(reports), 2)
+        self.assertEqual(reports[0], reports[1])
+
+
+class TestArrivalCursor(unittest.TestCase):
+    """Testes do cursor de chegadas do simulador."""
+
+    def test_restore_rewinds_cursor(self):
+        simulator = Simulator(create_scheduler("RR", quantum=2), generate_workload(40, "io", seed=2))
+        early = None
+        for _ in range(60):
+            if simulator.time == 20:
+                early = simulator.capture_state()
+            simulator.step()
+        simulator.run_full(max_iterations=100000)
+        expected = list(simulator.gantt_data)
+        simulator.restore_state(early)
+        simulator.run_full(max_iterations=100000)
+        self.assertEqual(simulator.gantt_data, expected)
+        while simulator.step_back():
+            pass
+        simulator.run_full(max_iterations=100000)
+        self.assertEqual(simulator.gantt_data, expected)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
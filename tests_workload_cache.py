@@ -0,0 +1,111 @@
+"""
+Testes para o cache binário de configurações.
+
+Verifica:
+1. A carga pelo cache é igual à interpretação do texto
+2. Validação por mtime/tamanho e, se só o mtime mudou, pelo hash do conteúdo
+3. Arquivo alterado ou cache corrompido voltam a interpretar o texto
+4. Cache em diretório próprio e diretório sem permissão de escrita
+
+Execute com: python3 tests_workload_cache.py
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import workload_cache
+from config_loader import load_simulation_config
+from tests_helpers import task_fields
+from workload_cache import cache_path, cache_status, load_cached_config, pack_workload, unpack_workload
+
+CONFIG = """PRIOPENV;3;2
+# comentário
+t01;#ff0000;0;5;2;IO:2-1;ML01:1;MU01:3
+t02;00ff00;1;3;1
+t03;#0000ff;4;6;;ML:0;MU:2;IO:4-2
+t15;#zz0000;2;2;7;IO:1-1;IO:3-2
+"""
+
+
+def _fields(workload):
+    algo, quantum, alpha, tasks = workload
+    return algo, quantum, alpha, task_fields(tasks)
+
+
+class TestWorkloadCache(unittest.TestCase):
+    """Testes do cache de configurações."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmp.name, "config.txt")
+        self._write(CONFIG)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, text, mtime=None):
+        with open(self.config, "w", encoding="utf-8") as f:
+            f.write(text)
+        if mtime is not None:
+            os.utime(self.config, ns=(mtime, mtime))
+
+    def test_round_trip(self):
+        expected = _fields(load_simulation_config(self.config))
+        self.assertEqual(_fields(unpack_workload(pack_workload(*load_simulation_config(self.config)))), expected)
+        self.assertEqual(cache_status(self.config), "missing")
+        self.assertEqual(_fields(load_cached_config(self.config)), expected)
+        self.assertTrue(os.path.exists(cache_path(self.config)))
+        self.assertEqual(cache_status(self.config), "hit")
+        with mock.patch.object(workload_cache, "load_simulation_config") as parse:
+            self.assertEqual(_fields(load_cached_config(self.config)), expected)
+            parse.assert_not_called()
+
+    def test_touched_file_uses_hash(self):
+        """Testa que só mudar o mtime não obriga a interpretar o texto."""
+        load_cached_config(self.config)
+        self._write(CONFIG, mtime=1_000_000_000_000_000_000)
+        self.assertEqual(cache_status(self.config), "touched")
+        with mock.patch.object(workload_cache, "load_simulation_config") as parse:
+            load_cached_config(self.config)
+            parse.assert_not_called()
+        self.assertEqual(cache_status(self.config), "hit")
+
+    def test_changed_file_is_reparsed(self):
+        load_cached_config(self.config)
+        changed = CONFIG.replace("t02;00ff00;1;3;1", "t02;00ff00;1;9;1")
+        self._write(changed, mtime=1_000_000_000_000_000_000)
+        self.assertEqual(cache_status(self.config), "stale")
+        _, _, _, tasks = load_cached_config(self.config)
+        self.assertEqual(tasks[1].duracao, 9)
+        self.assertEqual(cache_status(self.config), "hit")
+
+    def test_corrupted_cache(self):
+        expected = _fields(load_simulation_config(self.config))
+        load_cached_config(self.config)
+        path = cache_path(self.config)
+        with open(path, "r+b") as f:
+            f.seek(-5, os.SEEK_END)
+            f.truncate()
+        self.assertEqual(_fields(load_cached_config(self.config)), expected)
+        with open(path, "wb") as f:
+            f.write(b"lixo")
+        self.assertEqual(cache_status(self.config), "missing")
+        self.assertEqual(_fields(load_cached_config(self.config)), expected)
+
+    def test_cache_dir_and_read_only(self):
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        load_cached_config(self.config, cache_dir)
+        self.assertEqual(os.listdir(cache_dir), [os.path.basename(cache_path(self.config, cache_dir))])
+        self.assertFalse(os.path.exists(cache_path(self.config)))
+        # Sem poder gravar, carrega do texto normalmente
+        with mock.patch.object(workload_cache.os, "replace", side_effect=PermissionError):
+            other = os.path.join(self.tmp.name, "outro")
+            workload = load_cached_config(self.config, other)
+        self.assertEqual(_fields(workload), _fields(load_simulation_config(self.config)))
+        self.assertEqual(os.listdir(other), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
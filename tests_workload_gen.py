@@ -0,0 +1,154 @@
+"""
+Testes para o gerador estatístico de cargas de trabalho.
+
+Verifica:
+1. Mesma semente = mesma carga, com qualquer número de processos
+2. Distribuições de chegada e de duração; ingresso máximo
+3. Rajadas de I/O e seções críticas válidas
+4. Saída em texto e binária equivalentes; fluxo infinito como fonte de chegadas
+5. Parâmetros inválidos e linha de comando
+
+Execute com: python3 tests_workload_gen.py
+"""
+
+import contextlib
+import io
+import itertools
+import os
+import statistics
+import tempfile
+import unittest
+
+import workload_gen
+from config_loader import load_simulation_config
+from scheduler import create_scheduler
+from simulador import Simulator
+from workload_bin import MappedWorkload
+from workload_gen import WorkloadSpec, iter_tasks, validate_spec, workload_source, write_binary, write_text
+from tests_helpers import task_fields
+
+
+class TestWorkloadGenerator(unittest.TestCase):
+    """Testes do gerador."""
+
+    def test_reproducible_across_processes(self):
+        spec = WorkloadSpec(n_tasks=1000, arrival="bursty", service="pareto", io_prob=0.3, mutex_prob=0.3)
+        serial = task_fields(iter_tasks(spec, seed=5, chunk_size=128))
+        self.assertEqual(len(serial), 1000)
+        self.assertEqual(task_fields(iter_tasks(spec, seed=5, chunk_size=128)), serial)
+        self.assertEqual(task_fields(iter_tasks(spec, seed=5, processes=3, chunk_size=128)), serial)
+        self.assertNotEqual(task_fields(iter_tasks(spec, seed=6, chunk_size=128)), serial)
+        arrivals = [fields[2] for fields in serial]
+        self.assertEqual(arrivals, sorted(arrivals))
+        self.assertEqual([fields[0] for fields in serial], list(range(1, 1001)))
+
+    def test_arrival_distributions(self):
+        n = 20000
+        poisson = [t.inicio for t in iter_tasks(WorkloadSpec(n_tasks=n, rate=0.5), seed=1)]
+        self.assertAlmostEqual(poisson[-1] / n, 2.0, delta=0.1)
+        bursty = [t.inicio for t in iter_tasks(WorkloadSpec(n_tasks=n, rate=0.5, arrival="bursty",
+                                                            burst_size=10), seed=1)]
+        self.assertAlmostEqual(bursty[-1] / n, 2.0, delta=0.3)
+        same_tick = sum(a == b for a, b in zip(bursty, bursty[1:])) / n
+        self.assertGreater(same_tick, 0.85)
+        uniform = [t.inicio for t in iter_tasks(WorkloadSpec(n_tasks=10, rate=0.25, arrival="uniform"))]
+        self.assertEqual(uniform, list(range(4, 44, 4)))
+        # Ingresso máximo: chegadas posteriores ficam no limite, ainda em ordem
+        capped = [t.inicio for t in iter_tasks(WorkloadSpec(n_tasks=200, rate=10, max_arrival=15), seed=2)]
+        self.assertEqual(max(capped), 15)
+        self.assertEqual(capped, sorted(capped))
+        self.assertEqual(capped[:100], [t.inicio for t in iter_tasks(WorkloadSpec(n_tasks=100, rate=10), seed=2)])
+
+    def test_service_distributions(self):
+        n = 20000
+        exponential = [t.duracao for t in iter_tasks(WorkloadSpec(n_tasks=n, mean_service=8), seed=2)]
+        self.assertAlmostEqual(statistics.mean(exponential), 8, delta=0.5)
+        self.assertGreaterEqual(min(exponential), 1)
+        pareto = [t.duracao for t in iter_tasks(WorkloadSpec(n_tasks=n, service="pareto", mean_service=8,
+                                                             pareto_shape=2.5), seed=2)]
+        self.assertAlmostEqual(statistics.mean(pareto), 8, delta=0.8)
+        self.assertGreater(max(pareto), 5 * 8)
+        bimodal = [t.duracao for t in iter_tasks(WorkloadSpec(n_tasks=n, service="bimodal", short_service=2,
+                                                              long_service=30, long_fraction=0.2), seed=2)]
+        self.assertEqual(set(bimodal), {2, 30})
+        self.assertAlmostEqual(bimodal.count(30) / n, 0.2, delta=0.02)
+        uniform = [t.duracao for t in iter_tasks(WorkloadSpec(n_tasks=n, service="uniform", min_service=3,
+                                                              max_service=7), seed=2)]
+        self.assertEqual(set(uniform), set(range(3, 8)))
+
+    def test_io_and_critical_sections(self):
+        spec = WorkloadSpec(n_tasks=3000, io_prob=0.5, io_bursts=3, mutex_prob=0.4, n_mutexes=3, cs_fraction=0.5)
+        tasks = list(iter_tasks(spec, seed=3))
+        with_io = [t for t in tasks if t.io_events]
+        with_mutex = [t for t in tasks if t.ml_events]
+        self.assertAlmostEqual(len(with_mutex) / len(tasks), 0.4, delta=0.05)
+        for task in with_io:
+            points = [point for point, _ in task.io_events]
+            self.assertEqual(points, sorted(set(points)))
+            self.assertTrue(1 <= len(points) <= 3)
+            self.assertTrue(all(0 < point < task.duracao and length >= 1 for point, length in task.io_events))
+        for task in with_mutex:
+            (mutex_id, lock_at), = task.ml_events
+            (unlock_id, unlock_at), = task.mu_events
+            self.assertEqual(mutex_id, unlock_id)
+            self.assertIn(mutex_id, (1, 2, 3))
+            self.assertTrue(0 <= lock_at < unlock_at <= task.duracao)
+        plain = list(iter_tasks(WorkloadSpec(n_tasks=500), seed=3))
+        self.assertFalse(any(t.io_events or t.ml_events or t.mu_events for t in plain))
+        simulator = Simulator(create_scheduler("RR", quantum=2), tasks[:300])
+        self.assertTrue(simulator.run_full(max_iterations=100000))
+
+    def test_text_and_binary_outputs(self):
+        spec = WorkloadSpec(n_tasks=700, io_prob=0.3, mutex_prob=0.3, service="bimodal")
+        expected = task_fields(iter_tasks(spec, seed=4))
+        with tempfile.TemporaryDirectory() as tmp:
+            text = os.path.join(tmp, "carga.txt")
+            binary = os.path.join(tmp, "carga.wlb")
+            self.assertEqual(write_text(text, spec, seed=4, algo="PRIOPENV", quantum=3, alpha=1), 700)
+            self.assertEqual(write_binary(binary, spec, seed=4, algo="PRIOPENV", quantum=3, alpha=1), 700)
+            algo, quantum, alpha, tasks = load_simulation_config(text)
+            self.assertEqual((algo, quantum, alpha), ("PRIOPENV", 3, 1))
+            self.assertEqual(task_fields(tasks), expected)
+            with MappedWorkload(binary) as workload:
+                self.assertEqual(task_fields(workload.load()[3]), expected)
+            with self.assertRaises(ValueError):
+                write_binary(binary, spec._replace(n_tasks=None))
+
+    def test_infinite_source(self):
+        spec = WorkloadSpec(n_tasks=None, rate=0.1, mutex_prob=0.2)
+        first = task_fields(itertools.islice(iter_tasks(spec, seed=7, chunk_size=64), 300))
+        self.assertEqual(len(first), 300)
+        simulator = Simulator(create_scheduler("SRTF"), workload_source(spec, seed=7), horizon=500,
+                              retire_finished=True)
+        self.assertTrue(simulator.run_full(max_iterations=1000))
+        self.assertGreater(simulator.retired_count, 20)
+
+    def test_invalid_spec_and_cli(self):
+        for bad in (dict(arrival="x"), dict(service="x"), dict(rate=0), dict(pareto_shape=1),
+                    dict(min_service=5, max_service=2), dict(io_prob=2), dict(n_mutexes=0), dict(max_arrival=-1)):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                validate_spec(WorkloadSpec(**bad))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cli.txt")
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(workload_gen.main([path, "-n", "50", "--service", "uniform", "--seed", "3",
+                                                    "--algo", "fifo", "--io-prob", "0.5"]), 0)
+            self.assertIn("50 tarefas", out.getvalue())
+            spec = WorkloadSpec(n_tasks=50, service="uniform", io_prob=0.5)
+            _, _, _, tasks = load_simulation_config(path)
+            self.assertEqual(task_fields(tasks), task_fields(iter_tasks(spec, seed=3)))
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(workload_gen.main([path, "-n", "0"]), 1)
+                self.assertEqual(workload_gen.main([path, "--rate", "-1"]), 1)
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(workload_gen.main(["-", "-n", "3", "--algo", "srtf", "--quantum", "0"]), 0)
+            self.assertEqual(out.getvalue().splitlines()[0], "SRTF;0")
+            self.assertEqual(len(out.getvalue().splitlines()), 4)
+            # Linha de comentário do cabeçalho (diálogo "Teste Aleatório")
+            header = io.StringIO()
+            write_text(header, WorkloadSpec(n_tasks=2), header="#id;cor;chegada;duracao;prioridade")
+            self.assertEqual(header.getvalue().splitlines()[:2], ["RR;2", "#id;cor;chegada;duracao;prioridade"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,301 @@
+"""
+Módulo de exportação de execuções para o formato Chrome Trace Event (JSON).
+
+O arquivo gerado pode ser aberto no Perfetto (ui.perfetto.dev) ou em
+chrome://tracing, que lidam bem com escalonamentos muito longos.
+
+Organização do trace:
+    - Processo "CPU": uma única trilha com o que a CPU executou a cada ciclo
+      (nome da tarefa ou IDLE)
+    - Processo "Tarefas": uma trilha por tarefa com os intervalos
+      EXEC, READY, IO e MUTEX
+    - Posse de mutex: eventos de fluxo (ph 's'/'f') ligando a aquisição à liberação
+    - Deadlock: evento instantâneo global (ph 'i')
+
+A escrita é incremental: o exportador consome os registros novos de
+Simulator.gantt_data a cada passo, junta ciclos consecutivos do mesmo estado
+em um único intervalo e grava no arquivo assim que o intervalo se fecha.
+Com drain=True os registros consumidos também são descartados do simulador.
+"""
+
+import json
+from typing import Dict, IO, List, Optional, Tuple, Union
+
+from simulador import Simulator
+
+# IDs de processo usados no trace
+PID_CPU = 0
+PID_TASKS = 1
+
+# Cada intervalo aberto: [nome, inicio, fim, rgb]
+Span = List
+
+
+class ChromeTraceWriter:
+    """
+    Escritor incremental de traces no formato Chrome Trace Event (JSON Array).
+
+    Uso típico:
+        with ChromeTraceWriter("run.json") as writer:
+            writer.attach(simulator)
+            simulator.run_full()
+
+    Atributos:
+        tick_us (int): Duração de um ciclo da simulação em microssegundos no trace
+        drain (bool): Se True, descarta os registros do Gantt já exportados
+        events_written (int): Número de eventos gravados até o momento
+    """
+
+    def __init__(self, target: Union[str, IO[str]], tick_us: int = 1000, drain: bool = False):
+        """
+        Abre o destino e grava o cabeçalho do trace.
+
+        Args:
+            target: Caminho do arquivo ou objeto de arquivo aberto para escrita
+            tick_us: Microssegundos por ciclo da simulação
+            drain: Se True, remove de gantt_data os registros já exportados
+                   (desativa o histórico de step_back do simulador anexado)
+        """
+        if isinstance(target, str):
+            self._file = open(target, "w", encoding="utf-8")
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+
+        self.tick_us = tick_us
+        self.drain = drain
+        self.events_written = 0
+
+        self.simulator: Optional[Simulator] = None
+        self._cursor = 0  # Próximo índice de gantt_data a consumir
+
+        self._cpu_span: Optional[Span] = None               # Intervalo aberto da CPU
+        self._task_spans: Dict[Tuple[object, str], Span] = {}  # (tid, estado) -> intervalo aberto
+        self._named_tasks = set()                           # Trilhas que já receberam nome
+
+        self._next_flow_id = 1
+        self._open_flows: Dict[Tuple[int, int], int] = {}   # (mutex_id, tid) -> id do fluxo
+
+        self._closed = False
+        self._file.write("[\n")
+        self._write_metadata(PID_CPU, None, "process_name", "CPU")
+        self._write_metadata(PID_CPU, 0, "thread_name", "CPU")
+        self._write_metadata(PID_TASKS, None, "process_name", "Tarefas")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Integração com o simulador
+    # ------------------------------------------------------------------
+
+    def attach(self, simulator: Simulator):
+        """
+        Anexa o exportador a um simulador, consumindo o trace a cada passo.
+
+        Registros já existentes em gantt_data são exportados no primeiro passo.
+
+        Args:
+            simulator: Simulador a ser acompanhado
+        """
+        self.simulator = simulator
+        self._cursor = 0
+        if self.drain:
+            simulator.max_history = 0
+            simulator.history.clear()
+        simulator.add_listener(self._on_event)
+
+    def detach(self):
+        """Consome os registros pendentes e desanexa o exportador do simulador."""
+        if self.simulator is None:
+            return
+        self._consume()
+        self.simulator.remove_listener(self._on_event)
+        self.simulator = None
+
+    def _on_event(self, event: str, time: int, info: dict):
+        """Callback registrado no simulador."""
+        if event == 'step':
+            self._consume()
+        elif event == 'mutex_acquire':
+            # Repasse acontece no fim do ciclo: a posse começa no ciclo seguinte
+            start = time + 1 if info.get('handoff') else time
+            self.mutex_acquired(start, info['task_id'], info['mutex_id'])
+        elif event == 'mutex_release':
+            self.mutex_released(time, info['task_id'], info['mutex_id'])
+        elif event == 'deadlock':
+            self.deadlock(time, info['task_ids'])
+
+    def _consume(self):
+        """Exporta os registros de gantt_data adicionados desde o último passo."""
+        sim = self.simulator
+        records = sim.gantt_data
+        if self._cursor < len(records):
+            self.feed(records[self._cursor:], now=sim.time)
+            if self.drain:
+                del records[:]
+                self._cursor = 0
+            else:
+                self._cursor = len(records)
+        else:
+            self._flush_before(sim.time)
+
+    # ------------------------------------------------------------------
+    # Entrada de dados
+    # ------------------------------------------------------------------
+
+    def feed(self, records, now: Optional[int] = None):
+        """
+        Processa registros no formato de Simulator.gantt_data.
+
+        Args:
+            records: Sequência de (tempo, tid, rgb, estado)
+            now: Tempo atual da simulação. Intervalos que terminam antes dele
+                 não podem mais crescer e são gravados imediatamente.
+                 Se None, tudo fica aberto até close().
+        """
+        for entry in records:
+            if len(entry) == 4:
+                time, tid, rgb, state = entry
+            else:
+                time, tid, rgb = entry
+                state = "EXEC"
+
+            # Trilha da CPU: apenas o que ocupou o processador
+            if state in ("EXEC", "IDLE"):
+                name = "IDLE" if tid == "IDLE" else f"T{tid}"
+                self._cpu_span = self._extend(self._cpu_span, name, time, rgb, PID_CPU, 0)
+
+            if tid == "IDLE":
+                continue
+
+            # Trilha da tarefa
+            if tid not in self._named_tasks:
+                self._named_tasks.add(tid)
+                self._write_metadata(PID_TASKS, tid, "thread_name", f"T{tid}")
+                self._write_metadata(PID_TASKS, tid, "thread_sort_index", tid, key="sort_index")
+            key = (tid, state)
+            span = self._task_spans.get(key)
+            span = self._extend(span, state, time, rgb, PID_TASKS, tid)
+            self._task_spans[key] = span
+
+        if now is not None:
+            self._flush_before(now)
+
+    def mutex_acquired(self, time: int, task_id: int, mutex_id: int):
+        """Registra o início de um fluxo de posse de mutex."""
+        flow_id = self._next_flow_id
+        self._next_flow_id += 1
+        self._open_flows[(mutex_id, task_id)] = flow_id
+        self._write({
+            "name": f"mutex {mutex_id}", "cat": "mutex", "ph": "s", "id": flow_id,
+            "pid": PID_TASKS, "tid": task_id, "ts": time * self.tick_us,
+        })
+
+    def mutex_released(self, time: int, task_id: int, mutex_id: int):
+        """Fecha o fluxo de posse de mutex no ciclo em que foi liberado."""
+        flow_id = self._open_flows.pop((mutex_id, task_id), None)
+        if flow_id is None:
+            return
+        # A liberação acontece depois de executar o ciclo: fica no fim do intervalo
+        ts = (time + 1) * self.tick_us - 1 if self.tick_us > 1 else time
+        self._write({
+            "name": f"mutex {mutex_id}", "cat": "mutex", "ph": "f", "bp": "e", "id": flow_id,
+            "pid": PID_TASKS, "tid": task_id, "ts": ts,
+        })
+
+    def deadlock(self, time: int, task_ids: List[int]):
+        """Grava um evento instantâneo global de deadlock."""
+        self._write({
+            "name": "DEADLOCK", "cat": "deadlock", "ph": "i", "s": "g",
+            "pid": PID_CPU, "tid": 0, "ts": time * self.tick_us,
+            "args": {"tasks": [f"T{tid}" for tid in task_ids]},
+        })
+
+    def close(self):
+        """Grava os intervalos ainda abertos e finaliza o arquivo JSON."""
+        if self._closed:
+            return
+        if self.simulator is not None:
+            self.detach()
+        self._flush_before(None)
+        self._file.write("\n]\n")
+        self._closed = True
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    # ------------------------------------------------------------------
+    # Auxiliares
+    # ------------------------------------------------------------------
+
+    def _extend(self, span: Optional[Span], name: str, time: int, rgb, pid: int, tid) -> Span:
+        """Estende o intervalo se for contíguo, senão grava o antigo e abre outro."""
+        if span is not None and span[0] == name and span[2] == time:
+            span[2] = time + 1
+            return span
+        if span is not None:
+            self._write_span(span, pid, tid)
+        return [name, time, time + 1, rgb]
+
+    def _flush_before(self, now: Optional[int]):
+        """Grava os intervalos que terminam antes de 'now' (todos se now=None)."""
+        if self._cpu_span is not None and (now is None or self._cpu_span[2] < now):
+            self._write_span(self._cpu_span, PID_CPU, 0)
+            self._cpu_span = None
+
+        done = [key for key, span in self._task_spans.items() if now is None or span[2] < now]
+        for key in done:
+            self._write_span(self._task_spans.pop(key), PID_TASKS, key[0])
+
+    def _write_span(self, span: Span, pid: int, tid):
+        """Grava um intervalo completo (ph 'X')."""
+        name, start, end, rgb = span
+        self._write({
+            "name": name, "cat": "cpu" if pid == PID_CPU else "task", "ph": "X",
+            "pid": pid, "tid": tid,
+            "ts": start * self.tick_us, "dur": (end - start) * self.tick_us,
+            "args": {"inicio": start, "fim": end, "cor": "#{:02x}{:02x}{:02x}".format(*rgb)},
+        })
+
+    def _write_metadata(self, pid: int, tid, name: str, value, key: str = "name"):
+        """Grava um evento de metadados (nome de processo ou trilha)."""
+        event = {"name": name, "ph": "M", "pid": pid, "args": {key: value}}
+        if tid is not None:
+            event["tid"] = tid
+        self._write(event)
+
+    def _write(self, event: dict):
+        """Serializa um evento no arquivo."""
+        if self.events_written:
+            self._file.write(",\n")
+        self._file.write(json.dumps(event, separators=(",", ":")))
+        self.events_written += 1
+
+
+def export_chrome_trace(simulator: Simulator, filepath: str, tick_us: int = 1000) -> int:
+    """
+    Exporta o trace de uma simulação já executada.
+
+    Os fluxos de mutex só aparecem quando o exportador é anexado antes da
+    execução (ChromeTraceWriter.attach); aqui são exportados apenas os intervalos.
+
+    Args:
+        simulator: Simulador com gantt_data preenchido
+        filepath: Caminho do arquivo JSON de saída
+        tick_us: Microssegundos por ciclo da simulação
+
+    Returns:
+        Número de eventos gravados
+    """
+    with ChromeTraceWriter(filepath, tick_us=tick_us) as writer:
+        writer.feed(simulator.gantt_data)
+        deadlocked = simulator.detect_deadlock()
+        if deadlocked:
+            writer.deadlock(simulator.time, deadlocked)
+    return writer.events_written
@@ -0,0 +1,319 @@
+"""
+Formato binário de carga de trabalho, lido por mapeamento de memória.
+
+Para cargas de milhões de tarefas, até a lista de TCBs interpretada pesa
+demais. Neste formato o arquivo tem duas tabelas de largura fixa:
+    - tarefas: um registro de RECORD.size bytes por tarefa, ordenado por
+      ingresso (estável), com ingresso, id, duração, prioridade, cor e a
+      posição/quantidade dos seus eventos;
+    - eventos: pares (a, b) de inteiros de 64 bits, com os eventos de cada
+      tarefa em sequência (primeiro os de IO, depois ML e MU).
+
+MappedWorkload mapeia o arquivo só para leitura (mmap) e lê os campos
+direto do mapeamento: ingresso(i) e a busca da próxima chegada (bisect)
+não criam objetos por tarefa, e task(i) só materializa o TCB de uma
+tarefa quando ela é necessária.
+
+Gravação em fluxo (tarefas já em ordem de ingresso, memória limitada):
+    with WorkloadWriter("carga.wlb", "RR", 2, None) as writer:
+        writer.add(tarefa)
+
+Conversores:
+    text_to_binary("config.txt", "carga.wlb")
+    binary_to_text("carga.wlb", "config.txt")   # t<ID>;cor;ingresso;duracao;prioridade;eventos
+
+    python workload_bin.py config.txt carga.wlb   # direção pela extensão da saída
+    python workload_bin.py carga.wlb config.txt
+
+Layout (little-endian):
+    cabeçalho (HEADER): MAGIC, versão, algoritmo, quantum, alpha,
+                        número de tarefas e de eventos
+    tabela de tarefas (RECORD) logo após o cabeçalho
+    tabela de eventos (EVENT) logo após as tarefas
+"""
+
+import argparse
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from bisect import bisect_left
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from config_loader import load_simulation_config
+from tasks import TCB
+
+MAGIC = b"WLB1"
+VERSION = 1
+BINARY_SUFFIX = ".wlb"
+
+# magic, versão, algoritmo (16 bytes), tem quantum, quantum, tem alpha, alpha, tarefas, eventos
+HEADER = struct.Struct("<4sH16sBqBqQQ")
+# ingresso, id, duração, prioridade, primeiro evento, cor (R, G, B, livre), IO, ML, MU, livre
+RECORD = struct.Struct("<qqqqQ4BIIIQ")
+EVENT = struct.Struct("<qq")
+
+_KINDS = ("io", "ml", "mu")
+_PREFIX = {"ml": "ML", "mu": "MU"}
+
+Workload = Tuple[str, Optional[int], Optional[int], List[TCB]]
+
+
+def write_workload(target: Union[str, IO[bytes]], algo: str, quantum: Optional[int], alpha: Optional[int],
+                   tasks: Iterable[TCB]) -> int:
+    """
+    Grava a carga no formato binário.
+
+    Returns:
+        Número de tarefas gravadas
+    """
+    with WorkloadWriter(target, algo, quantum, alpha) as writer:
+        for task in sorted(tasks, key=lambda t: t.inicio):
+            writer.add(task)
+    return writer.count
+
+
+class WorkloadWriter:
+    """
+    Grava a carga tarefa a tarefa, em memória limitada.
+
+    As tarefas precisam chegar em ordem de ingresso. Os registros vão direto
+    para o destino e os eventos para um arquivo temporário, anexado no fim;
+    o cabeçalho (com as quantidades) é regravado ao fechar, então o destino
+    precisa aceitar seek().
+
+    Uso:
+        with WorkloadWriter("carga.wlb", "RR", 2, None) as writer:
+            for task in tarefas:
+                writer.add(task)
+    """
+
+    def __init__(self, target: Union[str, IO[bytes]], algo: str, quantum: Optional[int], alpha: Optional[int]):
+        self._name = algo.encode("utf-8")
+        if len(self._name) > 16:
+            raise ValueError(f"Nome de algoritmo longo demais para o formato binário: {algo}")
+        self._settings = (quantum is not None, quantum or 0, alpha is not None, alpha or 0)
+        self._owned = isinstance(target, str)
+        self._target = open(target, "wb") if self._owned else target
+        self._start = self._target.tell()
+        self._events = tempfile.TemporaryFile()
+        self._last_arrival: Optional[int] = None
+        self.count = 0
+        self.event_count = 0
+        self._write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write_header(self):
+        self._target.write(HEADER.pack(MAGIC, VERSION, self._name, *self._settings, self.count, self.event_count))
+
+    def add(self, task: TCB):
+        """Acrescenta uma tarefa (ingresso >= o da anterior)."""
+        if self._last_arrival is not None and task.inicio < self._last_arrival:
+            raise ValueError(f"Tarefas fora de ordem de ingresso: tarefa {task.id} chega em {task.inicio}")
+        self._last_arrival = task.inicio
+        counts = [len(getattr(task, f"{kind}_events")) for kind in _KINDS]
+        self._target.write(RECORD.pack(task.inicio, task.id, task.duracao, task.prio_s, self.event_count,
+                                       *task.RGB[:3], 0, *counts, 0))
+        for kind in _KINDS:
+            for a, b in getattr(task, f"{kind}_events"):
+                self._events.write(EVENT.pack(a, b))
+        self.event_count += sum(counts)
+        self.count += 1
+
+    def close(self):
+        """Anexa os eventos e regrava o cabeçalho."""
+        if self._events is None:
+            return
+        self._events.seek(0)
+        shutil.copyfileobj(self._events, self._target)
+        self._events.close()
+        self._events = None
+        end = self._target.tell()
+        self._target.seek(self._start)
+        self._write_header()
+        self._target.seek(end)
+        if self._owned:
+            self._target.close()
+
+
+class _Arrivals(Sequence):
+    """Ingressos da tabela de tarefas, lidos sob demanda (para bisect)."""
+
+    def __init__(self, workload: "MappedWorkload"):
+        self._workload = workload
+
+    def __len__(self):
+        return len(self._workload)
+
+    def __getitem__(self, index):
+        return self._workload.arrival(index)
+
+
+class MappedWorkload:
+    """
+    Carga binária mapeada em memória (somente leitura).
+
+    Uso:
+        with MappedWorkload("carga.wlb") as workload:
+            for i in range(workload.first_arrival_at(100), len(workload)):
+                ...
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._file = open(filepath, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivo vazio não pode ser mapeado
+            self._file.close()
+            raise ValueError(f"Arquivo de carga inválido: {filepath}")
+        try:
+            fields = HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Arquivo de carga inválido: {filepath}")
+        magic, version, name, has_quantum, quantum, has_alpha, alpha, count, events = fields
+        expected = HEADER.size + count * RECORD.size + events * EVENT.size
+        if magic != MAGIC or version != VERSION or len(self._map) != expected:
+            self.close()
+            raise ValueError(f"Arquivo de carga inválido: {filepath}")
+        self.algorithm = name.rstrip(b"\0").decode("utf-8")
+        self.quantum = quantum if has_quantum else None
+        self.alpha = alpha if has_alpha else None
+        self.event_count = events
+        self._count = count
+        self._tasks_offset = HEADER.size
+        self._events_offset = HEADER.size + count * RECORD.size
+        self.arrivals = _Arrivals(self)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def record(self, index: int) -> tuple:
+        """Registro cru: (ingresso, id, duração, prioridade, primeiro evento, r, g, b, _, n_io, n_ml, n_mu, _)."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return RECORD.unpack_from(self._map, self._tasks_offset + index * RECORD.size)
+
+    def arrival(self, index: int) -> int:
+        """Ingresso da i-ésima tarefa (ordem de chegada), sem ler o resto do registro."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return struct.unpack_from("<q", self._map, self._tasks_offset + index * RECORD.size)[0]
+
+    def first_arrival_at(self, time: int) -> int:
+        """Índice da primeira tarefa com ingresso >= time (len() se nenhuma)."""
+        return bisect_left(self.arrivals, time)
+
+    def events(self, index: int) -> Tuple[List[Tuple[int, int]], ...]:
+        """Eventos (io_events, ml_events, mu_events) da tarefa, lidos da tabela de eventos."""
+        fields = self.record(index)
+        position = self._events_offset + fields[4] * EVENT.size
+        result = []
+        for count in fields[9:12]:
+            result.append([EVENT.unpack_from(self._map, position + k * EVENT.size) for k in range(count)])
+            position += count * EVENT.size
+        return tuple(result)
+
+    def task(self, index: int) -> TCB:
+        """Materializa o TCB da i-ésima tarefa."""
+        inicio, tid, duracao, prio, _, r, g, b, _, _, _, _, _ = self.record(index)
+        io_events, ml_events, mu_events = self.events(index)
+        return TCB(id=tid, RGB=[r, g, b], state=1, inicio=inicio, duracao=duracao, prio_s=prio, prio_d=prio,
+                   io_events=io_events, ml_events=ml_events, mu_events=mu_events)
+
+    def iter_tasks(self, start: int = 0) -> Iterator[TCB]:
+        """TCBs em ordem de chegada, materializados um a um."""
+        for index in range(start, self._count):
+            yield self.task(index)
+
+    def mutex_ids(self) -> List[int]:
+        """Ids de todos os mutexes citados por eventos ML/MU (percorre a tabela de eventos)."""
+        ids = set()
+        for index in range(self._count):
+            fields = self.record(index)
+            position = self._events_offset + (fields[4] + fields[9]) * EVENT.size
+            for k in range(fields[10] + fields[11]):
+                ids.add(EVENT.unpack_from(self._map, position + k * EVENT.size)[0])
+        return sorted(ids)
+
+    def load(self) -> Workload:
+        """(algoritmo, quantum, alpha, tarefas) como load_simulation_config()."""
+        return self.algorithm, self.quantum, self.alpha, list(self.iter_tasks())
+
+
+def _format_task(fields: tuple, events: Tuple[List[Tuple[int, int]], ...]) -> str:
+    inicio, tid, duracao, prio, _, r, g, b = fields[:8]
+    parts = [f"t{tid:02d}", f"#{r:02x}{g:02x}{b:02x}", str(inicio), str(duracao), str(prio)]
+    io_events, ml_events, mu_events = events
+    parts.extend(f"IO:{start}-{length}" for start, length in io_events)
+    for kind, kind_events in (("ml", ml_events), ("mu", mu_events)):
+        parts.extend(f"{_PREFIX[kind]}{mutex_id:02d}:{time}" for mutex_id, time in kind_events)
+    return ";".join(parts)
+
+
+def text_to_binary(config_path: str, binary_path: str) -> int:
+    """Converte uma configuração de texto para o formato binário. Retorna o número de tarefas."""
+    algo, quantum, alpha, tasks = load_simulation_config(config_path)
+    return write_workload(binary_path, algo, quantum, alpha, tasks)
+
+
+def binary_to_text(binary_path: str, config_path: str) -> int:
+    """Converte uma carga binária para o formato de texto, tarefa a tarefa. Retorna o número de tarefas."""
+    with MappedWorkload(binary_path) as workload, open(config_path, "w", encoding="utf-8") as f:
+        settings = [workload.algorithm, "" if workload.quantum is None else str(workload.quantum)]
+        if workload.alpha is not None:
+            settings.append(str(workload.alpha))
+        f.write(";".join(settings) + "\n")
+        for index in range(len(workload)):
+            f.write(_format_task(workload.record(index), workload.events(index)) + "\n")
+        return len(workload)
+
+
+def is_binary_workload(filepath: str) -> bool:
+    """Se o arquivo começa com o MAGIC do formato binário."""
+    try:
+        with open(filepath, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Converte cargas entre o formato de texto e o binário")
+    parser.add_argument("entrada", help="Configuração de texto ou carga binária")
+    parser.add_argument("saida", help="Arquivo gerado (.wlb = binário, demais = texto)")
+    args = parser.parse_args(argv)
+    try:
+        if args.saida.endswith(BINARY_SUFFIX):
+            count = text_to_binary(args.entrada, args.saida)
+        else:
+            count = binary_to_text(args.entrada, args.saida)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(f"{count} tarefas gravadas em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
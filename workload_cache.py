@@ -0,0 +1,241 @@
+"""
+Cache binário das cargas de trabalho lidas de arquivos de configuração.
+
+load_simulation_config() refaz split/hex_to_rgb/parse_events de todas as
+linhas a cada carga; com configurações geradas de 10^5-10^6 linhas isso
+leva segundos, e a interface e as varreduras recarregam o mesmo arquivo
+várias vezes. load_cached_config() guarda o resultado já interpretado num
+arquivo binário compacto (arrays empacotados) e, enquanto o arquivo de
+configuração não mudar, carrega direto dele sem interpretar texto.
+
+Validação, da mais barata para a mais cara:
+    1. caminho, mtime e tamanho iguais aos gravados: usa o cache;
+    2. mtime diferente mas mesmo tamanho e mesmo hash SHA-256 do conteúdo
+       (arquivo só "tocado"): usa o cache e atualiza o mtime gravado;
+    3. caso contrário: interpreta o texto e regrava o cache.
+
+O cache fica ao lado da configuração (".<nome>.wlc") ou, com cache_dir,
+num diretório próprio (nome derivado do caminho absoluto). Cache corrompido
+ou de outra versão é ignorado; falha ao gravar (diretório só de leitura)
+não impede a carga.
+
+Formato (little-endian):
+    cabeçalho: MAGIC, versão, caminho, mtime_ns, tamanho, SHA-256
+    carga: algoritmo, quantum, alpha, número de tarefas e os arrays
+           ids, cores, ingresso, duração, prioridade, quantidade de eventos
+           por tarefa (IO/ML/MU) e os eventos de todas as tarefas em sequência
+"""
+
+import gc
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from typing import List, Optional, Tuple
+
+from config_loader import load_simulation_config
+from tasks import TCB
+
+MAGIC = b"WLC1"
+VERSION = 1
+CACHE_SUFFIX = ".wlc"
+
+_HEADER = struct.Struct("<4sHH")        # magic, versão, tamanho do caminho
+_KEY = struct.Struct("<qq32s")          # mtime_ns, tamanho, sha256
+_SETTINGS = struct.Struct("<HBqBqQ")    # tamanho do nome, tem quantum, quantum, tem alpha, alpha, tarefas
+_BLOCK = struct.Struct("<Q")            # tamanho em bytes de cada array
+
+# Arrays da carga, na ordem em que são gravados
+_ARRAYS = ("ids", "rgb", "inicio", "duracao", "prio", "n_io", "n_ml", "n_mu", "io", "ml", "mu")
+_TYPECODES = {"rgb": "B", "n_io": "I", "n_ml": "I", "n_mu": "I"}  # Os demais: 'q'
+
+Workload = Tuple[str, Optional[int], Optional[int], List[TCB]]
+
+
+def cache_path(filepath: str, cache_dir: Optional[str] = None) -> str:
+    """Caminho do arquivo de cache de uma configuração."""
+    filepath = os.path.abspath(filepath)
+    if cache_dir is None:
+        directory, name = os.path.split(filepath)
+        return os.path.join(directory, f".{name}{CACHE_SUFFIX}")
+    digest = hashlib.sha1(filepath.encode("utf-8")).hexdigest()[:20]
+    return os.path.join(cache_dir, f"{os.path.basename(filepath)}-{digest}{CACHE_SUFFIX}")
+
+
+def file_digest(filepath: str) -> bytes:
+    """SHA-256 do conteúdo do arquivo."""
+    sha = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.digest()
+
+
+def pack_workload(algo: str, quantum: Optional[int], alpha: Optional[int], tasks: List[TCB]) -> bytes:
+    """Empacota a carga (sem o cabeçalho de validação)."""
+    columns = {name: array(_TYPECODES.get(name, "q")) for name in _ARRAYS}
+    for task in tasks:
+        columns["ids"].append(task.id)
+        columns["rgb"].extend(task.RGB)
+        columns["inicio"].append(task.inicio)
+        columns["duracao"].append(task.duracao)
+        columns["prio"].append(task.prio_s)
+        for kind in ("io", "ml", "mu"):
+            events = getattr(task, f"{kind}_events")
+            columns[f"n_{kind}"].append(len(events))
+            for event in events:
+                columns[kind].extend(event)
+    name = algo.encode("utf-8")
+    parts = [_SETTINGS.pack(len(name), quantum is not None, quantum or 0, alpha is not None, alpha or 0, len(tasks)),
+             name]
+    for column in columns.values():
+        if sys.byteorder != "little":
+            column.byteswap()
+        data = column.tobytes()
+        parts.append(_BLOCK.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def unpack_workload(data, offset: int = 0) -> Workload:
+    """Reconstrói (algoritmo, quantum, alpha, tarefas) a partir de pack_workload()."""
+    name_len, has_quantum, quantum, has_alpha, alpha, count = _SETTINGS.unpack_from(data, offset)
+    offset += _SETTINGS.size
+    algo = bytes(data[offset:offset + name_len]).decode("utf-8")
+    offset += name_len
+    columns = {}
+    for name in _ARRAYS:
+        size, = _BLOCK.unpack_from(data, offset)
+        offset += _BLOCK.size
+        column = array(_TYPECODES.get(name, "q"))
+        column.frombytes(data[offset:offset + size])
+        if sys.byteorder != "little":
+            column.byteswap()
+        columns[name] = column
+        offset += size
+    if len(columns["ids"]) != count or len(columns["rgb"]) != 3 * count:
+        raise ValueError("Cache de carga de trabalho inconsistente")
+
+    # Coleta de lixo desligada durante a criação em massa (objetos que vivem até o fim da carga)
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        tasks = _build_tasks(columns)
+    finally:
+        if collecting:
+            gc.enable()
+    return algo, quantum if has_quantum else None, alpha if has_alpha else None, tasks
+
+
+def _build_tasks(columns) -> List[TCB]:
+    events = [_split_events(columns[f"n_{kind}"], columns[kind]) for kind in ("io", "ml", "mu")]
+    rgb = columns["rgb"].tolist()
+    colors = [rgb[i:i + 3] for i in range(0, len(rgb), 3)]
+    return [TCB(id=tid, RGB=color, state=1, inicio=inicio, duracao=duracao, prio_s=prio, prio_d=prio,
+                io_events=io_events, ml_events=ml_events, mu_events=mu_events)
+            for tid, color, inicio, duracao, prio, io_events, ml_events, mu_events
+            in zip(columns["ids"].tolist(), colors, columns["inicio"].tolist(), columns["duracao"].tolist(),
+                   columns["prio"].tolist(), *events)]
+
+
+def _split_events(counts: array, flat: array) -> List[List[Tuple[int, int]]]:
+    """Listas de eventos (a, b) de cada tarefa a partir das quantidades e dos pares em sequência."""
+    values = flat.tolist()
+    pairs = list(zip(values[0::2], values[1::2]))
+    result = []
+    start = 0
+    for n in counts.tolist():
+        result.append(pairs[start:start + n])
+        start += n
+    return result
+
+
+def _read_cache(path: str):
+    """(caminho gravado, mtime_ns, tamanho, sha256, bytes, início da carga) ou None se inválido."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, path_len = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            return None
+        offset = _HEADER.size
+        source = data[offset:offset + path_len].decode("utf-8")
+        offset += path_len
+        mtime_ns, size, digest = _KEY.unpack_from(data, offset)
+        return source, mtime_ns, size, digest, data, offset + _KEY.size
+    except (OSError, struct.error, UnicodeDecodeError):
+        return None
+
+
+def _write_cache(path: str, source: str, stat, digest: bytes, payload: bytes):
+    encoded = source.encode("utf-8")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(encoded)))
+            f.write(encoded)
+            f.write(_KEY.pack(stat.st_mtime_ns, stat.st_size, digest))
+            f.write(payload)
+        os.replace(tmp, path)
+    except OSError:
+        # Cache é só otimização: sem permissão de escrita, segue sem ele
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def cache_status(filepath: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Situação do cache de uma configuração, sem carregá-lo.
+
+    Returns:
+        'hit' (mtime e tamanho batem), 'touched' (só o conteúdo bate),
+        'stale' (conteúdo mudou) ou 'missing' (sem cache válido)
+    """
+    source = os.path.abspath(filepath)
+    cached = _read_cache(cache_path(filepath, cache_dir))
+    if cached is None or cached[0] != source:
+        return "missing"
+    stat = os.stat(source)
+    if (cached[1], cached[2]) == (stat.st_mtime_ns, stat.st_size):
+        return "hit"
+    if cached[2] == stat.st_size and cached[3] == file_digest(source):
+        return "touched"
+    return "stale"
+
+
+def load_cached_config(filepath: str, cache_dir: Optional[str] = None, bulk: bool = False,
+                       processes: Optional[int] = None) -> Workload:
+    """
+    Mesmo resultado de load_simulation_config(), usando o cache binário quando válido.
+
+    Args:
+        filepath: Arquivo de configuração (.txt)
+        cache_dir: Diretório dos caches (padrão: ao lado da configuração)
+        bulk, processes: Modo em lote de load_simulation_config(), se for preciso interpretar o texto
+    """
+    source = os.path.abspath(filepath)
+    path = cache_path(source, cache_dir)
+    stat = os.stat(source)
+    cached = _read_cache(path)
+    digest = None
+    if cached is not None and cached[0] == source:
+        _, mtime_ns, size, cached_digest, data, offset = cached
+        fresh = (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size)
+        if not fresh and size == stat.st_size:
+            digest = file_digest(source)
+            fresh = digest == cached_digest
+            if fresh:
+                _write_cache(path, source, stat, digest, data[offset:])
+        if fresh:
+            try:
+                return unpack_workload(data, offset)
+            except (struct.error, ValueError, UnicodeDecodeError):
+                pass  # Cache corrompido: interpreta o texto de novo
+
+    workload = load_simulation_config(source, bulk, processes)
+    _write_cache(path, source, stat, digest or file_digest(source), pack_workload(*workload))
+    return workload
@@ -0,0 +1,332 @@
+"""
+Gerador estatístico de cargas de trabalho.
+
+Gera tarefas a partir de um WorkloadSpec, com:
+    - chegadas: 'poisson' (intervalos exponenciais), 'bursty' (rajadas de
+      chegadas no mesmo tick, tamanho médio burst_size) ou 'uniform'
+      (intervalo fixo 1/rate);
+    - durações: 'exponential', 'pareto' (cauda pesada, média mean_service),
+      'bimodal' (short_service ou, com probabilidade long_fraction,
+      long_service) ou 'uniform' (min_service..max_service);
+    - rajadas de I/O: com probabilidade io_prob, de 1 a io_bursts rajadas
+      em instantes distintos da execução, de duração média io_mean;
+    - ingresso máximo: com max_arrival, chegadas sorteadas depois desse
+      tick ficam nele (as chegadas continuam em ordem);
+    - seções críticas: com probabilidade mutex_prob, um lock/unlock em um
+      de n_mutexes mutexes, cobrindo cs_fraction da duração da tarefa
+      (menos mutexes e seções maiores = mais contenção).
+
+Reprodutibilidade: as tarefas são geradas em blocos de CHUNK_SIZE e cada
+bloco tem o próprio gerador aleatório, semeado por (seed, índice do bloco).
+Os blocos só sorteiam os intervalos entre chegadas; o relógio é acumulado
+por iter_tasks, tarefa a tarefa e na ordem dos blocos, então o resultado é
+o mesmo com qualquer número de processos. A saída é gravada em fluxo (texto ou .wlb), com no máximo
+alguns blocos em memória.
+
+Uso:
+    python workload_gen.py carga.txt -n 100000 --arrival bursty --rate 0.8
+    python workload_gen.py carga.wlb -n 1000000 --service pareto --processes 4
+    python workload_gen.py - -n 0 --io-prob 0.3 | python cli.py - --stream --horizon 100000
+
+    spec = WorkloadSpec(n_tasks=1000, service="bimodal", mutex_prob=0.2)
+    simulator = Simulator(scheduler, workload_source(spec, seed=1))
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from arrival_sources import ArrivalSource
+from config_loader import format_task_line
+from tasks import TCB
+from workload_bin import BINARY_SUFFIX, WorkloadWriter
+
+ARRIVALS = ("poisson", "bursty", "uniform")
+SERVICES = ("exponential", "pareto", "bimodal", "uniform")
+CHUNK_SIZE = 4096
+
+# Tarefa gerada: intervalo desde a chegada anterior, duração, prioridade, cor, I/O, ML, MU
+_Generated = Tuple[float, int, int, Tuple[int, int, int], list, list, list]
+
+
+class WorkloadSpec(NamedTuple):
+    """Parâmetros da carga gerada."""
+    n_tasks: Optional[int] = 1000        # None = fluxo infinito
+    arrival: str = "poisson"
+    rate: float = 0.5                    # Chegadas por tick (média)
+    burst_size: float = 8.0              # Tamanho médio das rajadas ('bursty')
+    service: str = "exponential"
+    mean_service: float = 5.0            # Duração média ('exponential', 'pareto')
+    pareto_shape: float = 1.5            # Forma da Pareto (> 1)
+    short_service: int = 2               # 'bimodal'
+    long_service: int = 20
+    long_fraction: float = 0.1
+    min_service: int = 1                 # 'uniform'
+    max_service: int = 10
+    io_prob: float = 0.0
+    io_bursts: int = 2
+    io_mean: float = 3.0
+    mutex_prob: float = 0.0
+    n_mutexes: int = 2
+    cs_fraction: float = 0.3
+    max_priority: int = 10
+    first_id: int = 1
+    max_arrival: Optional[int] = None    # Ingresso máximo (None = sem limite)
+
+
+def validate_spec(spec: WorkloadSpec):
+    """Levanta ValueError se os parâmetros forem inconsistentes."""
+    if spec.arrival not in ARRIVALS:
+        raise ValueError(f"Chegada '{spec.arrival}' inválida. Use uma de: {', '.join(ARRIVALS)}")
+    if spec.service not in SERVICES:
+        raise ValueError(f"Duração '{spec.service}' inválida. Use uma de: {', '.join(SERVICES)}")
+    if spec.n_tasks is not None and spec.n_tasks < 0:
+        raise ValueError("Número de tarefas não pode ser negativo")
+    if spec.rate <= 0 or spec.burst_size < 1 or spec.mean_service <= 0 or spec.io_mean <= 0:
+        raise ValueError("Taxa, tamanho de rajada e médias devem ser positivos")
+    if spec.pareto_shape <= 1:
+        raise ValueError("A forma da Pareto deve ser maior que 1 (média finita)")
+    if not 1 <= spec.min_service <= spec.max_service or spec.short_service < 1 or spec.long_service < 1:
+        raise ValueError("Durações devem ser de pelo menos 1 tick")
+    for name in ("long_fraction", "io_prob", "mutex_prob", "cs_fraction"):
+        if not 0 <= getattr(spec, name) <= 1:
+            raise ValueError(f"{name} deve estar entre 0 e 1")
+    if spec.n_mutexes < 1 or spec.io_bursts < 1 or spec.max_priority < 1:
+        raise ValueError("n_mutexes, io_bursts e max_priority devem ser pelo menos 1")
+    if spec.max_arrival is not None and spec.max_arrival < 0:
+        raise ValueError("O ingresso máximo não pode ser negativo")
+
+
+def chunk_rng(seed: int, chunk: int) -> random.Random:
+    """Gerador aleatório independente de cada bloco (igual em qualquer processo)."""
+    return random.Random(f"{seed}:{chunk}")
+
+
+def _gap(rng: random.Random, spec: WorkloadSpec) -> float:
+    if spec.arrival == "poisson":
+        return rng.expovariate(spec.rate)
+    if spec.arrival == "bursty":
+        # Cada chegada abre uma rajada nova com probabilidade 1/burst_size; a taxa média continua rate
+        if rng.random() < 1 / spec.burst_size:
+            return rng.expovariate(spec.rate / spec.burst_size)
+        return 0.0
+    return 1 / spec.rate
+
+
+def _service(rng: random.Random, spec: WorkloadSpec) -> int:
+    if spec.service == "exponential":
+        return max(1, round(rng.expovariate(1 / spec.mean_service)))
+    if spec.service == "pareto":
+        scale = spec.mean_service * (spec.pareto_shape - 1) / spec.pareto_shape
+        return max(1, round(scale * rng.paretovariate(spec.pareto_shape)))
+    if spec.service == "bimodal":
+        return spec.long_service if rng.random() < spec.long_fraction else spec.short_service
+    return rng.randint(spec.min_service, spec.max_service)
+
+
+def _io_events(rng: random.Random, spec: WorkloadSpec, duracao: int) -> list:
+    if duracao < 2 or rng.random() >= spec.io_prob:
+        return []
+    points = rng.sample(range(1, duracao), k=min(duracao - 1, rng.randint(1, spec.io_bursts)))
+    return [(point, max(1, round(rng.expovariate(1 / spec.io_mean)))) for point in sorted(points)]
+
+
+def _critical_section(rng: random.Random, spec: WorkloadSpec, duracao: int) -> Tuple[list, list]:
+    if rng.random() >= spec.mutex_prob:
+        return [], []
+    mutex_id = rng.randint(1, spec.n_mutexes)
+    length = max(1, round(spec.cs_fraction * duracao))
+    lock_at = rng.randint(0, duracao - length)
+    return [(mutex_id, lock_at)], [(mutex_id, lock_at + length)]
+
+
+def generate_chunk(spec: WorkloadSpec, seed: int, chunk: int, count: int) -> List[_Generated]:
+    """Gera as count tarefas de um bloco (função de trabalho do pool)."""
+    rng = chunk_rng(seed, chunk)
+    generated = []
+    for _ in range(count):
+        gap = _gap(rng, spec)
+        duracao = _service(rng, spec)
+        prio = rng.randint(1, spec.max_priority)
+        color = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+        io_events = _io_events(rng, spec, duracao)
+        ml_events, mu_events = _critical_section(rng, spec, duracao)
+        generated.append((gap, duracao, prio, color, io_events, ml_events, mu_events))
+    return generated
+
+
+def _chunk_sizes(spec: WorkloadSpec, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """(índice, tamanho) de cada bloco; infinito se n_tasks for None."""
+    if spec.n_tasks is None:
+        return ((chunk, chunk_size) for chunk in itertools.count())
+    full, rest = divmod(spec.n_tasks, chunk_size)
+    sizes = [chunk_size] * full + ([rest] if rest else [])
+    return iter(enumerate(sizes))
+
+
+def _generated_chunks(spec: WorkloadSpec, seed: int, processes: int, chunk_size: int) -> Iterator[List[_Generated]]:
+    chunks = _chunk_sizes(spec, chunk_size)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for chunk, count in chunks:
+            yield generate_chunk(spec, seed, chunk, count)
+        return
+    # Pool com poucos blocos adiantados: memória limitada mesmo com fluxo infinito
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = deque()
+        for chunk, count in chunks:
+            pending.append(pool.submit(generate_chunk, spec, seed, chunk, count))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_tasks(spec: WorkloadSpec, seed: int = 0, processes: int = 1,
+               chunk_size: int = CHUNK_SIZE) -> Iterator[TCB]:
+    """
+    Tarefas geradas, em ordem de ingresso.
+
+    Args:
+        spec: Parâmetros da carga
+        seed: Semente (o resultado não depende de processes)
+        processes: Processos geradores (1 = no processo atual, None = um por CPU)
+        chunk_size: Tarefas por bloco (cada bloco tem sua semente; mudar o tamanho muda a carga)
+    """
+    validate_spec(spec)
+    clock = 0.0
+    tid = spec.first_id
+    max_arrival = spec.max_arrival
+    for generated in _generated_chunks(spec, seed, processes, chunk_size):
+        for gap, duracao, prio, color, io_events, ml_events, mu_events in generated:
+            clock += gap
+            inicio = int(clock)
+            if max_arrival is not None and inicio > max_arrival:
+                inicio = max_arrival
+            yield TCB(id=tid, RGB=list(color), inicio=inicio, duracao=duracao, prio_s=prio, prio_d=prio,
+                      io_events=io_events, ml_events=ml_events, mu_events=mu_events)
+            tid += 1
+
+
+def workload_source(spec: WorkloadSpec, seed: int = 0, processes: int = 1) -> ArrivalSource:
+    """Carga gerada como fonte de chegadas do simulador (gerada conforme é consumida)."""
+    return ArrivalSource(iter_tasks(spec, seed, processes))
+
+
+def write_text(target: Union[str, IO[str]], spec: WorkloadSpec, seed: int = 0, algo: str = "RR",
+               quantum: Optional[int] = 2, alpha: Optional[int] = None, processes: int = 1,
+               header: Optional[str] = None) -> int:
+    """
+    Grava a carga gerada como configuração de texto, em fluxo.
+
+    Args:
+        header: Linha de comentário gravada antes das tarefas (ex.: "#id;cor;chegada;duracao;prioridade")
+
+    Returns:
+        Número de tarefas gravadas
+    """
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8") as f:
+            return write_text(f, spec, seed, algo, quantum, alpha, processes, header)
+    settings = [algo, "" if quantum is None else str(quantum)]
+    if alpha is not None:
+        settings.append(str(alpha))
+    target.write(";".join(settings) + "\n")
+    if header is not None:
+        target.write(header + "\n")
+    count = 0
+    for task in iter_tasks(spec, seed, processes):
+        target.write(format_task_line(task) + "\n")
+        count += 1
+    return count
+
+
+def write_binary(target: Union[str, IO[bytes]], spec: WorkloadSpec, seed: int = 0, algo: str = "RR",
+                 quantum: Optional[int] = 2, alpha: Optional[int] = None, processes: int = 1) -> int:
+    """Grava a carga gerada no formato binário (workload_bin), em fluxo. Retorna o número de tarefas."""
+    if spec.n_tasks is None:
+        raise ValueError("O formato binário exige um número finito de tarefas")
+    with WorkloadWriter(target, algo, quantum, alpha) as writer:
+        for task in iter_tasks(spec, seed, processes):
+            writer.add(task)
+    return writer.count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = WorkloadSpec()
+    parser = argparse.ArgumentParser(description="Gera cargas de trabalho estatísticas para o simulador")
+    parser.add_argument("saida", help="Arquivo gerado (.wlb = binário, demais = texto; - = saída padrão)")
+    parser.add_argument("-n", "--tasks", type=int, default=defaults.n_tasks,
+                        help="Número de tarefas (0 = infinito, só na saída padrão)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=1, help="Processos geradores (0 = um por CPU)")
+    parser.add_argument("--algo", default="RR", help="Algoritmo gravado na configuração")
+    parser.add_argument("--quantum", type=int, default=2)
+    parser.add_argument("--alpha", type=int)
+    parser.add_argument("--arrival", choices=ARRIVALS, default=defaults.arrival)
+    parser.add_argument("--rate", type=float, default=defaults.rate, help="Chegadas por tick")
+    parser.add_argument("--max-arrival", type=int, help="Ingresso máximo (chegadas posteriores ficam neste tick)")
+    parser.add_argument("--burst-size", type=float, default=defaults.burst_size)
+    parser.add_argument("--service", choices=SERVICES, default=defaults.service)
+    parser.add_argument("--mean-service", type=float, default=defaults.mean_service)
+    parser.add_argument("--pareto-shape", type=float, default=defaults.pareto_shape)
+    parser.add_argument("--short-service", type=int, default=defaults.short_service)
+    parser.add_argument("--long-service", type=int, default=defaults.long_service)
+    parser.add_argument("--long-fraction", type=float, default=defaults.long_fraction)
+    parser.add_argument("--min-service", type=int, default=defaults.min_service)
+    parser.add_argument("--max-service", type=int, default=defaults.max_service)
+    parser.add_argument("--io-prob", type=float, default=defaults.io_prob)
+    parser.add_argument("--io-bursts", type=int, default=defaults.io_bursts)
+    parser.add_argument("--io-mean", type=float, default=defaults.io_mean)
+    parser.add_argument("--mutex-prob", type=float, default=defaults.mutex_prob)
+    parser.add_argument("--mutexes", type=int, default=defaults.n_mutexes)
+    parser.add_argument("--cs-fraction", type=float, default=defaults.cs_fraction)
+    parser.add_argument("--max-priority", type=int, default=defaults.max_priority)
+    return parser
+
+
+def spec_from_args(args) -> WorkloadSpec:
+    return WorkloadSpec(
+        n_tasks=args.tasks or None, arrival=args.arrival, rate=args.rate, burst_size=args.burst_size,
+        service=args.service, mean_service=args.mean_service, pareto_shape=args.pareto_shape,
+        short_service=args.short_service, long_service=args.long_service, long_fraction=args.long_fraction,
+        min_service=args.min_service, max_service=args.max_service, io_prob=args.io_prob,
+        io_bursts=args.io_bursts, io_mean=args.io_mean, mutex_prob=args.mutex_prob, n_mutexes=args.mutexes,
+        cs_fraction=args.cs_fraction, max_priority=args.max_priority, max_arrival=args.max_arrival)
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    spec = spec_from_args(args)
+    processes = args.processes or None
+    try:
+        validate_spec(spec)
+        if spec.n_tasks is None and args.saida != "-":
+            raise ValueError("Carga infinita (-n 0) só pode ser gravada na saída padrão")
+        settings = dict(seed=args.seed, algo=args.algo.upper(), quantum=args.quantum, alpha=args.alpha,
+                        processes=processes)
+        if args.saida == "-":
+            write_text(sys.stdout, spec, **settings)
+            return 0
+        if args.saida.endswith(BINARY_SUFFIX):
+            count = write_binary(args.saida, spec, **settings)
+        else:
+            count = write_text(args.saida, spec, **settings)
+    except BrokenPipeError:
+        # Leitor da saída padrão terminou antes (ex.: simulação com horizonte)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(f"{count} tarefas gravadas em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())